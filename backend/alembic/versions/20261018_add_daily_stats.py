@@ -0,0 +1,47 @@
+"""add daily_stats (materialized per-day occupancy / gender / party counters)
+
+Revision ID: daily_stats
+Revises: visitor_phone_index
+Create Date: 2026-10-18
+
+대시보드·매출 리포트·참여자 스냅샷이 날짜마다 stay_coverage_filter 로 예약을 다시 합산하던
+것을 테넌트 × 날짜 1행으로 대체한다. 예약/daily info/객실 배정 커밋 시 영향 날짜만 재계산
+(app/services/daily_stats.py). 배포 후 기존 데이터는 scripts/daily_stats.py rebuild 로 채운다
+(행이 없는 날짜는 읽을 때 즉시 계산하므로 채우기 전에도 값은 정확).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'daily_stats'
+down_revision = 'visitor_phone_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.String(length=20), nullable=False),
+        sa.Column('male_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('female_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('party_1_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('party_2_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('party_2only_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('party_unstable_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('party_sales_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rooms_occupied', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('beds_used', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'date', name='uq_tenant_daily_stat_date'),
+    )
+    op.create_index('ix_daily_stats_tenant_id', 'daily_stats', ['tenant_id'])
+
+
+def downgrade():
+    op.drop_index('ix_daily_stats_tenant_id', table_name='daily_stats')
+    op.drop_table('daily_stats')
@@ -0,0 +1,45 @@
+"""composite / partial indexes for hot query shapes (scripts/bench/index_audit.py)
+
+Revision ID: hot_query_indexes
+Revises: res_sms_event_lookup
+Create Date: 2026-10-18
+
+scripts/bench/index_audit.py 가 합성 데이터(테넌트 4 × 예약 25,000)로 실행 계획을 잰 결과
+(docs/index-audit.md):
+- ix_reservation_stay_range (tenant_id, end_date, date): stay_coverage_filter 의 범위 분기.
+  date 단일 인덱스로는 date <= d 가 과거 예약 전체를 훑는다 → end_date > d 로 seek,
+  date = d 분기는 기존 ix_reservations_date 와 OR 결합
+- ix_reservation_confirmed (tenant_id, confirmed_at): 이벤트 타겟 confirmed_at >= cutoff,
+  예약 목록 keyset 정렬 (confirmed_at DESC) — 임시 정렬 제거
+- ix_res_sms_pending (tenant_id, template_key, date) WHERE sent_at IS NULL: 미발송 칩 조회
+- ix_activity_log_type_created (tenant_id, type, created_at): 유형별 최신순 (정렬 제거)
+- ix_reservation_daily_date 제거: uq_reservation_daily_info 와 같은 컬럼의 중복 인덱스
+RoomAssignment (reservation_id, date) 는 uq_room_assignment_res_date 가 이미 커버.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'hot_query_indexes'
+down_revision = 'res_sms_event_lookup'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_reservation_stay_range', 'reservations', ['tenant_id', 'end_date', 'date'])
+    op.create_index('ix_reservation_confirmed', 'reservations', ['tenant_id', 'confirmed_at'])
+    op.create_index(
+        'ix_res_sms_pending', 'reservation_sms_assignments', ['tenant_id', 'template_key', 'date'],
+        postgresql_where=sa.text('sent_at IS NULL'), sqlite_where=sa.text('sent_at IS NULL'),
+    )
+    op.create_index('ix_activity_log_type_created', 'activity_logs', ['tenant_id', 'type', 'created_at'])
+    op.drop_index('ix_reservation_daily_date', table_name='reservation_daily_info')
+
+
+def downgrade():
+    op.create_index('ix_reservation_daily_date', 'reservation_daily_info', ['reservation_id', 'date'])
+    op.drop_index('ix_activity_log_type_created', table_name='activity_logs')
+    op.drop_index('ix_res_sms_pending', table_name='reservation_sms_assignments')
+    op.drop_index('ix_reservation_confirmed', table_name='reservations')
+    op.drop_index('ix_reservation_stay_range', table_name='reservations')
@@ -0,0 +1,43 @@
+"""add naver_backfill_checkpoints (resumable historical backfill)
+
+Revision ID: naver_backfill_checkpoint
+Revises: room_assign_solver
+Create Date: 2026-10-18
+
+from_date 백필을 월별 청크 단위로 커밋하고, 마지막으로 커밋된 청크 위치를 기록해
+쿠키 만료 등으로 중단돼도 재실행 시 이어서 진행한다. 테넌트 × source 당 1행.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'naver_backfill_checkpoint'
+down_revision = 'room_assign_solver'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'naver_backfill_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('from_date', sa.String(length=10), nullable=False),
+        sa.Column('last_chunk_end', sa.String(length=10), nullable=True),
+        sa.Column('chunks_done', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fetched', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('added', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'source', name='uq_naver_backfill_checkpoint_tenant_source'),
+    )
+    op.create_index('ix_naver_backfill_checkpoints_tenant_id', 'naver_backfill_checkpoints', ['tenant_id'])
+
+
+def downgrade():
+    op.drop_index('ix_naver_backfill_checkpoints_tenant_id', table_name='naver_backfill_checkpoints')
+    op.drop_table('naver_backfill_checkpoints')
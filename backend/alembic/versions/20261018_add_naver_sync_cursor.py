@@ -0,0 +1,54 @@
+"""add naver_sync_cursors / naver_booking_hashes (incremental Naver sync)
+
+Revision ID: naver_sync_cursor
+Revises: add_room_memo
+Create Date: 2026-10-18
+
+5분 주기 동기화가 최근 1일치를 매번 전부 재처리하던 것을 증분으로 전환.
+- naver_sync_cursors: 테넌트 × source 별 마지막 성공 조회 시각 (조회 구간 = 커서 - 안전 겹침)
+- naver_booking_hashes: 예약별 마지막 반영 내용 해시 (변경 없는 예약은 Phase 2~5 스킵)
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'naver_sync_cursor'
+down_revision = 'add_room_memo'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'naver_sync_cursors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('last_fetched_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'source', name='uq_naver_sync_cursor_tenant_source'),
+    )
+    op.create_index('ix_naver_sync_cursors_tenant_id', 'naver_sync_cursors', ['tenant_id'])
+
+    op.create_table(
+        'naver_booking_hashes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('external_id', sa.String(length=100), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'source', 'external_id', name='uq_naver_booking_hash'),
+    )
+    op.create_index('ix_naver_booking_hashes_tenant_id', 'naver_booking_hashes', ['tenant_id'])
+
+
+def downgrade():
+    op.drop_index('ix_naver_booking_hashes_tenant_id', table_name='naver_booking_hashes')
+    op.drop_table('naver_booking_hashes')
+    op.drop_index('ix_naver_sync_cursors_tenant_id', table_name='naver_sync_cursors')
+    op.drop_table('naver_sync_cursors')
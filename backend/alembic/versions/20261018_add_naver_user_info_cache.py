@@ -0,0 +1,45 @@
+"""add naver_user_infos cache + reservations.naver_user_id
+
+Revision ID: naver_user_info_cache
+Revises: naver_sync_cursor
+Create Date: 2026-10-18
+
+매 sync 마다 모든 userId 에 대해 네이버 user-info API 를 호출하던 것을 TTL 캐시로 전환.
+- naver_user_infos: 테넌트 × 업체 × userId 별 성별/연령대/방문횟수 (+ 실패 negative 캐시)
+- reservations.naver_user_id: 기존 예약으로 캐시 warm-up 하기 위한 userId 보관
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'naver_user_info_cache'
+down_revision = 'naver_sync_cursor'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'naver_user_infos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('business_id', sa.String(length=50), nullable=False),
+        sa.Column('naver_user_id', sa.String(length=50), nullable=False),
+        sa.Column('gender', sa.String(length=10), nullable=True),
+        sa.Column('age_group', sa.String(length=20), nullable=True),
+        sa.Column('visit_count', sa.Integer(), nullable=True),
+        sa.Column('is_negative', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'business_id', 'naver_user_id', name='uq_naver_user_info'),
+    )
+    op.create_index('ix_naver_user_infos_tenant_id', 'naver_user_infos', ['tenant_id'])
+
+    op.add_column('reservations', sa.Column('naver_user_id', sa.String(length=50), nullable=True))
+
+
+def downgrade():
+    op.drop_column('reservations', 'naver_user_id')
+    op.drop_index('ix_naver_user_infos_tenant_id', table_name='naver_user_infos')
+    op.drop_table('naver_user_infos')
@@ -0,0 +1,29 @@
+"""index reservation_sms_assignments for event targeting (exclude_sent anti-join)
+
+Revision ID: res_sms_event_lookup
+Revises: daily_stats
+Create Date: 2026-10-18
+
+이벤트 스케줄 exclude_sent 가 발송/실패 이력의 reservation_id 를 전부 Python 으로 읽던
+것을 NOT EXISTS 안티 조인으로 대체 (template_scheduler._get_targets_event).
+(tenant_id, template_key, reservation_id) seek 후 sent_at/send_status 는 인덱스만으로 판정.
+"""
+from alembic import op
+
+
+revision = 'res_sms_event_lookup'
+down_revision = 'daily_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_res_sms_event_lookup',
+        'reservation_sms_assignments',
+        ['tenant_id', 'template_key', 'reservation_id', 'sent_at', 'send_status'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_res_sms_event_lookup', table_name='reservation_sms_assignments')
@@ -0,0 +1,24 @@
+"""index reservations.visitor_phone (incremental consecutive-stay detection)
+
+Revision ID: visitor_phone_index
+Revises: naver_backfill_checkpoint
+Create Date: 2026-10-18
+
+연박 증분 감지(detect_and_link_for_reservations)가 identity(이름|전화) 후보를
+phone / visitor_phone 인덱스 seek 로 찾는다. phone 은 기존 index 사용.
+"""
+from alembic import op
+
+
+revision = 'visitor_phone_index'
+down_revision = 'naver_backfill_checkpoint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_reservations_visitor_phone', 'reservations', ['visitor_phone'])
+
+
+def downgrade():
+    op.drop_index('ix_reservations_visitor_phone', table_name='reservations')
@@ -0,0 +1,24 @@
+"""add tenants.room_assign_solver (auto-assign packing mode)
+
+Revision ID: room_assign_solver
+Revises: naver_user_info_cache
+Create Date: 2026-10-18
+
+테넌트별 자동 객실 배정 방식 선택: 'greedy'(기존 first-fit) | 'optimal'(room_packing 탐색).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'room_assign_solver'
+down_revision = 'naver_user_info_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('tenants', sa.Column('room_assign_solver', sa.String(length=20), nullable=True, server_default='greedy'))
+
+
+def downgrade():
+    op.drop_column('tenants', 'room_assign_solver')
@@ -0,0 +1,64 @@
+"""native DATE columns for stay dates + PostgreSQL stay_range daterange (GiST)
+
+Revision ID: native_date_columns
+Revises: hot_query_indexes
+Create Date: 2026-10-18
+
+예약 체크인/체크아웃과 박 단위 테이블(room_assignments, reservation_daily_info, party_checkins,
+participant_snapshots, daily_stats)의 date 를 VARCHAR → DATE. Python/API 쪽은 app/db/types.DateString
+이 'YYYY-MM-DD' 문자열로 그대로 주고받는다.
+reservations.stay_range = daterange(date, GREATEST(end_date, date + 1), '[)') generated 컬럼 + GiST —
+stay_coverage_filter (@>) / stay_overlap_filter (&&) 가 인덱스 조회가 된다 (app/db/models.STAY_RANGE_DDL).
+
+reservation_sms_assignments.date 는 '' (날짜 없음) 센티널을 쓰므로 문자열 유지.
+SQLite 는 타입 선호도만 다르고 저장 값('YYYY-MM-DD')이 같으므로 변경 없음.
+"""
+from alembic import op
+
+
+revision = 'native_date_columns'
+down_revision = 'hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, 원래 VARCHAR 길이)
+DATE_COLUMNS = (
+    ('reservations', 'date', 20),
+    ('reservations', 'end_date', 20),
+    ('room_assignments', 'date', 20),
+    ('reservation_daily_info', 'date', 20),
+    ('party_checkins', 'date', 10),
+    ('participant_snapshots', 'date', 20),
+    ('daily_stats', 'date', 20),
+)
+
+STAY_RANGE_DDL = (
+    "ALTER TABLE reservations ADD COLUMN stay_range daterange "
+    "GENERATED ALWAYS AS (daterange(date, GREATEST(end_date, date + 1), '[)')) STORED",
+    "CREATE INDEX ix_reservation_stay_range_gist ON reservations USING gist (stay_range)",
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column, _ in DATE_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE DATE '
+            f'USING NULLIF("{column}", \'\')::date'
+        )
+    for ddl in STAY_RANGE_DDL:
+        op.execute(ddl)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_reservation_stay_range_gist")
+    op.execute("ALTER TABLE reservations DROP COLUMN IF EXISTS stay_range")
+    for table, column, length in DATE_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE VARCHAR({length}) '
+            f'USING to_char("{column}", \'YYYY-MM-DD\')'
+        )
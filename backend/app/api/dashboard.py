@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func
 from app.api.deps import get_tenant_scoped_db
-from app.db.models import Reservation, ActivityLog, ReservationStatus, User
+from app.db.models import Reservation, ActivityLog, User
 from app.auth.dependencies import get_current_user
 from datetime import datetime
 from app.config import KST
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
 @router.get("/stats")
-async def get_dashboard_stats(db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def get_dashboard_stats(db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Get dashboard statistics"""
 
     # Today's new reservations (created today)
@@ -43,25 +43,16 @@ async def get_dashboard_stats(db: Session = Depends(get_tenant_scoped_db), curre
         ActivityLog.created_at >= today_start,
     ).scalar() or 0)
 
-    # Gender stats (7 days: today + 6 days forward) — 연박 중간일 + NULL/당일 모두 포함
+    # Gender stats (7 days: today + 6 days forward) — 연박 중간일 + NULL/당일 모두 포함 (daily_stats 7행)
     from datetime import timedelta
-    from app.services.filters import stay_coverage_filter
+    from app.services.daily_stats import get_daily_stats
     today = datetime.now(KST).date()
     date_strs = [(today + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
-    gender_daily = []
-    for d in date_strs:
-        row = db.query(
-            func.coalesce(func.sum(Reservation.male_count), 0).label("male"),
-            func.coalesce(func.sum(Reservation.female_count), 0).label("female"),
-        ).select_from(Reservation).filter(
-            stay_coverage_filter(d),
-            Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.COMPLETED]),
-        ).first()
-        gender_daily.append({
-            "date": d,
-            "male": int(row.male) if row else 0,
-            "female": int(row.female) if row else 0,
-        })
+    daily_stats = get_daily_stats(db, date_strs)
+    gender_daily = [
+        {"date": d, "male": daily_stats[d].male_count or 0, "female": daily_stats[d].female_count or 0}
+        for d in date_strs
+    ]
 
     # Naver sync status — from last ActivityLog + APScheduler next run
     from app.scheduler.jobs import scheduler as apscheduler
@@ -123,7 +114,7 @@ async def get_dashboard_stats(db: Session = Depends(get_tenant_scoped_db), curre
 
 
 @router.get("/today-schedules")
-async def get_today_schedules(db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def get_today_schedules(db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Get today's schedule timeline for dashboard display"""
     from app.db.models import TemplateSchedule
 
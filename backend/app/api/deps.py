@@ -20,62 +20,62 @@ async def get_current_tenant_id(
 
     Uses Request-based token extraction to avoid circular import with
     auth/dependencies.py (which itself imports get_current_tenant_id).
+    사용자/테넌트/매핑은 auth.context 에서 조인 쿼리 1회 (+ 짧은 TTL 캐시) 로 해석한다.
     """
-    from app.db.models import Tenant, User, UserTenantRole, UserRole
-    from app.auth.utils import decode_access_token
-    import jwt
+    from app.db.models import Tenant, UserRole
+    from app.auth.context import resolve_auth, token_payload
 
     if x_tenant_id is None:
         raise HTTPException(status_code=400, detail="X-Tenant-Id 헤더가 필요합니다")
 
-    tenant = db.query(Tenant).filter(
-        Tenant.id == x_tenant_id,
-        Tenant.is_active == True,
-    ).first()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="유효하지 않은 테넌트입니다")
-
     # Resolve the current user from the Authorization header if present.
-    # Deferred inline to avoid circular import: auth/dependencies.py imports this module.
-    current_user = None
+    ctx = None
     auth_header = request.headers.get("Authorization", "")
     if auth_header.startswith("Bearer "):
         token = auth_header[len("Bearer "):]
         try:
-            payload = decode_access_token(token)
-            username = payload.get("sub")
-            if username:
-                current_user = db.query(User).filter(
-                    User.username == username,
-                    User.is_active == True,
-                ).first()
-        except (jwt.PyJWTError, Exception):
+            payload = token_payload(request, token)
+        except Exception:
             # Invalid/expired token — let downstream auth deps handle the 401.
-            pass
-
-    # Fail-closed: require authentication for tenant access
-    if current_user is None:
+            payload = None
+        if payload is not None:
+            ctx = resolve_auth(request, db, token, payload, x_tenant_id)
+
+    if ctx is None or ctx.user is None:
+        # 사용자를 못 찾은 경우에도 테넌트 404 가 401 보다 먼저 (기존 순서 유지)
+        exists = db.query(Tenant.id).filter(
+            Tenant.id == x_tenant_id,
+            Tenant.is_active == True,
+        ).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="유효하지 않은 테넌트입니다")
+        # Fail-closed: require authentication for tenant access
         raise HTTPException(status_code=401, detail="인증이 필요합니다")
 
+    if ctx.tenant is None:
+        raise HTTPException(status_code=404, detail="유효하지 않은 테넌트입니다")
+
     # Verify user has access to this tenant (SUPERADMIN bypasses check).
-    if current_user.role != UserRole.SUPERADMIN:
-        mapping = db.query(UserTenantRole).filter(
-            UserTenantRole.user_id == current_user.id,
-            UserTenantRole.tenant_id == tenant.id,
-        ).first()
-        if not mapping:
-            raise HTTPException(status_code=403, detail="해당 펜션에 대한 접근 권한이 없습니다")
+    if ctx.user.role != UserRole.SUPERADMIN and not ctx.has_access:
+        raise HTTPException(status_code=403, detail="해당 펜션에 대한 접근 권한이 없습니다")
 
-    return tenant.id
+    return ctx.tenant.id
 
 
 async def get_current_tenant(
+    request: Request,
     tenant_id: int = Depends(get_current_tenant_id),
     db: Session = Depends(get_db),
 ):
     """Get full Tenant object for endpoints that need tenant settings (e.g., Naver sync).
-    Depends on get_current_tenant_id to reuse user-tenant access verification."""
+    Depends on get_current_tenant_id to reuse user-tenant access verification —
+    그 단계에서 해석한 테넌트를 이 세션에 붙여 반환 (추가 쿼리 없음)."""
     from app.db.models import Tenant
+    from app.auth.context import request_tenant
+
+    cached = request_tenant(request, tenant_id)
+    if cached is not None:
+        return cached.tenant_in(db)
     tenant = db.query(Tenant).filter(
         Tenant.id == tenant_id,
         Tenant.is_active == True,
@@ -3,8 +3,10 @@ SSE endpoint for real-time event streaming to frontend clients.
 """
 import asyncio
 import logging
+from typing import Optional
+
 import jwt
-from fastapi import APIRouter, Query, HTTPException, status
+from fastapi import APIRouter, Header, Query, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
@@ -73,6 +75,8 @@ def _validate_token_and_tenant(token: str, tenant_id: int) -> None:
 async def event_stream(
     token: str = Query(..., description="JWT access token"),
     tenant_id: int = Query(..., description="Tenant ID to subscribe to"),
+    last_event_id: Optional[str] = Query(None, description="Resume after this event ID (Last-Event-ID header takes precedence)"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
 ):
     """
     Server-Sent Events stream. Clients subscribe here to receive real-time
@@ -80,11 +84,16 @@ async def event_stream(
 
     Authentication is done via query parameters because the EventSource API
     does not support custom request headers.
+
+    Every event carries an ``id:`` line. EventSource sends it back as the
+    Last-Event-ID header on reconnect, and the events missed in between are
+    replayed before live events.
     """
     _validate_token_and_tenant(token, tenant_id)
 
-    q = subscribe(tenant_id)
-    diag("sse.subscribed", level="verbose", tenant_id=tenant_id)
+    resume_from = last_event_id_header or last_event_id
+    q = subscribe(tenant_id, last_event_id=resume_from)
+    diag("sse.subscribed", level="verbose", tenant_id=tenant_id, last_event_id=resume_from)
 
     async def generator():
         try:
@@ -93,7 +102,7 @@ async def event_stream(
             while True:
                 try:
                     payload = await asyncio.wait_for(q.get(), timeout=30)
-                    yield f"data: {payload}\n\n"
+                    yield f"id: {q.last_id}\ndata: {payload}\n\n"
                 except asyncio.TimeoutError:
                     # Keep-alive ping every 30 s
                     yield ": ping\n\n"
@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 from pydantic import BaseModel
 
 from app.api.deps import get_tenant_scoped_db
+from app.api.shared_schemas import IsoDate
 from app.db.models import Reservation, ReservationStatus, PartyCheckin, ReservationDailyInfo
 from app.auth.dependencies import require_any_role
 from app.diag_logger import diag
@@ -47,8 +48,8 @@ PARTY_TYPE_VALUES = {'1', '2', '2차만'}
 
 
 @router.get("", response_model=List[PartyCheckinItem])
-async def get_party_checkin_list(
-    date: str,
+def get_party_checkin_list(
+    date: IsoDate,
     party_source: str = "stable",
     db: Session = Depends(get_tenant_scoped_db),
     current_user=Depends(require_any_role),
@@ -147,9 +148,9 @@ async def get_party_checkin_list(
 
 
 @router.patch("/{reservation_id}/toggle", response_model=ToggleResponse)
-async def toggle_party_checkin(
+def toggle_party_checkin(
     reservation_id: int,
-    date: str,
+    date: IsoDate,
     db: Session = Depends(get_tenant_scoped_db),
     current_user=Depends(require_any_role),
 ):
@@ -1,7 +1,8 @@
 """
 Reservations API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from pydantic import BaseModel
@@ -11,9 +12,10 @@ from app.db.models import Reservation, ReservationStatus, User, Tenant, Reservat
 from app.factory import get_reservation_provider_for_tenant, get_sms_provider_for_tenant
 from app.auth.dependencies import get_current_user
 from app.rate_limit import limiter
-from app.services import room_assignment
+from app.services import reservation_grid, room_assignment
 from app.services.activity_logger import log_activity
-from app.api.shared_schemas import ActionResponse
+from app.services.reference_cache import get_active_schedules
+from app.api.shared_schemas import ActionResponse, IsoDate
 from datetime import datetime, timezone
 import logging
 from app.diag_logger import diag
@@ -25,9 +27,9 @@ logger = logging.getLogger(__name__)
 class ReservationCreate(BaseModel):
     customer_name: str
     phone: str
-    check_in_date: str  # YYYY-MM-DD
+    check_in_date: IsoDate  # YYYY-MM-DD
     check_in_time: str  # HH:MM
-    check_out_date: Optional[str] = None  # YYYY-MM-DD (연박 시)
+    check_out_date: Optional[IsoDate] = None  # YYYY-MM-DD (연박 시)
     status: str = "pending"
     notes: Optional[str] = None
     gender: Optional[str] = None
@@ -42,7 +44,7 @@ class ReservationCreate(BaseModel):
 class ReservationUpdate(BaseModel):
     customer_name: Optional[str] = None
     phone: Optional[str] = None
-    check_in_date: Optional[str] = None
+    check_in_date: Optional[IsoDate] = None
     check_in_time: Optional[str] = None
     status: Optional[str] = None
     notes: Optional[str] = None
@@ -59,7 +61,7 @@ class ReservationUpdate(BaseModel):
 
 class RoomAssignRequest(BaseModel):
     room_id: Optional[int] = None
-    date: Optional[str] = None
+    date: Optional[IsoDate] = None
     apply_subsequent: bool = True  # Apply to subsequent dates for multi-night stays
     apply_group: bool = False  # Apply to all reservations in the same stay_group
 
@@ -129,6 +131,15 @@ class ReservationResponse(BaseModel):
         from_attributes = True
 
 
+def _daily_template_keys(db: Session) -> set:
+    """daily 스케줄(target_mode 없음)의 template_key — 칩 날짜 필터용."""
+    return {
+        s.template.template_key
+        for s in get_active_schedules(db)
+        if s.target_mode is None and s.template
+    }
+
+
 def _to_response(res: Reservation, override_room: Optional[str] = None, override_password: Optional[str] = None, override_assigned_by: Optional[str] = None, override_party_type: Optional[str] = None, override_room_id: Optional[int] = None, override_bed_order: Optional[int] = None, db: Session = None, filter_date: Optional[str] = None, daily_keys: Optional[set] = None, override_notes: Optional[str] = None, override_unstable_party: Optional[bool] = None, override_has_unstable_booking: bool = False) -> ReservationResponse:
     assignments = []
     if db is not None and hasattr(res, 'sms_assignments'):
@@ -140,12 +151,7 @@ def _to_response(res: Reservation, override_room: Optional[str] = None, override
             # (3) date > 조회일 AND 미발송 AND !daily: 미래 미발송 칩 (예: 내일 보낼 후킹SMS)
             # daily 스케줄은 그 날만 표시 (연박자 각 날에 같은 칩 중복 방지)
             if daily_keys is None:
-                from app.db.models import TemplateSchedule
-                daily_keys = {
-                    s.template.template_key
-                    for s in db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True, TemplateSchedule.target_mode.is_(None)).all()
-                    if s.template
-                }
+                daily_keys = _daily_template_keys(db)
             source = [a for a in source if (a.date or '') == filter_date or ((a.date or '') < filter_date and a.sent_at is not None and a.template_key not in daily_keys) or ((a.date or '') > filter_date and a.sent_at is None and a.template_key not in daily_keys)]
         assignments = [
             SmsAssignmentResponse(
@@ -204,19 +210,29 @@ def _to_response(res: Reservation, override_room: Optional[str] = None, override
 
 
 @router.get("")
-async def get_reservations(
+def get_reservations(
     skip: int = 0,
     limit: int = 50,
     status: Optional[str] = None,
-    date: Optional[str] = None,
-    date_from: Optional[str] = None,
-    date_to: Optional[str] = None,
+    date: Optional[IsoDate] = None,
+    date_from: Optional[IsoDate] = None,
+    date_to: Optional[IsoDate] = None,
     search: Optional[str] = None,
     source: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count: str = "exact",
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get reservations with pagination and filtering"""
+    """Get reservations with pagination and filtering
+
+    - 정렬: confirmed_at 최신순 (동률은 id 역순). cursor(next_cursor 값)를 주면 keyset,
+      없으면 skip(OFFSET) 페이지네이션
+    - count: exact(COUNT) | estimate(PostgreSQL 플래너 추정, 그 외 DB 는 exact) | none
+    - date 가 있으면 그리드 전용 조회(services/reservation_grid) — SQL 1회 + dict 직렬화
+    """
+    if count not in ("exact", "estimate", "none"):
+        raise HTTPException(status_code=400, detail="count 는 exact, estimate, none 중 하나여야 합니다")
     query = db.query(Reservation)
 
     if status:
@@ -265,114 +281,78 @@ async def get_reservations(
             query = query.filter(Reservation.check_in_date <= date_to)
 
     # Total count before pagination (for server-side pagination)
-    total_count = query.count()
+    total_count = None
+    total_estimated = False
+    if count == "estimate":
+        total_count = reservation_grid.estimated_count(db, query)
+        total_estimated = total_count is not None
+    if count != "none" and total_count is None:
+        total_count = query.count()
+
+    if date:
+        from app.db.tenant_context import current_tenant_id
+        try:
+            items, next_cursor = reservation_grid.date_view_items(
+                db, query, date, current_tenant_id.get(), _daily_template_keys(db),
+                limit=limit, skip=skip, cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        body = {"items": items, "total": total_count, "total_estimated": total_estimated, "next_cursor": next_cursor}
+        return Response(content=to_json(body), media_type="application/json")
 
     # Order by most recent confirmation or cancellation datetime
     from sqlalchemy.orm import selectinload
-    reservations = query.options(
+    page_query = query
+    if cursor:
+        try:
+            page_query = reservation_grid.apply_cursor(page_query, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    page_query = page_query.options(
         selectinload(Reservation.sms_assignments)
-    ).order_by(
-        Reservation.confirmed_at.desc().nullslast(),
-    ).offset(skip).limit(limit).all()
+    ).order_by(*reservation_grid.GRID_ORDER)
+    if not cursor:
+        page_query = page_query.offset(skip)
+    reservations = page_query.limit(limit).all()
+    next_cursor = (
+        reservation_grid.encode_cursor(reservations[-1].confirmed_at, reservations[-1].id)
+        if reservations and len(reservations) == limit else None
+    )
 
     # 항상 RoomAssignment에서 객실 정보 조회 (소스 오브 트루스) — 배치 조회로 N+1 제거
+    # date 없음: 각 예약의 check-in date 기준으로 조회 ((reservation_id, date) 쌍을 한 번에 가져온 뒤 매핑)
+    room_map = {}
     res_ids = [r.id for r in reservations]
     if res_ids:
-        # date 파라미터가 있으면 해당 날짜로 일괄 조회, 없으면 각 예약의 date를 키로 사용
-        if date:
-            from app.services.room_lookup import batch_room_lookup
-            _rl = batch_room_lookup(db, res_ids, date)
-            room_map = {res_id: (info["room_id"], info["room_number"] or '', info["room_password"], info["assigned_by"], info.get("bed_order", 0)) for res_id, info in _rl.items()}
-
-            # Batch-query daily info for the target date
-            daily_infos = (
-                db.query(ReservationDailyInfo)
-                .filter(
-                    ReservationDailyInfo.reservation_id.in_(res_ids),
-                    ReservationDailyInfo.date == date,
-                )
-                .all()
-            )
-            daily_party_map = {di.reservation_id: di.party_type for di in daily_infos}
-            daily_notes_map = {di.reservation_id: di.notes for di in daily_infos if di.notes is not None}
-            daily_unstable_map = {di.reservation_id: di.unstable_party for di in daily_infos if di.unstable_party}
-        else:
-            # date 없음: 각 예약의 check-in date 기준으로 조회
-            # (reservation_id, date) 쌍을 한 번에 가져온 뒤 매핑
-            res_date_map = {r.id: r.check_in_date for r in reservations}
-            room_assignments = (
-                db.query(RoomAssignment)
-                .filter(RoomAssignment.reservation_id.in_(res_ids))
-                .all()
-            )
-            from app.services.room_lookup import batch_room_lookup
-            # Collect only assignments matching each reservation's check-in date
-            matching_ids = [ra.reservation_id for ra in room_assignments if ra.date == res_date_map.get(ra.reservation_id)]
-            _rl = batch_room_lookup(db, matching_ids) if matching_ids else {}
-            # Merge with per-date filter: only keep if the assignment date matches check-in
-            room_map = {}
-            for ra in room_assignments:
-                if ra.date == res_date_map.get(ra.reservation_id) and ra.reservation_id in _rl:
-                    info = _rl[ra.reservation_id]
-                    room_map[ra.reservation_id] = (info["room_id"], info["room_number"] or '', info["room_password"], info["assigned_by"], info.get("bed_order", 0))
-            daily_party_map = {}
-            daily_notes_map = {}
-            daily_unstable_map = {}
-    else:
-        room_map = {}
-        daily_party_map = {}
-        daily_notes_map = {}
-
-    # daily_keys를 한 번만 조회 (N+1 방지)
-    _daily_keys = None
-    if date:
-        from app.db.models import TemplateSchedule
-        _daily_keys = {
-            s.template.template_key
-            for s in db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True, TemplateSchedule.target_mode.is_(None)).all()
-            if s.template
-        }
-
-    # 언스테이블 예약 전화번호 매칭: 같은 날짜에 숙박 중인 스테이블 예약자 중 언스테이블도 예약한 사람 감지
-    unstable_phone_set: set = set()
-    if date:
-        unstable_phones = [r.phone for r in reservations if r.section == 'unstable' and r.phone]
-        unstable_phone_set = set(unstable_phones)
+        res_date_map = {r.id: r.check_in_date for r in reservations}
+        room_assignments = (
+            db.query(RoomAssignment)
+            .filter(RoomAssignment.reservation_id.in_(res_ids))
+            .all()
+        )
+        from app.services.room_lookup import batch_room_lookup
+        # Collect only assignments matching each reservation's check-in date
+        matching_ids = [ra.reservation_id for ra in room_assignments if ra.date == res_date_map.get(ra.reservation_id)]
+        _rl = batch_room_lookup(db, matching_ids) if matching_ids else {}
+        # Merge with per-date filter: only keep if the assignment date matches check-in
+        for ra in room_assignments:
+            if ra.date == res_date_map.get(ra.reservation_id) and ra.reservation_id in _rl:
+                info = _rl[ra.reservation_id]
+                room_map[ra.reservation_id] = (info["room_id"], info["room_number"] or '', info["room_password"], info["assigned_by"], info.get("bed_order", 0))
 
     results = []
     for res in reservations:
         if res.id in room_map:
             override_room_id, override_room, override_password, override_assigned_by, override_bed_order = room_map[res.id]
-        elif date:
-            # 해당 날짜에 배정 없음 — denormalized field 무시하고 빈 값 반환
-            override_room_id, override_room, override_password, override_assigned_by, override_bed_order = None, '', '', None, 0
         else:
             override_room_id, override_room, override_password, override_assigned_by, override_bed_order = None, None, None, None, 0
-
-        # Resolve per-date party_type: daily info overrides reservation-level value when date is provided
-        if date and res.id in daily_party_map:
-            override_party_type = daily_party_map[res.id]
-        else:
-            override_party_type = None  # Fall back to reservation.party_type in _to_response
-
-        # Resolve per-date notes
-        if date and res.id in daily_notes_map:
-            override_notes = daily_notes_map[res.id]
-        else:
-            override_notes = None
-
-        # Resolve per-date unstable_party
-        override_unstable = daily_unstable_map.get(res.id) if date else None
-
-        # 언스테이블 예약 매칭 (스테이블 예약자 중 언스테이블도 예약한 사람)
-        has_unstable = res.section != 'unstable' and bool(res.phone) and res.phone in unstable_phone_set
-
-        results.append(_to_response(res, override_room=override_room, override_password=override_password, override_assigned_by=override_assigned_by, override_party_type=override_party_type, override_room_id=override_room_id, override_bed_order=override_bed_order, db=db, filter_date=date, daily_keys=_daily_keys, override_notes=override_notes, override_unstable_party=override_unstable, override_has_unstable_booking=has_unstable))
-    return {"items": results, "total": total_count}
+        results.append(_to_response(res, override_room=override_room, override_password=override_password, override_assigned_by=override_assigned_by, override_room_id=override_room_id, override_bed_order=override_bed_order, db=db))
+    return {"items": results, "total": total_count, "total_estimated": total_estimated, "next_cursor": next_cursor}
 
 
 @router.post("", response_model=ReservationResponse)
-async def create_reservation(reservation: ReservationCreate, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def create_reservation(reservation: ReservationCreate, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Create a new reservation"""
     # Convert status string to enum
     try:
@@ -436,7 +416,7 @@ async def create_reservation(reservation: ReservationCreate, db: Session = Depen
 
 
 @router.put("/{reservation_id}", response_model=ReservationResponse)
-async def update_reservation(
+def update_reservation(
     reservation_id: int, reservation: ReservationUpdate, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)
 ):
     """Update a reservation"""
@@ -607,7 +587,7 @@ async def update_reservation(
 
 
 @router.delete("/{reservation_id}", response_model=ActionResponse)
-async def delete_reservation(reservation_id: int, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def delete_reservation(reservation_id: int, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Delete a reservation"""
     db_reservation = db.query(Reservation).filter(Reservation.id == reservation_id).first()
     if not db_reservation:
@@ -656,7 +636,7 @@ class RoomAssignResponse(BaseModel):
 
 
 @router.put("/{reservation_id}/room", response_model=RoomAssignResponse)
-async def assign_room(
+def assign_room(
     reservation_id: int, request: RoomAssignRequest, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)
 ):
     """Assign or unassign a room to a reservation"""
@@ -761,14 +741,14 @@ async def assign_room(
 
 
 class DailyInfoUpdate(BaseModel):
-    date: str  # YYYY-MM-DD
+    date: IsoDate  # YYYY-MM-DD
     party_type: Optional[str] = None
     notes: Optional[str] = None
     unstable_party: Optional[bool] = None
 
 
 @router.put("/{reservation_id}/daily-info", response_model=ReservationResponse)
-async def update_daily_info(
+def update_daily_info(
     reservation_id: int,
     request: DailyInfoUpdate,
     db: Session = Depends(get_tenant_scoped_db),
@@ -826,19 +806,22 @@ async def update_daily_info(
 
 @router.post("/sync/naver")
 @limiter.limit("5/minute")
-async def sync_from_naver(request: Request, from_date: Optional[str] = None, reconcile_date: Optional[str] = None, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user), tenant: Tenant = Depends(get_current_tenant)):
+async def sync_from_naver(request: Request, from_date: Optional[IsoDate] = None, reconcile_date: Optional[IsoDate] = None, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user), tenant: Tenant = Depends(get_current_tenant)):
     """Sync reservations from Naver Smart Place API.
 
     Args:
         from_date: Optional start date (YYYY-MM-DD) for historical sync.
         reconcile_date: Optional check-in date (YYYY-MM-DD) for STARTDATE-based reconciliation.
     """
+    from app.db.executor import run_db
     from app.services.naver_sync import sync_naver_to_db
 
     reservation_provider = get_reservation_provider_for_tenant(tenant)
     result = await sync_naver_to_db(reservation_provider, db, from_date=from_date, reconcile_date=reconcile_date)
 
-    log_activity(
+    # 활동 로그 / commit 도 DB 스레드 풀에서 (sync_naver_to_db 의 DB 구간과 동일)
+    await run_db(
+        log_activity,
         db,
         type="naver_sync",
         title=f"[스테이블] 네이버 예약 동기화 : 수동 실행{f' ({from_date}~)' if from_date else ''}",
@@ -858,7 +841,8 @@ async def sync_from_naver(request: Request, from_date: Optional[str] = None, rec
         )
         try:
             unstable_result = await sync_naver_to_db(unstable_provider, db, from_date=from_date, source="unstable")
-            log_activity(
+            await run_db(
+                log_activity,
                 db,
                 type="naver_sync",
                 title=f"[언스테이블] 네이버 예약 동기화 : 수동 실행{f' ({from_date}~)' if from_date else ''}",
@@ -870,7 +854,7 @@ async def sync_from_naver(request: Request, from_date: Optional[str] = None, rec
         except Exception as e:
             logger.warning(f"Unstable sync failed during manual sync: {e}")
 
-    db.commit()
+    await run_db(db.commit)
 
     # 응답에 언스테이블 결과도 포함
     if unstable_result:
@@ -880,7 +864,7 @@ async def sync_from_naver(request: Request, from_date: Optional[str] = None, rec
 
 
 @router.post("/{reservation_id}/sms-assign")
-async def assign_sms_template(
+def assign_sms_template(
     reservation_id: int,
     request: SmsAssignRequest,
     db: Session = Depends(get_tenant_scoped_db),
@@ -917,7 +901,7 @@ async def assign_sms_template(
 
 
 @router.delete("/{reservation_id}/sms-assign/{template_key}")
-async def unassign_sms_template(
+def unassign_sms_template(
     reservation_id: int,
     template_key: str,
     date: str = None,
@@ -1087,12 +1071,12 @@ class ExtendStayResponse(BaseModel):
 class ExtendStayAssignRequest(BaseModel):
     new_reservation_id: int
     room_id: int
-    date: str  # YYYY-MM-DD
+    date: IsoDate  # YYYY-MM-DD
     move_existing_to_unassigned: bool = False  # True = move existing guests to unassigned
 
 
 @router.post("/detect-consecutive", response_model=ActionResponse)
-async def detect_consecutive_stays(
+def detect_consecutive_stays(
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -1109,7 +1093,7 @@ async def detect_consecutive_stays(
 
 
 @router.post("/{reservation_id}/stay-group/link", response_model=ActionResponse)
-async def link_stay_group(
+def link_stay_group(
     reservation_id: int,
     request: StayGroupLinkRequest,
     db: Session = Depends(get_tenant_scoped_db),
@@ -1132,8 +1116,7 @@ async def link_stay_group(
         raise HTTPException(status_code=400, detail=str(e))
 
     from app.services.room_assignment import sync_sms_tags
-    from app.db.models import TemplateSchedule
-    schedules = db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True).all()
+    schedules = get_active_schedules(db)
     # 자동 확장된 멤버까지 포함해서 sync (linked_ids 는 확장 후 전체)
     for res_id in linked_ids:
         sync_sms_tags(db, res_id, schedules=schedules)
@@ -1152,7 +1135,7 @@ async def link_stay_group(
 
 
 @router.delete("/{reservation_id}/stay-group/unlink", response_model=ActionResponse)
-async def unlink_stay_group(
+def unlink_stay_group(
     reservation_id: int,
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
@@ -1160,7 +1143,7 @@ async def unlink_stay_group(
     """Remove a reservation from its consecutive stay group."""
     from app.services.consecutive_stay import unlink_from_group
     from app.services.room_assignment import sync_sms_tags
-    from app.db.models import TemplateSchedule, Reservation
+    from app.db.models import Reservation
 
     res = db.query(Reservation).filter(Reservation.id == reservation_id).first()
     affected_ids = []
@@ -1175,7 +1158,7 @@ async def unlink_stay_group(
              reservation_id=reservation_id)
         raise HTTPException(status_code=404, detail="연박 그룹에 속하지 않은 예약입니다")
 
-    schedules = db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True).all()
+    schedules = get_active_schedules(db)
     for res_id in affected_ids:
         sync_sms_tags(db, res_id, schedules=schedules)
 
@@ -1193,7 +1176,7 @@ async def unlink_stay_group(
 
 
 @router.post("/{reservation_id}/extend-stay", response_model=ExtendStayResponse)
-async def extend_stay(
+def extend_stay(
     reservation_id: int,
     request: ExtendStayRequest,
     db: Session = Depends(get_tenant_scoped_db),
@@ -1202,7 +1185,6 @@ async def extend_stay(
     """연박추가: 다음날 예약 생성 + 연박 그룹 연결 + 방 배정 (단일 트랜잭션)"""
     from app.services.consecutive_stay import link_reservations
     from app.services.room_assignment import sync_sms_tags, assign_room
-    from app.db.models import TemplateSchedule
     from datetime import timedelta, date as date_type
 
     # 1. 원본 예약 조회
@@ -1258,7 +1240,7 @@ async def extend_stay(
         raise HTTPException(status_code=400, detail=str(e))
 
     # 5. SMS 태그 동기화 (자동 확장된 멤버까지 포함)
-    schedules = db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True).all()
+    schedules = get_active_schedules(db)
     for res_id in linked_ids:
         sync_sms_tags(db, res_id, schedules=schedules)
 
@@ -1315,7 +1297,7 @@ async def extend_stay(
 
 
 @router.post("/{reservation_id}/extend-stay/assign-room", response_model=ActionResponse)
-async def extend_stay_assign_room(
+def extend_stay_assign_room(
     reservation_id: int,
     request: ExtendStayAssignRequest,
     db: Session = Depends(get_tenant_scoped_db),
@@ -1355,7 +1337,7 @@ async def extend_stay_assign_room(
 
 
 @router.delete("/{reservation_id}/extend-stay", response_model=ActionResponse)
-async def cancel_extend_stay(
+def cancel_extend_stay(
     reservation_id: int,
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
@@ -1363,7 +1345,6 @@ async def cancel_extend_stay(
     """연박취소: 수동연박 예약 삭제 + 연박 그룹 해제 + 원본 복원"""
     from app.services.consecutive_stay import unlink_from_group
     from app.services.room_assignment import sync_sms_tags
-    from app.db.models import TemplateSchedule
 
     original = db.query(Reservation).filter(Reservation.id == reservation_id).first()
     if not original:
@@ -1408,7 +1389,7 @@ async def cancel_extend_stay(
     db.flush()
 
     # 6. Sync SMS tags for remaining group members
-    schedules = db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True).all()
+    schedules = get_active_schedules(db)
     # Get remaining group members (if any)
     if original.stay_group_id:
         remaining = db.query(Reservation.id).filter(
@@ -15,7 +15,7 @@ from datetime import datetime, timezone
 import logging
 
 from app.services.room_auto_assign import auto_assign_rooms
-from app.api.shared_schemas import ActionResponse
+from app.api.shared_schemas import ActionResponse, IsoDate
 from app.diag_logger import diag
 
 router = APIRouter(prefix="/api/rooms", tags=["rooms"])
@@ -191,7 +191,7 @@ def _sync_biz_item_links(db: Session, room: Room, biz_item_ids: List[str],
 
 
 @router.get("", response_model=List[RoomResponse])
-async def get_rooms(
+def get_rooms(
     include_inactive: bool = False,
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
@@ -229,7 +229,7 @@ def _biz_item_to_response(item: NaverBizItem) -> NaverBizItemResponse:
 
 
 @router.get("/naver/biz-items", response_model=List[NaverBizItemResponse])
-async def get_naver_biz_items(db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def get_naver_biz_items(db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Get stored Naver biz items"""
     items = db.query(NaverBizItem).order_by(NaverBizItem.is_exposed.desc(), NaverBizItem.updated_at.desc()).all()
     return [_biz_item_to_response(i) for i in items]
@@ -352,7 +352,7 @@ class RoomGroupResponse(BaseModel):
 
 
 @router.get("/groups", response_model=List[RoomGroupResponse])
-async def get_room_groups(
+def get_room_groups(
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -367,7 +367,7 @@ async def get_room_groups(
 
 
 @router.post("/groups", response_model=RoomGroupResponse)
-async def create_room_group(
+def create_room_group(
     data: RoomGroupCreate,
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(require_admin_or_above),
@@ -392,7 +392,7 @@ async def create_room_group(
 
 
 @router.put("/groups/{group_id}", response_model=RoomGroupResponse)
-async def update_room_group(
+def update_room_group(
     group_id: int,
     data: RoomGroupUpdate,
     db: Session = Depends(get_tenant_scoped_db),
@@ -431,7 +431,7 @@ async def update_room_group(
 
 
 @router.delete("/groups/{group_id}")
-async def delete_room_group(
+def delete_room_group(
     group_id: int,
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(require_admin_or_above),
@@ -453,7 +453,7 @@ async def delete_room_group(
 # ── Single Room CRUD ─────────────────────────────────────────────────────────
 
 @router.get("/{room_id}", response_model=RoomResponse)
-async def get_room(room_id: int, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def get_room(room_id: int, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Get a single room by ID"""
     room = db.query(Room).options(selectinload(Room.biz_item_links), selectinload(Room.building), selectinload(Room.room_group)).filter(Room.id == room_id).first()
     if not room:
@@ -462,7 +462,7 @@ async def get_room(room_id: int, db: Session = Depends(get_tenant_scoped_db), cu
 
 
 @router.post("", response_model=RoomResponse)
-async def create_room(room: RoomCreate, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def create_room(room: RoomCreate, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Create a new room (duplicates allowed)"""
     # Resolve biz_item_links: prefer biz_item_links (with priority), fall back to biz_item_ids, then legacy
     if room.biz_item_links is not None:
@@ -508,7 +508,7 @@ async def create_room(room: RoomCreate, db: Session = Depends(get_tenant_scoped_
 
 
 @router.put("/{room_id}", response_model=RoomUpdateResponse)
-async def update_room(
+def update_room(
     room_id: int,
     room: RoomUpdate,
     db: Session = Depends(get_tenant_scoped_db),
@@ -623,7 +623,7 @@ def reorder_rooms(
 
 
 @router.delete("/{room_id}", response_model=ActionResponse)
-async def delete_room(room_id: int, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
+def delete_room(room_id: int, db: Session = Depends(get_tenant_scoped_db), current_user: User = Depends(get_current_user)):
     """Delete a room"""
     diag("rooms.delete", level="critical", room_id=room_id)
     db_room = db.query(Room).filter(Room.id == room_id).first()
@@ -650,8 +650,8 @@ async def delete_room(room_id: int, db: Session = Depends(get_tenant_scoped_db),
 
 
 @router.post("/auto-assign")
-async def trigger_auto_assign(
-    date: str = None,
+def trigger_auto_assign(
+    date: Optional[IsoDate] = None,
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
 ):
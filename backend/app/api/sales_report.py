@@ -3,15 +3,12 @@ Sales Report API - 진행자별 매출 분석 + 날짜별 상세
 """
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
 from pydantic import BaseModel
 from typing import Optional, List
 from app.api.deps import get_tenant_scoped_db
+from app.api.shared_schemas import IsoDate
 from app.auth.dependencies import get_current_user
-from app.db.models import (
-    Reservation, ReservationStatus, ReservationDailyInfo,
-    OnsiteSale, DailyHost, OnsiteAuction, User,
-)
+from app.db.models import OnsiteSale, DailyHost, OnsiteAuction, User
 
 router = APIRouter(prefix="/api/sales-report", tags=["sales-report"])
 
@@ -55,8 +52,8 @@ class SalesReportResponse(BaseModel):
 
 @router.get("", response_model=SalesReportResponse)
 async def get_sales_report(
-    date_from: str = Query(..., description="시작일 YYYY-MM-DD"),
-    date_to: str = Query(..., description="종료일 YYYY-MM-DD"),
+    date_from: IsoDate = Query(..., description="시작일 YYYY-MM-DD"),
+    date_to: IsoDate = Query(..., description="종료일 YYYY-MM-DD"),
     db: Session = Depends(get_tenant_scoped_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -82,60 +79,12 @@ async def get_sales_report(
     ).all()
     auction_map = {a.date: a.final_amount for a in auctions}
 
-    # 4. 파티 참여 인원 (전체 파티 예약자의 male+female 합계 — 체크인 여부 무관)
-    # party_checkin.py와 동일한 로직: 해당 날짜에 숙박 중인 confirmed 예약 중 party_type 매칭
-    PARTY_TYPE_VALUES = {'1', '2', '2차만'}
-
-    # 기간 내 모든 날짜를 순회해서 인원 계산
-    from datetime import datetime, timedelta
-    dt_from = datetime.strptime(date_from, "%Y-%m-%d")
-    dt_to = datetime.strptime(date_to, "%Y-%m-%d")
-    participants_by_date: dict[str, int] = {}
-
-    # 기간 내 confirmed 예약 한번에 조회
-    all_reservations = db.query(Reservation).filter(
-        Reservation.status == ReservationStatus.CONFIRMED,
-        Reservation.check_in_date <= date_to,
-        or_(
-            Reservation.check_out_date > date_from,
-            and_(Reservation.check_out_date.is_(None), Reservation.check_in_date >= date_from),
-        ),
-    ).all()
-
-    # daily_info 한번에 조회
-    all_daily_info = db.query(ReservationDailyInfo).filter(
-        ReservationDailyInfo.reservation_id.in_([r.id for r in all_reservations]),
-        ReservationDailyInfo.date >= date_from,
-        ReservationDailyInfo.date <= date_to,
-    ).all() if all_reservations else []
-
-    # date -> {res_id: party_type}
-    daily_info_map: dict[str, dict[int, str]] = {}
-    for di in all_daily_info:
-        daily_info_map.setdefault(di.date, {})[di.reservation_id] = di.party_type or ""
-
-    # 날짜별 인원 계산
-    current = dt_from
-    while current <= dt_to:
-        d = current.strftime("%Y-%m-%d")
-        total = 0
-        di_for_date = daily_info_map.get(d, {})
-        for r in all_reservations:
-            # 해당 날짜에 숙박 중인지 체크
-            if r.check_out_date:
-                if not (r.check_in_date <= d < r.check_out_date):
-                    continue
-            else:
-                if r.check_in_date != d:
-                    continue
-            # 스테이블 파티 타입 체크 (unstable 제외)
-            if r.section == 'unstable':
-                continue
-            party_type = di_for_date.get(r.id) or r.party_type
-            if party_type in PARTY_TYPE_VALUES:
-                total += (r.male_count or 0) + (r.female_count or 0)
-        participants_by_date[d] = total
-        current += timedelta(days=1)
+    # 4. 파티 참여 인원 (스테이블 파티 예약자의 male+female 합계 — 체크인 여부 무관)
+    # daily_stats.party_sales_count: 숙박 중인 confirmed 예약 중 party_type 매칭, section='unstable' 제외
+    # (당일 예약 제외 / 날짜별 unstable_party 무시 — 참여자 목록 기준인 party_participants 와 다름)
+    from app.services.daily_stats import date_range, get_daily_stats
+    daily_stats = get_daily_stats(db, date_range(date_from, date_to))
+    participants_by_date = {d: stat.party_sales_count for d, stat in daily_stats.items()}
 
     def get_participants(date: str) -> int:
         return participants_by_date.get(date, 0)
@@ -306,3 +306,38 @@ async def update_highlight_colors(
 
 
 
+
+
+# ── Room Auto-Assign Solver ──────────────────────────────────────
+
+ROOM_ASSIGN_SOLVERS = ("greedy", "optimal")
+
+
+class RoomAssignSolverRequest(BaseModel):
+    solver: str  # 'greedy' | 'optimal'
+
+
+@router.get("/room-assign-solver")
+async def get_room_assign_solver(
+    current_user: User = Depends(get_current_user),
+    tenant: Tenant = Depends(get_current_tenant),
+):
+    """Get auto room-assignment solver mode for this tenant"""
+    return {"solver": tenant.room_assign_solver or "greedy"}
+
+
+@router.put("/room-assign-solver")
+async def update_room_assign_solver(
+    req: RoomAssignSolverRequest,
+    current_user: User = Depends(require_admin_or_above),
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_tenant_scoped_db),
+):
+    """Update auto room-assignment solver mode ('optimal' = 만실 시 배치 최적화 탐색, 시간 제한 후 greedy)"""
+    if req.solver not in ROOM_ASSIGN_SOLVERS:
+        return {"success": False, "message": f"solver 는 {', '.join(ROOM_ASSIGN_SOLVERS)} 중 하나여야 합니다."}
+    # tenant is from a different session (get_db), so merge into tenant-scoped session
+    merged_tenant = db.merge(tenant)
+    merged_tenant.room_assign_solver = req.solver
+    db.commit()
+    return {"success": True, "solver": req.solver}
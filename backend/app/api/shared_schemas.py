@@ -1,5 +1,23 @@
-"""Shared Pydantic response schemas for API consistency"""
-from pydantic import BaseModel
+"""Shared Pydantic response schemas / field types for API consistency"""
+import re
+from datetime import date
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel
+
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _check_iso_date(value: str) -> str:
+    """'YYYY-MM-DD' 이고 실제 있는 날짜만 통과 — DATE 컬럼(DateString)에 바인딩되기 전에 422 로 거절."""
+    if not _ISO_DATE_RE.fullmatch(value):
+        raise ValueError("날짜는 YYYY-MM-DD 형식이어야 합니다")
+    date.fromisoformat(value)
+    return value
+
+
+# 요청 파라미터/본문의 날짜 — 값은 그대로 'YYYY-MM-DD' 문자열 (DB 모델과 같은 표현)
+IsoDate = Annotated[str, AfterValidator(_check_iso_date)]
 
 
 class ActionResponse(BaseModel):
@@ -11,7 +11,7 @@ from app.api.deps import get_tenant_scoped_db, _remap_active_field
 from app.diag_logger import diag
 from app.db.models import MessageTemplate, User
 from app.auth.dependencies import get_current_user, require_admin_or_above
-from app.templates.renderer import TemplateRenderer
+from app.templates.renderer import TemplateRenderer, compile_template, invalidate_template_cache
 from app.api.shared_schemas import ActionResponse
 
 router = APIRouter(prefix="/api/templates", tags=["templates"])
@@ -267,6 +267,8 @@ def update_template(template_id: int, template: TemplateUpdate, db: Session = De
         if existing:
             raise HTTPException(status_code=400, detail=f"키 '{template.template_key}'의 템플릿이 이미 존재합니다")
 
+    previous_key = db_template.template_key
+
     # Update fields
     update_data = template.dict(exclude_unset=True)
     # Remap Pydantic 'active' field to ORM 'is_active' column
@@ -287,6 +289,8 @@ def update_template(template_id: int, template: TemplateUpdate, db: Session = De
 
     db.commit()
     db.refresh(db_template)
+    invalidate_template_cache(db_template.tenant_id, previous_key)
+    invalidate_template_cache(db_template.tenant_id, db_template.template_key)
 
     diag("template.updated", level="critical", template_id=db_template.id, changed_fields=list(update_data.keys()))
     if "content" in update_data:
@@ -377,8 +381,10 @@ def delete_template(template_id: int, db: Session = Depends(get_tenant_scoped_db
         )
 
     diag("template.deleted", level="critical", template_id=template_id)
+    tenant_id, template_key = template.tenant_id, template.template_key
     db.delete(template)
     db.commit()
+    invalidate_template_cache(tenant_id, template_key)
 
     return {"success": True, "message": "템플릿이 삭제되었습니다"}
 
@@ -403,14 +409,12 @@ def preview_template(
         # Render template with provided variables
         rendered = renderer.render(template.template_key, request.variables)
 
-        # Extract variables used (simple regex)
-        import re
-        variables_pattern = r'\{\{(\w+)\}\}'
-        variables_used = re.findall(variables_pattern, template.content)
+        # Extract variables used (파싱 캐시의 변수 집합)
+        variables_used = compile_template(template).variables
 
         return {
             "rendered": rendered,
-            "variables_used": list(set(variables_used))
+            "variables_used": list(variables_used)
         }
 
     except Exception as e:
@@ -0,0 +1,246 @@
+"""
+Request-scoped auth context — 토큰 디코드 1회 + 사용자/테넌트/접근 권한 조인 쿼리 1회.
+
+기존에는 테넌트 API 요청마다 get_current_tenant_id (Tenant, JWT 디코드, User, UserTenantRole),
+get_current_user (JWT 디코드, User), get_current_tenant (Tenant) 가 각자 조회해 핸들러 전에
+쿼리 5~6번이 돌았다.
+
+- 요청 안: 디코드한 payload 와 해석 결과를 request.state 에 둔다 → 같은 요청의 다른 의존성이 재사용
+- 요청 간: (토큰 jti, tenant_id) → 사용자/테넌트 detached 복사본 + 접근 여부.
+  settings.AUTH_CACHE_TTL_SECONDS (0 이면 요청 간 캐시 미사용). jti 없는 기존 토큰은 토큰 해시로 대체.
+  토큰 서명/만료 검증은 캐시와 무관하게 요청마다 1회
+- 무효화: User / UserTenantRole / Tenant 가 flush (bulk update·delete 포함) 되면 버전 +1,
+  commit / rollback 시 한 번 더 +1 (reference_cache 와 같은 방식). api/auth.py 의 사용자·역할 변경,
+  api/tenants.py · settings.py 의 테넌트 변경은 모두 세션을 거치므로 별도 호출이 필요 없다.
+  다른 프로세스에는 전파하지 않음 — 다른 워커에서는 역할 회수·사용자 비활성화가 최대
+  AUTH_CACHE_TTL_SECONDS 동안 반영되지 않는다 (즉시 반영이 필요하면 0)
+- 캐시 값은 세션에 속하지 않은 복사본. 의존성마다 자기 세션에 merge(load=False) 로 붙인다 (SQL 없음)
+"""
+import hashlib
+import threading
+import time
+from itertools import chain
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, event, select
+from sqlalchemy.orm import Session
+
+from app.auth.utils import decode_access_token
+from app.config import settings
+from app.db.detached import attach, detached_copy
+from app.db.models import Tenant, User, UserTenantRole
+from app.diag_logger import diag
+
+_WATCHED = (User, UserTenantRole, Tenant)
+_PENDING_KEY = "_auth_cache_pending"
+
+_lock = threading.Lock()
+_version = 0
+# (engine, token key, tenant_id) → (version, loaded_at, AuthContext)
+_entries: Dict[Tuple[Any, str, Optional[int]], Tuple[int, float, "AuthContext"]] = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+class AuthContext:
+    """토큰 1개 × 테넌트 1개의 해석 결과. user / tenant 는 detached 복사본 (없으면 None)."""
+
+    __slots__ = ("user", "tenant", "has_access")
+
+    def __init__(self, user: Optional[User], tenant: Optional[Tenant], has_access: bool):
+        self.user = user
+        self.tenant = tenant
+        self.has_access = has_access
+
+    def user_in(self, db: Session) -> Optional[User]:
+        return attach(db, self.user) if self.user is not None else None
+
+    def tenant_in(self, db: Session) -> Optional[Tenant]:
+        return attach(db, self.tenant) if self.tenant is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def token_payload(request, token: str) -> Dict[str, Any]:
+    """JWT 디코드 (요청당 1회). 실패하면 jwt 예외를 그대로 — 같은 요청에서 다시 불러도 같은 예외."""
+    cache = _request_cache(request)
+    cached = cache.get(("payload", token))
+    if cached is None:
+        try:
+            cached = decode_access_token(token)
+        except Exception as e:
+            cached = e
+        cache[("payload", token)] = cached
+    if isinstance(cached, Exception):
+        raise cached
+    return cached
+
+
+def resolve_auth(request, db: Session, token: str, payload: Dict[str, Any], tenant_id: Optional[int] = None) -> AuthContext:
+    """payload 의 사용자 + tenant_id 의 활성 테넌트 + 접근 매핑 여부.
+
+    tenant_id 가 None 이면 사용자만. 같은 요청 안에서는 request.state, 요청 간에는 TTL 캐시.
+    """
+    cache = _request_cache(request)
+    ctx = cache.get(("auth", tenant_id))
+    if ctx is not None:
+        return ctx
+
+    key = (_engine(db), _token_key(token, payload), tenant_id)
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    now = time.monotonic()
+    with _lock:
+        version = _version
+        entry = _entries.get(key) if ttl > 0 else None
+        if entry is not None and entry[0] == version and now - entry[1] < ttl:
+            _stats["hits"] += 1
+            ctx = entry[2]
+        else:
+            _stats["misses"] += 1
+
+    if ctx is None:
+        ctx = _load(db, payload.get("sub"), tenant_id)
+        if ttl > 0:
+            with _lock:
+                # 조회 도중 무효화됐으면 저장하지 않음
+                if _version == version:
+                    _entries[key] = (version, now, ctx)
+                    _evict(now, ttl)
+        diag("auth_cache.miss", level="verbose", tenant_id=tenant_id, found=ctx.user is not None)
+
+    cache[("auth", tenant_id)] = ctx
+    return ctx
+
+
+def request_tenant(request, tenant_id: int) -> Optional[AuthContext]:
+    """이 요청에서 tenant_id 로 해석된 컨텍스트 (테넌트가 있을 때만). 없으면 None."""
+    ctx = _request_cache(request).get(("auth", tenant_id))
+    return ctx if ctx is not None and ctx.tenant is not None else None
+
+
+def request_user(request) -> Optional[User]:
+    """이 요청에서 이미 해석된 사용자 복사본 (테넌트 무관). 없으면 None."""
+    for (kind, _), value in _request_cache(request).items():
+        if kind == "auth" and value.user is not None:
+            return value.user
+    return None
+
+
+def invalidate_auth_cache() -> None:
+    """전체 무효화 (버전 +1)."""
+    global _version
+    with _lock:
+        _version += 1
+        _entries.clear()
+        _stats["invalidations"] += 1
+
+
+def clear() -> None:
+    """캐시/통계 초기화 (테스트용)."""
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0, invalidations=0)
+
+
+def auth_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+def _request_cache(request) -> Dict[Any, Any]:
+    if request is None:
+        return {}
+    cache = getattr(request.state, "auth_context", None)
+    if cache is None:
+        cache = {}
+        request.state.auth_context = cache
+    return cache
+
+
+def _token_key(token: str, payload: Dict[str, Any]) -> str:
+    jti = payload.get("jti")
+    return f"jti:{jti}" if jti else "sha:" + hashlib.sha256(token.encode()).hexdigest()
+
+
+def _engine(db: Session) -> Any:
+    bind = db.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def _load(db: Session, username: Optional[str], tenant_id: Optional[int]) -> AuthContext:
+    """활성 사용자 (+ 활성 테넌트, 매핑) 를 한 번에. Core/ORM select — 테넌트 자동 필터 대상 아님."""
+    if not username:
+        return AuthContext(None, None, False)
+    if tenant_id is None:
+        user = db.execute(
+            select(User).where(User.username == username, User.is_active == True)
+        ).scalar_one_or_none()
+        return AuthContext(_copy(user), None, False)
+
+    row = db.execute(
+        select(User, Tenant, UserTenantRole.id)
+        .select_from(User)
+        .outerjoin(Tenant, and_(Tenant.id == tenant_id, Tenant.is_active == True))
+        .outerjoin(UserTenantRole, and_(UserTenantRole.user_id == User.id, UserTenantRole.tenant_id == tenant_id))
+        .where(User.username == username, User.is_active == True)
+    ).first()
+    if row is None:
+        return AuthContext(None, None, False)
+    user, tenant, mapping_id = row
+    return AuthContext(_copy(user), _copy(tenant), mapping_id is not None)
+
+
+def _copy(obj):
+    return detached_copy(obj) if obj is not None else None
+
+
+def _evict(now: float, ttl: int) -> None:
+    """만료 항목 정리 (lock 보유 상태에서 호출). 요청마다 훑지 않도록 항목이 많을 때만."""
+    if len(_entries) < 1024:
+        return
+    for key in [k for k, (version, loaded_at, _) in _entries.items() if version != _version or now - loaded_at >= ttl]:
+        del _entries[key]
+
+
+# ---------------------------------------------------------------------------
+# Invalidation (session events)
+# ---------------------------------------------------------------------------
+
+def _mark(session: Session) -> None:
+    session.info[_PENDING_KEY] = True
+    invalidate_auth_cache()
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    if any(isinstance(obj, _WATCHED) for obj in chain(session.new, session.dirty, session.deleted)):
+        _mark(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _after_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _WATCHED):
+        _mark(orm_execute_state.session)
+
+
+def _settle(session) -> None:
+    if session.info.pop(_PENDING_KEY, None):
+        invalidate_auth_cache()
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    _settle(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    _settle(session)
@@ -1,9 +1,10 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.db.detached import attach
 from app.db.models import User, UserRole, UserTenantRole
-from app.auth.utils import decode_access_token
+from app.auth.context import request_user, resolve_auth, token_payload
 from app.api.deps import get_current_tenant_id
 import jwt
 
@@ -11,6 +12,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ) -> User:
@@ -20,7 +22,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = decode_access_token(token)
+        payload = token_payload(request, token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -33,10 +35,13 @@ async def get_current_user(
     except jwt.PyJWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == username).first()
-    if user is None or not user.is_active:
+    # get_current_tenant_id 가 이미 해석했으면 재사용 (같은 Authorization 헤더)
+    user = request_user(request)
+    if user is None:
+        user = resolve_auth(request, db, token, payload).user
+    if user is None:
         raise credentials_exception
-    return user
+    return attach(db, user)
 
 
 def require_role(*roles: UserRole):
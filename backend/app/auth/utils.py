@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timedelta, timezone
 import bcrypt
 import jwt
@@ -15,7 +16,8 @@ def verify_password(plain: str, hashed: str) -> bool:
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(hours=settings.JWT_EXPIRE_HOURS))
-    to_encode.update({"exp": expire})
+    # jti: 토큰별 식별자 — auth.context 캐시 키
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
@@ -34,11 +34,43 @@ class Settings(BaseSettings):
 
     # Database (SQLite for demo, PostgreSQL for production)
     DATABASE_URL: str = "sqlite:///./sms_demo.db"
+    DB_EXECUTOR_WORKERS: int = 8  # run_db() 스레드 수 (커넥션 풀 pool_size+max_overflow 이하)
 
     # Aligo SMS API (실제 발송 여부는 tenant.aligo_testmode로 제어)
     ALIGO_API_KEY: str = ""
     ALIGO_USER_ID: str = ""
     ALIGO_SENDER: str = ""
+    NAVER_USER_INFO_TTL_HOURS: int = 24  # 네이버 user-info 캐시 유효시간 (0 이면 캐시 미사용)
+    NAVER_USER_INFO_NEGATIVE_TTL_MINUTES: int = 30  # 조회 실패 결과 캐시 유효시간
+    NAVER_SYNC_OVERLAP_MINUTES: int = 30  # 증분 sync 조회 구간 = 커서 - 이 값 (늦게 반영되는 예약 대비)
+    SMS_SEND_CONCURRENCY: int = 8  # 스케줄 일괄 발송 시 동시 provider 호출 상한
+
+    # 외부 API 공용 HTTP 클라이언트 (real/http_client.py)
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_RETRY_ATTEMPTS: int = 2  # 재시도 횟수 (최초 요청 제외)
+    HTTP_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    HTTP_RETRY_MAX_DELAY_SECONDS: float = 5.0
+
+    # Redis (비워두면 미사용 — 프로세스 간 캐시 무효화 / SSE 이벤트 전파)
+    REDIS_URL: str = ""
+    REFERENCE_CACHE_TTL_SECONDS: int = 600  # rooms/스케줄 등 참조 데이터 캐시 상한 (0 이면 버전 무효화만)
+    # 토큰×테넌트 → 사용자/접근 권한 캐시 (0 이면 요청 안에서만 재사용). 무효화는 프로세스 안에서만 —
+    # 다른 워커 프로세스에는 역할 회수·사용자 비활성화·테넌트 비활성화가 최대 이 시간만큼 늦게 반영된다
+    AUTH_CACHE_TTL_SECONDS: int = 30
+
+    # SSE event bus (services/event_bus.py) — "memory" | "redis" (REDIS_URL 필요, 다중 워커/레플리카)
+    EVENT_BUS_BACKEND: str = "memory"
+    EVENT_BUS_REPLAY_SIZE: int = 500  # 테넌트별 Last-Event-ID 재전송용 보관 이벤트 수
+    EVENT_BUS_CLIENT_BUFFER: int = 50  # 클라이언트별 대기 이벤트 상한 (초과 시 같은 타입 병합)
+
+    # 자동 객실 배정 optimal 모드 탐색 시간 상한 (초과 시 greedy 결과 사용)
+    ROOM_ASSIGN_SOLVER_TIMEOUT_SECONDS: float = 2.0
+
+    # Scheduler tenant fan-out (scheduler/tenant_fanout.py)
+    SCHEDULER_TENANT_CONCURRENCY: int = 4  # 동시에 처리할 테넌트 수
+    SCHEDULER_TENANT_TIMEOUT_SECONDS: int = 240  # 테넌트당 상한 (5분 sync 주기 안쪽, 0 이면 무제한)
 
     # JWT Authentication
     JWT_SECRET_KEY: str = ""
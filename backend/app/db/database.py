@@ -42,8 +42,11 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-# Register tenant context event listeners
+# Register tenant context / daily stats event listeners
 import app.db.tenant_context  # noqa: F401 — registers before_flush event
+from app.services.daily_stats import register_listeners as _register_daily_stats_listeners
+
+_register_daily_stats_listeners()  # daily_stats 유지 이벤트 (flush / bulk write / commit)
 
 
 def init_db():
@@ -187,6 +190,11 @@ def init_db():
             if "highlight_color" not in cols:
                 conn.execute(text("ALTER TABLE reservations ADD COLUMN highlight_color VARCHAR(20)"))
                 print("AUTO-MIGRATE: Added highlight_color column to reservations table")
+            if "naver_user_id" not in cols:
+                conn.execute(text("ALTER TABLE reservations ADD COLUMN naver_user_id VARCHAR(50)"))
+                print("AUTO-MIGRATE: Added naver_user_id column to reservations table")
+            # 연박 증분 감지의 identity 조회 (phone 과 함께 index seek)
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_reservations_visitor_phone ON reservations (visitor_phone)"))
 
         # template_schedules.is_once_per_stay
         if "template_schedules" in inspector.get_table_names():
@@ -379,6 +387,9 @@ def init_db():
             if "surcharge_double_room_fee" not in cols:
                 conn.execute(text("ALTER TABLE tenants ADD COLUMN surcharge_double_room_fee INTEGER DEFAULT 5000 NOT NULL"))
                 print("AUTO-MIGRATE: Added surcharge_double_room_fee column to tenants table")
+            if "room_assign_solver" not in cols:
+                conn.execute(text("ALTER TABLE tenants ADD COLUMN room_assign_solver VARCHAR(20) DEFAULT 'greedy'"))
+                print("AUTO-MIGRATE: Added room_assign_solver column to tenants table")
 
     # Task 1.5: admin 기본 비밀번호 환경변수화
     db = SessionLocal()
@@ -0,0 +1,60 @@
+"""
+Detached ORM copies — 프로세스 메모리 캐시에 ORM 객체를 두고 요청 세션마다 붙여 쓰기 위한 헬퍼.
+
+services/reference_cache (객실·상품·스케줄) 와 auth/context (사용자·테넌트) 가 같은 방식을 쓴다:
+
+    clone = detached_copy(obj)              # 캐시에 저장 — 원본 세션과 무관
+    obj = attach(db, clone)                 # 조회 시 호출자 세션 객체로 (SQL 없음)
+
+- detached_copy: 로드된 컬럼 + follow 로 지정한 (eager 로드된) 관계만 복사. 로드 안 된 속성은
+  복사본에도 없으므로 attach 후 접근하면 그 세션에서 lazy load 된다.
+- attach: 세션 identity map 에 같은 키가 있으면 그 객체, 없으면 merge(load=False).
+  복사본 자체는 세션에 들어가지 않으므로 여러 세션/스레드가 같은 복사본을 공유해도 된다.
+"""
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+def detached_copy(
+    obj: Any,
+    follow: Optional[Mapping[type, Tuple[str, ...]]] = None,
+    memo: Optional[Dict[int, Any]] = None,
+) -> Any:
+    """로드된 컬럼 + follow[모델] 관계만 담은 detached 복사본.
+
+    memo: 여러 객체를 복사할 때 공유하면 같은 관계 객체(예: 같은 건물)를 한 번만 복사한다.
+    """
+    follow = follow or {}
+    memo = {} if memo is None else memo
+    if id(obj) in memo:
+        return memo[id(obj)]
+    state = inspect(obj)
+    mapper = state.mapper
+    clone = mapper.class_manager.new_instance()
+    memo[id(obj)] = clone
+    loaded = state.dict
+    for prop in mapper.column_attrs:
+        if prop.key in loaded:
+            set_committed_value(clone, prop.key, loaded[prop.key])
+    for key in follow.get(mapper.class_, ()):
+        if key not in loaded:
+            continue
+        value = loaded[key]
+        if isinstance(value, list):
+            value = [detached_copy(v, follow, memo) for v in value]
+        elif value is not None:
+            value = detached_copy(value, follow, memo)
+        set_committed_value(clone, key, value)
+    make_transient_to_detached(clone)
+    return clone
+
+
+def attach(db: Session, cached: Any) -> Any:
+    """호출자 세션의 객체로 변환 — identity map 에 있으면 그대로, 없으면 merge(load=False)."""
+    existing = db.identity_map.get(inspect(cached).key)
+    if existing is not None:
+        return existing
+    return db.merge(cached, load=False)
@@ -0,0 +1,57 @@
+"""
+DB executor — 동기 SQLAlchemy 작업을 이벤트 루프 밖(제한된 스레드 풀)에서 실행.
+
+async 라우트/스케줄러 잡이 sync Session 을 직접 호출하면 그동안 단일 uvicorn 워커의
+이벤트 루프 전체(다른 요청, SSE keep-alive)가 멈춘다. 무거운 DB 구간은 run_db() 로 감싼다:
+
+    result = await run_db(auto_assign_rooms, db, date)
+
+- contextvars 를 복사해 실행하므로 current_tenant_id / bypass_tenant_filter 가 그대로 전파된다.
+- 스레드 수는 settings.DB_EXECUTOR_WORKERS 로 제한 (커넥션 풀 크기 이하 권장).
+- Session 은 thread-safe 가 아니므로, 같은 Session 을 쓰는 호출자는 run_db 를 await 하는
+  동안 그 Session 을 건드리지 않아야 한다 (순차 사용은 안전).
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.DB_EXECUTOR_WORKERS),
+            thread_name_prefix="db-exec",
+        )
+    return _executor
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """fn(*args, **kwargs) 를 DB 스레드 풀에서 실행하고 결과를 반환 (예외도 그대로 전파)."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    fut = loop.run_in_executor(_get_executor(), call)
+    try:
+        return await asyncio.shield(fut)
+    except asyncio.CancelledError:
+        # 스레드 작업은 중단할 수 없다 — 끝날 때까지 기다린 뒤 취소를 전파해야
+        # 호출자의 finally(db.close 등)가 아직 실행 중인 Session 을 건드리지 않는다.
+        await asyncio.wait({fut})
+        raise
+
+
+def shutdown_db_executor() -> None:
+    """앱 종료 시 호출 — 진행 중 작업 완료 후 스레드 정리."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
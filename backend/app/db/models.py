@@ -1,9 +1,10 @@
 """
 SQLAlchemy database models
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, Enum, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Column, DDL, Integer, String, DateTime, Boolean, Text, Float, Enum, ForeignKey, UniqueConstraint, Index, event, text
 from sqlalchemy.orm import relationship, declared_attr
 from sqlalchemy.ext.declarative import declarative_base
+from app.db.types import DateString, coerce_date_attributes
 from datetime import datetime, timezone
 import enum
 
@@ -45,7 +46,7 @@ class Reservation(TenantMixin, Base):
     external_id = Column(String(100), nullable=True)  # indexed via uq_tenant_external_id (tenant_id, external_id)
     customer_name = Column(String(100), nullable=False)
     phone = Column(String(20), nullable=False, index=True)
-    check_in_date = Column("date", String(20), nullable=False, index=True)  # YYYY-MM-DD  # TODO: PostgreSQL 전환 시 Date 타입으로 변경
+    check_in_date = Column("date", DateString, nullable=False, index=True)  # YYYY-MM-DD (DB: DATE)
     check_in_time = Column("time", String(10), nullable=False)  # HH:MM  # TODO: PostgreSQL 전환 시 Time 타입으로 변경
     status = Column(Enum(ReservationStatus, name="reservation_status", native_enum=False), default=ReservationStatus.PENDING, index=True)
     notes = Column(Text, nullable=True)
@@ -58,7 +59,8 @@ class Reservation(TenantMixin, Base):
     naver_booking_id = Column(String(50), nullable=True, index=True)
     naver_biz_item_id = Column(String(50), nullable=True)  # Room type ID
     visitor_name = Column(String(100), nullable=True)  # Alternative contact
-    visitor_phone = Column(String(20), nullable=True)
+    visitor_phone = Column(String(20), nullable=True, index=True)  # 연박 identity 조회 (phone 과 함께 index seek)
+    naver_user_id = Column(String(50), nullable=True)  # 네이버 userId (user-info 캐시 warm-up 용)
 
     # Room assignment fields
     room_number = Column(String(20), nullable=True)  # DEPRECATED: use RoomAssignment via room_lookup
@@ -90,7 +92,7 @@ class Reservation(TenantMixin, Base):
     highlight_color = Column(String(20), nullable=True)              # UI highlight color for reservation card
 
     # Extended Naver booking data
-    check_out_date = Column("end_date", String(20), nullable=True)  # checkout date YYYY-MM-DD  # TODO: PostgreSQL 전환 시 Date 타입으로 변경
+    check_out_date = Column("end_date", DateString, nullable=True)  # checkout date YYYY-MM-DD (DB: DATE)
     biz_item_name = Column(String(200), nullable=True)  # product/room name from Naver
     booking_count = Column(Integer, default=1)  # quantity
     booking_options = Column(Text, nullable=True)  # JSON string from bookingOptionJson
@@ -104,6 +106,10 @@ class Reservation(TenantMixin, Base):
 
     __table_args__ = (
         UniqueConstraint("tenant_id", "external_id", name="uq_tenant_external_id"),
+        # stay_coverage_filter 범위 분기 (date <= d AND end_date > d) — end_date 로 범위 seek
+        Index("ix_reservation_stay_range", "tenant_id", "end_date", "date"),
+        # 이벤트 타겟 confirmed_at >= cutoff, 예약 목록 keyset (confirmed_at DESC)
+        Index("ix_reservation_confirmed", "tenant_id", "confirmed_at"),
     )
 
 
@@ -169,6 +175,13 @@ class ReservationSmsAssignment(TenantMixin, Base):
 
     __table_args__ = (
         UniqueConstraint("reservation_id", "template_key", "date", name="uq_res_sms_template_date"),
+        # 이벤트 타겟팅 exclude_sent 안티 조인 (template_scheduler._get_targets_event)
+        Index("ix_res_sms_event_lookup", "tenant_id", "template_key", "reservation_id", "sent_at", "send_status"),
+        # 미발송 칩 (template_key, date, sent_at IS NULL) — sms_sender 템플릿 일괄 발송 등
+        Index(
+            "ix_res_sms_pending", "tenant_id", "template_key", "date",
+            postgresql_where=text("sent_at IS NULL"), sqlite_where=text("sent_at IS NULL"),
+        ),
     )
 
 
@@ -276,7 +289,7 @@ class RoomAssignment(TenantMixin, Base):
 
     id = Column(Integer, primary_key=True, index=True)
     reservation_id = Column(Integer, ForeignKey("reservations.id", ondelete="CASCADE"), nullable=False, index=True)
-    date = Column(String(20), nullable=False)  # YYYY-MM-DD
+    date = Column(DateString, nullable=False)  # YYYY-MM-DD
     room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
     room_password = Column(String(20), nullable=True)  # 도어락 실제 비밀번호 (Room.door_password 복사본)
     room_password_prefixed = Column(String(20), nullable=True)  # 랜덤 prefix 붙은 표시용 버전 (템플릿이 {{prefix_room_password}} 쓰는 경우 사용)
@@ -386,6 +399,11 @@ class ActivityLog(TenantMixin, Base):
     created_at = Column(DateTime, default=utc_now, index=True)
     created_by = Column(String(50), nullable=True)  # username 또는 "system"
 
+    __table_args__ = (
+        # 유형별 최신순 (대시보드 마지막 naver_sync, 활동 로그 type 필터)
+        Index("ix_activity_log_type_created", "tenant_id", "type", "created_at"),
+    )
+
 
 class PartyCheckin(TenantMixin, Base):
     """Party check-in records per date"""
@@ -397,7 +415,7 @@ class PartyCheckin(TenantMixin, Base):
 
     id = Column(Integer, primary_key=True, index=True)
     reservation_id = Column(Integer, ForeignKey("reservations.id", ondelete="CASCADE"), nullable=False, index=True)
-    date = Column(String(10), nullable=False, index=True)  # YYYY-MM-DD
+    date = Column(DateString, nullable=False, index=True)  # YYYY-MM-DD
     checked_in_at = Column(DateTime, nullable=True)
 
     reservation = relationship("Reservation", backref="party_checkins")
@@ -409,7 +427,7 @@ class ReservationDailyInfo(TenantMixin, Base):
 
     id = Column(Integer, primary_key=True, index=True)
     reservation_id = Column(Integer, ForeignKey("reservations.id", ondelete="CASCADE"), nullable=False)
-    date = Column(String(20), nullable=False)  # YYYY-MM-DD
+    date = Column(DateString, nullable=False)  # YYYY-MM-DD
     party_type = Column(String(20), nullable=True)  # '1'=1차만, '2'=1+2차, '2차만'=2차만, 'X'=미참여
     notes = Column(Text, nullable=True)
     unstable_party = Column(Boolean, default=False)  # 이 날짜에 언스테이블 파티 참여 여부
@@ -420,7 +438,6 @@ class ReservationDailyInfo(TenantMixin, Base):
 
     __table_args__ = (
         UniqueConstraint("reservation_id", "date", name="uq_reservation_daily_info"),
-        Index("ix_reservation_daily_date", "reservation_id", "date"),
     )
 
 
@@ -444,7 +461,7 @@ class ParticipantSnapshot(TenantMixin, Base):
     __tablename__ = "participant_snapshots"
 
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(String(20), nullable=False)  # YYYY-MM-DD, indexed via uq_tenant_snapshot_date (tenant_id, date)
+    date = Column(DateString, nullable=False)  # YYYY-MM-DD, indexed via uq_tenant_snapshot_date (tenant_id, date)
     male_count = Column(Integer, default=0)
     female_count = Column(Integer, default=0)
     created_at = Column(DateTime, default=utc_now)
@@ -454,6 +471,33 @@ class ParticipantSnapshot(TenantMixin, Base):
     )
 
 
+class DailyStat(TenantMixin, Base):
+    """날짜별 집계 (투숙 인원/파티 참여/객실 점유) — services/daily_stats 가 예약·daily info·배정 변경 시 갱신"""
+    __tablename__ = "daily_stats"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    date = Column(DateString, nullable=False)  # YYYY-MM-DD, indexed via uq_tenant_daily_stat_date (tenant_id, date)
+    male_count = Column(Integer, nullable=False, default=0)  # 투숙/방문 중 (confirmed + completed)
+    female_count = Column(Integer, nullable=False, default=0)
+    party_1_count = Column(Integer, nullable=False, default=0)  # 스테이블 파티 참여 인원 (confirmed) — party_type '1'
+    party_2_count = Column(Integer, nullable=False, default=0)  # '2' (1+2차)
+    party_2only_count = Column(Integer, nullable=False, default=0)  # '2차만'
+    party_unstable_count = Column(Integer, nullable=False, default=0)  # 언스테이블 파티 (section / daily unstable_party)
+    party_sales_count = Column(Integer, nullable=False, default=0)  # 매출 리포트 파티 인원 (당일 예약 제외, section 만 unstable 판정)
+    rooms_occupied = Column(Integer, nullable=False, default=0)  # 배정 있는 객실 수 (도미토리 포함)
+    beds_used = Column(Integer, nullable=False, default=0)  # 도미토리 점유 인원 (party_size → booking_count → 1)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "date", name="uq_tenant_daily_stat_date"),
+    )
+
+    @property
+    def party_participants(self) -> int:
+        """스테이블 파티 참여 인원 합계 (1 / 2 / 2차만)."""
+        return (self.party_1_count or 0) + (self.party_2_count or 0) + (self.party_2only_count or 0)
+
+
 class Tenant(Base):
     """펜션(테넌트) 마스터 테이블"""
     __tablename__ = "tenants"
@@ -472,6 +516,7 @@ class Tenant(Base):
     surcharge_unit_standard = Column(Integer, default=20000)  # 일반 객실 초과 1인/1박 단가 (원, 모든 객실 공통)
     surcharge_unit_double = Column(Integer, default=25000)    # [DEPRECATED] 옛 더블 통합 단가 — 신규 로직은 unit_standard + double_room_fee 사용
     surcharge_double_room_fee = Column(Integer, default=5000) # 더블 객실 1박당 추가 변경비 (원, 인원과 무관)
+    room_assign_solver = Column(String(20), default="greedy")  # 자동 배정 방식: 'greedy' | 'optimal' (room_packing)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=utc_now)
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
@@ -551,6 +596,95 @@ class PartyHost(TenantMixin, Base):
     )
 
 
+class NaverSyncCursor(TenantMixin, Base):
+    """네이버 증분 동기화 high-water mark — 테넌트 × source(stable/unstable) 당 1행"""
+    __tablename__ = "naver_sync_cursors"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(20), nullable=False)  # 'stable' | 'unstable'
+    last_fetched_at = Column(DateTime, nullable=False)  # 마지막 성공 동기화의 조회 시작 시각 (UTC)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "source", name="uq_naver_sync_cursor_tenant_source"),
+    )
+
+
+class NaverBackfillCheckpoint(TenantMixin, Base):
+    """네이버 과거 백필 진행 위치 — 청크 커밋마다 갱신, 중단 후 같은 from_date 로 재실행하면 이어서 진행"""
+    __tablename__ = "naver_backfill_checkpoints"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(20), nullable=False)  # 'stable' | 'unstable'
+    from_date = Column(String(10), nullable=False)  # 백필 시작일 (YYYY-MM-DD)
+    last_chunk_end = Column(String(10), nullable=True)  # 마지막으로 커밋된 청크의 종료일
+    chunks_done = Column(Integer, nullable=False, default=0)
+    fetched = Column(Integer, nullable=False, default=0)
+    added = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "source", name="uq_naver_backfill_checkpoint_tenant_source"),
+    )
+
+
+class NaverBookingHash(TenantMixin, Base):
+    """예약별 마지막 반영 내용 해시 — 변경 없는 예약은 Phase 2~5 를 건너뜀"""
+    __tablename__ = "naver_booking_hashes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(20), nullable=False)
+    external_id = Column(String(100), nullable=False)  # Naver bookingId
+    content_hash = Column(String(64), nullable=False)  # sha256 hex
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "source", "external_id", name="uq_naver_booking_hash"),
+    )
+
+
+class NaverUserInfo(TenantMixin, Base):
+    """네이버 user-info(성별/연령대/방문횟수) 캐시 — 테넌트 × 업체 × userId 당 1행.
+
+    visit_count 가 업체별 값이라 business_id 도 키에 포함 (스테이블/언스테이블 분리).
+    is_negative=True: 조회 실패 결과 (짧은 TTL 동안 재조회 안 함).
+    """
+    __tablename__ = "naver_user_infos"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    business_id = Column(String(50), nullable=False)
+    naver_user_id = Column(String(50), nullable=False)
+    gender = Column(String(10), nullable=True)
+    age_group = Column(String(20), nullable=True)
+    visit_count = Column(Integer, nullable=True)
+    is_negative = Column(Boolean, nullable=False, default=False)
+    fetched_at = Column(DateTime, nullable=False, default=utc_now)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "business_id", "naver_user_id", name="uq_naver_user_info"),
+    )
+
+
+coerce_date_attributes(Base)
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL: 투숙 구간 daterange (generated) + GiST
+# stay_coverage_filter / stay_overlap_filter 가 @> / && 로 사용 (app/services/filters.py).
+# 모델 컬럼이 아니므로 INSERT/SELECT 에 나타나지 않는다. 기존 DB 는 alembic native_date_columns.
+# [check_in, max(check_out, check_in + 1)) — NULL·당일 체크아웃은 check_in 하루
+# ---------------------------------------------------------------------------
+STAY_RANGE_DDL = (
+    "ALTER TABLE reservations ADD COLUMN stay_range daterange "
+    "GENERATED ALWAYS AS (daterange(date, GREATEST(end_date, date + 1), '[)')) STORED",
+    "CREATE INDEX ix_reservation_stay_range_gist ON reservations USING gist (stay_range)",
+)
+for _ddl in STAY_RANGE_DDL:
+    event.listen(Reservation.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+
+
 # ---------------------------------------------------------------------------
 # Register tenant models for automatic SELECT filtering
 # ---------------------------------------------------------------------------
@@ -560,6 +694,7 @@ for _model in [
     Reservation, MessageTemplate, ReservationSmsAssignment,
     RoomBizItemLink, Building, RoomGroup, Room, RoomAssignment,
     NaverBizItem, TemplateSchedule, ActivityLog, PartyCheckin, ReservationDailyInfo,
-    ParticipantSnapshot, OnsiteSale, DailyHost, OnsiteAuction, PartyHost,
+    ParticipantSnapshot, DailyStat, OnsiteSale, DailyHost, OnsiteAuction, PartyHost,
+    NaverSyncCursor, NaverBookingHash, NaverUserInfo, NaverBackfillCheckpoint,
 ]:
     _register(_model)
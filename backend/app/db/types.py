@@ -0,0 +1,92 @@
+"""
+Column types shared by models.
+
+DateString: DB 에는 네이티브 DATE, Python/API 에는 기존과 같은 'YYYY-MM-DD' 문자열.
+컬럼과 비교하는 문자열 리터럴('2026-05-10')도 이 타입으로 바인딩되므로 호출부는 그대로 둔다.
+속성에 date/datetime 을 넣어도 set 이벤트에서 문자열로 바꾼다 (coerce_date_attributes).
+"""
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import Date, event
+from sqlalchemy.types import TypeDecorator
+
+logger = logging.getLogger(__name__)
+
+_MALFORMED_LOG_LIMIT = 100
+_malformed_seen: set = set()
+
+
+class DateString(TypeDecorator):
+    """DATE 컬럼 ↔ 'YYYY-MM-DD' 문자열 호환 계층.
+
+    bind: str / date / datetime → date ('' 은 NULL)
+    result: date → 'YYYY-MM-DD'. SQLite 에 남은 형식 오류 값('', '2026/05/01' 등 VARCHAR 시절 데이터)은
+      예외 대신 원래 값을 문자열로 돌려주고 경고 로그 (값마다 1회)
+    """
+
+    impl = Date
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return str
+
+    def process_bind_param(self, value, dialect):
+        if value is None or value == "":
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(value)
+
+    def process_literal_param(self, value, dialect):
+        return self.process_bind_param(value, dialect)
+
+    def result_processor(self, dialect, coltype):
+        process = super().result_processor(dialect, coltype)
+        if process is None:
+            return None
+
+        def tolerant(value):
+            try:
+                return process(value)
+            except (TypeError, ValueError):
+                _warn_malformed(value)
+                return str(value)
+
+        return tolerant
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+
+def _warn_malformed(value) -> None:
+    if value in _malformed_seen or len(_malformed_seen) >= _MALFORMED_LOG_LIMIT:
+        return
+    _malformed_seen.add(value)
+    logger.warning(f"Malformed DATE value {value!r} returned as-is (legacy row — fix the stored value)")
+
+
+def iso_date(value):
+    """date / datetime → 'YYYY-MM-DD'. 문자열·None 은 그대로."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _coerce_on_set(target, value, oldvalue, initiator):
+    return iso_date(value)
+
+
+def coerce_date_attributes(base) -> None:
+    """base 의 모든 DateString 컬럼 속성에 set 이벤트 등록 — 세션 안 값도 항상 문자열."""
+    for mapper in base.registry.mappers:
+        for prop in mapper.column_attrs:
+            if isinstance(prop.columns[0].type, DateString):
+                event.listen(getattr(mapper.class_, prop.key), "set", _coerce_on_set, retval=True)
@@ -177,6 +177,12 @@ async def startup_event():
     init_db()
     logging.info("Database initialized")
 
+    from app.real.http_client import open_http_clients
+    await open_http_clients()
+
+    from app.services.reference_cache import start_invalidation_listener
+    start_invalidation_listener()
+
     # Start scheduler for automated tasks
     if os.getenv("DISABLE_SCHEDULER"):
         logging.info("Scheduler disabled (DISABLE_SCHEDULER set)")
@@ -190,6 +196,12 @@ async def shutdown_event():
     # Stop scheduler on shutdown
     stop_scheduler()
     logging.info("Scheduler stopped")
+    from app.real.http_client import close_http_clients
+    await close_http_clients()
+    from app.services.reference_cache import stop_invalidation_listener
+    stop_invalidation_listener()
+    from app.db.executor import shutdown_db_executor
+    shutdown_db_executor()
 
 
 # Include routers
@@ -226,7 +238,7 @@ async def root():
 
 # Task 1.3: Health Check 강화
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+def health_check(db: Session = Depends(get_db)):
     health = {"status": "healthy", "checks": {}}
     try:
         db.execute(text("SELECT 1"))
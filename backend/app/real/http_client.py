@@ -0,0 +1,154 @@
+"""
+외부 API 공용 HTTP 클라이언트 — 프로바이더별(naver / aligo) 프로세스 단일 커넥션 풀.
+
+요청마다 httpx.AsyncClient 를 열고 닫으면 매번 TCP+TLS 핸드셰이크 비용을 낸다.
+여기서는 프로바이더별 클라이언트 1개를 재사용한다:
+
+    response = await request("aligo", "POST", ALIGO_SEND_URL, data=params, timeout=30.0)
+
+- keep-alive 커넥션 풀 (settings.HTTP_MAX_CONNECTIONS / HTTP_MAX_KEEPALIVE_CONNECTIONS)
+- HTTP/2: h2 패키지가 설치돼 있으면 사용 (ALPN 협상, 미지원 서버는 HTTP/1.1)
+- 재시도: 지수 백오프 + jitter. idempotent 요청은 5xx/타임아웃/연결 오류 모두,
+  비멱등 요청(SMS 발송)은 요청이 서버에 도달하지 않은 연결 단계 오류만 재시도 (중복 발송 방지)
+- 통계: 신규/재사용 커넥션 수 (httpcore trace 의 connect_tcp 이벤트로 판별)
+- 수명: main.py startup/shutdown 에서 open_http_clients / close_http_clients.
+  클라이언트는 이벤트 루프에 묶이므로 다른 루프에서 호출되면 그 루프용으로 새로 만든다.
+"""
+import asyncio
+import logging
+import random
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("naver", "aligo")
+
+# 요청이 서버에 전달되기 전 실패 — 비멱등 요청도 재시도 안전
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+# name → (client, loop)
+_clients: Dict[str, Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=_http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(30.0, connect=10.0),
+    )
+
+
+def _stat(name: str) -> Dict[str, int]:
+    return _stats.setdefault(name, {
+        "requests": 0, "new_connections": 0, "reused_connections": 0, "retries": 0, "errors": 0,
+    })
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """프로바이더 name 의 공용 클라이언트 (현재 이벤트 루프 기준, 없으면 생성)."""
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(name)
+    if entry is not None and entry[1] is loop and not entry[0].is_closed:
+        return entry[0]
+    client = _new_client()
+    _clients[name] = (client, loop)
+    return client
+
+
+async def open_http_clients() -> None:
+    """앱 startup — 프로바이더별 클라이언트 미리 생성."""
+    for name in PROVIDERS:
+        get_client(name)
+    logger.info(f"HTTP clients ready ({', '.join(PROVIDERS)}, http2={_http2_available()})")
+
+
+async def close_http_clients() -> None:
+    """앱 shutdown — 현재 루프의 클라이언트를 닫고 커넥션 통계를 남긴다."""
+    loop = asyncio.get_running_loop()
+    for name, (client, client_loop) in list(_clients.items()):
+        if client_loop is loop:
+            await client.aclose()
+        _clients.pop(name, None)
+    if _stats:
+        logger.info(f"HTTP client stats: {http_client_stats()}")
+
+
+def http_client_stats() -> Dict[str, Dict[str, int]]:
+    """프로바이더별 요청/신규 커넥션/재사용 커넥션/재시도/오류 카운터 (복사본)."""
+    return {name: dict(s) for name, s in _stats.items()}
+
+
+def _backoff_delay(attempt: int) -> float:
+    """attempt(0부터) 번째 재시도 대기 — full jitter: U(0, base * 2^attempt), 상한 적용."""
+    cap = settings.HTTP_RETRY_MAX_DELAY_SECONDS
+    return random.uniform(0, min(cap, settings.HTTP_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)))
+
+
+async def request(
+    name: str,
+    method: str,
+    url: str,
+    *,
+    idempotent: bool = True,
+    retries: Optional[int] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """공용 클라이언트로 요청 + 재시도. 최종 실패는 httpx 예외 그대로 전파.
+
+    5xx 응답은 재시도 후에도 5xx 면 그대로 반환 (호출자의 raise_for_status 가 처리).
+    idempotent=False 면 연결 단계 오류만 재시도 — 5xx/응답 타임아웃은 이미 처리됐을 수 있다.
+    """
+    client = get_client(name)
+    stat = _stat(name)
+    max_retries = settings.HTTP_RETRY_ATTEMPTS if retries is None else retries
+    retry_on = _RETRYABLE_ERRORS if idempotent else _CONNECT_ERRORS
+
+    attempt = 0
+    while True:
+        connected = {"new": False}
+
+        async def _trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.started":
+                connected["new"] = True
+
+        stat["requests"] += 1
+        try:
+            response = await client.request(method, url, extensions={"trace": _trace}, **kwargs)
+        except retry_on as e:
+            stat["errors"] += 1
+            if attempt >= max_retries:
+                raise
+            reason = type(e).__name__
+        except httpx.HTTPError:
+            stat["errors"] += 1
+            raise
+        else:
+            stat["new_connections" if connected["new"] else "reused_connections"] += 1
+            if not (idempotent and response.status_code >= 500 and attempt < max_retries):
+                return response
+            reason = f"HTTP {response.status_code}"
+            await response.aclose()
+
+        delay = _backoff_delay(attempt)
+        attempt += 1
+        stat["retries"] += 1
+        logger.warning(f"[{name}] {method} retry {attempt}/{max_retries} in {delay:.2f}s ({reason})")
+        await asyncio.sleep(delay)
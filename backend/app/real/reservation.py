@@ -2,13 +2,14 @@
 Real Reservation Provider - Naver Smart Place API integration
 Ported from stable-clasp-main/00_main.js + 03_trigger.js
 """
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
 import httpx
 import json
 import logging
 from app.diag_logger import diag
+from app.real.http_client import request
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,7 @@ class RealReservationProvider:
         self.business_id = business_id
         self.cookie = cookie
         self.base_url = "https://new.smartplace.naver.com"
+        self.last_user_info_stats: Dict[str, int] = {}  # 직전 조회의 user-info 캐시 hit/API 호출 수
 
     def _get_headers(self) -> Dict[str, str]:
         return {
@@ -38,7 +40,7 @@ class RealReservationProvider:
             'Cookie': self.cookie,
         }
 
-    async def _fetch_page(self, client: httpx.AsyncClient, start_date: datetime, end_date: datetime, page: int = 0, size: int = 200, date_filter: str = "REGDATE") -> List[Dict]:
+    async def _fetch_page(self, start_date: datetime, end_date: datetime, page: int = 0, size: int = 200, date_filter: str = "REGDATE") -> List[Dict]:
         """Fetch a single page of reservations from Naver API.
 
         Args:
@@ -79,7 +81,7 @@ class RealReservationProvider:
             f"&noCache={int(now.timestamp() * 1000)}"
         )
 
-        response = await client.get(url, headers=self._get_headers(), timeout=30.0)
+        response = await request("naver", "GET", url, headers=self._get_headers(), timeout=30.0)
         response.raise_for_status()
         result = response.json()
         try:
@@ -94,7 +96,12 @@ class RealReservationProvider:
             pass
         return result
 
-    async def sync_reservations(self, target_date: Optional[datetime] = None, from_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def sync_reservations(
+        self,
+        target_date: Optional[datetime] = None,
+        from_date: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Fetch reservations from Naver Smart Place API.
 
@@ -106,6 +113,10 @@ class RealReservationProvider:
             from_date: Optional start date string (YYYY-MM-DD). If provided,
                        fetches from that date to now in monthly chunks.
                        Default: last 1 day.
+            since: 증분 동기화 시작 시각 (커서 - 안전 겹침). REGDATE 는 일 단위라
+                   min(since, now - 1일) 이 속한 날부터 조회 — 기본 경로처럼 최소 어제+오늘
+                   (어제 등록된 예약의 자정 이후 변경/취소 포함), 장애로 커서가 오래됐으면
+                   그만큼 늘어남 (월별 청크). from_date 가 우선.
         """
         if not self.cookie:
             logger.info("[Naver] No cookie configured — skipping sync")
@@ -113,41 +124,65 @@ class RealReservationProvider:
 
         now = datetime.now()
 
-        if from_date:
+        if from_date or since:
             # 월별 청크로 나눠서 전체 가져오기
-            chunk_start = datetime.strptime(from_date, "%Y-%m-%d")
+            if from_date:
+                chunk_start = datetime.strptime(from_date, "%Y-%m-%d")
+            else:
+                chunk_start = min(since, now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            window_start = chunk_start.strftime("%Y-%m-%d")
             all_data = []
-            async with httpx.AsyncClient() as client:
-                while chunk_start < now:
-                    chunk_end = min(chunk_start + timedelta(days=30), now)
-                    # 페이징
-                    page = 0
-                    while True:
-                        data = await self._fetch_page(client, chunk_start, chunk_end, page=page)
-                        logger.info(f"Fetched {len(data)} reservations ({chunk_start.strftime('%m/%d')}~{chunk_end.strftime('%m/%d')}, page {page})")
-                        all_data.extend(data)
-                        if len(data) < 200:
-                            break
-                        page += 1
-                    chunk_start = chunk_end + timedelta(days=1)
+            async for _, _, chunk in self._iter_raw_chunks(chunk_start, now):
+                all_data.extend(chunk)
             data = all_data
-            logger.info(f"Total fetched: {len(data)} reservations from {from_date}")
+            logger.info(f"Total fetched: {len(data)} reservations from {window_start}")
         else:
             # 기본: 최근 1일
             end_date = now
             start_date = now - timedelta(days=1)
-            async with httpx.AsyncClient() as client:
-                data = await self._fetch_page(client, start_date, end_date)
-                logger.info(f"Fetched {len(data)} reservations from Naver API (last 1 day)")
+            data = await self._fetch_page(start_date, end_date)
+            logger.info(f"Fetched {len(data)} reservations from Naver API (last 1 day)")
 
         # 공통 처리: 필터링 → 유저정보 → 변환
         return await self._process_raw_data(data)
 
-    async def _process_raw_data(self, data: List[Dict]) -> List[Dict[str, Any]]:
+    async def iter_history_chunks(self, from_date: str) -> AsyncIterator[Tuple[str, str, List[Dict[str, Any]]]]:
+        """과거 백필용 — from_date ~ 현재를 월별 청크로 조회해 청크마다 변환 결과를 yield.
+
+        sync_reservations(from_date=...) 와 같은 구간/페이징이지만 전체를 메모리에 모으지 않는다.
+        Yields: (청크 시작일, 청크 종료일 'YYYY-MM-DD', _process_raw_data 결과)
+        """
+        if not self.cookie:
+            logger.info("[Naver] No cookie configured — skipping backfill")
+            return
+        chunk_start = datetime.strptime(from_date, "%Y-%m-%d")
+        async for start, end, data in self._iter_raw_chunks(chunk_start, datetime.now()):
+            # 변환 실패를 빈 청크로 삼키면 백필 체크포인트가 그 청크를 건너뛰므로 예외 전파
+            yield start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), await self._process_raw_data(data, raise_errors=True)
+
+    async def _iter_raw_chunks(self, chunk_start: datetime, now: datetime) -> AsyncIterator[Tuple[datetime, datetime, List[Dict]]]:
+        """REGDATE 월별(30일) 청크 단위 raw 응답 — 청크 안에서는 페이지를 끝까지 모아서 yield."""
+        while chunk_start <= now:
+            chunk_end = min(chunk_start + timedelta(days=30), now)
+            # 페이징
+            chunk_data: List[Dict] = []
+            page = 0
+            while True:
+                data = await self._fetch_page(chunk_start, chunk_end, page=page)
+                logger.info(f"Fetched {len(data)} reservations ({chunk_start.strftime('%m/%d')}~{chunk_end.strftime('%m/%d')}, page {page})")
+                chunk_data.extend(data)
+                if len(data) < 200:
+                    break
+                page += 1
+            yield chunk_start, chunk_end, chunk_data
+            chunk_start = chunk_end.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    async def _process_raw_data(self, data: List[Dict], raise_errors: bool = False) -> List[Dict[str, Any]]:
         """Raw API 응답을 표준 예약 데이터로 변환.
 
         필터링(확정/취소) → 유저정보 조회 → 표준 형식 변환.
         sync_reservations()와 fetch_by_checkin_date() 공통 사용.
+        raise_errors=False 면 실패 시 로그 후 [] (기존 동작), True 면 예외 전파 (iter_history_chunks).
         """
         try:
             # Filter confirmed (RC03)
@@ -174,18 +209,32 @@ class RealReservationProvider:
             multi_booking_ids = self._detect_multi_bookings(confirmed)
 
             # Fetch user info (gender/age) with dedup by userId, parallel with semaphore
+            # 캐시(naver_user_infos)에 유효한 값이 있거나 최근 실패한 userId 는 API 조회 생략
+            from app.services.naver_user_cache import get_cached_user_infos, store_user_infos
             all_items = confirmed + cancelled_filtered
             unique_user_ids = {str(item.get('userId', '')) for item in all_items if item.get('userId')}
+            user_info_cache, negative_ids = await get_cached_user_infos(self.business_id, unique_user_ids)
+            to_fetch = unique_user_ids - set(user_info_cache) - negative_ids
             sem = asyncio.Semaphore(10)
 
             async def _fetch_user(uid: str):
                 async with sem:
                     return uid, await self.get_user_info(uid)
 
-            results = await asyncio.gather(*[_fetch_user(uid) for uid in unique_user_ids])
-            user_info_cache = {uid: info for uid, info in results if info}
-
-            logger.info(f"Fetched user info for {len(user_info_cache)}/{len(unique_user_ids)} users")
+            results = await asyncio.gather(*[_fetch_user(uid) for uid in to_fetch])
+            await store_user_infos(self.business_id, dict(results))
+            user_info_cache.update({uid: info for uid, info in results if info})
+
+            self.last_user_info_stats = {
+                "users": len(unique_user_ids),
+                "cache_hits": len(unique_user_ids) - len(to_fetch),
+                "negative_hits": len(negative_ids),
+                "api_calls": len(to_fetch),
+            }
+            logger.info(
+                f"Fetched user info for {len(user_info_cache)}/{len(unique_user_ids)} users "
+                f"(cache hits {self.last_user_info_stats['cache_hits']}, API calls {len(to_fetch)})"
+            )
 
             def _enrich(reservation: Dict, item: Dict):
                 uid = str(item.get('userId', ''))
@@ -212,9 +261,13 @@ class RealReservationProvider:
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error processing reservations: {e}")
+            if raise_errors:
+                raise
             return []
         except Exception as e:
             logger.error(f"Error processing reservations: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def fetch_by_checkin_date(self, target_date: str) -> List[Dict[str, Any]]:
@@ -231,16 +284,15 @@ class RealReservationProvider:
         logger.info(f"Fetching reservations by check-in date: {target_date}")
 
         try:
-            async with httpx.AsyncClient() as client:
-                all_data = []
-                page = 0
-                while True:
-                    data = await self._fetch_page(client, dt, dt, date_filter="USEDATE", page=page)
-                    logger.info(f"Reconcile fetch: {len(data)} reservations for {target_date} (page {page})")
-                    all_data.extend(data)
-                    if len(data) < 200:
-                        break
-                    page += 1
+            all_data = []
+            page = 0
+            while True:
+                data = await self._fetch_page(dt, dt, date_filter="USEDATE", page=page)
+                logger.info(f"Reconcile fetch: {len(data)} reservations for {target_date} (page {page})")
+                all_data.extend(data)
+                if len(data) < 200:
+                    break
+                page += 1
 
             if not all_data:
                 logger.warning(f"STARTDATE fetch returned 0 results for {target_date}")
@@ -264,29 +316,28 @@ class RealReservationProvider:
         )
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self._get_headers(), timeout=10.0)
-                response.raise_for_status()
-
-                data = response.json()
-
-                age_group = data.get('ageGroup', '')
-                # Normalize "19세" to "20"
-                import re
-                age_match = re.search(r'\d+', age_group)
-                age_str = ''
-                if age_match:
-                    age_str = '20' if age_match.group() == '19' else age_match.group()
-
-                gender = '남' if data.get('sex') == 'MALE' else '여' if data.get('sex') == 'FEMALE' else ''
-                visit_count = data.get('completedCount', 0) + 1
-
-                return {
-                    'age_group': age_str,
-                    'gender': gender,
-                    'visit_count': visit_count,
-                    'summary': f"{visit_count}번/{age_str}{gender}",
-                }
+            response = await request("naver", "GET", url, headers=self._get_headers(), timeout=10.0)
+            response.raise_for_status()
+
+            data = response.json()
+
+            age_group = data.get('ageGroup', '')
+            # Normalize "19세" to "20"
+            import re
+            age_match = re.search(r'\d+', age_group)
+            age_str = ''
+            if age_match:
+                age_str = '20' if age_match.group() == '19' else age_match.group()
+
+            gender = '남' if data.get('sex') == 'MALE' else '여' if data.get('sex') == 'FEMALE' else ''
+            visit_count = data.get('completedCount', 0) + 1
+
+            return {
+                'age_group': age_str,
+                'gender': gender,
+                'visit_count': visit_count,
+                'summary': f"{visit_count}번/{age_str}{gender}",
+            }
 
         except Exception as e:
             logger.error(f"Error fetching user info for {user_id}: {e}")
@@ -379,23 +430,22 @@ class RealReservationProvider:
         )
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self._get_headers(), timeout=15.0)
-                response.raise_for_status()
-                data = response.json()
-                logger.info(f"Fetched {len(data)} biz items from Naver API")
-
-                items = []
-                for item in data:
-                    items.append({
-                        'biz_item_id': str(item.get('bizItemId', '')),
-                        'name': item.get('name', ''),
-                        'biz_item_type': item.get('bizItemType', ''),
-                        'is_exposed': bool(item.get('isImp', False)),
-                    })
-                exposed_count = sum(1 for i in items if i['is_exposed'])
-                logger.info(f"Fetched {len(items)} biz items ({exposed_count} exposed, {len(items) - exposed_count} hidden)")
-                return items
+            response = await request("naver", "GET", url, headers=self._get_headers(), timeout=15.0)
+            response.raise_for_status()
+            data = response.json()
+            logger.info(f"Fetched {len(data)} biz items from Naver API")
+
+            items = []
+            for item in data:
+                items.append({
+                    'biz_item_id': str(item.get('bizItemId', '')),
+                    'name': item.get('name', ''),
+                    'biz_item_type': item.get('bizItemType', ''),
+                    'is_exposed': bool(item.get('isImp', False)),
+                })
+            exposed_count = sum(1 for i in items if i['is_exposed'])
+            logger.info(f"Fetched {len(items)} biz items ({exposed_count} exposed, {len(items) - exposed_count} hidden)")
+            return items
         except Exception as e:
             logger.error(f"Error fetching biz items: {e}")
             return []
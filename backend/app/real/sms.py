@@ -9,6 +9,7 @@ import httpx
 import logging
 from app.config import settings
 from app.diag_logger import diag, mask_phone
+from app.real.http_client import request
 
 logger = logging.getLogger(__name__)
 
@@ -127,14 +128,14 @@ class RealSMSProvider:
             pass
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    ALIGO_SEND_URL,
-                    data=params,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await request(
+                "aligo", "POST", ALIGO_SEND_URL,
+                data=params,
+                timeout=30.0,
+                idempotent=False,
+            )
+            response.raise_for_status()
+            result = response.json()
 
             logger.info(f"[Aligo] 단건 응답: {result}")
             try:
@@ -250,15 +251,15 @@ class RealSMSProvider:
             pass
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    ALIGO_SEND_MASS_URL,
-                    data=data,
-                    files=files,
-                    timeout=60.0,
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await request(
+                "aligo", "POST", ALIGO_SEND_MASS_URL,
+                data=data,
+                files=files,
+                timeout=60.0,
+                idempotent=False,
+            )
+            response.raise_for_status()
+            result = response.json()
 
             logger.info(f"[Aligo MMS] 응답: {result}")
             try:
@@ -385,10 +386,9 @@ class RealSMSProvider:
         logger.info("[Aligo] 잔여건수 조회")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(ALIGO_REMAIN_URL, data=params, timeout=10.0)
-                response.raise_for_status()
-                result = response.json()
+            response = await request("aligo", "POST", ALIGO_REMAIN_URL, data=params, timeout=10.0)
+            response.raise_for_status()
+            result = response.json()
 
             logger.info(f"[Aligo] 잔여건수: SMS={result.get('SMS_CNT')}, LMS={result.get('LMS_CNT')}, MMS={result.get('MMS_CNT')}")
             success = str(result.get("result_code")) == "1"
@@ -486,14 +486,14 @@ class RealSMSProvider:
         logger.info(f"[Aligo] /send_mass/ 요청 — {cnt}건, msg_type={msg_type}, testmode={testmode_yn}")
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    ALIGO_SEND_MASS_URL,
-                    data=params,
-                    timeout=60.0,
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = await request(
+                "aligo", "POST", ALIGO_SEND_MASS_URL,
+                data=params,
+                timeout=60.0,
+                idempotent=False,
+            )
+            response.raise_for_status()
+            result = response.json()
 
             logger.info(f"[Aligo] /send_mass/ 응답: {result}")
 
@@ -8,8 +8,9 @@ from datetime import datetime, timezone, timedelta
 import logging
 
 from app.db.database import SessionLocal
-from app.db.models import Tenant
-from app.db.tenant_context import current_tenant_id, bypass_tenant_filter
+from app.db.executor import run_db
+from app.scheduler.tenant_fanout import active_tenants, fan_out_tenants
+from app.db.tenant_context import bypass_tenant_filter
 from app.diag_logger import diag
 from app.factory import get_reservation_provider_for_tenant
 from app.services.room_auto_assign import daily_assign_rooms
@@ -18,36 +19,13 @@ from app.config import KST
 logger = logging.getLogger(__name__)
 
 
-def _for_each_tenant(job_fn):
-    """Execute a job function for each active tenant with proper context."""
-    db = SessionLocal()
-    try:
-        token_bypass = bypass_tenant_filter.set(True)
-        try:
-            tenants = db.query(Tenant).filter(Tenant.is_active == True).all()
-        finally:
-            bypass_tenant_filter.reset(token_bypass)
-    finally:
-        db.close()
+async def _for_each_tenant(job_name: str, job_fn):
+    """Execute a sync job function for each active tenant (fan-out, DB 스레드 풀)."""
+    async def _work(db, tenant):
+        return await run_db(job_fn, db, tenant)
+
+    return await fan_out_tenants(job_name, _work)
 
-    for tenant in tenants:
-        token = current_tenant_id.set(tenant.id)
-        db = SessionLocal()
-        try:
-            job_fn(db, tenant)
-            db.commit()
-        except Exception as e:
-            logger.error(f"[{tenant.slug}] Job error: {e}")
-            try:
-                import sentry_sdk
-                sentry_sdk.set_tag("tenant_slug", tenant.slug)
-                sentry_sdk.capture_exception(e)
-            except ImportError:
-                pass
-            db.rollback()
-        finally:
-            db.close()
-            current_tenant_id.reset(token)
 
 # Create scheduler instance
 scheduler = AsyncIOScheduler()
@@ -71,26 +49,11 @@ async def sync_naver_reservations_job():
 
     from app.services.naver_sync import sync_naver_to_db
 
-    # Fetch all active tenants without tenant context restriction
-    token_bypass = bypass_tenant_filter.set(True)
-    try:
-        db = SessionLocal()
-        try:
-            tenants = db.query(Tenant).filter(Tenant.is_active == True).all()
-        finally:
-            db.close()
-    finally:
-        bypass_tenant_filter.reset(token_bypass)
-
-    for tenant in tenants:
-        token = current_tenant_id.set(tenant.id)
-        db = SessionLocal()
+    async def _sync(db, tenant):
         try:
             reservation_provider = get_reservation_provider_for_tenant(tenant)
             result = await sync_naver_to_db(reservation_provider, db)
-            logger.info(f"[{tenant.slug}] Scheduler sync result: {result['message']}")
         except Exception as e:
-            logger.error(f"[{tenant.slug}] Error in reservation sync job: {e}")
             diag(
                 "job.sync_naver_reservations.tenant_failed",
                 level="critical",
@@ -98,12 +61,13 @@ async def sync_naver_reservations_job():
                 tenant_slug=tenant.slug,
                 error=str(e),
             )
-            db.rollback()
-        finally:
-            db.close()
-            current_tenant_id.reset(token)
+            raise
+        logger.info(f"[{tenant.slug}] Scheduler sync result: {result['message']}")
+        return result
+
+    reports = await fan_out_tenants("sync_naver_reservations", _sync)
 
-    diag("job.sync_naver_reservations.exit", level="verbose", tenants=len(tenants))
+    diag("job.sync_naver_reservations.exit", level="verbose", tenants=len(reports))
 
 
 async def load_template_schedules():
@@ -156,7 +120,7 @@ async def sync_status_log_job():
         )
         logger.info(f"[{tenant.slug}] Sync status log recorded: {period_start}~{period_end}")
 
-    _for_each_tenant(_log_status)
+    await _for_each_tenant("sync_status_log", _log_status)
 
 
 async def detect_consecutive_stays_job():
@@ -170,8 +134,6 @@ async def detect_consecutive_stays_job():
 
     from app.services.consecutive_stay import detect_and_link_consecutive_stays
 
-    totals = {"linked": 0, "unlinked": 0, "groups": 0, "tenants": 0}
-
     def _detect(db, tenant):
         try:
             result = detect_and_link_consecutive_stays(db)
@@ -183,15 +145,23 @@ async def detect_consecutive_stays_job():
                 tenant_slug=tenant.slug,
                 error=str(e),
             )
-            return
+            return None
+        if result["linked"] > 0 or result["unlinked"] > 0:
+            logger.info(f"[{tenant.slug}] Consecutive stay detection: {result}")
+        return result
+
+    reports = await _for_each_tenant("detect_consecutive_stays", _detect)
+
+    # 테넌트별 결과 합산 (fan-out 은 동시 실행이라 공유 dict 갱신 대신 리포트에서 집계)
+    totals = {"linked": 0, "unlinked": 0, "groups": 0, "tenants": 0}
+    for r in reports:
+        result = r.get("result")
+        if r["outcome"] != "ok" or not result:
+            continue
         totals["tenants"] += 1
         totals["linked"] += result.get("linked", 0)
         totals["unlinked"] += result.get("unlinked", 0)
         totals["groups"] += result.get("groups", 0)
-        if result["linked"] > 0 or result["unlinked"] > 0:
-            logger.info(f"[{tenant.slug}] Consecutive stay detection: {result}")
-
-    _for_each_tenant(_detect)
 
     diag(
         "job.detect_consecutive_stays.exit",
@@ -218,78 +188,60 @@ async def reconcile_today_reservations_job():
 
     logger.info(f"Running daily reconciliation for {today} and {tomorrow} (all tenants)")
 
-    token_bypass = bypass_tenant_filter.set(True)
-    try:
-        db = SessionLocal()
-        try:
-            tenants = db.query(Tenant).filter(Tenant.is_active == True).all()
-        finally:
-            db.close()
-    finally:
-        bypass_tenant_filter.reset(token_bypass)
-
-    for tenant in tenants:
-        token = current_tenant_id.set(tenant.id)
-        db = SessionLocal()
-        try:
-            reservation_provider = get_reservation_provider_for_tenant(tenant)
-            total_added = 0
+    async def _reconcile(db, tenant):
+        reservation_provider = get_reservation_provider_for_tenant(tenant)
+        total_added = 0
+        for target_date in [today, tomorrow]:
+            result = await sync_naver_to_db(reservation_provider, db, reconcile_date=target_date)
+            added = result.get("added", 0)
+            total_added += added
+            if added > 0:
+                logger.info(f"[{tenant.slug}] Reconcile {target_date}: +{added} reservations")
+
+        if total_added > 0:
+            source_label = "[스테이블] " if tenant.unstable_business_id else ""
+            log_activity(
+                db,
+                type="naver_reconcile",
+                title=f"{source_label}네이버 예약 대사 : 스케줄 ({today}~{tomorrow})",
+                detail={"today": today, "tomorrow": tomorrow, "added": total_added},
+                target_count=total_added,
+                success_count=total_added,
+                created_by="scheduler",
+            )
+            db.commit()
+            logger.info(f"[{tenant.slug}] Reconciliation complete: {total_added} added")
+        else:
+            logger.info(f"[{tenant.slug}] Reconciliation: no missing reservations")
+
+        # 언스테이블 reconciliation (USEDATE 기반)
+        if tenant.unstable_business_id and tenant.unstable_cookie:
+            from app.real.reservation import RealReservationProvider
+            unstable_provider = RealReservationProvider(
+                business_id=tenant.unstable_business_id,
+                cookie=tenant.unstable_cookie,
+            )
+            unstable_added = 0
             for target_date in [today, tomorrow]:
-                result = await sync_naver_to_db(reservation_provider, db, reconcile_date=target_date)
+                result = await sync_naver_to_db(unstable_provider, db, reconcile_date=target_date, source="unstable")
                 added = result.get("added", 0)
-                total_added += added
+                unstable_added += added
                 if added > 0:
-                    logger.info(f"[{tenant.slug}] Reconcile {target_date}: +{added} reservations")
-
-            if total_added > 0:
-                source_label = "[스테이블] " if tenant.unstable_business_id else ""
+                    logger.info(f"[{tenant.slug}] Unstable reconcile {target_date}: +{added} reservations")
+            if unstable_added > 0:
                 log_activity(
                     db,
                     type="naver_reconcile",
-                    title=f"{source_label}네이버 예약 대사 : 스케줄 ({today}~{tomorrow})",
-                    detail={"today": today, "tomorrow": tomorrow, "added": total_added},
-                    target_count=total_added,
-                    success_count=total_added,
+                    title=f"[언스테이블] 네이버 예약 대사 : 스케줄 ({today}~{tomorrow})",
+                    detail={"source": "unstable", "today": today, "tomorrow": tomorrow, "added": unstable_added},
+                    target_count=unstable_added,
+                    success_count=unstable_added,
                     created_by="scheduler",
                 )
                 db.commit()
-                logger.info(f"[{tenant.slug}] Reconciliation complete: {total_added} added")
-            else:
-                logger.info(f"[{tenant.slug}] Reconciliation: no missing reservations")
-
-            # 언스테이블 reconciliation (USEDATE 기반)
-            if tenant.unstable_business_id and tenant.unstable_cookie:
-                from app.real.reservation import RealReservationProvider
-                unstable_provider = RealReservationProvider(
-                    business_id=tenant.unstable_business_id,
-                    cookie=tenant.unstable_cookie,
-                )
-                unstable_added = 0
-                for target_date in [today, tomorrow]:
-                    result = await sync_naver_to_db(unstable_provider, db, reconcile_date=target_date, source="unstable")
-                    added = result.get("added", 0)
-                    unstable_added += added
-                    if added > 0:
-                        logger.info(f"[{tenant.slug}] Unstable reconcile {target_date}: +{added} reservations")
-                if unstable_added > 0:
-                    log_activity(
-                        db,
-                        type="naver_reconcile",
-                        title=f"[언스테이블] 네이버 예약 대사 : 스케줄 ({today}~{tomorrow})",
-                        detail={"source": "unstable", "today": today, "tomorrow": tomorrow, "added": unstable_added},
-                        target_count=unstable_added,
-                        success_count=unstable_added,
-                        created_by="scheduler",
-                    )
-                    db.commit()
-                    logger.info(f"[{tenant.slug}] Unstable reconciliation complete: {unstable_added} added")
+                logger.info(f"[{tenant.slug}] Unstable reconciliation complete: {unstable_added} added")
 
-        except Exception as e:
-            logger.error(f"[{tenant.slug}] Reconciliation error: {e}")
-            db.rollback()
-        finally:
-            db.close()
-            current_tenant_id.reset(token)
+    await fan_out_tenants("reconcile_today_reservations", _reconcile)
 
 
 async def sync_unstable_reservations_job():
@@ -302,59 +254,46 @@ async def sync_unstable_reservations_job():
 
     logger.info("Running Unstable reservations sync job")
 
-    token_bypass = bypass_tenant_filter.set(True)
-    try:
-        db = SessionLocal()
-        try:
-            tenants = db.query(Tenant).filter(Tenant.is_active == True).all()
-        finally:
-            db.close()
-    finally:
-        bypass_tenant_filter.reset(token_bypass)
+    tenants = [
+        t for t in await run_db(active_tenants)
+        if t.unstable_business_id and t.unstable_cookie
+    ]
 
     diag("job.sync_unstable_reservations.enter", level="verbose",
          tenant_count=len(tenants))
 
-    sync_results = []
-    for tenant in tenants:
-        if not tenant.unstable_business_id or not tenant.unstable_cookie:
-            continue
-
-        token = current_tenant_id.set(tenant.id)
-        db = SessionLocal()
+    async def _sync(db, tenant):
+        provider = RealReservationProvider(
+            business_id=tenant.unstable_business_id,
+            cookie=tenant.unstable_cookie,
+        )
         try:
-            provider = RealReservationProvider(
-                business_id=tenant.unstable_business_id,
-                cookie=tenant.unstable_cookie,
-            )
             result = await sync_naver_to_db(provider, db, source="unstable")
-            sync_results.append({
-                "tenant_id": tenant.id,
-                "added": result.get("added", 0),
-                "updated": result.get("updated", 0),
-                "synced": result.get("synced", 0),
-            })
-            logger.info(f"[{tenant.slug}] Unstable sync result: {result['message']}")
-            if result.get("added", 0) > 0:
-                from app.services.activity_logger import log_activity
-                log_activity(
-                    db,
-                    type="naver_sync",
-                    title=f"[언스테이블] 네이버 예약 동기화 : {result['message']}",
-                    detail={"source": "unstable", "added": result["added"], "updated": result["updated"]},
-                    target_count=result.get("synced", 0),
-                    success_count=result.get("added", 0),
-                    created_by="scheduler",
-                )
-                db.commit()
         except Exception as e:
-            logger.error(f"[{tenant.slug}] Error in unstable sync job: {e}")
             diag("job.sync_unstable_reservations.tenant_failed", level="critical",
                  tenant_id=tenant.id, error=str(e)[:200])
-            db.rollback()
-        finally:
-            db.close()
-            current_tenant_id.reset(token)
+            raise
+        logger.info(f"[{tenant.slug}] Unstable sync result: {result['message']}")
+        if result.get("added", 0) > 0:
+            from app.services.activity_logger import log_activity
+            log_activity(
+                db,
+                type="naver_sync",
+                title=f"[언스테이블] 네이버 예약 동기화 : {result['message']}",
+                detail={"source": "unstable", "added": result["added"], "updated": result["updated"]},
+                target_count=result.get("synced", 0),
+                success_count=result.get("added", 0),
+                created_by="scheduler",
+            )
+        return {
+            "tenant_id": tenant.id,
+            "added": result.get("added", 0),
+            "updated": result.get("updated", 0),
+            "synced": result.get("synced", 0),
+        }
+
+    reports = await fan_out_tenants("sync_unstable_reservations", _sync, tenants=tenants)
+    sync_results = [r["result"] for r in reports if r["outcome"] == "ok"]
 
     diag("job.sync_unstable_reservations.exit", level="critical",
          active_tenants=len(sync_results),
@@ -376,11 +315,11 @@ async def daily_room_assign_job():
         result = daily_assign_rooms(db)
         logger.info(f"[{tenant.slug}] Daily room auto-assignment result: {result}")
 
-    _for_each_tenant(_assign)
+    await _for_each_tenant("daily_room_assign", _assign)
     diag("job.daily_room_assign.exit", level="verbose")
 
 
-def refresh_snapshots_job():
+async def refresh_snapshots_job():
     """Refresh participant snapshots for all tenants (today + tomorrow).
     Called at specific cron times (e.g., 08:50, 11:50).
     """
@@ -402,7 +341,24 @@ def refresh_snapshots_job():
         if refreshed:
             logger.info(f"[Snapshot Refresh] tenant={tenant.slug}: refreshed {', '.join(refreshed)}")
 
-    _for_each_tenant(_job)
+    await _for_each_tenant("refresh_snapshots", _job)
+
+
+async def check_daily_stats_job():
+    """daily_stats 정합성 검사 + 복구 (어제 ~ 60일 후). 증분 갱신이 놓친 변경(객실 도미토리 전환 등) 보정."""
+    from app.services.daily_stats import check_daily_stats
+
+    logger.info("[Scheduler] Checking daily stats...")
+
+    def _job(db, tenant):
+        today = datetime.now(KST)
+        date_from = (today - timedelta(days=1)).strftime('%Y-%m-%d')
+        date_to = (today + timedelta(days=60)).strftime('%Y-%m-%d')
+        mismatches = check_daily_stats(db, tenant.id, date_from, date_to, repair=True)
+        if mismatches:
+            logger.warning(f"[DailyStats] tenant={tenant.slug}: repaired {len({m['date'] for m in mismatches})} days")
+
+    await _for_each_tenant("check_daily_stats", _job)
 
 
 def setup_scheduler():
@@ -507,6 +463,15 @@ def setup_scheduler():
         replace_existing=True,
     )
 
+    # daily_stats 정합성 검사 - 04:20 KST
+    scheduler.add_job(
+        check_daily_stats_job,
+        trigger=CronTrigger(hour=4, minute=20, timezone='Asia/Seoul'),
+        id='check_daily_stats',
+        name='일별 집계 정합성 검사 (04:20)',
+        replace_existing=True,
+    )
+
     # Load template schedules on startup
     scheduler.add_job(
         load_template_schedules,
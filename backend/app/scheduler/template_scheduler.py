@@ -1,11 +1,12 @@
 """
 Template-based schedule execution engine
 """
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import exists, or_, func
 
 from app.db.models import TemplateSchedule, Reservation, RoomAssignment, ReservationSmsAssignment, Room, ReservationStatus
 from app.diag_logger import diag
@@ -13,12 +14,14 @@ from app.services.filters import (
     apply_structural_filters as _standalone_structural_filters,
 )
 from app.factory import get_sms_provider_for_tenant
-from app.services.sms_tracking import record_sms_sent
+from app.services.sms_tracking import record_sms_results_bulk
 from app.services.activity_logger import log_activity
 from app.services.event_bus import publish as publish_event
 from app.db.tenant_context import current_tenant_id
-from app.services.sms_sender import send_single_sms
-from app.config import today_kst, today_kst_date
+from app.db.executor import run_db
+from app.services.sms_sender import dispatch_sms, prepare_single_sms, sms_result
+from app.templates.variables import calculate_template_variables_batch, prefetch_room_assignments
+from app.config import settings, today_kst, today_kst_date
 
 logger = logging.getLogger(__name__)
 
@@ -38,9 +41,9 @@ class TemplateScheduleExecutor:
         Steps:
         1. Load TemplateSchedule
         2. Filter targets based on configuration
-        3. Render template for each target
-        4. Send SMS (bulk)
-        5. Update tracking flags
+        3. Render template for each target (stage 1, sequential DB work)
+        4. Send SMS (stage 2, concurrent — capped by SMS_SEND_CONCURRENCY)
+        5. Update tracking flags (stage 3, one bulk flush)
         6. Log campaign
 
         Returns:
@@ -54,11 +57,8 @@ class TemplateScheduleExecutor:
             manual=manual,
         )
 
-        # Load schedule
-        schedule = self.db.query(TemplateSchedule).filter(
-            TemplateSchedule.id == schedule_id,
-            TemplateSchedule.is_active == True
-        ).first()
+        # Load schedule (스케줄 + 템플릿 로드도 DB 스레드 풀에서 — 이하 모든 DB 구간 동일)
+        schedule = await run_db(self._load_schedule, schedule_id)
 
         if not schedule:
             logger.warning(f"Schedule #{schedule_id} not found or inactive")
@@ -94,10 +94,9 @@ class TemplateScheduleExecutor:
                 and schedule.send_condition_date
                 and schedule.send_condition_ratio is not None
             ):
-                condition_met = self._check_send_condition(schedule)
+                condition_met = await run_db(self._check_send_condition, schedule)
                 if not condition_met:
-                    schedule.last_run_at = datetime.now(timezone.utc)
-                    self.db.commit()
+                    await run_db(self._mark_run, schedule)
                     logger.info(f"Schedule #{schedule_id}: send condition not met, skipping")
                     diag(
                         "schedule.execute.exit",
@@ -110,8 +109,8 @@ class TemplateScheduleExecutor:
                     )
                     return {"success": True, "sent_count": 0, "message": "Send condition not met, skipped"}
 
-            # Get targets
-            targets = self.get_targets(schedule)
+            # Get targets (DB 스레드 풀 — 이벤트 루프 블로킹 방지)
+            targets = await run_db(self.get_targets, schedule)
             logger.info(f"Found {len(targets)} targets for schedule #{schedule_id}")
             diag(
                 "schedule.execute.targets",
@@ -122,8 +121,7 @@ class TemplateScheduleExecutor:
 
             if not targets:
                 # Update last_run even if no targets
-                schedule.last_run_at = datetime.now(timezone.utc)
-                self.db.commit()
+                await run_db(self._mark_run, schedule)
                 diag(
                     "schedule.execute.exit",
                     level="verbose",
@@ -152,133 +150,136 @@ class TemplateScheduleExecutor:
                 target_date = self._resolve_date_target(date_target_val) if date_target_val else None
 
             # Build reservation_id -> building+room display map for log
-            # Use RoomAssignment for target_date (not denormalized field)
-            target_res_ids = [r.id for r in targets]
-            room_building_map = {}  # reservation_id -> display string
-            if target_res_ids and target_date:
-                assignments = self.db.query(RoomAssignment).filter(
-                    RoomAssignment.reservation_id.in_(target_res_ids),
-                    RoomAssignment.date == target_date,
-                ).all()
-                assign_room_id_map = {ra.reservation_id: ra.room_id for ra in assignments}
-                room_ids = set(assign_room_id_map.values())
-                room_name_map = {}
-                if room_ids:
-                    rooms_with_building = self.db.query(Room).filter(Room.id.in_(room_ids)).all()
-                    for rm in rooms_with_building:
-                        building_name = rm.building.name if rm.building else ""
-                        rn = rm.room_number or ""
-                        # room_number에 이미 건물명이나 '호'가 포함된 경우 그대로 사용
-                        if building_name and building_name in rn:
-                            room_name_map[rm.id] = rn
-                        elif building_name:
-                            suffix = rn if rn.endswith("호") else f"{rn}호"
-                            room_name_map[rm.id] = f"{building_name} {suffix}"
-                        else:
-                            room_name_map[rm.id] = rn if rn.endswith("호") else f"{rn}호"
-                for res_id, rid in assign_room_id_map.items():
-                    room_building_map[res_id] = room_name_map.get(rid, str(rid))
+            room_building_map = await run_db(self._room_building_map, [r.id for r in targets], target_date)
 
             template_key = schedule.template.template_key
 
             schedule_custom_vars = schedule.template.get_buffer_vars()
 
-            for reservation in targets:
+            # ── Stage 1: 검증 + 렌더링 (DB 작업만, 순차 — DB 스레드 풀에서 실행) ──
+            def _prepare_all():
+                # 변수 컨텍스트는 대상 전체를 한 번에 계산 (실패 시 대상별 계산으로 fallback)
                 try:
-                    result = await send_single_sms(
-                        db=self.db,
-                        sms_provider=self.sms_provider,
-                        reservation=reservation,
-                        template_key=template_key,
-                        date=target_date,
-                        created_by="system",
-                        skip_activity_log=True,
-                        skip_commit=True,
-                        custom_vars=schedule_custom_vars,
+                    ra_map = prefetch_room_assignments(self.db, targets, target_date)
+                    contexts = calculate_template_variables_batch(
+                        self.db, targets, date=target_date, custom_vars=schedule_custom_vars,
+                        template_key=template_key, room_assignments=ra_map,
                     )
-
-                    if result.get('success'):
-                        sent_count += 1
-
-                        record_sms_sent(
-                            self.db,
-                            reservation.id,
-                            template_key,
-                            schedule.template.category,
-                            assigned_by='schedule',
-                            date=target_date or '',
-                        )
-
-                        self.db.flush()
-                        logger.info(f"Sent SMS to {reservation.customer_name} ({reservation.phone})")
-                        send_results.append({
-                            "customer_name": reservation.customer_name,
-                            "phone": reservation.phone,
-                            "template_key": template_key,
-                            "template_detail": room_building_map.get(reservation.id, ""),
-                            "status": "success",
-                            "message_id": result.get("message_id"),
-                            "message": result.get("message", ""),
-                        })
-                    else:
-                        failed_count += 1
-                        error_msg = result.get('error', 'unknown')
-                        logger.error(f"Failed to send SMS to {reservation.phone}: {error_msg}")
-
-                        from app.services.sms_tracking import record_sms_failed
-                        record_sms_failed(
-                            self.db, reservation.id, template_key,
-                            error=error_msg, date=target_date or '',
+                except Exception as e:
+                    logger.warning(f"Batch template variables failed for schedule #{schedule_id}: {e}")
+                    ra_map, contexts = {}, {}
+
+                prepared_list = []
+                for reservation in targets:
+                    try:
+                        prepared = prepare_single_sms(
+                            self.db, reservation, template_key,
+                            date=target_date, custom_vars=schedule_custom_vars,
+                            context=contexts.get(reservation.id),
+                            room_assignment=ra_map.get(reservation.id),
                         )
-                        self.db.flush()
-
-                        send_results.append({
-                            "customer_name": reservation.customer_name,
-                            "phone": reservation.phone,
-                            "template_key": template_key,
-                            "template_detail": room_building_map.get(reservation.id, ""),
-                            "status": "failed",
-                            "error": error_msg,
-                        })
+                    except Exception as e:
+                        prepared = e
+                    prepared_list.append(prepared)
+                return prepared_list
+
+            prepared_list = await run_db(_prepare_all)
+
+            # ── Stage 2: provider 호출 (DB 접근 없음, 동시 실행 상한) ──
+            semaphore = asyncio.Semaphore(max(1, settings.SMS_SEND_CONCURRENCY))
+
+            async def _dispatch(reservation, prepared):
+                if isinstance(prepared, Exception):
+                    raise prepared
+                if prepared["blocked"]:
+                    return prepared["result"]
+                async with semaphore:
+                    raw = await dispatch_sms(self.sms_provider, reservation, template_key, prepared["message"])
+                return sms_result(raw, prepared["message"])
+
+            results = await asyncio.gather(
+                *(_dispatch(r, p) for r, p in zip(targets, prepared_list)),
+                return_exceptions=True,
+            )
 
-                except Exception as e:
+            # ── Stage 3: 결과 기록 (칩 일괄 갱신 + flush 1회) ──
+            sent_ids: List[int] = []
+            failed_errors: Dict[int, str] = {}
+            for reservation, result in zip(targets, results):
+                if isinstance(result, Exception):
                     failed_count += 1
-                    logger.error(f"Error sending SMS to reservation #{reservation.id}: {str(e)}")
+                    logger.error(f"Error sending SMS to reservation #{reservation.id}: {str(result)}")
                     send_results.append({
                         "customer_name": reservation.customer_name,
                         "phone": reservation.phone,
                         "template_key": template_key,
                         "template_detail": "",
                         "status": "error",
-                        "error": str(e),
+                        "error": str(result),
+                    })
+                elif result.get('success'):
+                    sent_count += 1
+                    sent_ids.append(reservation.id)
+                    logger.info(f"Sent SMS to {reservation.customer_name} ({reservation.phone})")
+                    send_results.append({
+                        "customer_name": reservation.customer_name,
+                        "phone": reservation.phone,
+                        "template_key": template_key,
+                        "template_detail": room_building_map.get(reservation.id, ""),
+                        "status": "success",
+                        "message_id": result.get("message_id"),
+                        "message": result.get("message", ""),
+                    })
+                else:
+                    failed_count += 1
+                    error_msg = result.get('error', 'unknown')
+                    failed_errors[reservation.id] = error_msg
+                    logger.error(f"Failed to send SMS to {reservation.phone}: {error_msg}")
+                    send_results.append({
+                        "customer_name": reservation.customer_name,
+                        "phone": reservation.phone,
+                        "template_key": template_key,
+                        "template_detail": room_building_map.get(reservation.id, ""),
+                        "status": "failed",
+                        "error": error_msg,
                     })
 
-            # Update schedule
-            schedule.last_run_at = datetime.now(timezone.utc)
-
-            # 활동 로그 기록 (대상자 상세 포함)
             if (schedule.schedule_category or 'standard') == 'custom_schedule':
                 schedule_label = f"커스텀({schedule.custom_type or '미지정'})"
             else:
                 schedule_label = '스케줄 수동 발송' if manual else '스케줄 자동 발송'
-            log_activity(
-                self.db,
-                type="sms_send",
-                title=f"SMS 발송 : {schedule_label}",
-                detail={
-                    "schedule_id": schedule.id,
-                    "template_key": schedule.template.template_key,
-                    "targets": send_results,
-                    "message": next((r["message"] for r in send_results if r.get("status") == "success" and r.get("message")), schedule.template.content),
-                },
-                target_count=len(targets),
-                success_count=sent_count,
-                failed_count=failed_count,
-                status="success" if failed_count == 0 else ("partial" if sent_count > 0 else "failed"),
-                created_by="system",
-            )
 
-            self.db.commit()
+            def _record():
+                record_sms_results_bulk(
+                    self.db, template_key, target_date or '',
+                    sent_ids, failed_errors, assigned_by='schedule',
+                )
+                self.db.flush()
+
+                # Update schedule
+                schedule.last_run_at = datetime.now(timezone.utc)
+
+                # 활동 로그 기록 (대상자 상세 포함)
+                log_activity(
+                    self.db,
+                    type="sms_send",
+                    title=f"SMS 발송 : {schedule_label}",
+                    detail={
+                        "schedule_id": schedule.id,
+                        "template_key": template_key,
+                        "targets": send_results,
+                        "message": next((r["message"] for r in send_results if r.get("status") == "success" and r.get("message")), schedule.template.content),
+                    },
+                    target_count=len(targets),
+                    success_count=sent_count,
+                    failed_count=failed_count,
+                    status="success" if failed_count == 0 else ("partial" if sent_count > 0 else "failed"),
+                    created_by="system",
+                )
+
+                self.db.commit()
+
+            await run_db(_record)
 
             logger.info(f"Schedule #{schedule_id} execution completed: {sent_count} sent, {failed_count} failed")
 
@@ -313,7 +314,7 @@ class TemplateScheduleExecutor:
                 sentry_sdk.capture_exception(e)
             except ImportError:
                 pass
-            self.db.rollback()
+            await run_db(self.db.rollback)
             diag(
                 "schedule.execute.exit",
                 level="critical",
@@ -324,6 +325,50 @@ class TemplateScheduleExecutor:
             )
             return {"success": False, "error": str(e)}
 
+    def _load_schedule(self, schedule_id: int) -> Optional[TemplateSchedule]:
+        """활성 스케줄 + 템플릿 로드 (execute_schedule 의 run_db 구간)."""
+        schedule = self.db.query(TemplateSchedule).filter(
+            TemplateSchedule.id == schedule_id,
+            TemplateSchedule.is_active == True
+        ).first()
+        if schedule is not None:
+            schedule.template  # 루프에서 lazy load 되지 않도록 미리 로드
+        return schedule
+
+    def _mark_run(self, schedule: TemplateSchedule) -> None:
+        """발송 없이 끝난 실행도 last_run_at 기록."""
+        schedule.last_run_at = datetime.now(timezone.utc)
+        self.db.commit()
+
+    def _room_building_map(self, reservation_ids: List[int], target_date: Optional[str]) -> Dict[int, str]:
+        """reservation_id -> '건물 호실' 표시 문자열 (활동 로그용, target_date 의 RoomAssignment 기준)."""
+        room_building_map: Dict[int, str] = {}
+        if not reservation_ids or not target_date:
+            return room_building_map
+        assignments = self.db.query(RoomAssignment).filter(
+            RoomAssignment.reservation_id.in_(reservation_ids),
+            RoomAssignment.date == target_date,
+        ).all()
+        assign_room_id_map = {ra.reservation_id: ra.room_id for ra in assignments}
+        room_ids = set(assign_room_id_map.values())
+        room_name_map = {}
+        if room_ids:
+            rooms_with_building = self.db.query(Room).filter(Room.id.in_(room_ids)).all()
+            for rm in rooms_with_building:
+                building_name = rm.building.name if rm.building else ""
+                rn = rm.room_number or ""
+                # room_number에 이미 건물명이나 '호'가 포함된 경우 그대로 사용
+                if building_name and building_name in rn:
+                    room_name_map[rm.id] = rn
+                elif building_name:
+                    suffix = rn if rn.endswith("호") else f"{rn}호"
+                    room_name_map[rm.id] = f"{building_name} {suffix}"
+                else:
+                    room_name_map[rm.id] = rn if rn.endswith("호") else f"{rn}호"
+        for res_id, rid in assign_room_id_map.items():
+            room_building_map[res_id] = room_name_map.get(rid, str(rid))
+        return room_building_map
+
     def get_targets(
         self,
         schedule: TemplateSchedule,
@@ -540,6 +585,10 @@ class TemplateScheduleExecutor:
     ) -> List[Reservation]:
         """Event schedule targeting — confirmed_at 기반 필터링.
 
+        모든 조건을 SQL 로 처리 (confirmed_at >= cutoff, 연박 제외, exclude_sent 는
+        NOT EXISTS 안티 조인). 발송 이력이 쌓여도 훅 지연이 reservation_id 집합 크기에
+        비례하지 않도록 ix_res_sms_event_lookup 인덱스로 예약별 seek.
+
         restrict_to_ids: 주어지면 해당 reservation_id 들로만 좁힘 (naver_sync 훅 등에서 사용).
         """
         query = self.db.query(Reservation).filter(
@@ -568,42 +617,30 @@ class TemplateScheduleExecutor:
 
         # 이벤트는 structural filters (건물/배정/객실) 미적용 — 대상이 아직 미배정인 경우가 대부분
 
-        # 4) confirmed_at N시간 이내 — Python datetime 파싱 방식
-        results = query.all()
-
+        # 4) confirmed_at N시간 이내 — 수동 예약 (confirmed_at=NULL) 은 비교에서 자연히 제외
         if schedule.hours_since_booking:
             # confirmed_at 은 TIMESTAMP WITHOUT TIME ZONE (naive) 이므로
             # cutoff 도 naive 로 만들어야 비교 가능. UTC 기준은 유지.
             cutoff = (datetime.now(timezone.utc) - timedelta(hours=schedule.hours_since_booking)).replace(tzinfo=None)
-            filtered = []
-            for res in results:
-                if not res.confirmed_at:
-                    continue  # 수동 예약 (confirmed_at=NULL) 제외
-                if res.confirmed_at >= cutoff:
-                    filtered.append(res)
-            results = filtered
+            query = query.filter(Reservation.confirmed_at >= cutoff)
 
         # 5) 연박 필터 — filters JSON 안의 room assignment 우선 (v2),
         # 없으면 legacy schedule.stay_filter 컬럼 fallback. extract_stay_filter() 가 둘 다 처리.
         from app.services.filters import extract_stay_filter
         if extract_stay_filter(schedule) == 'exclude':
-            results = [r for r in results if not r.is_long_stay]
+            query = query.filter(or_(Reservation.is_long_stay.is_(False), Reservation.is_long_stay.is_(None)))
 
         # 6) exclude_sent — 이벤트 전용 (날짜 무관, sent 또는 failed 모두 제외)
         if exclude_sent and schedule.exclude_sent:
-            already_done_ids = {
-                row.reservation_id for row in
-                self.db.query(ReservationSmsAssignment.reservation_id).filter(
-                    ReservationSmsAssignment.template_key == schedule.template.template_key,
-                    or_(
-                        ReservationSmsAssignment.sent_at.isnot(None),
-                        ReservationSmsAssignment.send_status == 'failed',
-                    ),
-                ).all()
-            }
-            results = [r for r in results if r.id not in already_done_ids]
+            done = ReservationSmsAssignment
+            query = query.filter(~exists().where(
+                done.tenant_id == Reservation.tenant_id,
+                done.template_key == schedule.template.template_key,
+                done.reservation_id == Reservation.id,
+                or_(done.sent_at.isnot(None), done.send_status == 'failed'),
+            ))
 
-        return results
+        return query.all()
 
     def auto_assign_for_schedule(self, schedule: TemplateSchedule) -> int:
         """
@@ -655,9 +692,9 @@ class TemplateScheduleExecutor:
         For reservations with NULL check_out_date (당일 예약, 파티만 이동 케이스):
             check_in_date == target_date 이면 마지막 투숙일로 간주.
         """
-        from datetime import datetime as dt
+        from datetime import date
 
-        target_dt = dt.strptime(target_date, "%Y-%m-%d").date()
+        target_dt = date.fromisoformat(target_date)
         filtered = []
 
         # Batch-query max checkout per group
@@ -685,10 +722,10 @@ class TemplateScheduleExecutor:
                 max_co = group_max_checkout.get(res.stay_group_id)
                 if not max_co:
                     continue
-                last_day = dt.strptime(max_co, "%Y-%m-%d").date() - timedelta(days=1)
+                last_day = date.fromisoformat(max_co) - timedelta(days=1)
             else:
                 # Standalone: use own checkout
-                last_day = dt.strptime(res.check_out_date, "%Y-%m-%d").date() - timedelta(days=1)
+                last_day = date.fromisoformat(res.check_out_date) - timedelta(days=1)
 
             if last_day == target_dt:
                 filtered.append(res)
@@ -0,0 +1,144 @@
+"""
+Tenant fan-out — 스케줄러 잡의 테넌트별 작업을 동시에 실행.
+
+- 동시 실행 상한: settings.SCHEDULER_TENANT_CONCURRENCY (타임아웃된 작업도 실제 종료 전까지 슬롯 점유)
+- 테넌트별 타임아웃: settings.SCHEDULER_TENANT_TIMEOUT_SECONDS (느린 네이버 쿠키 하나가 전체를 막지 않도록)
+- 테넌트마다 독립 Session + ContextVar 스코프 (asyncio Task 단위로 current_tenant_id 설정)
+- 같은 잡의 이전 실행이 아직 그 테넌트를 처리 중이면 건너뜀 (타임아웃된 작업 포함)
+- 실행 결과: 테넌트별 outcome(ok/error/timeout/skipped) + duration_ms 리포트
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.executor import run_db
+from app.db.models import Tenant
+from app.db.tenant_context import bypass_tenant_filter, current_tenant_id
+from app.diag_logger import diag
+
+logger = logging.getLogger(__name__)
+
+TenantWork = Callable[[Session, Tenant], Awaitable[Any]]
+
+# (job_name, tenant_id) — 실행 중(타임아웃 후 정리 중 포함)인 테넌트 작업
+_in_flight: Set[Tuple[str, int]] = set()
+
+
+def active_tenants() -> List[Tenant]:
+    """활성 테넌트 목록 (테넌트 필터 우회)."""
+    token_bypass = bypass_tenant_filter.set(True)
+    try:
+        db = SessionLocal()
+        try:
+            tenants = db.query(Tenant).filter(Tenant.is_active == True).all()
+            db.expunge_all()
+            return tenants
+        finally:
+            db.close()
+    finally:
+        bypass_tenant_filter.reset(token_bypass)
+
+
+async def _run_tenant(tenant: Tenant, work: TenantWork) -> Any:
+    """테넌트 1곳 처리 — 자체 Session/ContextVar, 성공 시 commit, 실패 시 rollback."""
+    token = current_tenant_id.set(tenant.id)
+    db = SessionLocal()
+    try:
+        result = await work(db, tenant)
+        await run_db(db.commit)
+        return result
+    except Exception:
+        await run_db(db.rollback)
+        raise
+    finally:
+        await run_db(db.close)
+        current_tenant_id.reset(token)
+
+
+async def fan_out_tenants(
+    job_name: str,
+    work: TenantWork,
+    tenants: Optional[List[Tenant]] = None,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    work(db, tenant) 를 테넌트별로 동시 실행하고 테넌트별 리포트를 반환.
+
+    Args:
+        job_name: 잡 식별자 (중복 실행 판단 + 로그/diag 용)
+        work: async (db, tenant) -> result. 예외는 해당 테넌트 outcome='error' 로 격리.
+        tenants: 대상 테넌트 (None 이면 활성 테넌트 전체)
+        concurrency / timeout: None 이면 settings 값
+
+    Returns:
+        [{"tenant_id", "tenant_slug", "outcome", "duration_ms", "result" | "error"}] (tenants 순서)
+    """
+    if tenants is None:
+        tenants = await run_db(active_tenants)
+    limit = max(1, concurrency or settings.SCHEDULER_TENANT_CONCURRENCY)
+    timeout = timeout if timeout is not None else settings.SCHEDULER_TENANT_TIMEOUT_SECONDS
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _guarded(tenant: Tenant) -> Dict[str, Any]:
+        key = (job_name, tenant.id)
+        report: Dict[str, Any] = {"tenant_id": tenant.id, "tenant_slug": tenant.slug}
+        await semaphore.acquire()
+        if key in _in_flight:
+            semaphore.release()
+            logger.warning(f"[{tenant.slug}] {job_name}: previous run still in flight, skipped")
+            report.update(outcome="skipped", duration_ms=0)
+            return report
+
+        _in_flight.add(key)
+        started = time.perf_counter()
+        task = asyncio.ensure_future(_run_tenant(tenant, work))
+
+        def _finished(_t: asyncio.Future) -> None:
+            # 슬롯은 태스크가 실제로 끝날 때 반납 — 타임아웃된 테넌트도 DB 구간이 끝날 때까지 상한에 포함
+            _in_flight.discard(key)
+            semaphore.release()
+
+        task.add_done_callback(_finished)
+        done, _ = await asyncio.wait({task}, timeout=timeout or None)
+        report["duration_ms"] = int((time.perf_counter() - started) * 1000)
+
+        if not done:
+            # 취소는 진행 중인 DB 구간이 끝난 뒤 반영 — 그때까지 _in_flight / 세마포어 슬롯 유지
+            task.cancel()
+            logger.error(f"[{tenant.slug}] {job_name}: timed out after {timeout}s")
+            report["outcome"] = "timeout"
+        elif task.exception() is not None:
+            e = task.exception()
+            logger.error(f"[{tenant.slug}] {job_name} error: {e}")
+            try:
+                import sentry_sdk
+                sentry_sdk.set_tag("tenant_slug", tenant.slug)
+                sentry_sdk.capture_exception(e)
+            except ImportError:
+                pass
+            report.update(outcome="error", error=str(e)[:200])
+        else:
+            report.update(outcome="ok", result=task.result())
+        return report
+
+    reports = list(await asyncio.gather(*(_guarded(t) for t in tenants)))
+
+    counts: Dict[str, int] = {}
+    for r in reports:
+        counts[r["outcome"]] = counts.get(r["outcome"], 0) + 1
+    diag(
+        "job.tenant_fanout",
+        level="critical" if counts.get("error") or counts.get("timeout") else "verbose",
+        job=job_name,
+        tenants=len(reports),
+        concurrency=limit,
+        **counts,
+        durations={r["tenant_slug"]: r["duration_ms"] for r in reports},
+    )
+    return reports
@@ -9,26 +9,33 @@
 
 핵심 로직:
   1. get_schedule_dates(schedule, reservation) → 칩이 필요한 날짜 목록
-  2. _reservation_matches_schedule(db, schedule, reservation, date) → 그 날 필터 통과?
+  2. match_schedule_batch(db, schedule, pairs) → (예약, 날짜) 쌍 중 필터 통과 집합
+     (compile_filter_predicate — 필요한 행만 미리 로드해 Python 에서 평가)
   3. _sync_chips(expected, existing) → diff: 없는 칩 생성, 불필요 칩 삭제
 
 칩 보호: assigned_by='manual'/'excluded' 또는 sent_at 있으면 삭제 안 됨.
 """
 import logging
 from datetime import timedelta
-from typing import List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.db.models import (
     Reservation,
+    ReservationDailyInfo,
     ReservationSmsAssignment,
     ReservationStatus,
+    RoomAssignment,
     TemplateSchedule,
 )
 from app.config import today_kst, today_kst_date
 from app.diag_logger import diag
-from app.services.filters import apply_structural_filters, extract_stay_filter
+from app.services.filters import (
+    apply_structural_filters,
+    compile_filter_predicate,
+    extract_stay_filter,
+)
 from app.services.schedule_utils import get_schedule_dates, resolve_target_date
 
 logger = logging.getLogger(__name__)
@@ -36,6 +43,9 @@ logger = logging.getLogger(__name__)
 # Chip protection rules (unified)
 _PROTECTED_ASSIGNED_BY = {'manual', 'excluded'}
 
+# match_schedule_batch: IN 절 크기 상한 (SQLite 변수 한도 대비)
+_MATCH_ID_CHUNK = 500
+
 
 def reconcile_chips_for_reservation(
     db: Session,
@@ -49,39 +59,72 @@ def reconcile_chips_for_reservation(
 
     Does NOT commit — caller owns the transaction.
     """
-    reservation = db.query(Reservation).filter(
-        Reservation.id == reservation_id
-    ).first()
-    if not reservation:
+    reconcile_chips_for_reservations(db, [reservation_id], schedules)
+
+
+def reconcile_chips_for_reservations(
+    db: Session,
+    reservation_ids: Iterable[int],
+    schedules: Optional[list] = None,
+) -> None:
+    """Batched reconcile_chips_for_reservation — N 예약 × 모든 활성 스케줄.
+
+    예약/기존 칩은 한 번에 로드하고, 필터 매칭은 match_schedule_batch 로
+    스케줄당 1회만 평가한다. 결과(생성/삭제 칩)는 예약별 개별 호출과 동일.
+
+    Does NOT commit — caller owns the transaction.
+    """
+    ids = list(dict.fromkeys(reservation_ids))
+    if not ids:
         return
 
-    diag("reconcile_chips_for_reservation.enter", level="verbose", res_id=reservation_id)
+    by_id: Dict[int, Reservation] = {}
+    for i in range(0, len(ids), _MATCH_ID_CHUNK):
+        chunk = ids[i:i + _MATCH_ID_CHUNK]
+        for r in db.query(Reservation).filter(Reservation.id.in_(chunk)).all():
+            by_id[r.id] = r
+    ordered = [by_id[rid] for rid in ids if rid in by_id]
+    if not ordered:
+        return
 
-    # 취소된 예약: 기존 미발송 칩만 정리하고 리턴 (새 칩 생성 안 함)
-    if reservation.status == ReservationStatus.CANCELLED:
-        existing = db.query(ReservationSmsAssignment).filter(
-            ReservationSmsAssignment.reservation_id == reservation_id,
-            ReservationSmsAssignment.sent_at.is_(None),
-            ~ReservationSmsAssignment.assigned_by.in_(_PROTECTED_ASSIGNED_BY),
-        ).all()
-        for a in existing:
-            db.delete(a)
-        diag(
-            "reconcile_chips_for_reservation.exit",
-            level="verbose",
-            res_id=reservation_id,
-            cancelled_cleanup=len(existing),
-        )
+    for reservation in ordered:
+        diag("reconcile_chips_for_reservation.enter", level="verbose", res_id=reservation.id)
+
+    # 취소된 예약: 기존 미발송 칩만 정리 (새 칩 생성 안 함)
+    cancelled = [r for r in ordered if r.status == ReservationStatus.CANCELLED]
+    active = [r for r in ordered if r.status != ReservationStatus.CANCELLED]
+
+    if cancelled:
+        cancelled_ids = [r.id for r in cancelled]
+        stale_by_res: Dict[int, list] = {rid: [] for rid in cancelled_ids}
+        for i in range(0, len(cancelled_ids), _MATCH_ID_CHUNK):
+            chunk = cancelled_ids[i:i + _MATCH_ID_CHUNK]
+            for a in db.query(ReservationSmsAssignment).filter(
+                ReservationSmsAssignment.reservation_id.in_(chunk),
+                ReservationSmsAssignment.sent_at.is_(None),
+                ~ReservationSmsAssignment.assigned_by.in_(_PROTECTED_ASSIGNED_BY),
+            ).all():
+                stale_by_res[a.reservation_id].append(a)
+        for rid in cancelled_ids:
+            for a in stale_by_res[rid]:
+                db.delete(a)
+            diag(
+                "reconcile_chips_for_reservation.exit",
+                level="verbose",
+                res_id=rid,
+                cancelled_cleanup=len(stale_by_res[rid]),
+            )
+
+    if not active:
         return
 
     if schedules is None:
-        schedules = db.query(TemplateSchedule).filter(
-            TemplateSchedule.is_active == True
-        ).all()
+        from app.services.reference_cache import get_active_schedules
+        schedules = get_active_schedules(db)
 
     # Compute expected (template_key, date) pairs with schedule_id tracking
-    expected_pairs: Set[Tuple[str, str]] = set()
-    expected_schedule_map: dict = {}  # (template_key, date) -> schedule_id
+    expected_pairs: Dict[int, Set[Tuple[str, str]]] = {r.id: set() for r in active}
+    expected_schedule_map: Dict[int, dict] = {r.id: {} for r in active}  # (template_key, date) -> schedule_id
     for schedule in schedules:
         if not schedule.template or not schedule.template.is_active:
             continue
@@ -90,30 +133,42 @@ def reconcile_chips_for_reservation(
             continue
 
         template_key = schedule.template.template_key
-        dates = get_schedule_dates(schedule, reservation)
-        for d in dates:
-            if _reservation_matches_schedule(db, schedule, reservation, d):
-                expected_pairs.add((template_key, d))
-                if (template_key, d) not in expected_schedule_map:
-                    expected_schedule_map[(template_key, d)] = schedule.id
-
-    # Get current chips for this reservation (custom_schedule 소속 칩 제외)
+        candidate_pairs = [
+            (reservation.id, d)
+            for reservation in active
+            for d in get_schedule_dates(schedule, reservation)
+        ]
+        matched = match_schedule_batch(db, schedule, candidate_pairs)
+        for (res_id, d) in candidate_pairs:
+            if (res_id, d) in matched:
+                expected_pairs[res_id].add((template_key, d))
+                expected_schedule_map[res_id].setdefault((template_key, d), schedule.id)
+
+    # Get current chips for these reservations (custom_schedule 소속 칩 제외)
     custom_schedule_ids = {s.id for s in schedules if (s.schedule_category or 'standard') == 'custom_schedule'}
-    all_existing = db.query(ReservationSmsAssignment).filter(
-        ReservationSmsAssignment.reservation_id == reservation_id,
-    ).all()
-    existing = [a for a in all_existing if a.schedule_id not in custom_schedule_ids]
-
-    created = _sync_chips(db, expected_pairs, existing, reservation_id=reservation_id, schedule_map=expected_schedule_map)
-
-    diag(
-        "reconcile_chips_for_reservation.exit",
-        level="verbose",
-        res_id=reservation_id,
-        expected=len(expected_pairs),
-        existing=len(existing),
-        created=created,
-    )
+    active_ids = [r.id for r in active]
+    existing_by_res: Dict[int, list] = {rid: [] for rid in active_ids}
+    for i in range(0, len(active_ids), _MATCH_ID_CHUNK):
+        chunk = active_ids[i:i + _MATCH_ID_CHUNK]
+        for a in db.query(ReservationSmsAssignment).filter(
+            ReservationSmsAssignment.reservation_id.in_(chunk),
+        ).all():
+            if a.schedule_id not in custom_schedule_ids:
+                existing_by_res[a.reservation_id].append(a)
+
+    for rid in active_ids:
+        created = _sync_chips(
+            db, expected_pairs[rid], existing_by_res[rid],
+            reservation_id=rid, schedule_map=expected_schedule_map[rid],
+        )
+        diag(
+            "reconcile_chips_for_reservation.exit",
+            level="verbose",
+            res_id=rid,
+            expected=len(expected_pairs[rid]),
+            existing=len(existing_by_res[rid]),
+            created=created,
+        )
 
 
 def reconcile_chips_for_schedule(
@@ -167,14 +222,14 @@ def reconcile_chips_for_schedule(
     # scope_dates: 후보 예약의 전체 스케줄 날짜 범위 (필터링 전)
     # → stale 칩 삭제 누락 방지
     scope_dates: set = {target_date}
-    expected_pairs: Set[Tuple[int, str]] = set()
+    candidate_pairs: List[Tuple[int, str]] = []
 
     for reservation in candidates:
         dates = get_schedule_dates(schedule, reservation)
         scope_dates.update(dates)  # 필터링 전에 scope에 추가
-        for d in dates:
-            if _reservation_matches_schedule(db, schedule, reservation, d):
-                expected_pairs.add((reservation.id, d))
+        candidate_pairs.extend((reservation.id, d) for d in dates)
+
+    expected_pairs: Set[Tuple[int, str]] = match_schedule_batch(db, schedule, candidate_pairs)
 
     # scope_dates 범위 내 + candidate 범위 내 자기 칩만 diff 대상
     # ★ reservation_id 필터가 없으면, scope_dates 에 우연히 포함된
@@ -214,6 +269,66 @@ def _reservation_matches_schedule(
     return query.first() is not None
 
 
+def match_schedule_batch(
+    db: Session,
+    schedule: TemplateSchedule,
+    pairs: Iterable[Tuple[int, str]],
+) -> Set[Tuple[int, str]]:
+    """Set-based _reservation_matches_schedule over many (reservation_id, date) pairs.
+
+    스케줄 필터를 compile_filter_predicate 로 한 번 컴파일하고, 예약과 (필터가 필요로 할 때만)
+    해당 날짜들의 RoomAssignment(+room) / ReservationDailyInfo 를 예약 id 500개 단위로
+    미리 로드해 Python 에서 평가한다. 날짜 수와 무관하게 chunk 당 SELECT 최대 3회.
+
+    Returns:
+        pairs 중 필터를 통과한 (reservation_id, date) 집합.
+    """
+    wanted = set(pairs)
+    if not wanted:
+        return set()
+
+    predicate = compile_filter_predicate(schedule)
+    all_dates = sorted({d for _, d in wanted})
+    all_ids = sorted({rid for rid, _ in wanted})
+    dates_by_id: Dict[int, List[str]] = {}
+    for rid, d in wanted:
+        dates_by_id.setdefault(rid, []).append(d)
+    matched: Set[Tuple[int, str]] = set()
+
+    for ii in range(0, len(all_ids), _MATCH_ID_CHUNK):
+        chunk = all_ids[ii:ii + _MATCH_ID_CHUNK]
+        reservations = db.query(Reservation).filter(Reservation.id.in_(chunk)).all()
+        assignments: Dict[Tuple[int, str], RoomAssignment] = {}
+        if predicate.needs_assignment:
+            for a in db.query(RoomAssignment).options(joinedload(RoomAssignment.room)).filter(
+                RoomAssignment.reservation_id.in_(chunk),
+                RoomAssignment.date.in_(all_dates),
+            ):
+                assignments[(a.reservation_id, a.date)] = a
+        daily: Dict[Tuple[int, str], ReservationDailyInfo] = {}
+        if predicate.needs_daily_info:
+            for info in db.query(ReservationDailyInfo).filter(
+                ReservationDailyInfo.reservation_id.in_(chunk),
+                ReservationDailyInfo.date.in_(all_dates),
+            ):
+                daily[(info.reservation_id, info.date)] = info
+
+        for res in reservations:
+            for d in dates_by_id[res.id]:
+                if predicate(res, assignments.get((res.id, d)), daily.get((res.id, d))):
+                    matched.add((res.id, d))
+
+    diag(
+        "chip_reconciler.match_batch",
+        level="verbose",
+        schedule_id=schedule.id,
+        pairs=len(wanted),
+        dates=len(all_dates),
+        matched=len(matched),
+    )
+    return matched
+
+
 def _get_candidate_reservations(
     db: Session,
     schedule: TemplateSchedule,
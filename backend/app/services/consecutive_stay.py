@@ -14,8 +14,9 @@ Idempotent: safe to run multiple times. Auto-unlinks stale groups.
 import logging
 import uuid
 from collections import defaultdict
-from typing import List
+from typing import Dict, Iterable, List, Set
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.db.models import Reservation, ReservationStatus
@@ -31,10 +32,8 @@ def compute_is_long_stay(res) -> bool:
         return True
     if res.check_out_date and res.check_in_date:
         try:
-            from datetime import datetime as _dt
-            d1 = _dt.strptime(str(res.check_in_date), "%Y-%m-%d")
-            d2 = _dt.strptime(str(res.check_out_date), "%Y-%m-%d")
-            return (d2 - d1).days > 1
+            from datetime import date as _date
+            return (_date.fromisoformat(str(res.check_out_date)) - _date.fromisoformat(str(res.check_in_date))).days > 1
         except (ValueError, TypeError):
             pass
     return False
@@ -61,6 +60,71 @@ def detect_and_link_consecutive_stays(db: Session, tenant_id: int = None) -> dic
     if tid is None:
         raise RuntimeError("detect_and_link_consecutive_stays requires tenant context")
 
+    reservations = (
+        _window_query(db, tid)
+        .order_by(Reservation.check_in_date)
+        .all()
+    )
+    return _link_chains(db, reservations)
+
+
+def detect_and_link_for_reservations(db: Session, reservation_ids: Iterable[int], tenant_id: int = None) -> dict:
+    """
+    증분 연박 감지 — sync 가 건드린 예약의 identity(이름|전화) 만 다시 묶는다.
+
+    전체 스캔(detect_and_link_consecutive_stays)과 같은 윈도우/규칙을 쓰되, 대상은
+    건드린 예약에서 출발해 identity 키와 기존 stay_group_id 로 닿는 예약 전체(연결 요소)로 한정.
+    연결 요소 단위로는 전체 스캔과 link/unlink 결과가 같다. identity 후보 조회는
+    phone / visitor_phone 인덱스 seek (윈도우 전체 스캔 없음).
+
+    Returns: {"linked", "unlinked", "groups"} — groups 는 대상 연결 요소 안의 chain 수
+    """
+    tid = tenant_id or current_tenant_id.get()
+    if tid is None:
+        raise RuntimeError("detect_and_link_for_reservations requires tenant context")
+    reservation_ids = set(reservation_ids)
+    diag("stay_group.detect_incremental.enter", level="verbose", seeds=len(reservation_ids))
+    if not reservation_ids:
+        return {"linked": 0, "unlinked": 0, "groups": 0}
+
+    # 시드는 윈도우/상태와 무관하게 읽는다 — 취소·날짜 이동된 예약의 옛 그룹/identity 도 다시 봐야 함
+    frontier = (
+        db.query(Reservation)
+        .filter(Reservation.tenant_id == tid, Reservation.id.in_(reservation_ids))
+        .all()
+    )
+    members: Dict[int, Reservation] = {}
+    seen_keys: Set[str] = set()
+    seen_groups: Set[str] = set()
+    while frontier:
+        keys = {key for res in frontier for key in _identity_keys(res)} - seen_keys
+        group_ids = {res.stay_group_id for res in frontier if res.stay_group_id} - seen_groups
+        seen_keys |= keys
+        seen_groups |= group_ids
+        if not keys and not group_ids:
+            break
+        phones = {key.rsplit("|", 1)[1] for key in keys}
+        conditions = []
+        if phones:
+            conditions += [Reservation.phone.in_(phones), Reservation.visitor_phone.in_(phones)]
+        if group_ids:
+            conditions.append(Reservation.stay_group_id.in_(group_ids))
+        candidates = _window_query(db, tid).filter(or_(*conditions)).all()
+        frontier = []
+        for res in candidates:
+            if res.id in members:
+                continue
+            if (res.stay_group_id and res.stay_group_id in seen_groups) or \
+                    (res.booking_source != "naver_split" and set(_identity_keys(res)) & seen_keys):
+                members[res.id] = res
+                frontier.append(res)
+
+    reservations = sorted(members.values(), key=lambda r: r.check_in_date)
+    return _link_chains(db, reservations)
+
+
+def _window_query(db: Session, tid: int):
+    """연박 감지 대상 — CONFIRMED, 체크아웃이 오늘 이후이고 체크인이 5일 이내."""
     # 임박한 예약만 스캔 — 체크아웃이 오늘 이후이고 체크인이 5일 이내.
     # — 과거 예약은 감지해도 배정/SMS 에 반영될 일 없음 (이미 이벤트 끝남).
     # — 먼 미래 예약은 입실일 가까워지면 다음 주기 감지에서 자동 커버됨 (5분 + 피크 10분).
@@ -69,21 +133,36 @@ def detect_and_link_consecutive_stays(db: Session, tenant_id: int = None) -> dic
     from app.config import today_kst, today_kst_date
     today_str = today_kst()
     max_checkin = (today_kst_date() + timedelta(days=5)).strftime("%Y-%m-%d")
-    reservations = (
-        db.query(Reservation)
-        .filter(
-            Reservation.tenant_id == tid,
-            Reservation.status == ReservationStatus.CONFIRMED,
-            Reservation.check_out_date.isnot(None),
-            Reservation.check_out_date >= today_str,
-            Reservation.check_in_date <= max_checkin,
-            Reservation.phone.isnot(None),
-            Reservation.phone != "",
-        )
-        .order_by(Reservation.check_in_date)
-        .all()
+    return db.query(Reservation).filter(
+        Reservation.tenant_id == tid,
+        Reservation.status == ReservationStatus.CONFIRMED,
+        Reservation.check_out_date.isnot(None),
+        Reservation.check_out_date >= today_str,
+        Reservation.check_in_date <= max_checkin,
+        Reservation.phone.isnot(None),
+        Reservation.phone != "",
     )
 
+
+def _identity_keys(res: Reservation) -> List[str]:
+    """예약의 identity 키 — (이름|전화), (방문자명|전화), (이름|방문자 전화)."""
+    keys = []
+    name = (res.customer_name or "").strip()
+    phone = (res.phone or "").strip()
+    if name and phone:
+        keys.append(f"{name}|{phone}")
+    # Also match visitor_name/visitor_phone combinations
+    vname = (res.visitor_name or "").strip()
+    vphone = (res.visitor_phone or "").strip()
+    if vname and phone and vname != name:
+        keys.append(f"{vname}|{phone}")
+    if name and vphone and vphone != phone:
+        keys.append(f"{name}|{vphone}")
+    return keys
+
+
+def _link_chains(db: Session, reservations: List[Reservation]) -> dict:
+    """check_in_date 순으로 정렬된 reservations 안에서 identity 그룹별 연속 chain 을 묶고, 나머지는 해제."""
     # Build identity groups: multiple keys per reservation for fuzzy matching
     identity_map: dict[str, list[Reservation]] = defaultdict(list)
     siblings_skipped = 0
@@ -94,17 +173,8 @@ def detect_and_link_consecutive_stays(db: Session, tenant_id: int = None) -> dic
         if res.booking_source == "naver_split":
             siblings_skipped += 1
             continue
-        name = (res.customer_name or "").strip()
-        phone = (res.phone or "").strip()
-        if name and phone:
-            identity_map[f"{name}|{phone}"].append(res)
-        # Also match visitor_name/visitor_phone combinations
-        vname = (res.visitor_name or "").strip()
-        vphone = (res.visitor_phone or "").strip()
-        if vname and phone and vname != name:
-            identity_map[f"{vname}|{phone}"].append(res)
-        if name and vphone and vphone != phone:
-            identity_map[f"{name}|{vphone}"].append(res)
+        for key in _identity_keys(res):
+            identity_map[key].append(res)
 
     # Deduplicate: merge groups that share reservations
     res_to_group: dict[int, set[int]] = {}
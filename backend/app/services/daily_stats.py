@@ -0,0 +1,463 @@
+"""
+Daily stats — 테넌트 × 날짜 집계 테이블(daily_stats) 유지 / 조회 / 재구축 / 정합성 검사.
+
+참여자 스냅샷(get_or_create_snapshot / refresh_snapshot), 대시보드 7일 성별 통계,
+매출 리포트 날짜별 파티 인원이 날짜마다 stay_coverage_filter 로 예약을 다시 합산하던 것을
+날짜당 1행 조회로 바꾼다.
+
+집계 규칙 (기존 조회와 동일):
+- male_count / female_count: 그 날 투숙/방문 중(stay_coverage_filter)인 confirmed + completed 예약 합계
+- party_*_count: confirmed 예약 중 스테이블 파티 참여 인원(male + female) — party_type 은 daily info 우선
+  ('1' / '2' / '2차만'). section='unstable' 또는 그 날 unstable_party 면 party_unstable_count 로
+- party_sales_count: 매출 리포트의 파티 인원 (기존 리포트 기준 그대로) — party_* 와 달리
+  체크아웃 = 체크인(당일) 예약은 제외하고, unstable 은 section 으로만 판정 (그 날 unstable_party 여도 포함)
+- rooms_occupied: 그 날 배정이 있는 객실 수, beds_used: 도미토리 점유 인원
+  (occupancy_grid 와 같은 party_size → booking_count → 1)
+
+유지: Reservation / ReservationDailyInfo / RoomAssignment 가 flush 되거나 bulk insert·update·delete
+되면 영향 날짜(예약은 변경 전·후 체류 구간)를 세션에 모아 두고, 최상위 commit 직전에 그 날짜만
+재계산해 upsert 한다 (SAVEPOINT 안에서 — 실패해도 원래 commit 은 진행, 정합성 검사가 복구).
+동시 커밋: 재계산 전에 (tenant, date) advisory lock (PostgreSQL, 트랜잭션 끝까지 유지) → 같은 날짜를
+건드린 트랜잭션들은 차례로 재계산하고, 뒤에 잠금을 잡은 쪽이 앞 커밋을 본 뒤 (READ COMMITTED) 저장한다.
+SQLite 는 쓰기 트랜잭션이 DB 잠금을 쥐고 있어 재계산이 겹치지 않는다.
+Room.is_dormitory 변경처럼 추적 대상 밖의 변경은 check_daily_stats_job 이 매일 바로잡는다.
+
+행이 없는 날짜는 get_daily_stats 가 즉시 계산해 돌려준다 (저장 안 함) → 배포 직후
+rebuild 전에도 값은 정확하고, rebuild 후엔 날짜당 1행 조회.
+"""
+import logging
+from datetime import date, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, inspect, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    DailyStat, Reservation, ReservationDailyInfo, ReservationStatus, Room, RoomAssignment, utc_now,
+)
+from app.db.tenant_context import current_tenant_id
+from app.diag_logger import diag
+from app.services.filters import stay_overlap_filter
+from app.services.occupancy_grid import _occupant_count
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = (
+    "male_count", "female_count", "party_1_count", "party_2_count", "party_2only_count",
+    "party_unstable_count", "party_sales_count", "rooms_occupied", "beds_used",
+)
+PARTY_TYPE_COUNTERS = {"1": "party_1_count", "2": "party_2_count", "2차만": "party_2only_count"}
+
+_ACTIVE = (ReservationStatus.CONFIRMED, ReservationStatus.COMPLETED)
+_RUN_GAP_DAYS = 31  # 이보다 멀리 떨어진 날짜는 별도 구간으로 조회
+_PENDING_KEY = "_daily_stats_dates"  # {tenant_id: {date}}
+_RECHECK_KEY = "_daily_stats_reservations"  # {tenant_id: {reservation_id}} — bulk UPDATE 후 새 구간 재조회
+
+# 이 속성이 바뀔 때만 재계산 (updated_at 등 무관한 변경 무시)
+_WATCHED_ATTRS = {
+    Reservation: (
+        "status", "check_in_date", "check_out_date", "male_count", "female_count",
+        "section", "party_type", "party_size", "booking_count",
+    ),
+    ReservationDailyInfo: ("date", "party_type", "unstable_party", "reservation_id"),
+    RoomAssignment: ("date", "room_id", "reservation_id"),
+}
+
+
+def stay_dates(check_in: Optional[str], check_out: Optional[str]) -> List[str]:
+    """stay_coverage_filter 가 잡는 날짜 목록 — [check_in, check_out), NULL·당일이면 check_in 하루."""
+    if not check_in:
+        return []
+    if not check_out or check_out <= check_in:
+        return [check_in]
+    first = date.fromisoformat(check_in)
+    return [(first + timedelta(days=n)).isoformat() for n in range((date.fromisoformat(check_out) - first).days)]
+
+
+def date_range(date_from: str, date_to: str) -> List[str]:
+    """date_from ~ date_to (양 끝 포함) 날짜 목록."""
+    return stay_dates(date_from, (date.fromisoformat(date_to) + timedelta(days=1)).isoformat())
+
+
+def _runs(dates: List[str]) -> List[Tuple[str, str]]:
+    """정렬된 날짜 → 가까운 날짜끼리 묶은 (lo, hi) 구간."""
+    runs: List[Tuple[str, str]] = []
+    for d in dates:
+        if runs:
+            lo, hi = runs[-1]
+            gap = (date.fromisoformat(d) - date.fromisoformat(hi)).days
+            if gap <= _RUN_GAP_DAYS:
+                runs[-1] = (lo, d)
+                continue
+        runs.append((d, d))
+    return runs
+
+
+# ---------------------------------------------------------------------------
+# Compute / store
+# ---------------------------------------------------------------------------
+
+def compute_daily_stats(db: Session, tenant_id: int, dates: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """원본(예약 / daily info / 배정)에서 날짜별 집계 계산. 구간당 쿼리 3번 (Core select, tenant 명시)."""
+    wanted = sorted(set(d for d in dates if d))
+    result = {d: dict.fromkeys(COUNTERS, 0) for d in wanted}
+    for lo, hi in _runs(wanted):
+        _accumulate(db, tenant_id, lo, hi, result)
+    return result
+
+
+def _accumulate(db: Session, tenant_id: int, lo: str, hi: str, result: Dict[str, Dict[str, int]]) -> None:
+    reservations = db.execute(
+        select(
+            Reservation.id, Reservation.check_in_date, Reservation.check_out_date, Reservation.status,
+            Reservation.section, Reservation.party_type, Reservation.male_count, Reservation.female_count,
+        ).where(
+            Reservation.tenant_id == tenant_id,
+            Reservation.status.in_(_ACTIVE),
+            stay_overlap_filter(lo, hi),
+        )
+    ).all()
+    daily = {
+        (res_id, d): (party_type, unstable)
+        for res_id, d, party_type, unstable in db.execute(
+            select(
+                ReservationDailyInfo.reservation_id, ReservationDailyInfo.date,
+                ReservationDailyInfo.party_type, ReservationDailyInfo.unstable_party,
+            ).where(
+                ReservationDailyInfo.tenant_id == tenant_id,
+                ReservationDailyInfo.date >= lo,
+                ReservationDailyInfo.date <= hi,
+            )
+        )
+    }
+
+    for res_id, check_in, check_out, status, section, party_type, male, female in reservations:
+        people = (male or 0) + (female or 0)
+        same_day = bool(check_out) and check_out <= check_in
+        for d in stay_dates(check_in, check_out):
+            if d < lo or d > hi or d not in result:
+                continue
+            row = result[d]
+            row["male_count"] += male or 0
+            row["female_count"] += female or 0
+            if status != ReservationStatus.CONFIRMED:
+                continue
+            day_party_type, day_unstable = daily.get((res_id, d), (None, False))
+            counter = PARTY_TYPE_COUNTERS.get(day_party_type or party_type)
+            if counter and section != "unstable" and not same_day:
+                row["party_sales_count"] += people
+            if section == "unstable" or day_unstable:
+                row["party_unstable_count"] += people
+                continue
+            if counter:
+                row[counter] += people
+
+    rooms: Dict[str, Set[int]] = {}
+    for d, room_id, is_dormitory, party_size, booking_count in db.execute(
+        select(
+            RoomAssignment.date, RoomAssignment.room_id, Room.is_dormitory,
+            Reservation.party_size, Reservation.booking_count,
+        )
+        .join(Room, Room.id == RoomAssignment.room_id)
+        .join(Reservation, Reservation.id == RoomAssignment.reservation_id)
+        .where(
+            RoomAssignment.tenant_id == tenant_id,
+            RoomAssignment.date >= lo,
+            RoomAssignment.date <= hi,
+        )
+    ):
+        if d not in result:
+            continue
+        rooms.setdefault(d, set()).add(room_id)
+        if is_dormitory:
+            result[d]["beds_used"] += _occupant_count(party_size, booking_count)
+    for d, room_ids in rooms.items():
+        result[d]["rooms_occupied"] = len(room_ids)
+
+
+def _store(db: Session, tenant_id: int, computed: Dict[str, Dict[str, int]]) -> None:
+    """(tenant_id, date) upsert — 동시 트랜잭션이 같은 날짜를 넣어도 unique 충돌 없음."""
+    if not computed:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    now = utc_now()
+    stmt = dialect_insert(DailyStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "date"],
+        set_={key: stmt.excluded[key] for key in COUNTERS + ("updated_at",)},
+    )
+    db.execute(stmt, [
+        {"tenant_id": tenant_id, "date": d, "updated_at": now, **counters}
+        for d, counters in computed.items()
+    ])
+
+
+def _lock_dates(db: Session, tenant_id: int, dates: Iterable[str]) -> None:
+    """(tenant, date) 트랜잭션 advisory lock — 날짜 오름차순 1문장 (교착 방지). PostgreSQL 전용."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    days = sorted({date.fromisoformat(d).toordinal() for d in dates if d})
+    if days:
+        db.execute(
+            text(
+                "SELECT pg_advisory_xact_lock(:tid, d) "
+                "FROM (SELECT unnest(CAST(:days AS integer[])) AS d ORDER BY d) AS days"
+            ),
+            {"tid": tenant_id, "days": days},
+        )
+
+
+def recompute_daily_stats(db: Session, tenant_id: int, dates: Iterable[str]) -> int:
+    """지정 날짜 재계산 + 저장. 커밋은 호출자. Returns: 갱신한 날짜 수.
+
+    (tenant, date) 잠금을 먼저 잡는다 — 같은 날짜를 재계산하는 다른 트랜잭션은 이 커밋 뒤에 읽는다.
+    """
+    dates = list(dates)
+    _lock_dates(db, tenant_id, dates)
+    computed = compute_daily_stats(db, tenant_id, dates)
+    _store(db, tenant_id, computed)
+    diag("daily_stats.recompute", level="verbose", tid=tenant_id, dates=len(computed))
+    return len(computed)
+
+
+# ---------------------------------------------------------------------------
+# Read
+# ---------------------------------------------------------------------------
+
+def get_daily_stats(db: Session, dates: Iterable[str]) -> Dict[str, DailyStat]:
+    """현재 테넌트의 날짜별 집계. 행이 없는 날짜는 즉시 계산한 (저장하지 않은) DailyStat."""
+    wanted = sorted(set(d for d in dates if d))
+    if not wanted:
+        return {}
+    tenant_id = current_tenant_id.get()
+    stats = {
+        row.date: row
+        for row in db.query(DailyStat).filter(DailyStat.date >= wanted[0], DailyStat.date <= wanted[-1]).all()
+        if row.date in wanted
+    }
+    missing = [d for d in wanted if d not in stats]
+    if missing and tenant_id is not None:
+        for d, counters in compute_daily_stats(db, tenant_id, missing).items():
+            stats[d] = DailyStat(tenant_id=tenant_id, date=d, **counters)
+    diag("daily_stats.read", level="verbose", tid=tenant_id, dates=len(wanted), computed=len(missing))
+    return stats
+
+
+def get_daily_stat(db: Session, date: str) -> DailyStat:
+    return get_daily_stats(db, [date])[date]
+
+
+# ---------------------------------------------------------------------------
+# Rebuild / consistency check
+# ---------------------------------------------------------------------------
+
+def _tenant_span(db: Session, tenant_id: int) -> Optional[Tuple[str, str]]:
+    lo, hi_in, hi_out = db.execute(
+        select(
+            func.min(Reservation.check_in_date), func.max(Reservation.check_in_date),
+            func.max(Reservation.check_out_date),
+        ).where(Reservation.tenant_id == tenant_id)
+    ).one()
+    if lo is None:
+        return None
+    return lo, max(hi_in, hi_out or hi_in)
+
+
+def rebuild_daily_stats(
+    db: Session, tenant_id: int, date_from: Optional[str] = None, date_to: Optional[str] = None,
+) -> int:
+    """기간 전체 재계산 (기본: 테넌트 예약의 최초 체크인 ~ 최종 체크아웃). 기간 밖의 기존 행은 삭제.
+
+    31일 단위로 계산·저장. 커밋은 호출자. Returns: 저장한 날짜 수.
+    """
+    span = _tenant_span(db, tenant_id)
+    if date_from is None or date_to is None:
+        if span is None:
+            return 0
+        date_from, date_to = date_from or span[0], date_to or span[1]
+        db.query(DailyStat).filter(
+            DailyStat.tenant_id == tenant_id,
+            or_(DailyStat.date < date_from, DailyStat.date > date_to),
+        ).delete(synchronize_session=False)
+    days = date_range(date_from, date_to)
+    for i in range(0, len(days), _RUN_GAP_DAYS):
+        _store(db, tenant_id, compute_daily_stats(db, tenant_id, days[i:i + _RUN_GAP_DAYS]))
+    logger.info(f"[DailyStats] tenant={tenant_id}: rebuilt {len(days)} days ({date_from} ~ {date_to})")
+    diag("daily_stats.rebuild", level="critical", tid=tenant_id, date_from=date_from, date_to=date_to, days=len(days))
+    return len(days)
+
+
+def check_daily_stats(
+    db: Session, tenant_id: int, date_from: str, date_to: str, repair: bool = False,
+) -> List[Dict]:
+    """저장된 집계와 원본 재계산 비교. 행이 없는 날짜는 0 으로 간주.
+
+    Returns: [{"date", "field", "stored", "actual"}] — repair=True 면 불일치 날짜를 재계산 저장 (커밋은 호출자)
+    """
+    days = date_range(date_from, date_to)
+    actual = compute_daily_stats(db, tenant_id, days)
+    stored = {
+        row.date: row
+        for row in db.execute(
+            select(DailyStat.date, *(getattr(DailyStat, key) for key in COUNTERS)).where(
+                DailyStat.tenant_id == tenant_id, DailyStat.date >= date_from, DailyStat.date <= date_to,
+            )
+        )
+    }
+    mismatches = []
+    for d in days:
+        row = stored.get(d)
+        for key in COUNTERS:
+            have = (getattr(row, key) or 0) if row is not None else 0
+            if have != actual[d][key]:
+                mismatches.append({"date": d, "field": key, "stored": have, "actual": actual[d][key]})
+    if mismatches and repair:
+        # 잠금 후 다시 계산 — 검사 도중 커밋된 변경을 오래된 값으로 덮어쓰지 않도록
+        recompute_daily_stats(db, tenant_id, {m["date"] for m in mismatches})
+    if mismatches:
+        logger.warning(
+            f"[DailyStats] tenant={tenant_id}: {len(mismatches)} mismatches in {date_from} ~ {date_to}"
+            f"{' (repaired)' if repair else ''}"
+        )
+    diag("daily_stats.check", level="verbose", tid=tenant_id, days=len(days), mismatches=len(mismatches), repair=repair)
+    return mismatches
+
+
+# ---------------------------------------------------------------------------
+# Incremental maintenance (session events)
+# ---------------------------------------------------------------------------
+
+def _mark(session: Session, tenant_id: Optional[int], dates: Iterable[str]) -> None:
+    if tenant_id is None:
+        return
+    dates = {d for d in dates if d}
+    if dates:
+        session.info.setdefault(_PENDING_KEY, {}).setdefault(tenant_id, set()).update(dates)
+
+
+def _old_new(state, key: str):
+    new = getattr(state.obj(), key)
+    deleted = state.attrs[key].history.deleted
+    return (deleted[0] if deleted else new), new
+
+
+def _object_dates(state) -> Set[str]:
+    if state.class_ is Reservation:
+        (old_in, new_in), (old_out, new_out) = _old_new(state, "check_in_date"), _old_new(state, "check_out_date")
+        return set(stay_dates(old_in, old_out)) | set(stay_dates(new_in, new_out))
+    return set(_old_new(state, "date"))
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+def _load_deleted(session, flush_context, instances):
+    """삭제될 객체의 날짜 속성을 flush 전에 적재 (after_flush 에서 만료된 속성을 다시 읽으면 행이 없음)."""
+    for obj in session.deleted:
+        if type(obj) in _WATCHED_ATTRS:
+            state = inspect(obj)
+            for key in ("check_in_date", "check_out_date") if state.class_ is Reservation else ("date",):
+                getattr(obj, key)
+
+
+def _after_flush(session, flush_context):
+    dirty = session.dirty
+    for obj in chain(session.new, dirty, session.deleted):
+        attrs = _WATCHED_ATTRS.get(type(obj))
+        if attrs is None:
+            continue
+        state = inspect(obj)
+        if obj in dirty and not any(state.attrs[key].history.has_changes() for key in attrs):
+            continue
+        _mark(session, obj.tenant_id, _object_dates(state))
+
+
+def _on_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    model = mapper.class_ if mapper is not None else None
+    if model not in _WATCHED_ATTRS:
+        return
+    session = orm_execute_state.session
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else ([params] if params else [])
+
+    if orm_execute_state.is_insert:
+        for row in rows:
+            dates = (
+                stay_dates(row.get("check_in_date"), row.get("check_out_date"))
+                if model is Reservation else [row.get("date")]
+            )
+            _mark(session, row.get("tenant_id", current_tenant_id.get()), dates)
+        return
+
+    # UPDATE / DELETE — 실행 전 대상 행의 현재 날짜를 읽어 둠
+    if rows and all("id" in row for row in rows):
+        where = model.id.in_([row["id"] for row in rows])  # PK 기준 bulk UPDATE (executemany)
+    else:
+        where = orm_execute_state.statement.whereclause
+    if model is Reservation:
+        columns = (Reservation.tenant_id, Reservation.id, Reservation.check_in_date, Reservation.check_out_date)
+    else:
+        columns = (model.tenant_id, model.id, model.date, model.date)
+    query = select(*columns)
+    if where is not None:
+        query = query.where(where)
+    for tenant_id, row_id, first, last in session.execute(query):
+        _mark(session, tenant_id, stay_dates(first, last) if model is Reservation else [first])
+        if model is Reservation and orm_execute_state.is_update:
+            session.info.setdefault(_RECHECK_KEY, {}).setdefault(tenant_id, set()).add(row_id)
+
+
+def _before_commit(session):
+    if session.in_nested_transaction():
+        return  # 최상위 commit 에서 한 번에
+    session.flush()
+    recheck = session.info.pop(_RECHECK_KEY, None)
+    for tenant_id, ids in (recheck or {}).items():
+        for check_in, check_out in session.execute(
+            select(Reservation.check_in_date, Reservation.check_out_date).where(Reservation.id.in_(ids))
+        ):
+            _mark(session, tenant_id, stay_dates(check_in, check_out))
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    try:
+        with session.begin_nested():
+            for tenant_id, dates in sorted(pending.items()):
+                recompute_daily_stats(session, tenant_id, dates)
+    except Exception as e:
+        logger.warning(f"[DailyStats] incremental update failed ({sorted(pending)}): {e}")
+        diag("daily_stats.recompute_failed", level="critical", tenants=sorted(pending), error=str(e)[:200])
+
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_RECHECK_KEY, None)
+
+
+_SESSION_LISTENERS = (
+    ("before_flush", _load_deleted),
+    ("after_flush", _after_flush),
+    ("do_orm_execute", _on_bulk_write),
+    ("before_commit", _before_commit),
+    ("after_transaction_end", _after_transaction_end),
+)
+
+
+def register_listeners() -> None:
+    """daily_stats 유지 이벤트 등록 (app.db.database 에서 호출, 여러 번 호출해도 1회)."""
+    if event.contains(Session, "before_commit", _before_commit):
+        return
+    # 날짜 속성은 변경 전 값을 history 에 남김 (만료된 객체에 대입해도 이전 체류 구간을 재계산)
+    for attr in (Reservation.check_in_date, Reservation.check_out_date, ReservationDailyInfo.date, RoomAssignment.date):
+        event.listen(attr, "set", _keep_old_value, active_history=True)
+    for name, fn in _SESSION_LISTENERS:
+        event.listen(Session, name, fn)
@@ -1,56 +1,297 @@
 """
-Simple in-process event bus using asyncio.Queue for SSE clients.
+SSE event bus — 테넌트별 이벤트 발행/구독. 백엔드는 settings.EVENT_BUS_BACKEND 로 선택.
+
+- memory (기본): 프로세스 메모리. 같은 프로세스의 SSE 클라이언트에만 전달
+- redis: Redis Streams (sse:events:{tenant_id}). 어느 워커/레플리카·스케줄러에서 발행해도
+  모든 프로세스의 구독자에게 전달 (프로세스마다 구독 중인 테넌트별 XREAD 태스크 1개)
+
+이벤트마다 "<ms>-<seq>" 형식 ID 를 붙인다 (redis 는 stream entry ID, memory 는 프로세스
+시작 시각-순번). /api/events/stream 은 Last-Event-ID 이후 이벤트를 재전송한다
+(테넌트별 최근 EVENT_BUS_REPLAY_SIZE 건 보관).
+
+느린 구독자: 클라이언트 버퍼(EVENT_BUS_CLIENT_BUFFER)가 차면 같은 event_type 의 이전 이벤트를
+지우고 최신 것만 남긴다 (프론트는 이벤트를 "다시 조회" 신호로 쓰므로 최신 1건이면 충분).
+같은 타입이 없을 때만 가장 오래된 이벤트를 버린다.
+
+publish() 는 run_db() 워커 스레드에서도 호출될 수 있으므로(자동배정 실패 알림 등),
+루프 밖에서 호출되면 call_soon_threadsafe 로 루프 스레드에 전달한다.
 """
 import asyncio
 import json
 import logging
-from typing import Dict, Set
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-_queues: Dict[int, Set[asyncio.Queue]] = {}
+Event = Tuple[str, str, str]  # (event_id, event_type, payload)
+
+_EPOCH = int(time.time() * 1000)
+
+_subscribers: Dict[int, Set["Subscription"]] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None  # 구독자가 속한 이벤트 루프
+_backend_instance = None
+
+
+class Subscription:
+    """SSE 클라이언트 1개의 이벤트 버퍼. get() 은 payload 를 돌려주고 last_id 를 갱신."""
+
+    def __init__(self, tenant_id: int, last_event_id: Optional[str] = None, maxsize: Optional[int] = None):
+        self.tenant_id = tenant_id
+        self.last_id: Optional[str] = last_event_id
+        self.coalesced = 0
+        self.dropped = 0
+        self._replay_after = last_event_id
+        self._maxsize = maxsize or settings.EVENT_BUS_CLIENT_BUFFER
+        self._buffer: Deque[Event] = deque()
+        self._ready = asyncio.Event()
+
+    def offer(self, event_id: str, event_type: str, payload: str) -> None:
+        """루프 스레드에서 호출. 버퍼가 차면 같은 타입의 이전 이벤트를 병합(제거)."""
+        if len(self._buffer) >= self._maxsize:
+            for i, pending in enumerate(self._buffer):
+                if pending[1] == event_type:
+                    del self._buffer[i]
+                    self.coalesced += 1
+                    break
+            else:
+                self._buffer.popleft()
+                self.dropped += 1
+                logger.warning(f"SSE buffer full for a tenant {self.tenant_id} client, oldest event dropped")
+        self._buffer.append((event_id, event_type, payload))
+        self._ready.set()
+
+    def qsize(self) -> int:
+        return len(self._buffer)
 
+    async def get(self) -> str:
+        if self._replay_after is not None:
+            await self._replay()
+        while not self._buffer:
+            self._ready.clear()
+            await self._ready.wait()
+        event_id, _, payload = self._buffer.popleft()
+        self.last_id = event_id
+        return payload
 
-def subscribe(tenant_id: int) -> asyncio.Queue:
-    """Register a new SSE client for a tenant and return its queue."""
-    q: asyncio.Queue = asyncio.Queue(maxsize=50)
-    if tenant_id not in _queues:
-        _queues[tenant_id] = set()
-    _queues[tenant_id].add(q)
-    total = sum(len(s) for s in _queues.values())
+    async def _replay(self) -> None:
+        """Last-Event-ID 이후 이벤트를 버퍼 앞쪽에 채움 (구독 후 이미 받은 이벤트와 중복 제거)."""
+        after, self._replay_after = self._replay_after, None
+        try:
+            missed = await _backend().replay(self.tenant_id, after)
+        except Exception as e:
+            logger.warning(f"SSE replay failed for tenant {self.tenant_id}: {e}")
+            return
+        live = list(self._buffer)
+        seen = {event[0] for event in live}
+        self._buffer.clear()
+        for event in missed:
+            if event[0] not in seen:
+                self.offer(*event)
+        for event in live:
+            self.offer(*event)
+        if missed:
+            try:
+                from app.diag_logger import diag
+                diag("event_bus.replay", level="verbose", tid=self.tenant_id, after=after, count=len(missed))
+            except Exception:
+                pass
+
+
+def subscribe(tenant_id: int, last_event_id: Optional[str] = None) -> Subscription:
+    """Register a new SSE client for a tenant. last_event_id 가 있으면 첫 get() 에서 놓친 이벤트 재전송."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    sub = Subscription(tenant_id, last_event_id)
+    _subscribers.setdefault(tenant_id, set()).add(sub)
+    _backend().on_subscribe(tenant_id)
+    total = sum(len(s) for s in _subscribers.values())
     logger.debug(f"SSE client subscribed for tenant {tenant_id} (total: {total})")
-    return q
+    return sub
 
 
-def unsubscribe(q: asyncio.Queue, tenant_id: int) -> None:
-    """Remove a client queue when it disconnects."""
-    tenant_set = _queues.get(tenant_id)
+def unsubscribe(sub: Subscription, tenant_id: int) -> None:
+    """Remove a client when it disconnects."""
+    tenant_set = _subscribers.get(tenant_id)
     if tenant_set is not None:
-        tenant_set.discard(q)
+        tenant_set.discard(sub)
         if not tenant_set:
-            del _queues[tenant_id]
-    total = sum(len(s) for s in _queues.values())
+            del _subscribers[tenant_id]
+            _backend().on_unsubscribe(tenant_id)
+    if sub.coalesced or sub.dropped:
+        logger.info(f"SSE client for tenant {tenant_id} closed (coalesced={sub.coalesced}, dropped={sub.dropped})")
+    total = sum(len(s) for s in _subscribers.values())
     logger.debug(f"SSE client unsubscribed for tenant {tenant_id} (total: {total})")
 
 
 def publish(event_type: str, data: dict, tenant_id: int) -> None:
-    """
-    Send an event to SSE clients of a specific tenant.
-    Drops the event for any client whose queue is full.
-    """
+    """Send an event to SSE clients of a specific tenant (모든 프로세스 — redis 백엔드)."""
     try:
         from app.diag_logger import diag
         diag("event_bus.publish", level="verbose", event_type=event_type, tid=tenant_id)
     except Exception:
         pass
-
-    if not _queues:
+    if tenant_id is None:
         return
     payload = json.dumps({"event": event_type, "data": data})
-    target_queues = list(_queues.get(tenant_id, set()))
+    _backend().publish(tenant_id, event_type, payload)
+
+
+def _deliver(tenant_id: int, event_id: str, event_type: str, payload: str) -> None:
+    """루프 스레드에서 구독자 버퍼에 적재."""
+    for sub in list(_subscribers.get(tenant_id, ())):
+        sub.offer(event_id, event_type, payload)
+
+
+def _dispatch(tenant_id: int, event_id: str, event_type: str, payload: str) -> None:
+    """어느 스레드에서든 루프 스레드의 _deliver 로 전달."""
+    if tenant_id not in _subscribers:
+        return
+    try:
+        on_loop = asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        on_loop = False
+    if not on_loop and _loop is not None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_deliver, tenant_id, event_id, event_type, payload)
+        return
+    _deliver(tenant_id, event_id, event_type, payload)
+
 
-    for q in target_queues:
+def _id_key(event_id: Optional[str]) -> Optional[Tuple[int, int]]:
+    """"<ms>-<seq>" → (ms, seq). 형식이 아니면 None."""
+    try:
+        ms, seq = str(event_id).split("-", 1)
+        return int(ms), int(seq)
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class _MemoryBackend:
+    """프로세스 메모리 — 테넌트별 순번 + 최근 이벤트 보관 (프로세스 재시작 시 epoch 가 바뀜)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seq: Dict[int, int] = {}
+        self._history: Dict[int, Deque[Event]] = {}
+
+    def publish(self, tenant_id: int, event_type: str, payload: str) -> None:
+        with self._lock:
+            seq = self._seq.get(tenant_id, 0) + 1
+            self._seq[tenant_id] = seq
+            event = (f"{_EPOCH}-{seq}", event_type, payload)
+            history = self._history.get(tenant_id)
+            if history is None:
+                history = self._history[tenant_id] = deque(maxlen=settings.EVENT_BUS_REPLAY_SIZE)
+            history.append(event)
+            # 락 안에서 전달 예약 → 워커 스레드가 여럿이어도 ID 순서대로 도착
+            _dispatch(tenant_id, *event)
+
+    async def replay(self, tenant_id: int, after: str) -> List[Event]:
+        key = _id_key(after)
+        if key is None:
+            return []
+        with self._lock:
+            events = list(self._history.get(tenant_id, ()))
+        if key[0] != _EPOCH:
+            return events  # 다른 프로세스 수명의 ID — 보관분 전체
+        return [event for event in events if _id_key(event[0]) > key]
+
+    def on_subscribe(self, tenant_id: int) -> None:
+        pass
+
+    def on_unsubscribe(self, tenant_id: int) -> None:
+        pass
+
+
+class _RedisBackend:
+    """Redis Streams — XADD 로 발행, 프로세스별 테넌트 XREAD 태스크가 로컬 구독자에게 전달."""
+
+    def __init__(self, url: str):
+        import redis
+        self._url = url
+        self._sync = redis.Redis.from_url(url, decode_responses=True, socket_timeout=2, socket_connect_timeout=2)
+        self._clients: Dict[int, object] = {}  # id(loop) → redis.asyncio.Redis
+        self._readers: Dict[int, asyncio.Task] = {}
+        # 발행 순서 보존 + 루프 블로킹 방지: 단일 스레드에서 XADD
+        self._publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-bus")
+
+    @staticmethod
+    def _stream(tenant_id: int) -> str:
+        return f"sse:events:{tenant_id}"
+
+    def _client(self):
+        import redis.asyncio as aioredis
+        loop_id = id(asyncio.get_running_loop())
+        client = self._clients.get(loop_id)
+        if client is None:
+            client = self._clients[loop_id] = aioredis.Redis.from_url(self._url, decode_responses=True)
+        return client
+
+    def publish(self, tenant_id: int, event_type: str, payload: str) -> None:
+        self._publisher.submit(self._xadd, tenant_id, event_type, payload)
+
+    def _xadd(self, tenant_id: int, event_type: str, payload: str) -> None:
         try:
-            q.put_nowait(payload)
-        except asyncio.QueueFull:
-            logger.warning("SSE queue full for a client, event dropped")
+            self._sync.xadd(
+                self._stream(tenant_id), {"type": event_type, "payload": payload},
+                maxlen=settings.EVENT_BUS_REPLAY_SIZE, approximate=True,
+            )
+        except Exception as e:
+            logger.warning(f"SSE publish to redis failed ({event_type}, tenant {tenant_id}): {e}")
+
+    async def replay(self, tenant_id: int, after: str) -> List[Event]:
+        key = _id_key(after)
+        if key is None:
+            return []
+        rows = await self._client().xrange(
+            self._stream(tenant_id), min=f"{key[0]}-{key[1] + 1}", max="+", count=settings.EVENT_BUS_REPLAY_SIZE,
+        )
+        return [(entry_id, fields.get("type", ""), fields.get("payload", "")) for entry_id, fields in rows]
+
+    def on_subscribe(self, tenant_id: int) -> None:
+        task = self._readers.get(tenant_id)
+        if task is None or task.done():
+            self._readers[tenant_id] = asyncio.get_running_loop().create_task(self._read(tenant_id))
+
+    def on_unsubscribe(self, tenant_id: int) -> None:
+        task = self._readers.pop(tenant_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def _read(self, tenant_id: int) -> None:
+        stream = self._stream(tenant_id)
+        last = "$"
+        while True:
+            try:
+                rows = await self._client().xread({stream: last}, block=5000, count=100)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"SSE redis read failed for tenant {tenant_id}: {e}")
+                await asyncio.sleep(1)
+                continue
+            for _, entries in rows or ():
+                for entry_id, fields in entries:
+                    last = entry_id
+                    _deliver(tenant_id, entry_id, fields.get("type", ""), fields.get("payload", ""))
+
+
+def _backend():
+    global _backend_instance
+    if _backend_instance is None:
+        if settings.EVENT_BUS_BACKEND == "redis" and settings.REDIS_URL:
+            _backend_instance = _RedisBackend(settings.REDIS_URL)
+        else:
+            if settings.EVENT_BUS_BACKEND == "redis":
+                logger.warning("EVENT_BUS_BACKEND=redis but REDIS_URL is empty — using in-process event bus")
+            _backend_instance = _MemoryBackend()
+    return _backend_instance
@@ -27,12 +27,22 @@ Stay options (stay_filter):
     - Live inside the "room" assignment filter (v2)
     - extract_stay_filter() returns stay_filter for the scheduler
     - Falls back to legacy TemplateSchedule column during transition
+
+Backends:
+    - apply_structural_filters: SQLAlchemy clauses
+    - compile_filter_predicate: cached pure-Python predicate over preloaded rows
 """
 import json
+from functools import lru_cache
+
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy import Boolean, or_, and_, func, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
 
 from app.diag_logger import diag
+from app.db.types import DateString
 from app.db.models import (
     Reservation,
     Room,
@@ -66,9 +76,17 @@ def stay_coverage_filter(date_str: str):
       - 퇴실일 (check_in < d, check_out == d)
       - 해당 날짜와 무관한 예약
 
-    두 번째 OR 분기 `check_in == d` 가 NULL·당일 케이스를 한꺼번에 흡수한다.
+    PostgreSQL 은 generated 컬럼 stay_range @> d (GiST 인덱스), 그 외는 stay_coverage_or().
     상태/섹션 필터는 호출자가 별도로 붙인다.
     """
+    return _StayRangeFilter(date_str, date_str, "@>")
+
+
+def stay_coverage_or(date_str):
+    """stay_coverage_filter 의 이식 가능한 형태 (SQLite, 벤치마크 비교용).
+
+    두 번째 OR 분기 `check_in == d` 가 NULL·당일 케이스를 한꺼번에 흡수한다.
+    """
     return or_(
         and_(
             Reservation.check_in_date <= date_str,
@@ -78,6 +96,59 @@ def stay_coverage_filter(date_str: str):
     )
 
 
+def stay_overlap_filter(date_from: str, date_to: str):
+    """date_from ~ date_to (양 끝 포함) 중 하루라도 stay_coverage_filter 에 걸리는 예약.
+
+    PostgreSQL 은 stay_range && daterange(from, to, '[]'), 그 외는 아래 B-tree 조건.
+    """
+    return _StayRangeFilter(date_from, date_to, "&&")
+
+
+def _stay_overlap_or(date_from, date_to):
+    return and_(
+        Reservation.check_in_date <= date_to,
+        or_(Reservation.check_out_date > date_from, Reservation.check_in_date >= date_from),
+    )
+
+
+class _StayRangeFilter(ColumnElement):
+    """reservations.stay_range 연산 (@> 날짜 / && 구간) — 방언별 컴파일."""
+
+    type = Boolean()
+    inherit_cache = True
+    _is_implicitly_boolean = True  # WHERE 에서 "= 1" 비교를 붙이지 않음 (SQLite)
+    _traverse_internals = [
+        ("date_from", InternalTraversal.dp_clauseelement),
+        ("date_to", InternalTraversal.dp_clauseelement),
+        ("operator", InternalTraversal.dp_string),
+    ]
+
+    def __init__(self, date_from: str, date_to: str, operator: str):
+        self.date_from = literal(date_from, DateString())
+        self.date_to = self.date_from if date_to == date_from else literal(date_to, DateString())
+        self.operator = operator
+
+
+@compiles(_StayRangeFilter)
+def _compile_stay_range_default(element, compiler, **kw):
+    if element.operator == "@>":
+        clause = stay_coverage_or(element.date_from)
+    else:
+        clause = _stay_overlap_or(element.date_from, element.date_to)
+    return compiler.process(clause.self_group(), **kw)
+
+
+@compiles(_StayRangeFilter, "postgresql")
+def _compile_stay_range_postgresql(element, compiler, **kw):
+    stay_range = f"{compiler.preparer.format_table(Reservation.__table__)}.stay_range"
+    if element.operator == "@>":
+        return f"({stay_range} @> {compiler.process(element.date_from, **kw)})"
+    return (
+        f"({stay_range} && daterange({compiler.process(element.date_from, **kw)}, "
+        f"{compiler.process(element.date_to, **kw)}, '[]'))"
+    )
+
+
 # ---------------------------------------------------------------------------
 # Dual-parse: v1 → v2 normalization (normalize-on-read)
 # ---------------------------------------------------------------------------
@@ -383,6 +454,36 @@ def _condition_column_match(spec: dict, ctx: dict):
 _COLUMN_MATCH_DATE_DEPENDENT = {"party_type", "notes"}
 
 
+def _build_structural_conditions(
+    db: Session, schedule, target_date: str,
+    *, only_date_independent: bool = False,
+) -> tuple[list, list]:
+    """Compile v2 filters into (assignment_conds, column_match_conds)."""
+    filters = _parse_filters(schedule.filters)
+    ctx = {"db": db, "target_date": target_date}
+
+    assignment_conds: list = []
+    cm_conds: list = []
+
+    for f in filters:
+        ftype = f.get("type")
+        if ftype == "assignment":
+            cond = _condition_assignment(f, ctx, only_date_independent=only_date_independent)
+            if cond is not None:
+                assignment_conds.append(cond)
+        elif ftype == "column_match":
+            if only_date_independent:
+                col = (f.get("value") or "").split(':', 1)[0]
+                if col in _COLUMN_MATCH_DATE_DEPENDENT:
+                    continue
+            cond = _condition_column_match(f, ctx)
+            if cond is not None:
+                cm_conds.append(cond)
+        # else: passthrough/unknown types silently ignored
+
+    return assignment_conds, cm_conds
+
+
 def apply_structural_filters(
     db: Session, query, schedule, target_date: str,
     *, only_date_independent: bool = False,
@@ -408,27 +509,9 @@ def apply_structural_filters(
         only_date_independent=only_date_independent,
     )
 
-    filters = _parse_filters(schedule.filters)
-    ctx = {"db": db, "target_date": target_date}
-
-    assignment_conds: list = []
-    cm_conds: list = []
-
-    for f in filters:
-        ftype = f.get("type")
-        if ftype == "assignment":
-            cond = _condition_assignment(f, ctx, only_date_independent=only_date_independent)
-            if cond is not None:
-                assignment_conds.append(cond)
-        elif ftype == "column_match":
-            if only_date_independent:
-                col = (f.get("value") or "").split(':', 1)[0]
-                if col in _COLUMN_MATCH_DATE_DEPENDENT:
-                    continue
-            cond = _condition_column_match(f, ctx)
-            if cond is not None:
-                cm_conds.append(cond)
-        # else: passthrough/unknown types silently ignored
+    assignment_conds, cm_conds = _build_structural_conditions(
+        db, schedule, target_date, only_date_independent=only_date_independent,
+    )
 
     # assignment group: OR
     if assignment_conds:
@@ -446,3 +529,145 @@ def apply_structural_filters(
 
     diag("filter.apply.exit", level="verbose")
     return query
+
+
+# ---------------------------------------------------------------------------
+# In-memory predicate backend
+# ---------------------------------------------------------------------------
+#
+# apply_structural_filters 와 같은 의미를 순수 Python callable 로 컴파일한다.
+# DB 왕복 없이 "이 예약이 이 날짜에 매칭되나?" 를 답할 때 사용.
+#
+#   predicate(reservation, assignment, daily_info) -> bool
+#     reservation: Reservation (또는 같은 속성을 가진 row)
+#     assignment:  해당 날짜의 RoomAssignment (없으면 None). buildings 필터는
+#                  assignment.room.building_id 를 읽으므로 room 을 미리 로드할 것.
+#     daily_info:  해당 날짜의 ReservationDailyInfo (없으면 None)
+#
+# 문자열 매칭은 PostgreSQL LIKE 와 동일하게 대소문자를 구분한다.
+
+def _predicate_room(spec: dict):
+    buildings = {int(b) for b in spec.get("buildings") or []}
+    include_unassigned = bool(spec.get("include_unassigned"))
+
+    def pred(res, assignment, daily):
+        if res.section == 'room':
+            if not buildings:
+                return True
+            room = getattr(assignment, "room", None) if assignment is not None else None
+            if room is not None and room.building_id in buildings:
+                return True
+        return include_unassigned and res.section == 'unassigned'
+    return pred
+
+
+def _predicate_simple_assignment(spec: dict):
+    value = spec.get("value")
+    if value in ("party", "unassigned"):
+        return lambda res, assignment, daily: res.section == value
+    if value == "unstable":
+        return lambda res, assignment, daily: (
+            res.section == 'unstable'
+            or (daily is not None and bool(daily.unstable_party))
+        )
+    return None
+
+
+def _predicate_column_match(spec: dict):
+    value = spec.get("value", "")
+    parts = value.split(':', 2)
+    if len(parts) < 2:
+        return None
+    column, operator = parts[0], parts[1]
+    text = parts[2] if len(parts) == 3 else ''
+    if column not in _COLUMN_MATCH_COLUMNS:
+        return None
+
+    if column in _COLUMN_MATCH_DATE_DEPENDENT:
+        def effective(res, daily):
+            daily_val = getattr(daily, column) if daily is not None else None
+            return daily_val if daily_val is not None else getattr(res, column)
+    else:
+        def effective(res, daily):
+            return getattr(res, column)
+
+    if operator == 'is_empty':
+        return lambda res, assignment, daily: effective(res, daily) in (None, '')
+    if operator == 'is_not_empty':
+        return lambda res, assignment, daily: effective(res, daily) not in (None, '')
+    if operator == 'contains' and text:
+        def contains(res, assignment, daily):
+            v = effective(res, daily)
+            return v is not None and text in v
+        return contains
+    if operator == 'not_contains' and text:
+        def not_contains(res, assignment, daily):
+            v = effective(res, daily)
+            return v is None or text not in v
+        return not_contains
+    return None
+
+
+@lru_cache(maxsize=512)
+def _compile_predicate(filters_key: str, exclude_long_stay: bool):
+    filters = _parse_filters(filters_key)
+
+    assignment_preds: list = []
+    cm_preds: list = []
+    for f in filters:
+        ftype = f.get("type")
+        if ftype == "assignment":
+            if f.get("value") == "room":
+                pred = _predicate_room(f)
+            else:
+                pred = _predicate_simple_assignment(f)
+            if pred is not None:
+                assignment_preds.append(pred)
+        elif ftype == "column_match":
+            pred = _predicate_column_match(f)
+            if pred is not None:
+                cm_preds.append(pred)
+
+    assignment_preds = tuple(assignment_preds)
+    cm_preds = tuple(cm_preds)
+
+    def predicate(reservation, assignment=None, daily_info=None) -> bool:
+        if exclude_long_stay and reservation.is_long_stay:
+            return False
+        if assignment_preds and not any(p(reservation, assignment, daily_info) for p in assignment_preds):
+            return False
+        return all(p(reservation, assignment, daily_info) for p in cm_preds)
+
+    # 호출자가 어떤 행을 미리 로드해야 하는지 (없으면 None 을 넘겨도 결과 동일)
+    predicate.needs_assignment = any(
+        f.get("type") == "assignment" and f.get("value") == "room" and f.get("buildings")
+        for f in filters
+    )
+    predicate.needs_daily_info = any(
+        (f.get("type") == "assignment" and f.get("value") == "unstable")
+        or (f.get("type") == "column_match"
+            and (f.get("value") or "").split(':', 1)[0] in _COLUMN_MATCH_DATE_DEPENDENT)
+        for f in filters
+    )
+    return predicate
+
+
+def compile_filter_predicate(schedule, *, include_stay_filter: bool = False):
+    """Compile schedule.filters into a cached in-memory predicate.
+
+    Args:
+        schedule: TemplateSchedule-like with .filters (JSON string or list)
+        include_stay_filter: When True, also reject long stays if
+            extract_stay_filter(schedule) == 'exclude' (SQL 경로에서는 호출자가
+            Reservation.is_long_stay 조건을 따로 붙이는 부분).
+
+    Returns:
+        predicate(reservation, assignment=None, daily_info=None) -> bool.
+        같은 filters 값에 대해서는 컴파일된 callable 을 재사용한다.
+        predicate.needs_assignment / needs_daily_info: 해당 행이 결과에 영향을 주는지.
+    """
+    raw = schedule.filters
+    if isinstance(raw, list):
+        raw = json.dumps(raw, sort_keys=True, ensure_ascii=False)
+    exclude_long_stay = include_stay_filter and extract_stay_filter(schedule) == 'exclude'
+    return _compile_predicate(raw or '', exclude_long_stay)
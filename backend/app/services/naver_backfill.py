@@ -0,0 +1,184 @@
+"""
+Naver historical backfill — from_date 동기화를 월별 청크 스트리밍으로 처리.
+
+기존 from_date 경로는 모든 청크/페이지를 메모리 리스트 하나에 모은 뒤 Phase 2~5 를
+트랜잭션 하나로 돌려서, 1년치 백필은 RAM 을 크게 쓰고 중간에 쿠키가 만료되면
+진행분이 전부 사라졌다.
+
+- 청크 단위: provider.iter_history_chunks() 가 청크마다 변환 결과를 yield
+- 청크마다 _apply_naver_reservations(Phase 2~5, 내부 commit) → 체크포인트 commit
+- 조회/변환/반영 중 예외가 난 청크는 체크포인트를 남기지 않음 — 재실행 시 그 청크부터 다시
+- 다음 청크 조회는 현재 청크 DB 반영과 동시에 진행 (prefetch 1청크)
+- 중단 후 같은 from_date 로 재실행하면 마지막 커밋 청크 다음 날부터 이어서 진행
+- 진행 상황은 SSE(event_bus) 로 naver_backfill_progress / _done / _failed 발행
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.executor import run_db
+from app.db.models import NaverBackfillCheckpoint
+from app.db.tenant_context import current_tenant_id
+from app.diag_logger import diag
+
+logger = logging.getLogger(__name__)
+
+_COUNTERS = ("fetched", "added", "updated")
+
+
+async def backfill_naver_history(reservation_provider, db: Session, from_date: str, source: str = "stable") -> Dict[str, Any]:
+    """
+    from_date ~ 현재 네이버 예약을 청크 단위로 동기화.
+
+    Returns: sync_naver_to_db 와 같은 요약 dict + chunks / resumed_from
+             (중단 시 success=False, resumable=True — 재실행하면 이어서 진행)
+    """
+    tenant_id = current_tenant_id.get()
+    state = await run_db(_start_checkpoint, db, source, from_date)
+    resumed_from = state["start"] if state["resumed"] else None
+    totals = state["totals"]
+    chunks = 0
+    changed = 0
+
+    diag("naver_backfill.enter", level="verbose", source=source, from_date=from_date, start=state["start"], resumed=state["resumed"])
+    if resumed_from:
+        logger.info(f"Resuming Naver backfill ({source}) from {resumed_from} (started {from_date})")
+
+    from app.services.naver_sync import _apply_naver_reservations
+    try:
+        async for chunk_start, chunk_end, reservations in _prefetch(reservation_provider.iter_history_chunks(state["start"])):
+            applied = await run_db(_apply_naver_reservations, db, reservations, None, source, False)
+            chunks += 1
+            changed += applied["changed"]
+            for key in _COUNTERS:
+                totals[key] += applied[key]
+            await run_db(_save_checkpoint, db, source, chunk_end, totals)
+
+            if applied["new_reservation_ids"]:
+                try:
+                    from app.services.event_sms_hook import schedule_event_sms_hook
+                    schedule_event_sms_hook(applied["new_reservation_ids"])
+                except Exception as e:
+                    logger.exception(f"event_sms_hook scheduling failed (suppressed): {e}")
+
+            _publish("naver_backfill_progress", tenant_id, {
+                "source": source,
+                "from_date": from_date,
+                "chunk_start": chunk_start,
+                "chunk_end": chunk_end,
+                "chunks": state["chunks_done"] + chunks,
+                **totals,
+            })
+    except Exception as e:
+        logger.error(f"Naver backfill ({source}) stopped after {chunks} chunks: {e}")
+        diag("naver_backfill.failed", level="critical", source=source, from_date=from_date, chunks=chunks, error=str(e))
+        _publish("naver_backfill_failed", tenant_id, {"source": source, "from_date": from_date, "error": str(e), **totals})
+        return {
+            "success": False,
+            "resumable": True,
+            "error": str(e),
+            "synced": totals["fetched"],
+            "fetched": totals["fetched"],
+            "added": totals["added"],
+            "updated": totals["updated"],
+            "chunks": chunks,
+            "resumed_from": resumed_from,
+            "message": f"백필 중단 ({chunks}개 구간 반영) — 다시 실행하면 이어서 진행",
+        }
+
+    await run_db(_complete_checkpoint, db, source)
+    _publish("naver_backfill_done", tenant_id, {"source": source, "from_date": from_date, "chunks": chunks, **totals})
+    diag("naver_backfill.exit", level="verbose", source=source, chunks=chunks, **totals)
+
+    return {
+        "success": True,
+        "synced": totals["fetched"],
+        "added": totals["added"],
+        "updated": totals["updated"],
+        "fetched": totals["fetched"],
+        "changed": changed,
+        "unchanged": 0,
+        "chunks": chunks,
+        "resumed_from": resumed_from,
+        "message": f"{totals['fetched']}건 조회, {totals['added']}건 추가, {totals['updated']}건 갱신",
+    }
+
+
+async def _prefetch(chunks: AsyncIterator, depth: int = 1) -> AsyncIterator:
+    """async generator 를 별도 task 로 앞서 돌려 최대 depth 개 청크를 미리 받아 둔다."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+    done = object()
+
+    async def _produce():
+        try:
+            async for item in chunks:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(done)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+
+
+def _start_checkpoint(db: Session, source: str, from_date: str) -> Dict[str, Any]:
+    """같은 from_date 의 미완료 체크포인트가 있으면 이어서, 아니면 새로 시작."""
+    row = db.query(NaverBackfillCheckpoint).filter(NaverBackfillCheckpoint.source == source).first()
+    if row and row.from_date == from_date and row.completed_at is None and row.last_chunk_end:
+        start = (datetime.strptime(row.last_chunk_end, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        return {
+            "start": start,
+            "resumed": True,
+            "chunks_done": row.chunks_done,
+            "totals": {key: getattr(row, key) or 0 for key in _COUNTERS},
+        }
+
+    if row is None:
+        row = NaverBackfillCheckpoint(source=source, from_date=from_date)
+        db.add(row)
+    row.from_date = from_date
+    row.last_chunk_end = None
+    row.chunks_done = 0
+    row.completed_at = None
+    for key in _COUNTERS:
+        setattr(row, key, 0)
+    db.commit()
+    return {"start": from_date, "resumed": False, "chunks_done": 0, "totals": {key: 0 for key in _COUNTERS}}
+
+
+def _save_checkpoint(db: Session, source: str, chunk_end: str, totals: Dict[str, int]) -> None:
+    row = db.query(NaverBackfillCheckpoint).filter(NaverBackfillCheckpoint.source == source).one()
+    row.last_chunk_end = chunk_end
+    row.chunks_done = (row.chunks_done or 0) + 1
+    for key in _COUNTERS:
+        setattr(row, key, totals[key])
+    db.commit()
+
+
+def _complete_checkpoint(db: Session, source: str) -> None:
+    row = db.query(NaverBackfillCheckpoint).filter(NaverBackfillCheckpoint.source == source).one()
+    row.completed_at = datetime.now(timezone.utc)
+    db.commit()
+
+
+def _publish(event_type: str, tenant_id: Optional[int], data: Dict[str, Any]) -> None:
+    if tenant_id is None:
+        return
+    try:
+        from app.services.event_bus import publish
+        publish(event_type, data, tenant_id=tenant_id)
+    except Exception as e:
+        logger.warning(f"SSE publish failed: {e}")
@@ -2,21 +2,28 @@
 Shared Naver reservation sync logic.
 Used by both the API endpoint and the scheduler job.
 """
-from datetime import datetime, timezone
-from typing import Dict, Any
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import or_, insert, literal_column, true, update
+import hashlib
+import json
 import logging
 
 import re
 
-from app.db.models import Reservation, ReservationStatus, ReservationSmsAssignment, NaverBizItem, RoomBizItemLink, Room
+from app.db.models import (
+    Reservation, ReservationStatus, ReservationSmsAssignment,
+    NaverSyncCursor, NaverBookingHash,
+)
 from app.diag_logger import diag
 from app.services import room_assignment
 from app.services.consecutive_stay import compute_is_long_stay
-from app.services.room_auto_assign import auto_assign_rooms
-from app.config import KST
+from app.services.room_auto_assign import auto_assign_rooms_range
+from app.config import KST, settings
 from app.db.tenant_context import current_tenant_id
+from app.db.executor import run_db
 
 logger = logging.getLogger(__name__)
 
@@ -55,11 +62,12 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
     Phase 1: reservation_provider.get_reservations() — 네이버 API에서 예약 가져오기
     Phase 2: enrichment(biz_name/people_count/gender) + _create_reservation/_update_reservation
     Phase 3: reconcile_chips_for_reservation (1차) — 방 미배정 상태, building 칩 미생성
-    Phase 4: detect_and_link_consecutive_stays — 연박 그룹 링크
-    Phase 5: auto_assign_rooms → assign_room() → reconcile (2차) — building 칩 생성
+    Phase 4: detect_and_link_for_reservations — 연박 그룹 링크 (이번 sync 가 건드린 identity 만)
+    Phase 5: auto_assign_rooms_range → assign_room() → reconcile (2차) — building 칩 생성
 
     Args:
         from_date: Optional start date (YYYY-MM-DD) for historical sync.
+                   청크 스트리밍 provider 면 naver_backfill.backfill_naver_history 로 위임.
         reconcile_date: Optional check-in date (YYYY-MM-DD) for reconciliation.
                         Uses STARTDATE filter instead of REGDATE.
 
@@ -73,21 +81,101 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
         from_date=from_date,
     )
 
+    # from_date 백필: 월별 청크 스트리밍 + 청크별 commit/체크포인트 (중단 후 재실행 시 이어서)
+    if from_date and not reconcile_date and hasattr(reservation_provider, "iter_history_chunks"):
+        from app.services.naver_backfill import backfill_naver_history
+        return await backfill_naver_history(reservation_provider, db, from_date, source=source)
+
+    # 일반 5분 sync 만 증분 (커서 + 해시). reconcile/backfill 은 항상 전량 처리.
+    incremental = not reconcile_date and not from_date and target_date is None
+    fetch_started_at = datetime.now(timezone.utc)
+
     if reconcile_date:
         logger.info(f"Starting Naver reconciliation for check-in date: {reconcile_date}")
         raw_reservations = await reservation_provider.fetch_by_checkin_date(reconcile_date)
     else:
-        logger.info(f"Starting Naver reservation sync...{f' (from {from_date})' if from_date else ''}")
-        raw_reservations = await reservation_provider.sync_reservations(target_date, from_date=from_date)
+        since = await run_db(_load_cursor_since, db, source) if incremental else None
+        logger.info(
+            f"Starting Naver reservation sync...{f' (from {from_date})' if from_date else ''}"
+            f"{f' (since {since:%Y-%m-%d %H:%M})' if since else ''}"
+        )
+        if since is not None:
+            raw_reservations = await reservation_provider.sync_reservations(target_date, from_date=from_date, since=since)
+        else:
+            raw_reservations = await reservation_provider.sync_reservations(target_date, from_date=from_date)
 
     diag(
         "naver_sync.fetched",
         level="verbose",
         raw_count=len(raw_reservations),
+        **getattr(reservation_provider, "last_user_info_stats", {}),
     )
 
-    # Build lookup maps from DB (NaverBizItem + Room)
-    biz_items = db.query(NaverBizItem).all()
+    # ── Phase 2~5: DB 작업 전체를 DB 스레드 풀에서 실행 (이벤트 루프 블로킹 방지) ──
+    applied = await run_db(_apply_naver_reservations, db, raw_reservations, reconcile_date, source, incremental)
+    new_reservation_ids = applied["new_reservation_ids"]
+    added_count = applied["added"]
+    updated_count = applied["updated"]
+    synced_count = applied["synced"]
+
+    if incremental:
+        await run_db(_advance_cursor, db, source, fetch_started_at)
+
+    # ── Phase 6: event SMS 즉시 발송 훅 (fire-and-forget, 격리) ──
+    # 활성 event 스케줄(gender_filter / hours_since_booking 등) 매칭되는 신규 예약에
+    # 즉시 안내 SMS 발송. 실패는 sync 메인 흐름에 영향 없음.
+    if new_reservation_ids:
+        try:
+            from app.services.event_sms_hook import schedule_event_sms_hook
+            schedule_event_sms_hook(new_reservation_ids)
+        except Exception as e:
+            logger.exception(f"event_sms_hook scheduling failed (suppressed): {e}")
+
+    logger.info(
+        f"Naver sync completed: {added_count} added, {updated_count} updated"
+        f" (fetched {applied['fetched']}, changed {applied['changed']}, unchanged {applied['unchanged']})"
+    )
+
+    diag(
+        "naver_sync.exit",
+        level="verbose",
+        synced=synced_count,
+        added=added_count,
+        updated=updated_count,
+        fetched=applied["fetched"],
+        changed=applied["changed"],
+        unchanged=applied["unchanged"],
+    )
+
+    return {
+        "success": True,
+        "synced": synced_count,
+        "added": added_count,
+        "updated": updated_count,
+        "fetched": applied["fetched"],
+        "changed": applied["changed"],
+        "unchanged": applied["unchanged"],
+        "message": f"{synced_count}건 조회, {added_count}건 추가, {updated_count}건 갱신",
+    }
+
+
+def _apply_naver_reservations(
+    db: Session,
+    raw_reservations: List[Dict[str, Any]],
+    reconcile_date: Optional[str],
+    source: str,
+    incremental: bool = False,
+) -> Dict[str, Any]:
+    """[Phase 2~5] 수신한 네이버 예약을 DB 에 반영 (동기 — run_db 로 루프 밖에서 실행).
+
+    Phase 6(event SMS 훅)은 실행 중인 이벤트 루프가 필요하므로 호출자(sync_naver_to_db)가 처리.
+    incremental=True 면 내용 해시가 지난 반영분과 같은 예약은 Phase 2~5 를 건너뛴다.
+
+    Returns: {"synced", "added", "updated", "new_reservation_ids", "fetched", "changed", "unchanged"}
+    """
+    # Build lookup maps from DB (NaverBizItem + Room) — 테넌트 참조 데이터 캐시
+    from app.services.reference_cache import get_biz_items, get_rooms
+    biz_items = get_biz_items(db)
     biz_name_map = {b.biz_item_id: (b.display_name or b.name) for b in biz_items}
     biz_section_map = {b.biz_item_id: b.section_hint for b in biz_items}
     biz_party_map = {b.biz_item_id: b.default_party_type for b in biz_items if b.default_party_type}
@@ -98,15 +186,13 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
     # 매핑 없는 biz_item (예: 차량투어, 미등록 상품) 은 split 대상 아님 — 가드용.
     biz_dormitory_map: Dict[str, bool] = {}
     biz_link_set: set[str] = set()
-    links = db.query(RoomBizItemLink).join(
-        Room, and_(Room.id == RoomBizItemLink.room_id, Room.tenant_id == RoomBizItemLink.tenant_id)
-    ).all()
-    for link in links:
-        biz_link_set.add(link.biz_item_id)
-        if link.biz_item_id not in biz_capacity_map:
-            biz_capacity_map[link.biz_item_id] = link.room.base_capacity
-        if link.room.is_dormitory:
-            biz_dormitory_map[link.biz_item_id] = True
+    for room in get_rooms(db):
+        for link in room.biz_item_links:
+            biz_link_set.add(link.biz_item_id)
+            if link.biz_item_id not in biz_capacity_map:
+                biz_capacity_map[link.biz_item_id] = room.base_capacity
+            if room.is_dormitory:
+                biz_dormitory_map[link.biz_item_id] = True
 
     # Deduplicate by external_id (monthly chunks can overlap)
     seen_ids = {}
@@ -120,6 +206,35 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
     if len(reservations) != len(raw_reservations):
         logger.info(f"Deduplicated: {len(raw_reservations)} → {len(reservations)}")
 
+    # 체크인 날짜 없음/형식 오류 예약은 건너뜀 — DATE 바인딩(NOT NULL, fromisoformat) 실패가
+    # bulk INSERT/UPDATE 배치 전체를 중단시키지 않도록. 해시도 저장하지 않으므로 고쳐지면 다음 sync 에 반영
+    invalid = [r for r in reservations if not _has_valid_dates(r)]
+    if invalid:
+        reservations = [r for r in reservations if _has_valid_dates(r)]
+        logger.warning(f"Skipped {len(invalid)} Naver bookings without a valid date")
+        diag(
+            "naver_sync.invalid_dates",
+            level="critical",
+            count=len(invalid),
+            bookings=[
+                (r.get("external_id") or r.get("naver_booking_id"), r.get("date"), r.get("end_date"))
+                for r in invalid[:20]
+            ],
+        )
+
+    # ── 증분: 내용 해시 비교 → 변경 없는 예약 제외 ──
+    # 해시에는 enrichment 입력(상품 매핑)도 포함 — 상품 설정이 바뀌면 해당 예약은 다시 반영된다.
+    fetched_count = len(reservations)
+    booking_hashes: Dict[str, str] = {}
+    if incremental:
+        def _enrichment_inputs(bid):
+            return (
+                biz_name_map.get(bid), biz_section_map.get(bid), biz_party_map.get(bid),
+                biz_capacity_map.get(bid), biz_dormitory_map.get(bid, False), bid in biz_link_set,
+            )
+        reservations, booking_hashes = _skip_unchanged_bookings(db, reservations, source, _enrichment_inputs)
+    unchanged_count = fetched_count - len(reservations)
+
     # ── Phase 2: enrichment ──
     # 네이버 상품ID → DB 매핑(상품명, 도미토리 여부, 기준인원, 섹션 힌트)으로 변환
     for res_data in reservations:
@@ -209,26 +324,74 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
     updated_count = 0
     new_reservation_ids = []  # 칩 생성 대상: 새 예약 ID
     date_changed_ids = []  # 칩 재계산 대상: 날짜 변경 예약 ID
+    updated_ids = []  # 연박 증분 감지 대상: 갱신된 기존 예약 ID
+
+    # bulk: 신규는 모아서 INSERT 1회(ID RETURNING), 기존은 부수효과 없는 변경만 모아서 UPDATE 1회.
+    # 취소/날짜/제약/SMS 필드 변경처럼 후처리가 필요한 예약만 _update_reservation 으로 개별 처리.
+    tenant_id = current_tenant_id.get()
+    new_rows: List[Dict[str, Any]] = []
+    new_data: List[Dict[str, Any]] = []  # new_rows 와 같은 순서의 res_data
+    plain_updates: List[tuple] = []  # (existing, {attr: 새 값})
+    unchanged_rows = 0
 
     for res_data in reservations:
         external_id = res_data.get("external_id") or res_data.get("naver_booking_id")
         existing = existing_map.get(external_id) if external_id else None
 
         if existing:
+            values = _naver_field_values(existing, res_data)
+            if _needs_full_update(existing, values):
+                old_dates = (existing.check_in_date, existing.check_out_date)
+                _update_reservation(db, existing, res_data)
+                new_dates = (existing.check_in_date, existing.check_out_date)
+                if old_dates != new_dates:
+                    date_changed_ids.append(existing.id)
+            else:
+                changed = {key: value for key, value in values.items() if getattr(existing, key) != value}
+                is_long_stay = compute_is_long_stay(existing)
+                if is_long_stay != existing.is_long_stay:
+                    changed["is_long_stay"] = is_long_stay
+                if changed:
+                    plain_updates.append((existing, changed))
+                else:
+                    unchanged_rows += 1
+            updated_ids.append(existing.id)
+            updated_count += 1
+        else:
+            new_rows.append(_reservation_row(res_data, tenant_id))
+            new_data.append(res_data)
+
+    if plain_updates:
+        _bulk_update_reservations(db, plain_updates)
+    if new_rows:
+        for (res_id, inserted), res_data in zip(_bulk_insert_reservations(db, new_rows), new_data):
+            if inserted:
+                new_reservation_ids.append(res_id)
+                continue
+            # 동시 sync 가 먼저 넣은 예약 → 기존 예약 갱신과 같은 규칙 (네이버 필드만), 갱신으로 집계
+            existing = db.get(Reservation, res_id)
             old_dates = (existing.check_in_date, existing.check_out_date)
             _update_reservation(db, existing, res_data)
-            new_dates = (existing.check_in_date, existing.check_out_date)
-            if old_dates != new_dates:
+            if old_dates != (existing.check_in_date, existing.check_out_date):
                 date_changed_ids.append(existing.id)
+            existing_map[res_data.get("external_id") or res_data.get("naver_booking_id")] = existing
+            updated_ids.append(existing.id)
             updated_count += 1
-        else:
-            new_res = _create_reservation(res_data)
-            db.add(new_res)
-            db.flush()  # ID 즉시 할당 (commit 후 N+1 lazy reload 방지)
-            new_reservation_ids.append(new_res.id)
-            added_count += 1
+        added_count = len(new_reservation_ids)
 
     db.commit()
+    diag(
+        "naver_sync.bulk_upsert",
+        level="verbose",
+        inserted=added_count,
+        bulk_updated=len(plain_updates),
+        full_updated=updated_count - len(plain_updates) - unchanged_rows,
+        unchanged=unchanged_rows,
+    )
+
+    # 해시는 Phase 4~5 + 칩/추가요금 reconcile 까지 성공한 뒤에만 저장 (아래).
+    # 중간 단계가 실패하면 저장하지 않아 다음 증분 sync 가 해당 예약을 다시 반영한다.
+    downstream_ok = True
 
     # ── Phase 3: 칩 reconcile은 Phase 5(자동배정) 이후 1회로 통합 ──
     # 이전에는 여기서 1차 reconcile 했으나, RoomAssignment 없는 상태에서
@@ -239,8 +402,9 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
     # ── Phase 4: 연박 감지 (같은 이름+전화의 연속 날짜 예약 → stay_group으로 링크) ──
     if added_count > 0 or updated_count > 0:
         try:
-            from app.services.consecutive_stay import detect_and_link_consecutive_stays
-            stay_result = detect_and_link_consecutive_stays(db)
+            # 이번 sync 가 건드린 예약의 identity 만 재검사 (윈도우 전체 재스캔은 detect_consecutive_stays_job 이 주기 실행)
+            from app.services.consecutive_stay import detect_and_link_for_reservations
+            stay_result = detect_and_link_for_reservations(db, new_reservation_ids + updated_ids)
             db.commit()
             if stay_result["linked"] > 0 or stay_result["unlinked"] > 0:
                 logger.info(f"Consecutive stay detection after sync: {stay_result}")
@@ -252,9 +416,10 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
         except Exception as e:
             logger.error(f"Consecutive stay detection failed: {e}")
             db.rollback()
+            downstream_ok = False
 
     # ── Phase 5: 자동 객실 배정 ──
-    # auto_assign_rooms → assign_room() → ★ 칩 reconcile (2차)
+    # auto_assign_rooms_range → assign_room() → ★ 칩 reconcile (2차)
     # 이번에는 RoomAssignment 있으므로 building 필터 통과 → 칩 생성됨
     # reconcile 경로: 오늘 포함 / 일반 sync 경로: 내일 이후만 (오늘은 수동 배정 유지)
     if added_count > 0 or date_changed_ids:
@@ -293,10 +458,12 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
                                 dates.add(d)
 
             assigned_total = 0
-            for d in sorted(dates):
-                result = auto_assign_rooms(db, d, created_by="reconcile" if reconcile_date else "sync")
-                assigned_total += result.get("assigned", 0)
             if dates:
+                # 날짜별 반복 대신 윈도우 1회 — 방/점유/스케줄 1회 적재, 연박자는 전 박 한 번에
+                result = auto_assign_rooms_range(
+                    db, sorted(dates), created_by="reconcile" if reconcile_date else "sync",
+                )
+                assigned_total = result["assigned"]
                 logger.info(f"Auto-assigned {assigned_total} rooms after sync (dates: {sorted(dates)})")
                 db.commit()
 
@@ -305,6 +472,7 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
         except Exception as e:
             logger.error(f"Auto-assign after sync failed: {e}")
             db.rollback()
+            downstream_ok = False
 
     # ── Phase 5 이후: ★ 칩 reconcile (통합 1회) ──
     # Phase 5 자동배정 완료 후 RoomAssignment가 확정된 상태에서 칩 생성.
@@ -312,15 +480,15 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
     # 자동배정 실패 예약도 여기서 building 무관 칩(hook, 후기 등)이 생성됨.
     if chip_target_ids:
         try:
-            from app.services.chip_reconciler import reconcile_chips_for_reservation
-            from app.db.models import TemplateSchedule
-            active_schedules = db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True).all()
-            for res_id in chip_target_ids:
-                reconcile_chips_for_reservation(db, res_id, schedules=active_schedules)
+            from app.services.chip_reconciler import reconcile_chips_for_reservations
+            from app.services.reference_cache import get_active_schedules
+            active_schedules = get_active_schedules(db)
+            reconcile_chips_for_reservations(db, chip_target_ids, schedules=active_schedules)
             db.commit()
         except Exception as e:
             logger.error(f"Chip reconciliation after sync failed: {e}")
             db.rollback()
+            downstream_ok = False
 
         # Surcharge reconcile for synced reservations
         try:
@@ -329,36 +497,121 @@ async def sync_naver_to_db(reservation_provider, db: Session, target_date=None,
             reconcile_surcharge_batch(db, chip_target_ids, today_str)
         except Exception as e:
             logger.warning(f"Surcharge batch reconcile after sync failed: {e}")
+            downstream_ok = False
 
-    # ── Phase 6: event SMS 즉시 발송 훅 (fire-and-forget, 격리) ──
-    # 활성 event 스케줄(gender_filter / hours_since_booking 등) 매칭되는 신규 예약에
-    # 즉시 안내 SMS 발송. 실패는 sync 메인 흐름에 영향 없음.
-    if new_reservation_ids:
-        try:
-            from app.services.event_sms_hook import schedule_event_sms_hook
-            schedule_event_sms_hook(new_reservation_ids)
-        except Exception as e:
-            logger.exception(f"event_sms_hook scheduling failed (suppressed): {e}")
-
-    logger.info(f"Naver sync completed: {added_count} added, {updated_count} updated")
-
-    diag(
-        "naver_sync.exit",
-        level="verbose",
-        synced=len(reservations),
-        added=added_count,
-        updated=updated_count,
-    )
+    if booking_hashes:
+        if downstream_ok:
+            _store_booking_hashes(db, source, booking_hashes)
+            db.commit()
+        else:
+            diag("naver_sync.hashes_skipped", level="critical", source=source, bookings=len(booking_hashes))
 
     return {
-        "success": True,
         "synced": len(reservations),
         "added": added_count,
         "updated": updated_count,
-        "message": f"{len(reservations)}건 조회, {added_count}건 추가, {updated_count}건 갱신",
+        "new_reservation_ids": new_reservation_ids,
+        "fetched": fetched_count,
+        "changed": fetched_count - unchanged_count,
+        "unchanged": unchanged_count,
     }
 
 
+def _load_cursor_since(db: Session, source: str) -> Optional[datetime]:
+    """증분 조회 시작 시각 = 커서 - 안전 겹침 (로컬 naive, provider 의 datetime.now() 와 같은 기준).
+
+    커서가 없으면 None — provider 기본 구간(최근 1일)으로 조회.
+    """
+    cursor = db.query(NaverSyncCursor).filter(NaverSyncCursor.source == source).first()
+    if not cursor or not cursor.last_fetched_at:
+        return None
+    last = cursor.last_fetched_at
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=timezone.utc)
+    since = last - timedelta(minutes=settings.NAVER_SYNC_OVERLAP_MINUTES)
+    return since.astimezone().replace(tzinfo=None)
+
+
+def _advance_cursor(db: Session, source: str, fetched_at: datetime) -> None:
+    """동기화 성공 후 커서 전진 (조회 시작 시각 기준 — 조회 중 들어온 예약은 다음 회차 겹침 구간에 포함)."""
+    cursor = db.query(NaverSyncCursor).filter(NaverSyncCursor.source == source).first()
+    if cursor is None:
+        db.add(NaverSyncCursor(source=source, last_fetched_at=fetched_at))
+    else:
+        cursor.last_fetched_at = fetched_at
+    db.commit()
+    diag("naver_sync.cursor_advanced", level="verbose", source=source, fetched_at=fetched_at.isoformat())
+
+
+def _booking_hash(res_data: Dict[str, Any], enrichment_inputs: tuple) -> str:
+    """예약 내용 해시 — raw_data(원본 응답, DB 미저장)는 제외."""
+    payload = {k: v for k, v in res_data.items() if k != "raw_data"}
+    blob = json.dumps([payload, list(enrichment_inputs)], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _skip_unchanged_bookings(
+    db: Session,
+    reservations: List[Dict[str, Any]],
+    source: str,
+    enrichment_inputs,
+) -> tuple:
+    """해시가 저장값과 같고 DB 에 예약 row 가 있는 예약을 제외.
+
+    Returns: (처리할 reservations, {external_id: 새 해시} — 처리 대상만)
+    """
+    hashes: Dict[str, str] = {}
+    for res_data in reservations:
+        ext_id = res_data.get("external_id") or res_data.get("naver_booking_id")
+        if ext_id:
+            hashes[ext_id] = _booking_hash(res_data, enrichment_inputs(res_data.get("naver_biz_item_id", "")))
+    if not hashes:
+        return reservations, hashes
+
+    stored = {
+        row.external_id: row.content_hash
+        for row in db.query(NaverBookingHash).filter(
+            NaverBookingHash.source == source,
+            NaverBookingHash.external_id.in_(list(hashes)),
+        ).all()
+    }
+    same = {ext for ext, h in hashes.items() if stored.get(ext) == h}
+    if same:
+        # 해시만 남고 예약 row 가 사라진 경우(수동 삭제 등)는 다시 생성해야 하므로 제외 대상에서 뺀다
+        present = {
+            ext for (ext,) in db.query(Reservation.external_id).filter(Reservation.external_id.in_(list(same))).all()
+        }
+        same &= present
+
+    changed = []
+    for res_data in reservations:
+        ext_id = res_data.get("external_id") or res_data.get("naver_booking_id")
+        if ext_id in same:
+            hashes.pop(ext_id, None)
+        else:
+            changed.append(res_data)
+    if same:
+        logger.info(f"Incremental sync: {len(same)} unchanged bookings skipped, {len(changed)} to apply")
+    return changed, hashes
+
+
+def _store_booking_hashes(db: Session, source: str, hashes: Dict[str, str]) -> None:
+    """반영 완료된 예약들의 해시 upsert."""
+    existing = {
+        row.external_id: row
+        for row in db.query(NaverBookingHash).filter(
+            NaverBookingHash.source == source,
+            NaverBookingHash.external_id.in_(list(hashes)),
+        ).all()
+    }
+    for ext_id, h in hashes.items():
+        row = existing.get(ext_id)
+        if row is None:
+            db.add(NaverBookingHash(source=source, external_id=ext_id, content_hash=h))
+        elif row.content_hash != h:
+            row.content_hash = h
+
+
 def _align_bed_orders_for_groups(db: Session):
     """연박 그룹 내 같은 방 배정의 bed_order를 통일한다.
 
@@ -559,6 +812,91 @@ def _split_multi_room_reservations(
     return reservations + extras
 
 
+# 바뀌면 _update_reservation 의 후처리(날짜 reconcile, 제약 재검증, SMS 칩 재동기화)가 필요한 필드
+_SIDE_EFFECT_FIELDS = (
+    "check_in_date", "check_out_date",
+    "male_count", "female_count", "party_size", "gender",
+    "naver_room_type",
+)
+
+
+def _needs_full_update(existing: Reservation, values: Dict[str, Any]) -> bool:
+    """컬럼 값만 바꾸면 되는지(False) / _update_reservation 의 부수효과가 필요한지(True)."""
+    if values.get("status") == ReservationStatus.CANCELLED:
+        return True  # 취소 정리(배정 해제/칩 삭제/연박 해제)는 매 sync 마다 멱등 실행
+    return any(key in values and values[key] != getattr(existing, key) for key in _SIDE_EFFECT_FIELDS)
+
+
+def _has_valid_dates(res_data: Dict[str, Any]) -> bool:
+    """date(필수) / end_date(있으면) 가 DateString 으로 바인딩 가능한 'YYYY-MM-DD' 인지."""
+    for key, required in (("date", True), ("end_date", False)):
+        value = res_data.get(key)
+        if not value:
+            if required:
+                return False
+            continue
+        try:
+            date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return False
+    return True
+
+
+def _reservation_row(res_data: Dict[str, Any], tenant_id: Optional[int]) -> Dict[str, Any]:
+    """_create_reservation 과 같은 규칙으로 INSERT 용 row dict (attribute 키) 생성."""
+    reservation = _create_reservation(res_data)
+    row = {
+        attr.key: getattr(reservation, attr.key)
+        for attr in Reservation.__mapper__.column_attrs
+        if attr.key in reservation.__dict__
+    }
+    row["tenant_id"] = tenant_id
+    return row
+
+
+def _reservation_insert(dialect_name: str):
+    """_bulk_insert_reservations 의 INSERT 문. RETURNING (id, inserted).
+
+    PostgreSQL: ON CONFLICT (tenant_id, external_id) 이면 값은 바꾸지 않고 (no-op SET) 기존 id 를
+      돌려받는다 — inserted = (xmax = 0). 로컬 관리 필드(section, 메모 등)를 덮어쓰지 않도록
+      네이버 필드 반영은 호출자가 기존 예약 갱신 규칙(_update_reservation)으로 한다.
+    그 외(SQLite): 충돌 처리 없음 — 전부 inserted
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        stmt = pg_insert(Reservation)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tenant_id", "external_id"],
+            set_={"external_id": stmt.excluded.external_id},
+        )
+        inserted = literal_column("(xmax = 0)")
+    else:
+        stmt = insert(Reservation)
+        inserted = true()
+    return stmt.returning(Reservation.id, inserted.label("inserted"), sort_by_parameter_order=True)
+
+
+def _bulk_insert_reservations(db: Session, rows: List[Dict[str, Any]]) -> List[Tuple[int, bool]]:
+    """신규 예약 일괄 INSERT (executemany 1회) — 입력 순서대로 (id, inserted).
+
+    inserted=False: 동시 sync 가 먼저 넣은 같은 external_id 예약 (PostgreSQL, 값 변경 없음).
+    """
+    stmt = _reservation_insert(db.get_bind().dialect.name)
+    return [(row.id, bool(row.inserted)) for row in db.execute(stmt, rows)]
+
+
+def _bulk_update_reservations(db: Session, updates: List[tuple]) -> None:
+    """(existing, {attr: 새 값}) 목록을 PK 기준 bulk UPDATE 로 반영 — 세션 객체도 같은 값으로 맞춤."""
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(Reservation),
+        [{"id": existing.id, **changed, "updated_at": now} for existing, changed in updates],
+    )
+    for existing, changed in updates:
+        for key, value in {**changed, "updated_at": now}.items():
+            set_committed_value(existing, key, value)
+
+
 def _create_reservation(res_data: Dict[str, Any]) -> Reservation:
     """Create a new Reservation from Naver API data."""
     try:
@@ -585,7 +923,8 @@ def _create_reservation(res_data: Dict[str, Any]) -> Reservation:
         phone=res_data.get("phone", ""),
         visitor_name=res_data.get("visitor_name"),
         visitor_phone=res_data.get("visitor_phone"),
-        check_in_date=res_data.get("date", ""),
+        naver_user_id=res_data.get("user_id") or None,
+        check_in_date=res_data["date"],  # 날짜 없는 예약은 _apply_naver_reservations 가 미리 제외
         check_in_time=res_data.get("time", ""),
         status=status_enum,
         booking_source=res_data.get("_booking_source_override", "naver"),
@@ -611,70 +950,79 @@ def _create_reservation(res_data: Dict[str, Any]) -> Reservation:
     return reservation
 
 
-def _update_reservation(db: Session, existing: Reservation, res_data: Dict[str, Any]):
-    """[Phase 2] 기존 예약 갱신. 성별 인원은 gender_manual=False일 때만 재계산."""
-    # Phase 2-5c: 제약 관련 필드의 이전 값 캡처 (invariant 재검증에 사용)
-    old_male = existing.male_count
-    old_female = existing.female_count
-    old_party_size = existing.party_size
-    old_gender = existing.gender
-    # F1: SMS 칩 영향 필드 변경 감지용 (reservations.py::PATCH _SMS_TAG_FIELDS 와 동일 규약)
-    old_naver_room_type = existing.naver_room_type
+def _naver_field_values(existing: Reservation, res_data: Dict[str, Any]) -> Dict[str, Any]:
+    """[Phase 2] 네이버 데이터로 덮어쓸 컬럼 값 (attribute → 새 값). 부수효과 없음.
+
+    _update_reservation(ORM 갱신)과 bulk 경로(_bulk_update_plan)가 같은 규칙을 쓰도록 분리.
+    """
+    values: Dict[str, Any] = {}
 
     # split 정책: 일반실(매핑된 biz_item)의 primary 는 booking_count/total_price/party_size 가
     # split 시 분할된 값이라 네이버 원본값으로 덮어쓰면 sibling 들과 합계 어긋남.
     # 도미토리(booking_count=인원수 의미)와 매핑 없는 정체불명 상품은 네이버 원본 그대로.
     is_split_managed = (not res_data.get("_is_dormitory")) and res_data.get("_has_room_link")
 
-    # Only update fields that come from Naver (don't overwrite local edits like room_number)
-    existing.customer_name = res_data.get("customer_name", existing.customer_name)
-    existing.phone = res_data.get("phone", existing.phone)
-    existing.visitor_name = res_data.get("visitor_name", existing.visitor_name)
-    existing.visitor_phone = res_data.get("visitor_phone", existing.visitor_phone)
-    existing.naver_biz_item_id = res_data.get("naver_biz_item_id", existing.naver_biz_item_id)
-    existing.naver_room_type = res_data.get("room_type", existing.naver_room_type)
+    values["customer_name"] = res_data.get("customer_name", existing.customer_name)
+    values["phone"] = res_data.get("phone", existing.phone)
+    values["visitor_name"] = res_data.get("visitor_name", existing.visitor_name)
+    values["visitor_phone"] = res_data.get("visitor_phone", existing.visitor_phone)
+    if res_data.get("user_id"):
+        values["naver_user_id"] = res_data["user_id"]
+    values["naver_biz_item_id"] = res_data.get("naver_biz_item_id", existing.naver_biz_item_id)
+    values["naver_room_type"] = res_data.get("room_type", existing.naver_room_type)
     if not is_split_managed:
-        existing.party_size = res_data.get("people_count", existing.party_size)
-    old_date = existing.check_in_date
-    old_end_date = existing.check_out_date
-    existing.check_in_date = res_data.get("date", existing.check_in_date)
-    existing.check_in_time = res_data.get("time", existing.check_in_time)
-    existing.check_out_date = res_data.get("end_date", existing.check_out_date)
-    existing.biz_item_name = res_data.get("biz_item_name", existing.biz_item_name)
+        values["party_size"] = res_data.get("people_count", existing.party_size)
+    values["check_in_date"] = res_data.get("date", existing.check_in_date)
+    values["check_in_time"] = res_data.get("time", existing.check_in_time)
+    values["check_out_date"] = res_data.get("end_date", existing.check_out_date)
+    values["biz_item_name"] = res_data.get("biz_item_name", existing.biz_item_name)
     if not is_split_managed:
-        existing.booking_count = res_data.get("booking_count", existing.booking_count)
-    existing.booking_options = res_data.get("booking_options", existing.booking_options)
-    existing.special_requests = res_data.get("custom_form_input", existing.special_requests)
+        values["booking_count"] = res_data.get("booking_count", existing.booking_count)
+    values["booking_options"] = res_data.get("booking_options", existing.booking_options)
+    values["special_requests"] = res_data.get("custom_form_input", existing.special_requests)
     if not is_split_managed:
-        existing.total_price = res_data.get("total_price", existing.total_price)
-    existing.confirmed_at = _parse_datetime(res_data.get("confirmed_at")) if res_data.get("confirmed_at") is not None else existing.confirmed_at
-    existing.cancelled_at = _parse_datetime(res_data.get("cancelled_at")) if res_data.get("cancelled_at") is not None else existing.cancelled_at
+        values["total_price"] = res_data.get("total_price", existing.total_price)
+    values["confirmed_at"] = _parse_datetime(res_data.get("confirmed_at")) if res_data.get("confirmed_at") is not None else existing.confirmed_at
+    values["cancelled_at"] = _parse_datetime(res_data.get("cancelled_at")) if res_data.get("cancelled_at") is not None else existing.cancelled_at
     if res_data.get("gender"):
-        existing.gender = res_data["gender"]
+        values["gender"] = res_data["gender"]
     if res_data.get("age_group"):
-        existing.age_group = res_data["age_group"]
+        values["age_group"] = res_data["age_group"]
     if res_data.get("visit_count"):
-        existing.visit_count = res_data["visit_count"]
+        values["visit_count"] = res_data["visit_count"]
     # 성별 인원 재계산: 도미토리는 매 동기화마다, 일반실은 초기화 시에만
     if not existing.gender_manual:
         is_dormitory = res_data.get("_is_dormitory", False)
-        if is_dormitory:
-            # 도미토리: booking_count + gender로 항상 재계산
-            male_count, female_count = _init_gender_counts(res_data)
-            existing.male_count = male_count
-            existing.female_count = female_count
-        elif existing.male_count is None and existing.female_count is None:
-            # 일반실: 최초 세팅 시에만
-            male_count, female_count = _init_gender_counts(res_data)
-            existing.male_count = male_count
-            existing.female_count = female_count
-
-    # Update status based on Naver status
+        if is_dormitory or (existing.male_count is None and existing.female_count is None):
+            values["male_count"], values["female_count"] = _init_gender_counts(res_data)
+
     naver_status = res_data.get("status", "confirmed")
     if naver_status == "confirmed":
-        existing.status = ReservationStatus.CONFIRMED
+        values["status"] = ReservationStatus.CONFIRMED
     elif naver_status == "cancelled":
-        existing.status = ReservationStatus.CANCELLED
+        values["status"] = ReservationStatus.CANCELLED
+    return values
+
+
+def _update_reservation(db: Session, existing: Reservation, res_data: Dict[str, Any]):
+    """[Phase 2] 기존 예약 갱신. 성별 인원은 gender_manual=False일 때만 재계산."""
+    # Phase 2-5c: 제약 관련 필드의 이전 값 캡처 (invariant 재검증에 사용)
+    old_male = existing.male_count
+    old_female = existing.female_count
+    old_party_size = existing.party_size
+    old_gender = existing.gender
+    # F1: SMS 칩 영향 필드 변경 감지용 (reservations.py::PATCH _SMS_TAG_FIELDS 와 동일 규약)
+    old_naver_room_type = existing.naver_room_type
+
+    old_date = existing.check_in_date
+    old_end_date = existing.check_out_date
+
+    # Only update fields that come from Naver (don't overwrite local edits like room_number)
+    for key, value in _naver_field_values(existing, res_data).items():
+        setattr(existing, key, value)
+
+    # 취소 처리: 배정/칩/연박 그룹 정리
+    if res_data.get("status", "confirmed") == "cancelled":
         today_str = datetime.now(KST).strftime("%Y-%m-%d")
         check_in_str = str(existing.check_in_date) if existing.check_in_date else ""
         is_same_day_cancel = (check_in_str == today_str)
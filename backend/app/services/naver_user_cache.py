@@ -0,0 +1,177 @@
+"""
+네이버 user-info 캐시 — 성별/연령대/방문횟수 TTL 캐시 (naver_user_infos 테이블).
+
+재방문 고객의 user-info 가 하루에도 수십 번 재조회되던 것을 줄인다.
+- 키: (tenant, business_id, naver userId). 테넌트는 current_tenant_id ContextVar 기준
+  (tenant 컨텍스트 밖이면 캐시 미사용 → 기존처럼 전부 API 조회)
+- 성공: settings.NAVER_USER_INFO_TTL_HOURS 동안 재사용
+- 실패(negative): settings.NAVER_USER_INFO_NEGATIVE_TTL_MINUTES 동안 재조회 안 함
+- warm_user_info_cache(): 기존 Reservation 의 naver_user_id/성별/연령대로 캐시 채우기
+  (배포 직후 1회 — scripts/warm_naver_user_cache.py)
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.executor import run_db
+from app.db.models import NaverUserInfo, Reservation, Tenant
+from app.db.tenant_context import current_tenant_id
+
+logger = logging.getLogger(__name__)
+
+
+def cache_enabled() -> bool:
+    return current_tenant_id.get() is not None and settings.NAVER_USER_INFO_TTL_HOURS > 0
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _row_to_info(row: NaverUserInfo) -> Dict[str, Any]:
+    visit_count = row.visit_count or 0
+    return {
+        "age_group": row.age_group or "",
+        "gender": row.gender or "",
+        "visit_count": visit_count,
+        "summary": f"{visit_count}번/{row.age_group or ''}{row.gender or ''}",
+    }
+
+
+def _load(business_id: str, user_ids: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """만료 안 된 캐시 조회 → (hits {uid: info}, negative_hits {uid})."""
+    ids = list(user_ids)
+    if not ids:
+        return {}, set()
+    now = datetime.now(timezone.utc)
+    positive_after = now - timedelta(hours=settings.NAVER_USER_INFO_TTL_HOURS)
+    negative_after = now - timedelta(minutes=settings.NAVER_USER_INFO_NEGATIVE_TTL_MINUTES)
+
+    hits: Dict[str, Dict[str, Any]] = {}
+    negative: Set[str] = set()
+    db = SessionLocal()
+    try:
+        rows = db.query(NaverUserInfo).filter(
+            NaverUserInfo.business_id == business_id,
+            NaverUserInfo.naver_user_id.in_(ids),
+        ).all()
+        for row in rows:
+            fetched_at = _as_utc(row.fetched_at)
+            if row.is_negative:
+                if fetched_at > negative_after:
+                    negative.add(row.naver_user_id)
+            elif fetched_at > positive_after:
+                hits[row.naver_user_id] = _row_to_info(row)
+    finally:
+        db.close()
+    return hits, negative
+
+
+def _store(business_id: str, results: Dict[str, Optional[Dict[str, Any]]]) -> None:
+    """API 조회 결과 upsert (None = 실패 → negative)."""
+    if not results:
+        return
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        existing = {
+            row.naver_user_id: row
+            for row in db.query(NaverUserInfo).filter(
+                NaverUserInfo.business_id == business_id,
+                NaverUserInfo.naver_user_id.in_(list(results)),
+            ).all()
+        }
+        for uid, info in results.items():
+            row = existing.get(uid)
+            if row is None:
+                row = NaverUserInfo(business_id=business_id, naver_user_id=uid)
+                db.add(row)
+            row.is_negative = info is None
+            row.fetched_at = now
+            if info is not None:
+                # 실패(negative) 시에는 이전 값을 지우지 않는다 — 다음 성공 조회에서 갱신
+                row.gender = info.get("gender") or None
+                row.age_group = info.get("age_group") or None
+                row.visit_count = info.get("visit_count")
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"naver user-info cache store failed (ignored): {e}")
+    finally:
+        db.close()
+
+
+async def get_cached_user_infos(business_id: str, user_ids: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """(hits, negative_hits). 캐시 비활성/오류 시 빈 결과 — 호출자는 전부 API 조회."""
+    if not cache_enabled():
+        return {}, set()
+    try:
+        return await run_db(_load, business_id, list(user_ids))
+    except Exception as e:
+        logger.warning(f"naver user-info cache load failed (ignored): {e}")
+        return {}, set()
+
+
+async def store_user_infos(business_id: str, results: Dict[str, Optional[Dict[str, Any]]]) -> None:
+    if cache_enabled() and results:
+        await run_db(_store, business_id, results)
+
+
+def warm_user_info_cache(db: Session, tenant: Tenant) -> int:
+    """기존 예약(naver_user_id 보유, 성별 수동편집 아님)의 최신 값으로 비어 있는 캐시 행을 채운다.
+
+    fetched_at 은 warm-up 시각 — 채운 행은 TTL 동안 재사용되고, 그 뒤 다음 sync 에서 재조회된다.
+    Returns: 추가한 행 수
+    """
+    latest = (
+        db.query(
+            Reservation.naver_user_id,
+            Reservation.section,
+            func.max(Reservation.id).label("rid"),
+        )
+        .filter(
+            Reservation.naver_user_id.isnot(None),
+            Reservation.gender.isnot(None),
+            Reservation.gender_manual.isnot(True),
+        )
+        .group_by(Reservation.naver_user_id, Reservation.section)
+        .subquery()
+    )
+    rows = (
+        db.query(Reservation)
+        .join(latest, Reservation.id == latest.c.rid)
+        .order_by(Reservation.id.desc())  # 같은 업체에 여러 section 행이면 최신 예약 우선
+        .all()
+    )
+
+    existing = {
+        (r.business_id, r.naver_user_id)
+        for r in db.query(NaverUserInfo.business_id, NaverUserInfo.naver_user_id).all()
+    }
+    now = datetime.now(timezone.utc)
+    added = 0
+    for res in rows:
+        business_id = tenant.unstable_business_id if res.section == "unstable" else tenant.naver_business_id
+        if not business_id or (business_id, res.naver_user_id) in existing:
+            continue
+        existing.add((business_id, res.naver_user_id))
+        db.add(NaverUserInfo(
+            tenant_id=tenant.id,
+            business_id=business_id,
+            naver_user_id=res.naver_user_id,
+            gender=res.gender,
+            age_group=res.age_group,
+            visit_count=res.visit_count,
+            is_negative=False,
+            fetched_at=now,
+        ))
+        added += 1
+    if added:
+        db.commit()
+    logger.info(f"[{tenant.slug}] naver user-info cache warmed: {added} rows")
+    return added
@@ -0,0 +1,140 @@
+"""
+Occupancy grid — 자동 배정 1회 실행 동안 쓰는 (room × date) 점유 인덱스.
+
+auto-assign 이 후보 예약 × 후보 방마다 "이 방이 [in, out) 전 박에 비어 있나?" 를
+SQL(일반실: 날짜별 COUNT, 도미토리: GROUP BY + 성별 조회)로 묻던 것을 대체한다.
+윈도우 내 RoomAssignment+Reservation 을 쿼리 1번으로 읽어 메모리에 올리고,
+배정 결정 시 place() 로 격자를 갱신한다 → 탐색 중 추가 쿼리 없음.
+
+판정 규칙은 room_assignment.check_capacity_all_dates / 기존 도미토리 성별 잠금과 동일:
+- 일반실: 용량 1 — 다른 예약이 하루라도 있으면 불가
+- 도미토리: 날짜별 점유 인원(party_size → booking_count → 1) + 신규 인원 <= bed_capacity
+- 성별 잠금: 도미토리 체류 구간에 성별이 다른 점유자가 있으면 불가 (성별 미상은 무시)
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.db.models import Reservation, RoomAssignment, Room
+
+Cell = Tuple[int, str]  # (room_id, date)
+
+
+class OccupancyGrid:
+    """room × date 점유 현황 (reservation_id 별 인원/성별)."""
+
+    def __init__(self, rooms: Iterable[Room]):
+        self.rooms: Dict[int, Room] = {r.id: r for r in rooms}
+        # (room_id, date) → {reservation_id: (인원, 성별)}
+        self._cells: Dict[Cell, Dict[int, Tuple[int, str]]] = defaultdict(dict)
+
+    @classmethod
+    def load(cls, db: Session, rooms: Iterable[Room], dates: Iterable[str]) -> "OccupancyGrid":
+        """rooms × dates 윈도우의 기존 배정을 쿼리 1번으로 적재."""
+        grid = cls(rooms)
+        dates = sorted(set(dates))
+        if not grid.rooms or not dates:
+            return grid
+        rows = (
+            db.query(
+                RoomAssignment.room_id,
+                RoomAssignment.date,
+                RoomAssignment.reservation_id,
+                Reservation.party_size,
+                Reservation.booking_count,
+                Reservation.gender,
+            )
+            .join(Reservation, and_(
+                RoomAssignment.reservation_id == Reservation.id,
+                RoomAssignment.tenant_id == Reservation.tenant_id,
+            ))
+            .filter(
+                RoomAssignment.room_id.in_(list(grid.rooms)),
+                RoomAssignment.date >= dates[0],
+                RoomAssignment.date <= dates[-1],
+            )
+            .all()
+        )
+        for room_id, date, res_id, party_size, booking_count, gender in rows:
+            grid._cells[(room_id, date)][res_id] = (_occupant_count(party_size, booking_count), (gender or "").strip())
+        return grid
+
+    def has_capacity(
+        self,
+        room_id: int,
+        dates: List[str],
+        people_count: int = 1,
+        exclude_reservation_id: Optional[int] = None,
+    ) -> bool:
+        room = self.rooms.get(room_id)
+        if room is None:
+            return False
+        if room.is_dormitory:
+            capacity = room.bed_capacity
+            for d in dates:
+                occupancy = sum(
+                    count for rid, (count, _) in self._cells.get((room_id, d), {}).items()
+                    if rid != exclude_reservation_id
+                )
+                if occupancy + people_count > capacity:
+                    return False
+        else:
+            for d in dates:
+                if any(rid != exclude_reservation_id for rid in self._cells.get((room_id, d), {})):
+                    return False
+        return True
+
+    def gender_conflict(self, room_id: int, dates: List[str], gender: str) -> bool:
+        gender = (gender or "").strip()
+        if not gender:
+            return False
+        for d in dates:
+            for _, other in self._cells.get((room_id, d), {}).values():
+                if other and other != gender:
+                    return True
+        return False
+
+    def place(self, room_id: int, dates: List[str], reservation: Reservation) -> List[Tuple[Cell, Optional[Tuple[int, str]]]]:
+        """배정 결정 반영 — 같은 예약의 해당 날짜 기존 점유(다른 방 포함)는 이동으로 간주해 제거
+        (assign_room 이 구간 내 기존 배정을 지우는 것과 동일).
+
+        Returns: undo() 로 되돌리기 위한 변경 기록
+        """
+        changes: List[Tuple[Cell, Optional[Tuple[int, str]]]] = []
+        date_set: Set[str] = set(dates)
+        for cell, occupants in self._cells.items():
+            if cell[1] in date_set and cell[0] != room_id and reservation.id in occupants:
+                changes.append((cell, occupants.pop(reservation.id)))
+        entry = (_occupant_count(reservation.party_size, reservation.booking_count), (reservation.gender or "").strip())
+        for d in dates:
+            cell = (room_id, d)
+            changes.append((cell, self._cells[cell].get(reservation.id)))
+            self._cells[cell][reservation.id] = entry
+        return changes
+
+    def undo(self, reservation_id: int, changes: List[Tuple[Cell, Optional[Tuple[int, str]]]]) -> None:
+        """place() 되돌리기 (탐색형 solver 의 backtracking 용)."""
+        for cell, previous in reversed(changes):
+            if previous is None:
+                self._cells[cell].pop(reservation_id, None)
+            else:
+                self._cells[cell][reservation_id] = previous
+
+    def adopt(self, other: "OccupancyGrid") -> None:
+        """다른 격자(copy 후 solver 가 갱신한 것)의 점유 상태로 교체."""
+        self._cells = defaultdict(dict, {cell: dict(occupants) for cell, occupants in other._cells.items()})
+
+    def copy(self) -> "OccupancyGrid":
+        clone = OccupancyGrid(self.rooms.values())
+        for cell, occupants in self._cells.items():
+            clone._cells[cell] = dict(occupants)
+        return clone
+
+
+def _occupant_count(party_size: Optional[int], booking_count: Optional[int]) -> int:
+    """점유 인원 — check_capacity_all_dates 의 SQL coalesce(party_size, booking_count, 1) 와 동일 (0 은 0)."""
+    if party_size is not None:
+        return party_size
+    return booking_count if booking_count is not None else 1
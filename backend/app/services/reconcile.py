@@ -35,7 +35,7 @@ def reconcile_all_chips(
     """
     # 순환 import 회피용 지연 import
     from app.services.room_assignment import sync_sms_tags
-    from app.services.surcharge import reconcile_surcharge
+    from app.services.surcharge import reconcile_surcharge_pairs
     from app.services.party3_mms import reconcile_party3_mms_for_reservation
 
     res = db.query(Reservation).filter(Reservation.id == reservation_id).first()
@@ -62,13 +62,15 @@ def reconcile_all_chips(
             f"reconcile_all_chips: sync_sms_tags failed for res={reservation_id}: {e}"
         )
 
+    # surcharge: 전 날짜를 한 번에 (쿼리 수가 날짜 수와 무관)
+    try:
+        reconcile_surcharge_pairs(db, [(reservation_id, d) for d in target_dates], room_id=room_id)
+    except Exception as e:
+        logger.warning(
+            f"reconcile_all_chips: surcharge failed res={reservation_id}: {e}"
+        )
+
     for d in target_dates:
-        try:
-            reconcile_surcharge(db, reservation_id, d, room_id=room_id)
-        except Exception as e:
-            logger.warning(
-                f"reconcile_all_chips: surcharge failed res={reservation_id} date={d}: {e}"
-            )
         try:
             reconcile_party3_mms_for_reservation(db, reservation_id, d)
         except Exception as e:
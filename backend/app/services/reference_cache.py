@@ -0,0 +1,340 @@
+"""
+Reference-data cache — 테넌트별 rooms / buildings / biz items / 활성 스케줄 read-through 캐시.
+
+객실·건물·네이버 상품·활성 TemplateSchedule 은 거의 바뀌지 않는데 sync / 자동 배정 /
+변수 계산 / 예약 목록 / 칩 reconcile 이 호출될 때마다 다시 조회하고 있었다.
+
+- 키: (engine, tenant, kind). 테넌트 컨텍스트 밖이면 캐시 미사용 → 기존처럼 직접 조회
+- 버전: 테넌트별 정수. 해당 모델(Room, RoomBizItemLink, Building, NaverBizItem,
+  TemplateSchedule, MessageTemplate)이 flush / bulk update·delete 되면 +1,
+  commit / rollback 시 한 번 더 +1 (다른 세션이 flush~commit 사이에 옛 값을 채운 경우 대비).
+  api/rooms.py · buildings.py · template_schedules.py · templates.py 의 쓰기 경로는
+  모두 세션을 거치므로 별도 호출 없이 무효화된다.
+- 프로세스 간: settings.REDIS_URL 이 있으면 버전 증가를 pub/sub 로 전파
+  (start_invalidation_listener — main.py startup). 메시지 유실 대비 REFERENCE_CACHE_TTL_SECONDS.
+- 캐시 값은 세션에 속하지 않은 detached 복사본 (app/db/detached). 조회 시 호출자 세션의
+  identity map 에 이미 있으면 그 객체를, 없으면 merge(load=False) 로 붙인다 → SQL 없음.
+- 통계: reference_cache_stats() — kind 별 hits / misses, invalidations
+"""
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.config import settings
+from app.db.detached import attach, detached_copy
+from app.db.models import Building, MessageTemplate, NaverBizItem, Room, RoomBizItemLink, TemplateSchedule
+from app.db.tenant_context import current_tenant_id
+from app.diag_logger import diag
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL = "reference_cache:invalidate"
+_ORIGIN = f"{os.getpid()}-{id(object())}"
+_WATCHED = (Room, RoomBizItemLink, Building, NaverBizItem, TemplateSchedule, MessageTemplate)
+_PENDING_KEY = "_reference_cache_tenants"
+
+# 복사본에 함께 담을 (eager 로드된) 관계
+_FOLLOW: Dict[type, Tuple[str, ...]] = {
+    Room: ("biz_item_links", "building"),
+    TemplateSchedule: ("template",),
+}
+
+_lock = threading.Lock()
+_versions: Dict[int, int] = {}
+# engine → {(tenant_id, kind): (version, loaded_at, {"list": [...], "by_id": {...}})}
+_entries: "weakref.WeakKeyDictionary[Any, Dict[Tuple[int, str], Tuple[int, float, Dict[str, Any]]]]" = weakref.WeakKeyDictionary()
+_stats: Dict[str, Dict[str, int]] = {}
+_invalidations = {"local": 0, "remote": 0}
+_listener: Dict[str, Any] = {"thread": None, "pubsub": None}
+_client: Dict[str, Any] = {"redis": None}  # 프로세스당 1개 — 커넥션 풀을 publish / 구독이 공유
+
+
+# ---------------------------------------------------------------------------
+# Loaders
+# ---------------------------------------------------------------------------
+
+def _load_rooms(db: Session) -> List[Room]:
+    return (
+        db.query(Room)
+        .options(selectinload(Room.biz_item_links), joinedload(Room.building))
+        .order_by(Room.sort_order, Room.id)
+        .all()
+    )
+
+
+def _load_buildings(db: Session) -> List[Building]:
+    return db.query(Building).order_by(Building.sort_order, Building.id).all()
+
+
+def _load_biz_items(db: Session) -> List[NaverBizItem]:
+    return db.query(NaverBizItem).all()
+
+
+def _load_active_schedules(db: Session) -> List[TemplateSchedule]:
+    return (
+        db.query(TemplateSchedule)
+        .options(joinedload(TemplateSchedule.template))
+        .filter(TemplateSchedule.is_active == True)
+        .order_by(TemplateSchedule.id)
+        .all()
+    )
+
+
+_LOADERS: Dict[str, Callable[[Session], List[Any]]] = {
+    "rooms": _load_rooms,
+    "buildings": _load_buildings,
+    "biz_items": _load_biz_items,
+    "active_schedules": _load_active_schedules,
+}
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def get_rooms(db: Session) -> List[Room]:
+    """전체 객실 (비활성 포함, sort_order 순). biz_item_links / building 로드됨."""
+    return _get_list(db, "rooms")
+
+
+def get_room(db: Session, room_id: Optional[int]) -> Optional[Room]:
+    return _get_one(db, "rooms", room_id)
+
+
+def get_building(db: Session, building_id: Optional[int]) -> Optional[Building]:
+    return _get_one(db, "buildings", building_id)
+
+
+def get_biz_items(db: Session) -> List[NaverBizItem]:
+    return _get_list(db, "biz_items")
+
+
+def get_active_schedules(db: Session) -> List[TemplateSchedule]:
+    """is_active 스케줄 전체 (id 순). template 로드됨."""
+    return _get_list(db, "active_schedules")
+
+
+def invalidate(tenant_id: Optional[int] = None, publish: bool = True) -> None:
+    """테넌트 캐시 버전 +1 (None 이면 전 테넌트). publish=True 면 다른 프로세스에도 전파."""
+    with _lock:
+        _bump(tenant_id)
+        _invalidations["local"] += 1
+    if publish:
+        _publish(tenant_id)
+
+
+def clear() -> None:
+    """캐시/버전/통계 초기화 (테스트용)."""
+    with _lock:
+        _entries.clear()
+        _versions.clear()
+        _stats.clear()
+        _invalidations.update(local=0, remote=0)
+
+
+def reference_cache_stats() -> Dict[str, Any]:
+    """kind 별 hits / misses / hit_rate + 무효화 횟수 (복사본)."""
+    with _lock:
+        kinds = {}
+        for kind, s in _stats.items():
+            total = s["hits"] + s["misses"]
+            kinds[kind] = {**s, "hit_rate": round(s["hits"] / total, 3) if total else 0.0}
+        return {"kinds": kinds, "invalidations": dict(_invalidations)}
+
+
+# ---------------------------------------------------------------------------
+# Read-through
+# ---------------------------------------------------------------------------
+
+def _get_list(db: Session, kind: str) -> List[Any]:
+    payload = _payload(db, kind)
+    if payload is None:
+        return _LOADERS[kind](db)
+    if payload.get("fresh"):
+        return payload["fresh"]
+    return [attach(db, obj) for obj in payload["list"]]
+
+
+def _get_one(db: Session, kind: str, obj_id: Optional[int]) -> Optional[Any]:
+    if obj_id is None:
+        return None
+    payload = _payload(db, kind)
+    if payload is None:
+        return next((obj for obj in _LOADERS[kind](db) if obj.id == obj_id), None)
+    if payload.get("fresh"):
+        return next((obj for obj in payload["fresh"] if obj.id == obj_id), None)
+    cached = payload["by_id"].get(obj_id)
+    return attach(db, cached) if cached is not None else None
+
+
+def _payload(db: Session, kind: str) -> Optional[Dict[str, Any]]:
+    """캐시 payload. miss 면 호출자 세션으로 조회해 저장하고 {"fresh": 조회 결과} 를 함께 돌려준다.
+
+    테넌트 컨텍스트 밖이면 None (캐시 미사용).
+    """
+    tid = current_tenant_id.get()
+    if tid is None:
+        return None
+    engine = _engine(db)
+    now = time.monotonic()
+    ttl = settings.REFERENCE_CACHE_TTL_SECONDS
+    with _lock:
+        version = _versions.get(tid, 0)
+        entry = _entries.get(engine, {}).get((tid, kind))
+        stat = _stats.setdefault(kind, {"hits": 0, "misses": 0})
+        if entry is not None and entry[0] == version and (ttl <= 0 or now - entry[1] < ttl):
+            stat["hits"] += 1
+            return entry[2]
+        stat["misses"] += 1
+
+    rows = _LOADERS[kind](db)
+    memo: Dict[int, Any] = {}
+    clones = [detached_copy(obj, _FOLLOW, memo) for obj in rows]
+    payload = {"list": clones, "by_id": {c.id: c for c in clones}}
+    with _lock:
+        # 조회 도중 무효화됐으면 저장하지 않음 (다음 호출이 다시 조회)
+        if _versions.get(tid, 0) == version:
+            _entries.setdefault(engine, {})[(tid, kind)] = (version, now, payload)
+    diag("reference_cache.miss", level="verbose", kind=kind, tenant_id=tid, rows=len(rows))
+    return {**payload, "fresh": rows}
+
+
+def _engine(db: Session) -> Any:
+    bind = db.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation (session events)
+# ---------------------------------------------------------------------------
+
+def _bump(tenant_id: Optional[int]) -> None:
+    if tenant_id is None:
+        for tid in list(_versions):
+            _versions[tid] += 1
+        for per_engine in list(_entries.values()):
+            per_engine.clear()
+    else:
+        _versions[tenant_id] = _versions.get(tenant_id, 0) + 1
+
+
+def _mark(session: Session, tenants) -> None:
+    if not tenants:
+        return
+    session.info.setdefault(_PENDING_KEY, set()).update(tenants)
+    for tid in tenants:
+        invalidate(tid, publish=False)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    tenants = {
+        getattr(obj, "tenant_id", None)
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, _WATCHED)
+    }
+    _mark(session, tenants)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _after_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _WATCHED):
+        _mark(orm_execute_state.session, {current_tenant_id.get()})
+
+
+def _settle(session) -> None:
+    tenants = session.info.pop(_PENDING_KEY, None)
+    for tid in tenants or ():
+        invalidate(tid)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    _settle(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    _settle(session)
+
+
+# ---------------------------------------------------------------------------
+# Cross-process (Redis pub/sub)
+# ---------------------------------------------------------------------------
+
+def _redis():
+    """공유 Redis 클라이언트 (지연 생성). 무효화 commit 마다 새 클라이언트/커넥션을 만들지 않도록."""
+    client = _client["redis"]
+    if client is None:
+        import redis
+        with _lock:
+            if _client["redis"] is None:
+                _client["redis"] = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+            client = _client["redis"]
+    return client
+
+
+def _publish(tenant_id: Optional[int]) -> None:
+    if not settings.REDIS_URL:
+        return
+    try:
+        _redis().publish(_CHANNEL, json.dumps({"tenant_id": tenant_id, "origin": _ORIGIN}))
+    except Exception as e:
+        logger.warning(f"Reference cache invalidation publish failed: {e}")
+
+
+def _apply_remote(raw: Any) -> None:
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        return
+    if message.get("origin") == _ORIGIN:
+        return
+    with _lock:
+        _bump(message.get("tenant_id"))
+        _invalidations["remote"] += 1
+
+
+def start_invalidation_listener() -> bool:
+    """REDIS_URL 이 있으면 다른 프로세스의 버전 증가를 구독하는 데몬 스레드 시작."""
+    if not settings.REDIS_URL or _listener["thread"] is not None:
+        return False
+
+    def _handle(message):
+        _apply_remote(message.get("data"))
+
+    try:
+        pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{_CHANNEL: _handle})
+    except Exception as e:
+        logger.warning(f"Reference cache invalidation listener disabled: {e}")
+        return False
+    _listener["pubsub"] = pubsub
+    _listener["thread"] = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+    logger.info("Reference cache invalidation listener started")
+    return True
+
+
+def stop_invalidation_listener() -> None:
+    thread = _listener["thread"]
+    if thread is not None:
+        thread.stop()
+    if _listener["pubsub"] is not None:
+        _listener["pubsub"].close()
+    _listener.update(thread=None, pubsub=None)
+    if _client["redis"] is not None:
+        _client["redis"].close()
+        _client["redis"] = None
+    if _stats:
+        logger.info(f"Reference cache stats: {reference_cache_stats()}")
@@ -0,0 +1,221 @@
+"""
+Reservation grid date view — GET /api/reservations?date=... 전용 조회.
+
+기존 경로는 COUNT → 페이지(selectinload 칩) → batch_room_lookup(배정+객실) → DailyInfo →
+활성 스케줄 순으로 쿼리 5~6회를 돌고, 예약마다 Pydantic 모델을 만든 뒤 칩 날짜 필터를
+Python 에서 적용했다 (일자 그리드가 가장 많이 호출되는 엔드포인트).
+
+- SQL 1회: 페이지(예약 id, keyset/offset + limit) 서브쿼리 ⋈ 예약 ⟕ 당일 배정 ⟕ 객실
+  ⟕ 당일 daily info ⟕ 표시 대상 칩. 칩 날짜 필터(_to_response 의 Phase 6 규칙)는 JOIN 조건으로
+  SQL 에서 처리. daily 템플릿 키는 reference_cache 의 활성 스케줄에서 얻음 (캐시 hit 시 쿼리 없음)
+- 결과는 ReservationResponse 와 같은 키의 dict — 호출자가 pydantic_core.to_json 으로 바로 직렬화
+- 정렬: confirmed_at DESC NULLS LAST, id DESC. cursor = 마지막 행의 (confirmed_at, id)
+- Core select 이므로 tenant 자동 필터(Query before_compile)가 적용되지 않는다 → 예약/객실에
+  tenant_id 조건을 명시. 배정·daily info·칩은 reservation_id(FK)로만 조인 — 예약이 이미 테넌트로
+  걸러졌고, tenant_id 동등 조건을 더하면 SQLite 플래너가 tenant 인덱스를 골라 칩 전체를 훑는다
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Query, Session
+
+from app.db.models import Reservation, ReservationDailyInfo, ReservationSmsAssignment, Room, RoomAssignment
+
+GRID_ORDER = (Reservation.confirmed_at.desc().nullslast(), Reservation.id.desc())
+
+_RES_COLUMNS = (
+    Reservation.id, Reservation.external_id, Reservation.customer_name, Reservation.phone,
+    Reservation.visitor_name, Reservation.visitor_phone, Reservation.check_in_date, Reservation.check_in_time,
+    Reservation.status, Reservation.notes, Reservation.booking_source, Reservation.naver_room_type,
+    Reservation.gender, Reservation.male_count, Reservation.female_count, Reservation.party_size,
+    Reservation.party_type, Reservation.check_out_date, Reservation.biz_item_name, Reservation.booking_count,
+    Reservation.booking_options, Reservation.special_requests, Reservation.total_price, Reservation.confirmed_at,
+    Reservation.cancelled_at, Reservation.section, Reservation.stay_group_id, Reservation.stay_group_order,
+    Reservation.is_long_stay, Reservation.highlight_color, Reservation.created_at, Reservation.updated_at,
+)
+_CONFIRMED_AT = [c.key for c in _RES_COLUMNS].index("confirmed_at")
+
+
+def encode_cursor(confirmed_at: Optional[datetime], reservation_id: int) -> str:
+    raw = json.dumps([confirmed_at.isoformat() if confirmed_at else None, reservation_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Raises ValueError: 형식이 잘못된 cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        confirmed_at, reservation_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(confirmed_at) if confirmed_at else None), int(reservation_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError(f"잘못된 cursor 입니다: {cursor}") from e
+
+
+def apply_cursor(query: Query, cursor: str) -> Query:
+    """GRID_ORDER 기준 cursor 다음 행부터 (keyset)."""
+    confirmed_at, reservation_id = decode_cursor(cursor)
+    if confirmed_at is None:
+        return query.filter(Reservation.confirmed_at.is_(None), Reservation.id < reservation_id)
+    return query.filter(or_(
+        Reservation.confirmed_at < confirmed_at,
+        and_(Reservation.confirmed_at == confirmed_at, Reservation.id < reservation_id),
+        Reservation.confirmed_at.is_(None),
+    ))
+
+
+def estimated_count(db: Session, query: Query) -> Optional[int]:
+    """PostgreSQL 플래너 추정 행 수 (EXPLAIN). 다른 DB 면 None → 호출자가 COUNT 사용."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    compiled = query.with_entities(Reservation.id).statement.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def date_view_items(
+    db: Session,
+    query: Query,
+    date: str,
+    tenant_id: int,
+    daily_keys: set,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    date 기준 그리드 행 (ReservationResponse 와 같은 키의 dict) + next_cursor.
+
+    Args:
+        query: 상태/검색/출처/날짜 필터가 적용된 db.query(Reservation)
+        daily_keys: target_mode 없는 활성 스케줄의 template_key (칩 날짜 필터)
+        skip: cursor 가 없을 때만 OFFSET 으로 사용 (기존 호환)
+    """
+    page_query = query.with_entities(Reservation.id).filter(Reservation.tenant_id == tenant_id)
+    if cursor:
+        page_query = apply_cursor(page_query, cursor)
+    page_query = page_query.order_by(*GRID_ORDER)
+    if skip and not cursor:
+        page_query = page_query.offset(skip)
+    page = page_query.limit(limit).subquery()
+
+    ra, room, daily, chip = RoomAssignment, Room, ReservationDailyInfo, ReservationSmsAssignment
+    chip_date = func.coalesce(chip.date, "")
+    not_daily = chip.template_key.notin_(daily_keys) if daily_keys else True
+    stmt = (
+        select(
+            *_RES_COLUMNS,
+            ra.room_id, ra.room_password, ra.assigned_by, ra.bed_order, room.room_number,
+            daily.id, daily.party_type, daily.notes, daily.unstable_party,
+            chip.id, chip.template_key, chip.assigned_at, chip.sent_at, chip.assigned_by,
+            chip.date, chip.send_status, chip.send_error,
+        )
+        .select_from(Reservation)
+        .join(page, page.c.id == Reservation.id)
+        .outerjoin(ra, and_(ra.reservation_id == Reservation.id, ra.date == date))
+        .outerjoin(room, and_(room.id == ra.room_id, room.tenant_id == ra.tenant_id))
+        .outerjoin(daily, and_(daily.reservation_id == Reservation.id, daily.date == date))
+        .outerjoin(chip, and_(
+            chip.reservation_id == Reservation.id,
+            or_(chip.assigned_by.is_(None), chip.assigned_by != "excluded"),
+            or_(
+                chip_date == date,
+                and_(chip_date < date, chip.sent_at.isnot(None), not_daily),
+                and_(chip_date > date, chip.sent_at.is_(None), not_daily),
+            ),
+        ))
+        .where(Reservation.tenant_id == tenant_id)
+        .order_by(*GRID_ORDER, chip.id)
+    )
+
+    n_res = len(_RES_COLUMNS)
+    items: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    last_key: Optional[Tuple[Optional[datetime], int]] = None
+    for row in db.execute(stmt):
+        res_id = row[0]
+        if current is None or current["id"] != res_id:
+            current = _item(row[:n_res], row[n_res:n_res + 9])
+            items.append(current)
+            last_key = (row[_CONFIRMED_AT], res_id)
+        if row[n_res + 9] is not None:
+            _, template_key, assigned_at, sent_at, assigned_by, chip_day, send_status, send_error = row[n_res + 9:]
+            current["sms_assignments"].append({
+                "template_key": template_key,
+                "assigned_at": assigned_at,
+                "sent_at": sent_at,
+                "assigned_by": assigned_by,
+                "date": chip_day or "",
+                "send_status": send_status,
+                "send_error": send_error,
+            })
+
+    # 언스테이블 예약 매칭: 페이지 안 스테이블 예약자 중 언스테이블도 예약한 사람
+    unstable_phones = {item["phone"] for item in items if item["section"] == "unstable" and item["phone"]}
+    for item in items:
+        item["has_unstable_booking"] = (
+            item["section"] != "unstable" and bool(item["phone"]) and item["phone"] in unstable_phones
+        )
+
+    next_cursor = encode_cursor(*last_key) if last_key and len(items) == limit else None
+    return items, next_cursor
+
+
+def _item(res, extra) -> Dict[str, Any]:
+    """한 예약 행 → ReservationResponse 와 같은 키 순서의 dict (칩/언스테이블 매칭 제외)."""
+    (
+        res_id, external_id, customer_name, phone, visitor_name, visitor_phone, check_in_date, check_in_time,
+        status, notes, booking_source, naver_room_type, gender, male_count, female_count, party_size,
+        party_type, check_out_date, biz_item_name, booking_count, booking_options, special_requests, total_price,
+        confirmed_at, cancelled_at, section, stay_group_id, stay_group_order, is_long_stay, highlight_color,
+        created_at, updated_at,
+    ) = res
+    room_id, room_password, room_assigned_by, bed_order, room_number, daily_id, daily_party, daily_notes, daily_unstable = extra
+    has_room = room_id is not None and room_number is not None
+    has_daily = daily_id is not None
+    return {
+        "id": res_id,
+        "external_id": external_id,
+        "customer_name": customer_name,
+        "phone": phone,
+        "visitor_name": visitor_name,
+        "visitor_phone": visitor_phone,
+        "check_in_date": check_in_date,
+        "check_in_time": check_in_time,
+        "status": status.value if hasattr(status, "value") else status,
+        "notes": daily_notes if has_daily and daily_notes is not None else notes,
+        "booking_source": booking_source,
+        "room_id": room_id if has_room else None,
+        "room_number": (room_number or "") if has_room else "",
+        "room_password": room_password if has_room else "",
+        "room_assigned_by": room_assigned_by if has_room else None,
+        "naver_room_type": naver_room_type,
+        "gender": gender,
+        "male_count": male_count,
+        "female_count": female_count,
+        "party_size": party_size,
+        "party_type": daily_party if has_daily and daily_party is not None else party_type,
+        "check_out_date": check_out_date,
+        "biz_item_name": biz_item_name,
+        "booking_count": booking_count,
+        "booking_options": booking_options,
+        "special_requests": special_requests,
+        "total_price": total_price,
+        "confirmed_at": confirmed_at,
+        "cancelled_at": cancelled_at,
+        "section": section or "unassigned",
+        "stay_group_id": stay_group_id,
+        "stay_group_order": stay_group_order,
+        "is_long_stay": bool(is_long_stay),
+        "bed_order": (bed_order or 0) if has_room else 0,
+        "unstable_party": bool(has_daily and daily_unstable),
+        "has_unstable_booking": False,
+        "highlight_color": highlight_color,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "sms_assignments": [],
+    }
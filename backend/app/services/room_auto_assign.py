@@ -6,56 +6,70 @@ Manual assignments (assigned_by='manual') are never overwritten.
 Unified assignment logic (biz_item_id mapping + capacity check + gender lock):
 - All rooms (regular and dormitory) use a single biz_item_id → rooms mapping.
 - For each unassigned reservation, candidate rooms are looked up by biz_item_id.
-- Regular rooms: one reservation per room (capacity check via check_capacity_all_dates).
+- Regular rooms: one reservation per room (capacity check via OccupancyGrid — same rule as
+  room_assignment.check_capacity_all_dates, evaluated in memory).
 - Dormitory rooms: multiple reservations per room up to bed_capacity; gender lock
   prevents mixing genders in the same room on the same date.
 """
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
-from app.config import KST
+from typing import List, Dict, Optional, Tuple
+from app.config import KST, settings
 from sqlalchemy.orm import Session
 import logging
 
-from sqlalchemy import exists, and_
-from sqlalchemy.orm import selectinload
-from app.db.models import Reservation, Room, RoomAssignment, ReservationStatus, TemplateSchedule, RoomBizItemLink
+from sqlalchemy import and_, or_
+from app.db.models import Reservation, Room, RoomAssignment, ReservationStatus, Tenant
 from app.services import room_assignment
+from app.services.occupancy_grid import OccupancyGrid
+from app.services.reference_cache import get_active_schedules, get_rooms
+from app.services.schedule_utils import date_range as _date_range
 from app.db.tenant_context import current_tenant_id
 from app.diag_logger import diag
 
 logger = logging.getLogger(__name__)
 
 
-def auto_assign_rooms(db: Session, target_date: str = None, created_by: str = "system"):
+def auto_assign_rooms(db: Session, target_date: str = None, created_by: str = "system", solver: str = None):
     """
     Auto-assign rooms for target_date (defaults to today).
     Uses a unified biz_item_id mapping for all room types.
     Never touches manual assignments.
+    solver: "greedy" | "optimal" — None 이면 테넌트 설정(Tenant.room_assign_solver)
     """
     if not target_date:
         target_date = datetime.now(KST).strftime("%Y-%m-%d")
+    return auto_assign_rooms_range(db, [target_date], created_by=created_by, solver=solver)["by_date"][target_date]
 
-    logger.info(f"Starting room auto-assignment for {target_date}")
 
-    try:
-        diag("auto_assign.enter", level="verbose", target_date=target_date, created_by=created_by)
-    except Exception:
-        pass
+def auto_assign_rooms_range(db: Session, dates: List[str], created_by: str = "system", solver: str = None):
+    """
+    여러 날짜 일괄 자동 배정 — 날짜별 auto_assign_rooms 반복 대신 1회 실행.
+
+    방/biz_item 링크, 미배정 후보, 점유 격자(OccupancyGrid), 활성 스케줄은 윈도우 전체에 대해
+    한 번만 적재한다. 날짜 오름차순으로 진행하며, 앞 날짜에서 배정된 연박자는 체류 전 박이
+    한 번에 배정되므로 뒤 날짜 후보에서 빠진다. 칩/추가요금 reconcile 은 배정된 예약마다 1회.
+
+    Returns: {"dates", "assigned", "unassigned", "by_date": {date: auto_assign_rooms 결과}}
+    """
+    dates = sorted(set(dates))
+    summary = {"dates": dates, "assigned": 0, "unassigned": 0, "by_date": {}}
+    if not dates:
+        return summary
+
+    for target_date in dates:
+        logger.info(f"Starting room auto-assignment for {target_date}")
+        try:
+            diag("auto_assign.enter", level="verbose", target_date=target_date, created_by=created_by)
+        except Exception:
+            pass
 
     # Get rooms with at least one biz_item linked (N:M via RoomBizItemLink)
-    rooms_with_biz = (
-        db.query(Room)
-        .filter(
-            Room.is_active == True,
-            exists().where(RoomBizItemLink.room_id == Room.id),
-        )
-        .options(selectinload(Room.biz_item_links))
-        .order_by(Room.sort_order)
-        .all()
-    )
+    rooms_with_biz = [room for room in get_rooms(db) if room.is_active and room.biz_item_links]
     if not rooms_with_biz:
         logger.info("No rooms with biz_item_id found, skipping auto-assign")
-        return {"target_date": target_date, "assigned": 0, "unassigned": 0}
+        for target_date in dates:
+            summary["by_date"][target_date] = {"target_date": target_date, "assigned": 0, "unassigned": 0}
+        return summary
 
     # Build biz_item_id -> rooms mapping for ALL rooms (regular + dormitory)
     biz_to_rooms: Dict[str, List[Room]] = {}
@@ -63,26 +77,86 @@ def auto_assign_rooms(db: Session, target_date: str = None, created_by: str = "s
         for link in room.biz_item_links:
             biz_to_rooms.setdefault(link.biz_item_id, []).append(room)
 
-    # Get all unassigned confirmed reservations for target_date
-    unassigned = _get_unassigned_reservations(db, target_date)
+    if solver is None:
+        tenant = db.query(Tenant).filter(Tenant.id == current_tenant_id.get()).first()
+        solver = (tenant.room_assign_solver if tenant else None) or "greedy"
+
+    # 윈도우 후보 + 이미 배정된 (예약, 날짜) — 날짜별 재조회 없음
+    pool, assigned_nights = _load_assignment_window(db, dates)
+    window = set(dates)
+    for res in pool:
+        window.update(_date_range(max(res.check_in_date, dates[0]), res.check_out_date))
+    window = sorted(window)
+    all_rooms = {room.id: room for rooms in biz_to_rooms.values() for room in rooms}
+    grid = OccupancyGrid.load(db, all_rooms.values(), [window[0], window[-1]])
+
+    touched: Dict[int, str] = {}  # reservation_id → 처음 배정된 날짜 (surcharge reconcile 기준일)
+    per_date = []
+    for target_date in dates:
+        unassigned = [
+            r for r in pool
+            if _is_active_on(r, target_date) and (r.id, target_date) not in assigned_nights
+        ]
+        assigned_details, failed_details, solver_report = _assign_all_rooms(
+            db, unassigned, biz_to_rooms, target_date, solver=solver, grid=grid,
+        )
+        by_id = {r.id: r for r in unassigned}
+        for detail in assigned_details:
+            res = by_id[detail["reservation_id"]]
+            for d in _date_range(target_date, res.check_out_date):
+                assigned_nights.add((res.id, d))
+            touched.setdefault(res.id, target_date)
+        per_date.append((target_date, unassigned, assigned_details, failed_details, solver_report))
+
+    # Flush then sync SMS tags in bulk — 배정된 예약마다 1회
+    db.flush()
+    if touched:
+        schedules = get_active_schedules(db)
+        from app.services.chip_reconciler import reconcile_chips_for_reservations
+        reconcile_chips_for_reservations(db, list(touched), schedules=schedules)
 
-    assigned_details, failed_details = _assign_all_rooms(db, unassigned, biz_to_rooms, target_date)
+        # Surcharge reconcile (추가 인원 요금) — 예약별 첫 배정일 기준, 전체를 한 번에
+        try:
+            from app.services.surcharge import reconcile_surcharge_pairs
+            reconcile_surcharge_pairs(db, sorted(touched.items(), key=lambda item: (item[1], item[0])))
+        except Exception as e:
+            logger.warning(f"Surcharge batch reconcile failed: {e}")
 
-    assigned_count = len(assigned_details)
-    assigned_reservation_ids = [d["reservation_id"] for d in assigned_details]
+    for target_date, unassigned, assigned_details, failed_details, solver_report in per_date:
+        result = _report_date_result(
+            db, target_date, unassigned, assigned_details, failed_details, solver_report, created_by,
+        )
+        summary["by_date"][target_date] = result
+        summary["assigned"] += result["assigned"]
+        summary["unassigned"] += result["unassigned"]
 
-    # Flush then sync SMS tags in bulk
-    db.flush()
-    schedules = db.query(TemplateSchedule).filter(TemplateSchedule.is_active == True).all()
-    for res_id in assigned_reservation_ids:
-        room_assignment.sync_sms_tags(db, res_id, schedules=schedules)
+    if len(dates) > 1:
+        try:
+            diag(
+                "auto_assign.range",
+                level="verbose",
+                dates=len(dates),
+                candidates=len(pool),
+                assigned=summary["assigned"],
+                reconciled=len(touched),
+            )
+        except Exception:
+            pass
 
-    # Surcharge batch reconcile (추가 인원 요금)
-    try:
-        from app.services.surcharge import reconcile_surcharge_batch
-        reconcile_surcharge_batch(db, assigned_reservation_ids, target_date)
-    except Exception as e:
-        logger.warning(f"Surcharge batch reconcile failed: {e}")
+    return summary
+
+
+def _report_date_result(
+    db: Session,
+    target_date: str,
+    unassigned: List[Reservation],
+    assigned_details: List[dict],
+    failed_details: List[dict],
+    solver_report: Optional[dict],
+    created_by: str,
+) -> dict:
+    """날짜별 활동 로그 / 실패 SSE / diag 기록 후 auto_assign_rooms 결과 dict 반환."""
+    assigned_count = len(assigned_details)
 
     # Summary activity log (like template scheduler)
     if assigned_count > 0:
@@ -150,6 +224,8 @@ def auto_assign_rooms(db: Session, target_date: str = None, created_by: str = "s
         "assigned": assigned_count,
         "unassigned": len(unassigned) - assigned_count,
     }
+    if solver_report:
+        result["solver"] = solver_report
     logger.info(f"Room auto-assignment complete: {result}")
 
     try:
@@ -167,35 +243,51 @@ def auto_assign_rooms(db: Session, target_date: str = None, created_by: str = "s
     return result
 
 
-def _get_unassigned_reservations(db: Session, target_date: str) -> List[Reservation]:
-    """Get confirmed reservations with no assignment for target_date."""
+def _is_active_on(res: Reservation, target_date: str) -> bool:
+    """target_date 에 투숙 중인 예약인지 (체크아웃 미정이면 체크인 이후 계속 투숙으로 간주)."""
+    if res.check_in_date > target_date:
+        return False
+    return res.check_out_date is None or res.check_out_date > target_date or res.check_in_date == target_date
+
+
+def _load_assignment_window(db: Session, dates: List[str]) -> Tuple[List[Reservation], set]:
+    """
+    dates 윈도우의 자동 배정 후보 예약 + 이미 배정된 (reservation_id, date) 집합을 쿼리 2번으로 적재.
+    날짜별 후보 = 해당 날짜에 투숙 중(_is_active_on)이면서 그 날짜 배정이 없는 예약.
+    """
     tid = current_tenant_id.get()
     if tid is None:
-        raise RuntimeError("_get_unassigned_reservations requires tenant context")
+        raise RuntimeError("_load_assignment_window requires tenant context")
 
-    unassigned = (
+    pool = (
         db.query(Reservation)
         .filter(
             Reservation.naver_biz_item_id.isnot(None),
             Reservation.status == ReservationStatus.CONFIRMED,
             Reservation.section.notin_(['party', 'unstable']),
-            Reservation.check_in_date <= target_date,
-        )
-        .filter(
-            ~Reservation.id.in_(
-                db.query(RoomAssignment.reservation_id).filter(
-                    RoomAssignment.date == target_date,
-                    RoomAssignment.tenant_id == tid,
-                )
-            )
+            Reservation.check_in_date <= dates[-1],
+            or_(
+                Reservation.check_out_date.is_(None),
+                Reservation.check_out_date > dates[0],
+                Reservation.check_in_date >= dates[0],
+            ),
         )
         .all()
     )
-    # Filter to only those actually active on target_date
-    return [
-        r for r in unassigned
-        if r.check_out_date is None or r.check_out_date > target_date or r.check_in_date == target_date
-    ]
+    pool = [r for r in pool if any(_is_active_on(r, d) for d in dates)]
+    assigned_nights = set()
+    if pool:
+        rows = (
+            db.query(RoomAssignment.reservation_id, RoomAssignment.date)
+            .filter(
+                RoomAssignment.tenant_id == tid,
+                RoomAssignment.reservation_id.in_([r.id for r in pool]),
+                RoomAssignment.date.in_(dates),
+            )
+            .all()
+        )
+        assigned_nights = {(rid, d) for rid, d in rows}
+    return pool, assigned_nights
 
 
 def _sort_candidate_rooms(rooms: List[Room], biz_item_id: str, gender: str) -> List[Room]:
@@ -225,14 +317,20 @@ def _assign_all_rooms(
     candidates: List[Reservation],
     biz_to_rooms: Dict[str, List[Room]],
     target_date: str,
-) -> Tuple[List[dict], List[dict]]:
+    solver: str = "greedy",
+    grid: Optional[OccupancyGrid] = None,
+) -> Tuple[List[dict], List[dict], Optional[dict]]:
     """
     Assign rooms based on biz_item_id mapping.
     For dormitory rooms: respects bed_capacity and gender lock.
     For regular rooms: one reservation per room.
     Gender lock: if a dormitory room already has occupants, only same-gender guests can be added.
 
-    Returns (assigned_results, failed_results):
+    solver="optimal" 이면 greedy 결과에 실패가 있을 때 room_packing 탐색으로 개선을 시도한다.
+    grid: auto_assign_rooms_range 가 윈도우 전체로 적재한 격자 (None 이면 여기서 적재).
+    배정 결과는 grid 에 반영된 상태로 돌아온다.
+
+    Returns (assigned_results, failed_results, solver_report):
       assigned_results: [{"reservation_id", "customer_name", "room_number"}, ...]
       failed_results:   [{"reservation_id", "customer_name", "reason",
                           "biz_item_id", "target_date"}, ...]
@@ -241,6 +339,7 @@ def _assign_all_rooms(
       - "capacity_full": every dorm candidate had no free beds
       - "gender_lock": every dorm candidate was locked by opposite gender
       - "all_rooms_occupied": no regular room had capacity
+    solver_report: optimal 모드에서 탐색을 돌렸을 때만 dict (room_packing.PackingResult.report)
     """
     assigned_results = []
     failed_results: List[dict] = []
@@ -298,6 +397,29 @@ def _assign_all_rooms(
             for res_id, room_id in prev_assignments:
                 long_stay_room_map[res_id] = room_id
 
+    # 점유 격자: 후보 방 × 체류 윈도우를 쿼리 1번으로 적재 — 이후 탐색은 메모리에서만
+    stay_dates = {res.id: _date_range(target_date, res.check_out_date) for res in candidates}
+    if grid is None:
+        all_rooms = {room.id: room for rooms in biz_to_rooms.values() for room in rooms}
+        grid = OccupancyGrid.load(
+            db, all_rooms.values(), [d for dates in stay_dates.values() for d in dates],
+        )
+    initial_grid = grid.copy() if solver == "optimal" else None
+    # 같은 방 유지 대상 (연장 그룹 / 연박) — optimal 탐색에서도 greedy 결정을 고정
+    continuity: set = set()
+    if solver == "optimal":
+        group_sizes: Dict[str, int] = {}
+        for r in candidates:
+            if r.stay_group_id:
+                group_sizes[r.stay_group_id] = group_sizes.get(r.stay_group_id, 0) + 1
+        continuity = {
+            r.id for r in candidates
+            if r.id in long_stay_room_map
+            or (r.stay_group_id and (r.stay_group_id in stay_group_room_map or group_sizes[r.stay_group_id] > 1))
+        }
+    planned: List[Tuple[Reservation, Room]] = []
+    ordered_rooms: Dict[int, List[Room]] = {}  # 예약별 후보 방 (선호 순서) — solver 가 재사용
+
     for res in candidates:
         candidate_rooms = biz_to_rooms.get(res.naver_biz_item_id, [])
         # Sort rooms by gender-specific priority
@@ -324,100 +446,100 @@ def _assign_all_rooms(
             })
             continue
 
-        people_count = res.party_size or res.booking_count or 1
-
-        assigned_this_res = False
-        last_failure_reason: str = None  # tracks the most recent reason across dorm candidates
-
-        for room in candidate_rooms:
-            if room.is_dormitory:
-                # Check capacity with actual party size
-                if not room_assignment.check_capacity_all_dates(
-                    db, room.id, target_date, res.check_out_date,
-                    people_count=people_count, exclude_reservation_id=res.id
-                ):
-                    last_failure_reason = "capacity_full"
-                    continue
-
-                # Gender lock: check ALL existing occupants' gender across FULL stay range
-                # (과거엔 target_date 1일만 봐서 연박 중간일 혼숙이 통과할 수 있었음 — 용량 검사와 범위 맞춤)
-                gender_range_end = res.check_out_date or target_date
-                existing_query = (
-                    db.query(RoomAssignment)
-                    .filter(RoomAssignment.room_id == room.id)
-                )
-                if res.check_out_date:
-                    existing_query = existing_query.filter(
-                        RoomAssignment.date >= target_date,
-                        RoomAssignment.date < gender_range_end,
-                    )
-                else:
-                    # NULL checkout 은 1박 예약 → target_date 하루만 검사
-                    existing_query = existing_query.filter(
-                        RoomAssignment.date == target_date
-                    )
-                existing = existing_query.all()
-                if existing:
-                    existing_reservations = db.query(Reservation).filter(
-                        Reservation.id.in_([e.reservation_id for e in existing])
-                    ).all()
-                    res_gender = (res.gender or "").strip()
-                    gender_conflict = False
-                    for existing_res in existing_reservations:
-                        existing_gender = (existing_res.gender or "").strip()
-                        if existing_gender and res_gender and existing_gender != res_gender:
-                            gender_conflict = True
-                            break
-                    if gender_conflict:
-                        last_failure_reason = "gender_lock"
-                        continue
-
-                # Assign
-                room_assignment.assign_room(
-                    db, res.id, room.id, target_date, res.check_out_date,
-                    assigned_by="auto", skip_sms_sync=True, skip_logging=True,
-                )
-                db.flush()
-                assigned_results.append({"reservation_id": res.id, "customer_name": res.customer_name, "room_number": room.room_number})
-                # Update group room map so next group member prefers same room
-                if res.stay_group_id:
-                    stay_group_room_map[res.stay_group_id] = room.id
-                assigned_this_res = True
-                break
-            else:
-                # Regular room: booking_count>1 은 naver_sync 단계에서 primary+sibling 으로
-                # split 되어 모든 row 가 booking_count=1 로 정규화됨. 따라서 여기선 1방씩만 배정.
-                for reg_room in candidate_rooms:
-                    if reg_room.is_dormitory:
-                        continue
-                    if room_assignment.check_capacity_all_dates(
-                        db, reg_room.id, target_date, res.check_out_date,
-                        people_count=1, exclude_reservation_id=res.id
-                    ):
-                        room_assignment.assign_room(
-                            db, res.id, reg_room.id, target_date, res.check_out_date,
-                            assigned_by="auto", skip_sms_sync=True, skip_logging=True,
-                        )
-                        db.flush()
-                        assigned_results.append({"reservation_id": res.id, "customer_name": res.customer_name, "room_number": reg_room.room_number})
-                        if res.stay_group_id:
-                            stay_group_room_map[res.stay_group_id] = reg_room.id
-                        assigned_this_res = True
-                        break
-                else:
-                    last_failure_reason = "all_rooms_occupied"
-                break  # 일반실 분기 완료 — 다음 예약으로
-
-        if not assigned_this_res:
+        dates = stay_dates[res.id]
+        ordered_rooms[res.id] = candidate_rooms
+        chosen_room, failure_reason = _pick_room(res, candidate_rooms, dates, grid)
+
+        if chosen_room is None:
             failed_results.append({
                 "reservation_id": res.id,
                 "customer_name": res.customer_name,
-                "reason": last_failure_reason or "no_candidate_rooms",
+                "reason": failure_reason,
                 "biz_item_id": res.naver_biz_item_id,
                 "target_date": target_date,
             })
+            continue
 
-    return assigned_results, failed_results
+        grid.place(chosen_room.id, dates, res)
+        planned.append((res, chosen_room))
+        # Update group room map so next group member prefers same room
+        if res.stay_group_id:
+            stay_group_room_map[res.stay_group_id] = chosen_room.id
+
+    # Optimal 모드: greedy 가 못 넣은 손님이 있으면 시간 제한 탐색으로 더 나은 배치를 찾는다
+    solver_report = None
+    if solver == "optimal" and failed_results:
+        from app.services.room_packing import solve_packing
+        packing = solve_packing(
+            [res for res in candidates if ordered_rooms.get(res.id)],
+            ordered_rooms, stay_dates, initial_grid, planned,
+            timeout=settings.ROOM_ASSIGN_SOLVER_TIMEOUT_SECONDS,
+            pinned=continuity,
+        )
+        solver_report = packing.report()
+        if packing.improved:
+            planned = packing.planned
+            grid.adopt(packing.grid)
+            placed_ids = {res.id for res, _ in planned}
+            failed_results = [f for f in failed_results if f["reservation_id"] not in placed_ids]
+            for f in failed_results:
+                res = next(r for r in candidates if r.id == f["reservation_id"])
+                if ordered_rooms.get(res.id):
+                    f["reason"] = _pick_room(res, ordered_rooms[res.id], stay_dates[res.id], packing.grid)[1]
+        try:
+            diag("auto_assign.solver", level="verbose", target_date=target_date, **solver_report)
+        except Exception:
+            pass
+
+    # 배정 반영: 결정이 끝난 뒤 한 번에 기록 (비밀번호/bed_order 규칙은 assign_room 한 곳에서)
+    for res, room in planned:
+        room_assignment.assign_room(
+            db, res.id, room.id, target_date, res.check_out_date,
+            assigned_by="auto", skip_sms_sync=True, skip_logging=True,
+        )
+        assigned_results.append({"reservation_id": res.id, "customer_name": res.customer_name, "room_number": room.room_number})
+    if planned:
+        db.flush()
+
+    return assigned_results, failed_results, solver_report
+
+
+def _pick_room(
+    res: Reservation,
+    candidate_rooms: List[Room],
+    dates: List[str],
+    grid: OccupancyGrid,
+) -> Tuple[Optional[Room], Optional[str]]:
+    """Greedy first-fit: candidate_rooms 순서대로 첫 번째 가능한 방. Returns (room, None) | (None, 실패 사유)."""
+    people_count = res.party_size or res.booking_count or 1
+    res_gender = (res.gender or "").strip()
+    last_failure_reason: str = None  # tracks the most recent reason across dorm candidates
+
+    for room in candidate_rooms:
+        if room.is_dormitory:
+            # Check capacity with actual party size
+            if not grid.has_capacity(room.id, dates, people_count=people_count, exclude_reservation_id=res.id):
+                last_failure_reason = "capacity_full"
+                continue
+
+            # Gender lock: check ALL existing occupants' gender across FULL stay range
+            # (과거엔 target_date 1일만 봐서 연박 중간일 혼숙이 통과할 수 있었음 — 용량 검사와 범위 맞춤)
+            if grid.gender_conflict(room.id, dates, res_gender):
+                last_failure_reason = "gender_lock"
+                continue
+
+            return room, None
+
+        # Regular room: booking_count>1 은 naver_sync 단계에서 primary+sibling 으로
+        # split 되어 모든 row 가 booking_count=1 로 정규화됨. 따라서 여기선 1방씩만 배정.
+        for reg_room in candidate_rooms:
+            if reg_room.is_dormitory:
+                continue
+            if grid.has_capacity(reg_room.id, dates, people_count=1, exclude_reservation_id=res.id):
+                return reg_room, None
+        return None, "all_rooms_occupied"  # 일반실 분기 완료 — 다음 예약으로
+
+    return None, last_failure_reason or "no_candidate_rooms"
 
 
 def daily_assign_rooms(db: Session):
@@ -434,9 +556,10 @@ def daily_assign_rooms(db: Session):
 
     logger.info(f"Running daily FILL-ONLY assignment for {today} and {tomorrow}")
 
-    # FILL-ONLY: 미배정만 배정 (DELETE 없음)
-    result_today = auto_assign_rooms(db, today, created_by="scheduler")
-    result_tomorrow = auto_assign_rooms(db, tomorrow, created_by="scheduler")
+    # FILL-ONLY: 미배정만 배정 (DELETE 없음) — 오늘/내일 1회 일괄
+    by_date = auto_assign_rooms_range(db, [today, tomorrow], created_by="scheduler")["by_date"]
+    result_today = by_date[today]
+    result_tomorrow = by_date[tomorrow]
 
     # diag
     try:
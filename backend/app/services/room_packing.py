@@ -0,0 +1,165 @@
+"""
+Room packing solver — 자동 배정 "optimal" 모드 (테넌트 설정 room_assign_solver).
+
+greedy first-fit(_pick_room)은 만실 주말에 배치 순서 때문에 손님을 떨어뜨릴 수 있다
+(예: 여성 1명이 빈 도미토리를 먼저 잡아 남성 단체가 들어갈 방이 없어짐).
+여기서는 같은 OccupancyGrid 위에서 분기 한정(branch-and-bound) 탐색으로
+"배정 인원 수"를 최대화하는 배치를 찾는다.
+
+- 제약: greedy 와 동일 (일반실 1예약/방, 도미토리 bed_capacity + 성별 잠금, 전 박 동일 방)
+  + _pick_room 의 후보 범위: 첫 후보가 일반실이면 그 뒤의 도미토리는 시도하지 않음
+- 연박/연장 (pinned): 같은 방 유지는 탐색 대상이 아니다 — greedy 결과(배정/미배정)를 그대로
+  고정하고 나머지 손님만 재배치한다
+- 탐색 순서: 선택지가 적은 손님 → 인원 많은 손님 → 긴 체류 먼저. 방은 greedy 선호 순서
+  (성별 우선순위) 그대로 시도 → 동률이면 greedy 와 같은 선택
+- 한정: 현재 배정 수 + 남은 손님 수 <= 최선이면 가지치기. 초기 최선 = greedy 결과
+- 시간 제한: 초과 시 그때까지의 최선(최소 greedy) 반환, timed_out=True
+"""
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.db.models import Reservation, Room
+from app.services.occupancy_grid import OccupancyGrid
+
+
+class _Deadline(Exception):
+    pass
+
+
+class PackingResult:
+    """solve_packing 결과. planned 는 improved 일 때만 greedy 와 다르다."""
+
+    def __init__(self, planned, grid, greedy_assigned, assigned, timed_out, nodes, elapsed_ms):
+        self.planned: List[Tuple[Reservation, Room]] = planned
+        self.grid: OccupancyGrid = grid
+        self.greedy_assigned = greedy_assigned
+        self.assigned = assigned
+        self.timed_out = timed_out
+        self.nodes = nodes
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def improved(self) -> bool:
+        return self.assigned > self.greedy_assigned
+
+    def report(self) -> dict:
+        return {
+            "mode": "optimal",
+            "greedy_assigned": self.greedy_assigned,
+            "assigned": self.assigned,
+            "gain": self.assigned - self.greedy_assigned,
+            "timed_out": self.timed_out,
+            "nodes": self.nodes,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+def _feasible(res: Reservation, room: Room, dates: List[str], grid: OccupancyGrid) -> bool:
+    if room.is_dormitory:
+        people_count = res.party_size or res.booking_count or 1
+        return (
+            grid.has_capacity(room.id, dates, people_count=people_count, exclude_reservation_id=res.id)
+            and not grid.gender_conflict(room.id, dates, res.gender)
+        )
+    return grid.has_capacity(room.id, dates, people_count=1, exclude_reservation_id=res.id)
+
+
+def _allowed_rooms(rooms: List[Room]) -> List[Room]:
+    """_pick_room 이 실제로 시도하는 방: 첫 일반실 전까지의 도미토리 + 일반실 전부 (선호 순서 유지)."""
+    for i, room in enumerate(rooms):
+        if not room.is_dormitory:
+            return rooms[:i] + [r for r in rooms[i:] if not r.is_dormitory]
+    return list(rooms)
+
+
+def solve_packing(
+    guests: List[Reservation],
+    ordered_rooms: Dict[int, List[Room]],
+    stay_dates: Dict[int, List[str]],
+    grid: OccupancyGrid,
+    greedy_plan: List[Tuple[Reservation, Room]],
+    timeout: float,
+    pinned: Optional[Iterable[int]] = None,
+) -> PackingResult:
+    """
+    guests 를 최대한 많이 배정하는 배치 탐색.
+
+    Args:
+        guests: 후보 방이 1개 이상인 미배정 예약
+        ordered_rooms: 예약별 후보 방 (greedy 선호 순서)
+        stay_dates: 예약별 배정 날짜
+        grid: greedy 배치 전 점유 격자 (탐색 중 place/undo 로 변경 후 원복)
+        greedy_plan: greedy 결과 — 초기 최선해이자 시간 초과 시 fallback
+        timeout: 초
+        pinned: greedy 결과를 그대로 둘 예약 id (연박/연장 같은 방 유지 대상)
+    """
+    started = time.perf_counter()
+    deadline = started + max(0.0, timeout)
+    pinned = set(pinned or ())
+    allowed = {r.id: _allowed_rooms(ordered_rooms[r.id]) for r in guests}
+
+    # 고정 손님은 greedy 방에 먼저 놓는다 (탐색 중 undo 하지 않음)
+    fixed = [(res, room) for res, room in greedy_plan if res.id in pinned]
+    for res, room in fixed:
+        grid.place(room.id, stay_dates[res.id], res)
+
+    # 선택지가 적은 손님 → 인원 많은 손님 → 긴 체류 먼저 (실패 가지를 일찍 드러냄)
+    order = sorted(
+        (r for r in guests if r.id not in pinned),
+        key=lambda r: (
+            len(allowed[r.id]),
+            -(r.party_size or r.booking_count or 1),
+            -len(stay_dates[r.id]),
+        ),
+    )
+    total = len(order)
+    upper = len(fixed) + total
+    best: Dict[str, object] = {"count": len(greedy_plan), "plan": None}
+    current: List[Tuple[Reservation, Room]] = list(fixed)
+    nodes = 0
+    timed_out = False
+
+    def search(idx: int) -> None:
+        nonlocal nodes
+        nodes += 1
+        if time.perf_counter() > deadline:
+            raise _Deadline()
+        if len(current) + (total - idx) <= best["count"]:
+            return
+        if idx == total:
+            best["count"] = len(current)
+            best["plan"] = list(current)
+            return
+
+        res = order[idx]
+        dates = stay_dates[res.id]
+        for room in allowed[res.id]:
+            if not _feasible(res, room, dates, grid):
+                continue
+            changes = grid.place(room.id, dates, res)
+            current.append((res, room))
+            try:
+                search(idx + 1)
+            finally:
+                current.pop()
+                grid.undo(res.id, changes)
+            if best["count"] == upper:
+                return
+        search(idx + 1)  # 이 손님은 미배정
+
+    try:
+        search(0)
+    except _Deadline:
+        timed_out = True
+
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
+    if best["plan"] is None:
+        return PackingResult(greedy_plan, grid, len(greedy_plan), len(greedy_plan), timed_out, nodes, elapsed_ms)
+
+    # 원래 greedy 처리 순서로 기록 (bed_order/비밀번호 부여 순서를 greedy 와 맞춤)
+    position = {r.id: i for i, r in enumerate(guests)}
+    plan = sorted(best["plan"], key=lambda pair: position[pair[0].id])
+    for res, room in plan:
+        if res.id not in pinned:
+            grid.place(room.id, stay_dates[res.id], res)
+    return PackingResult(plan, grid, len(greedy_plan), len(plan), timed_out, nodes, elapsed_ms)
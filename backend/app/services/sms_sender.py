@@ -3,7 +3,7 @@ SmsSender - Tag-based SMS filtering and sending
 Ported from stable-clasp-main/01_sns.js
 (Renamed from campaigns/tag_manager.py; TagCampaignManager → SmsSender)
 """
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
@@ -14,6 +14,9 @@ from app.diag_logger import diag
 from app.providers.base import SMSProvider
 from app.services.activity_logger import log_activity
 
+if TYPE_CHECKING:
+    from app.db.models import RoomAssignment
+
 logger = logging.getLogger(__name__)
 
 # MMS(이미지 첨부) 경로로 발송할 템플릿 키 집합.
@@ -22,45 +25,39 @@ logger = logging.getLogger(__name__)
 MMS_TEMPLATES: frozenset[str] = frozenset({"party3_today_mms"})
 
 
+_ROOM_VARS_REQUIRED = ("room_num", "building", "room_password", "prefix_room_password")
+
+
 def find_unreplaced_vars(text: str) -> list[str]:
     """텍스트에서 미치환 {{변수}} 를 찾아 변수명 리스트로 반환."""
-    import re
-    return re.findall(r'\{\{(\w+)\}\}', text)
+    from app.templates.renderer import _VAR_RE
+    return _VAR_RE.findall(text)
 
 
-async def send_single_sms(
+def prepare_single_sms(
     db: Session,
-    sms_provider,
     reservation: "Reservation",
     template_key: str,
     date: Optional[str] = None,
-    created_by: str = "system",
-    skip_activity_log: bool = False,
-    skip_commit: bool = False,
     custom_vars: Optional[Dict[str, Any]] = None,
+    context: Optional[Dict[str, Any]] = None,
+    room_assignment: Optional["RoomAssignment"] = None,
 ) -> Dict[str, Any]:
     """
-    단건 SMS 발송 공통 함수.
-    RoomAssignment 조회 + calculate_template_variables + 렌더링 + 발송.
+    발송 1단계 — 검증 + 변수 계산 + 렌더링 (DB 작업만, 네트워크 호출 없음).
 
-    [호출부 동기화 주의]
-    custom_vars는 MessageTemplate.get_buffer_vars()로 통일되었습니다.
-    발송 결과(성공/실패)를 activity log에 기록합니다.
+    차단 사유(전화번호/템플릿/방 정보/미치환 변수)가 있으면 실패 기록까지 마친 뒤
+    {"blocked": True, "result": {...}} 를 반환한다.
+    통과하면 {"blocked": False, "message": str, "room_assignment": RoomAssignment | None,
+    "effective_date": str | None} 를 반환한다.
 
-    Returns: {"success": bool, "message_id": str | None, "error": str | None}
+    context: calculate_template_variables_batch() 로 미리 계산한 변수 dict.
+        주어지면 RoomAssignment 조회·변수 계산을 생략하고 room_assignment 를 그대로 사용.
     """
     from app.db.models import RoomAssignment
     from app.templates.renderer import TemplateRenderer
     from app.templates.variables import calculate_template_variables
 
-    diag(
-        "send_single_sms.enter",
-        level="verbose",
-        res_id=reservation.id,
-        template_key=template_key,
-        date=date,
-    )
-
     if not reservation.phone:
         diag(
             "send_single_sms.exit",
@@ -70,7 +67,7 @@ async def send_single_sms(
             success=False,
             reason="no_phone",
         )
-        return {"success": False, "message_id": None, "error": "전화번호가 없습니다"}
+        return {"blocked": True, "result": {"success": False, "message_id": None, "error": "전화번호가 없습니다"}}
 
     import re
     phone_digits = re.sub(r"[\s\-+().]", "", reservation.phone)
@@ -91,7 +88,7 @@ async def send_single_sms(
             error=f"전화번호 형식 오류: {reservation.phone!r}",
             date=str(date) if date else "",
         )
-        return {"success": False, "message_id": None, "error": f"전화번호 형식 오류: {reservation.phone!r}"}
+        return {"blocked": True, "result": {"success": False, "message_id": None, "error": f"전화번호 형식 오류: {reservation.phone!r}"}}
 
     effective_date = date or (
         reservation.check_in_date.strftime("%Y-%m-%d")
@@ -101,25 +98,28 @@ async def send_single_sms(
         else None
     )
 
-    ra = db.query(RoomAssignment).filter(
-        RoomAssignment.reservation_id == reservation.id,
-        RoomAssignment.date == effective_date,
-    ).first()
-
-    context = calculate_template_variables(
-        reservation=reservation,
-        db=db,
-        date=effective_date,
-        custom_vars=custom_vars,
-        room_assignment=ra,
-        template_key=template_key,
-    )
+    if context is not None:
+        ra = room_assignment
+    else:
+        ra = db.query(RoomAssignment).filter(
+            RoomAssignment.reservation_id == reservation.id,
+            RoomAssignment.date == effective_date,
+        ).first()
+
+        context = calculate_template_variables(
+            reservation=reservation,
+            db=db,
+            date=effective_date,
+            custom_vars=custom_vars,
+            room_assignment=ra,
+            template_key=template_key,
+        )
 
     # ★ 3-1a: 템플릿 존재 여부 확인 — renderer.render() 가 없는 템플릿을 에러 문자열로 반환해
     #         그대로 SMS 발송되는 사고 방지.
     renderer = TemplateRenderer(db)
-    _template_obj = renderer.get_template(template_key)
-    if _template_obj is None:
+    compiled = renderer.get_compiled(template_key)
+    if compiled is None:
         logger.error(
             f"Blocking SMS: template not found. res={reservation.id} template={template_key} date={date}"
         )
@@ -136,13 +136,11 @@ async def send_single_sms(
             error=f"템플릿 없음: {template_key}",
             date=effective_date or "",
         )
-        return {"success": False, "message_id": None, "error": f"템플릿 없음: {template_key}"}
+        return {"blocked": True, "result": {"success": False, "message_id": None, "error": f"템플릿 없음: {template_key}"}}
 
     # ★ 3-1b: 방 정보 변수를 쓰는 템플릿인데 해당 context 값이 비어있으면 차단
-    #         템플릿에서 실제 사용하는 변수들을 검사해 빈 값 SMS 방지
-    _ROOM_VARS_REQUIRED = ("room_num", "building", "room_password", "prefix_room_password")
-    _template_content = _template_obj.content
-    used_room_vars = [v for v in _ROOM_VARS_REQUIRED if f"{{{{{v}}}}}" in _template_content]
+    #         템플릿에서 실제 사용하는 변수들을 검사해 빈 값 SMS 방지 (파싱 시 수집된 변수 집합 사용)
+    used_room_vars = [v for v in _ROOM_VARS_REQUIRED if v in compiled.variables]
     missing_room_vars = [v for v in used_room_vars if not context.get(v)]
     if missing_room_vars:
         logger.error(
@@ -162,17 +160,36 @@ async def send_single_sms(
             error=f"방 정보 누락: {', '.join(missing_room_vars)}",
             date=effective_date or "",
         )
-        return {"success": False, "message_id": None, "error": f"방 정보 누락: {', '.join(missing_room_vars)}"}
+        return {"blocked": True, "result": {"success": False, "message_id": None, "error": f"방 정보 누락: {', '.join(missing_room_vars)}"}}
 
-    message_content = renderer.render(template_key, context)
+    diag("template.render.enter", level="verbose", template_key=template_key)
+    message_content, unreplaced = renderer.render_compiled(compiled, context)
 
     # 미치환 변수가 남아있으면 발송 차단
-    unreplaced = find_unreplaced_vars(message_content)
     if unreplaced:
         error_msg = f"미치환 변수 발견: {', '.join(unreplaced)}"
         logger.error(f"[{template_key}] {error_msg} - 발송 차단됨 (수신자: {reservation.phone})")
-        return {"success": False, "message_id": None, "error": error_msg, "message": message_content}
+        return {"blocked": True, "result": {"success": False, "message_id": None, "error": error_msg, "message": message_content}}
 
+    return {
+        "blocked": False,
+        "message": message_content,
+        "room_assignment": ra,
+        "effective_date": effective_date,
+    }
+
+
+async def dispatch_sms(
+    sms_provider,
+    reservation: "Reservation",
+    template_key: str,
+    message_content: str,
+) -> Dict[str, Any]:
+    """
+    발송 2단계 — provider 호출만 수행 (DB 접근 없음, 동시 실행 가능).
+
+    Returns: provider 원본 결과 dict
+    """
     is_mms = template_key in MMS_TEMPLATES
 
     diag(
@@ -189,15 +206,65 @@ async def send_single_sms(
         # 즉시 실패로 기록 (예: 테스트 mock). 런타임 중에는 Real 만 사용.
         send_party_mms = getattr(sms_provider, "send_party_mms", None)
         if send_party_mms is None:
-            result = {
+            return {
                 "success": False,
                 "message_id": None,
                 "error": f"MMS 미지원 provider: {type(sms_provider).__name__}",
             }
-        else:
-            result = await send_party_mms(to=reservation.phone, message=message_content)
-    else:
-        result = await sms_provider.send_sms(to=reservation.phone, message=message_content)
+        return await send_party_mms(to=reservation.phone, message=message_content)
+    return await sms_provider.send_sms(to=reservation.phone, message=message_content)
+
+
+def sms_result(result: Dict[str, Any], message_content: str) -> Dict[str, Any]:
+    """provider 원본 결과 → send_single_sms 표준 반환값."""
+    if result.get("success"):
+        return {"success": True, "message_id": result.get("message_id"), "error": None, "message": message_content}
+    return {"success": False, "message_id": None, "error": result.get("error", "SMS 발송 실패"), "message": message_content}
+
+
+async def send_single_sms(
+    db: Session,
+    sms_provider,
+    reservation: "Reservation",
+    template_key: str,
+    date: Optional[str] = None,
+    created_by: str = "system",
+    skip_activity_log: bool = False,
+    skip_commit: bool = False,
+    custom_vars: Optional[Dict[str, Any]] = None,
+    context: Optional[Dict[str, Any]] = None,
+    room_assignment: Optional["RoomAssignment"] = None,
+) -> Dict[str, Any]:
+    """
+    단건 SMS 발송 공통 함수.
+    RoomAssignment 조회 + calculate_template_variables + 렌더링 + 발송.
+
+    [호출부 동기화 주의]
+    custom_vars는 MessageTemplate.get_buffer_vars()로 통일되었습니다.
+    발송 결과(성공/실패)를 activity log에 기록합니다.
+
+    context/room_assignment: 배치로 미리 계산한 값 (prepare_single_sms 참조).
+
+    Returns: {"success": bool, "message_id": str | None, "error": str | None}
+    """
+    diag(
+        "send_single_sms.enter",
+        level="verbose",
+        res_id=reservation.id,
+        template_key=template_key,
+        date=date,
+    )
+
+    prepared = prepare_single_sms(
+        db, reservation, template_key, date=date, custom_vars=custom_vars,
+        context=context, room_assignment=room_assignment,
+    )
+    if prepared["blocked"]:
+        return prepared["result"]
+
+    message_content = prepared["message"]
+    ra = prepared["room_assignment"]
+    result = await dispatch_sms(sms_provider, reservation, template_key, message_content)
 
     success = bool(result.get("success"))
     if not skip_activity_log:
@@ -233,10 +300,7 @@ async def send_single_sms(
         success=success,
     )
 
-    if success:
-        return {"success": True, "message_id": result.get("message_id"), "error": None, "message": message_content}
-    else:
-        return {"success": False, "message_id": None, "error": result.get("error", "SMS 발송 실패"), "message": message_content}
+    return sms_result(result, message_content)
 
 
 class SmsSender:
@@ -312,6 +376,16 @@ class SmsSender:
             for r in self.db.query(Reservation).filter(Reservation.id.in_(reservation_ids)).all()
         }
 
+        # 변수 컨텍스트 일괄 계산 (예약당 RoomAssignment/Room/Building/스냅샷 조회 → 고정 횟수)
+        from app.templates.variables import calculate_template_variables_batch, prefetch_room_assignments
+        custom_vars = template.get_buffer_vars()
+        targets = list(reservations_by_id.values())
+        ra_map = prefetch_room_assignments(self.db, targets, date)
+        contexts = calculate_template_variables_batch(
+            self.db, targets, date=date, custom_vars=custom_vars,
+            template_key=template_key, room_assignments=ra_map,
+        )
+
         try:
             for assignment in assignments:
                 reservation = reservations_by_id.get(assignment.reservation_id)
@@ -327,7 +401,9 @@ class SmsSender:
                         date=date,
                         created_by="schedule",
                         skip_commit=True,
-                        custom_vars=template.get_buffer_vars(),
+                        custom_vars=custom_vars,
+                        context=contexts.get(reservation.id),
+                        room_assignment=ra_map.get(reservation.id),
                     )
                     if result.get("success"):
                         sent_count += 1
@@ -96,3 +96,96 @@ def record_sms_failed(
             send_error=(error or 'unknown')[:500],
             date=date,
         ))
+
+
+def record_sms_results_bulk(
+    db: Session,
+    template_key: str,
+    date: str,
+    sent_ids: list[int],
+    failed: dict[int, str],
+    assigned_by: str = "auto",
+) -> None:
+    """
+    여러 예약의 발송 결과를 한 번에 기록 (record_sms_sent / record_sms_failed 일괄판).
+
+    기존 칩은 1회 조회로 가져오고 (아직 flush 안 된 pending 칩 포함),
+    없으면 새로 추가한다. flush 는 호출자가 1회 수행.
+
+    Args:
+        sent_ids: 발송 성공 reservation_id 목록
+        failed: reservation_id -> 에러 메시지 (발송 실패)
+    """
+    res_ids = set(sent_ids) | set(failed)
+    if not res_ids:
+        return
+
+    existing: dict[int, ReservationSmsAssignment] = {}
+    for obj in db.new:
+        if (
+            isinstance(obj, ReservationSmsAssignment)
+            and obj.reservation_id in res_ids
+            and obj.template_key == template_key
+            and obj.date == date
+        ):
+            existing[obj.reservation_id] = obj
+    missing = [rid for rid in res_ids if rid not in existing]
+    if missing:
+        for chip in db.query(ReservationSmsAssignment).filter(
+            ReservationSmsAssignment.reservation_id.in_(missing),
+            ReservationSmsAssignment.template_key == template_key,
+            ReservationSmsAssignment.date == date,
+        ).all():
+            existing[chip.reservation_id] = chip
+
+    now = datetime.now(timezone.utc)
+    for rid in sent_ids:
+        diag(
+            "sms.sent_recorded",
+            level="verbose",
+            res_id=rid,
+            template_key=template_key,
+            date=date,
+            assigned_by=assigned_by,
+        )
+        chip = existing.get(rid)
+        if chip:
+            chip.sent_at = now
+            chip.send_status = 'sent'
+            chip.send_error = None
+        else:
+            chip = ReservationSmsAssignment(
+                reservation_id=rid,
+                template_key=template_key,
+                assigned_by=assigned_by,
+                sent_at=now,
+                send_status='sent',
+                date=date,
+            )
+            db.add(chip)
+            existing[rid] = chip
+
+    for rid, error in failed.items():
+        diag(
+            "sms.failed_recorded",
+            level="critical",
+            res_id=rid,
+            template_key=template_key,
+            date=date,
+            error=(error or "")[:100],
+        )
+        chip = existing.get(rid)
+        if chip:
+            chip.send_status = 'failed'
+            chip.send_error = (error or 'unknown')[:500]
+        else:
+            chip = ReservationSmsAssignment(
+                reservation_id=rid,
+                template_key=template_key,
+                assigned_by='auto',
+                send_status='failed',
+                send_error=(error or 'unknown')[:500],
+                date=date,
+            )
+            db.add(chip)
+            existing[rid] = chip
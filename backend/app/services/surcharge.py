@@ -7,18 +7,19 @@
 단가/박수는 템플릿 변수로 동적 계산됨 (templates/variables.py 참조).
 """
 import logging
-from typing import Optional, List
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.db.models import (
     Reservation,
+    ReservationDailyInfo,
     Room,
     RoomAssignment,
     ReservationSmsAssignment,
     TemplateSchedule,
-    RoomBizItemLink,
 )
-from app.db.tenant_context import current_tenant_id
 from app.diag_logger import diag
 
 logger = logging.getLogger(__name__)
@@ -31,44 +32,12 @@ SURCHARGE_DOUBLE = 'surcharge_double'
 _ALL_SURCHARGE_TYPES = (SURCHARGE_STANDARD, SURCHARGE_DOUBLE)
 
 
-def _is_double_room(db: Session, room: Room) -> bool:
-    """방에 연결된 biz_item_id 중 DOUBLE_ROOM_BIZ_ITEM_IDS 에 속한 게 있으면 True."""
-    links = db.query(RoomBizItemLink).filter(
-        RoomBizItemLink.room_id == room.id
-    ).all()
-    for link in links:
-        if link.biz_item_id in DOUBLE_ROOM_BIZ_ITEM_IDS:
-            return True
-    return False
-
+def _is_double_room(room: Room) -> bool:
+    """방에 연결된 biz_item_id 중 DOUBLE_ROOM_BIZ_ITEM_IDS 에 속한 게 있으면 True.
 
-def _has_test_marker(db: Session, reservation_id: int, date: str) -> bool:
-    """[테스트 기간 전용] 예약/일자별 메모에 '테스트' 포함 여부.
-
-    Reservation.notes 또는 ReservationDailyInfo(date).notes 중 하나라도
-    '테스트' 포함하면 True. 테스트 기간 종료 시 이 함수 호출부와 함께 제거.
+    reference_cache 의 Room 은 biz_item_links 가 로드돼 있어 쿼리 없음.
     """
-    from app.db.models import Reservation, ReservationDailyInfo
-    reservation = db.query(Reservation).filter(
-        Reservation.id == reservation_id
-    ).first()
-    if reservation and reservation.notes and '테스트' in reservation.notes:
-        return True
-    daily = db.query(ReservationDailyInfo).filter(
-        ReservationDailyInfo.reservation_id == reservation_id,
-        ReservationDailyInfo.date == date,
-    ).first()
-    if daily and daily.notes and '테스트' in daily.notes:
-        return True
-    return False
-
-
-def _find_schedule(db: Session, custom_type: str) -> Optional[TemplateSchedule]:
-    return db.query(TemplateSchedule).filter(
-        TemplateSchedule.schedule_category == 'custom_schedule',
-        TemplateSchedule.custom_type == custom_type,
-        TemplateSchedule.is_active == True,
-    ).first()
+    return any(link.biz_item_id in DOUBLE_ROOM_BIZ_ITEM_IDS for link in room.biz_item_links)
 
 
 def compute_guest_count(reservation) -> int:
@@ -99,114 +68,215 @@ def reconcile_surcharge(
     객실 타입에 따라 surcharge_standard 또는 surcharge_double 칩을 생성.
     반대 타입의 기존 칩은 삭제. excess <= 0 이면 양쪽 모두 삭제.
     """
-    diag("surcharge.reconcile.enter", level="verbose", res_id=reservation_id, date=date)
-    try:
-        # 0. [테스트 기간 전용] notes 에 '테스트' 포함된 예약에만 발송.
-        #    테스트 기간 종료 시 이 블록 제거하여 일반 발송으로 전환.
-        if not _has_test_marker(db, reservation_id, date):
-            _delete_all_surcharge_chips(db, reservation_id, date)
-            diag("surcharge.skipped_no_test_marker",
-                 level="verbose", res_id=reservation_id, date=date)
-            return
-
-        # 1. RoomAssignment 조회
-        q = db.query(RoomAssignment).filter(
-            RoomAssignment.reservation_id == reservation_id,
-            RoomAssignment.date == date,
-        )
-        if room_id is not None:
-            q = q.filter(RoomAssignment.room_id == room_id)
-        assignment = q.first()
-        if not assignment:
-            _delete_all_surcharge_chips(db, reservation_id, date)
-            return
-
-        # 2. Room 조회 + 도미토리 스킵
-        room = db.query(Room).filter(Room.id == assignment.room_id).first()
-        if not room or room.is_dormitory:
-            _delete_all_surcharge_chips(db, reservation_id, date)
-            return
-
-        # 3. 객실 타입 판단
-        is_double = _is_double_room(db, room)
-        target_type = SURCHARGE_DOUBLE if is_double else SURCHARGE_STANDARD
-        other_type = SURCHARGE_STANDARD if is_double else SURCHARGE_DOUBLE
-
-        # 4. 초과 계산 (variables.py 와 공유 helper)
-        reservation = db.query(Reservation).filter(
-            Reservation.id == reservation_id
-        ).first()
-        if not reservation:
-            return
-        excess = compute_excess(reservation, room)
-
-        # 5. 칩 생성/삭제
-        if excess > 0:
-            _ensure_chip(db, reservation_id, date, target_type)
-            _remove_chip(db, reservation_id, date, other_type)
-            diag("surcharge.chip_applied", level="verbose",
-                 res_id=reservation_id, date=date,
-                 type=target_type, excess=excess, is_double=is_double)
-        else:
-            _remove_chip(db, reservation_id, date, target_type)
-            _remove_chip(db, reservation_id, date, other_type)
+    reconcile_surcharge_pairs(db, [(reservation_id, date)], room_id=room_id)
 
-        db.flush()
+
+def reconcile_surcharge_batch(
+    db: Session,
+    reservation_ids: List[int],
+    date: str,
+) -> None:
+    """배치 reconcile (개별 실패가 전체 차단 안 함)."""
+    diag("surcharge.batch.enter", level="verbose", count=len(reservation_ids))
+    reconcile_surcharge_pairs(db, [(rid, date) for rid in reservation_ids])
+    diag("surcharge.batch.exit", level="verbose", count=len(reservation_ids))
+
+
+def reconcile_surcharge_pairs(
+    db: Session,
+    pairs: Iterable[Tuple[int, str]],
+    room_id: Optional[int] = None,
+) -> None:
+    """(예약, 날짜) 쌍 전체를 한 번에 재조정 — 쌍 개수와 무관하게 쿼리 5회 + 쓰기 1회.
+
+    배정 / 예약 / daily info 메모 / 기존 칩을 일괄 조회하고, 객실·더블룸 판단과 surcharge 스케줄은
+    reference_cache 에서 얻는다. 쌍마다 메모리에서 칩 diff 를 계산(실패는 그 쌍만 reconcile_failed)한 뒤
+    삭제 1회 + INSERT 1회로 반영. 일괄 쓰기가 실패하면 쌍별 SAVEPOINT 로 다시 써서 실패를 격리한다.
+    """
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return
+    for rid, date in pairs:
+        diag("surcharge.reconcile.enter", level="verbose", res_id=rid, date=date)
+    try:
+        ctx = _load_context(db, pairs, room_id)
     except Exception:
-        # 돈 관련 로직이라 조용히 삼키지 않고 critical diag 로 기록.
-        # 호출자 경로들은 개별 try/except 로 격리돼 있어 전체 차단은 방지.
-        logger.exception(
-            "surcharge: reconcile 실패 (reservation_id=%s, date=%s)",
-            reservation_id, date,
-        )
-        diag(
-            "surcharge.reconcile_failed",
-            level="critical",
-            reservation_id=reservation_id,
-            date=date,
+        logger.exception("surcharge: 일괄 조회 실패 (pairs=%s)", len(pairs))
+        for rid, date in pairs:
+            diag("surcharge.reconcile_failed", level="critical", reservation_id=rid, date=date)
+        return
+
+    plans = []
+    for rid, date in pairs:
+        try:
+            plans.append(_plan(ctx, rid, date))
+        except Exception:
+            # 돈 관련 로직이라 조용히 삼키지 않고 critical diag 로 기록 — 나머지 쌍은 계속 처리.
+            logger.exception("surcharge: reconcile 실패 (reservation_id=%s, date=%s)", rid, date)
+            diag("surcharge.reconcile_failed", level="critical", reservation_id=rid, date=date)
+    _apply(db, [plan for plan in plans if plan[2] or plan[3]])
+
+
+class _Context:
+    """reconcile_surcharge_pairs 1회분 일괄 조회 결과."""
+
+    def __init__(self):
+        self.reservations: Dict[int, Reservation] = {}
+        self.daily_notes: Dict[Tuple[int, str], Optional[str]] = {}
+        self.assigned_room: Dict[Tuple[int, str], int] = {}
+        self.rooms: Dict[int, Room] = {}
+        self.schedules: Dict[str, TemplateSchedule] = {}  # custom_type → 활성 스케줄 (id 순 첫 번째)
+        self.surcharge_schedule_ids: Set[int] = set()  # 비활성 포함
+        self.chips: Dict[Tuple[int, str], List[Tuple[int, Optional[int], str, bool]]] = {}  # (id, schedule_id, key, sent)
+
+
+def _load_context(db: Session, pairs: List[Tuple[int, str]], room_id: Optional[int]) -> _Context:
+    from app.services.reference_cache import get_active_schedules, get_rooms
+
+    ctx = _Context()
+    wanted = set(pairs)
+    res_ids = sorted({rid for rid, _ in pairs})
+    dates = sorted({d for _, d in pairs})
+
+    ctx.reservations = {r.id: r for r in db.query(Reservation).filter(Reservation.id.in_(res_ids)).all()}
+    for rid, d, notes in db.query(
+        ReservationDailyInfo.reservation_id, ReservationDailyInfo.date, ReservationDailyInfo.notes,
+    ).filter(ReservationDailyInfo.reservation_id.in_(res_ids), ReservationDailyInfo.date.in_(dates)):
+        ctx.daily_notes.setdefault((rid, d), notes)
+
+    q = db.query(RoomAssignment.reservation_id, RoomAssignment.date, RoomAssignment.room_id).filter(
+        RoomAssignment.reservation_id.in_(res_ids), RoomAssignment.date.in_(dates),
+    )
+    if room_id is not None:
+        q = q.filter(RoomAssignment.room_id == room_id)
+    for rid, d, assigned_room_id in q.order_by(RoomAssignment.id):
+        if (rid, d) in wanted:
+            ctx.assigned_room.setdefault((rid, d), assigned_room_id)
+
+    ctx.rooms = {room.id: room for room in get_rooms(db)}
+    for schedule in get_active_schedules(db):
+        if schedule.schedule_category == 'custom_schedule' and schedule.custom_type in _ALL_SURCHARGE_TYPES:
+            ctx.schedules.setdefault(schedule.custom_type, schedule)
+    ctx.surcharge_schedule_ids = {
+        row.id for row in db.query(TemplateSchedule.id).filter(
+            TemplateSchedule.schedule_category == 'custom_schedule',
+            TemplateSchedule.custom_type.in_(_ALL_SURCHARGE_TYPES),
         )
+    }
 
+    for chip_id, rid, d, schedule_id, template_key, sent_at in db.query(
+        ReservationSmsAssignment.id, ReservationSmsAssignment.reservation_id, ReservationSmsAssignment.date,
+        ReservationSmsAssignment.schedule_id, ReservationSmsAssignment.template_key, ReservationSmsAssignment.sent_at,
+    ).filter(
+        ReservationSmsAssignment.reservation_id.in_(res_ids), ReservationSmsAssignment.date.in_(dates),
+    ).order_by(ReservationSmsAssignment.id):
+        if (rid, d) in wanted:
+            ctx.chips.setdefault((rid, d), []).append((chip_id, schedule_id, template_key, sent_at is not None))
+    return ctx
 
-def _ensure_chip(db: Session, reservation_id: int, date: str, custom_type: str) -> None:
-    """해당 custom_type 의 스케줄에 대한 칩이 없으면 생성.
 
-    template 비활성화 상태면 칩 생성하지 않음 (chip_reconciler/template_scheduler 와 동일 규약).
+def _has_test_marker(ctx: _Context, reservation_id: int, date: str) -> bool:
+    """[테스트 기간 전용] 예약/일자별 메모에 '테스트' 포함 여부.
+
+    Reservation.notes 또는 ReservationDailyInfo(date).notes 중 하나라도
+    '테스트' 포함하면 True. 테스트 기간 종료 시 이 함수 호출부와 함께 제거.
     """
-    schedule = _find_schedule(db, custom_type)
-    if not schedule or not schedule.template or not schedule.template.is_active:
-        return
-    existing = db.query(ReservationSmsAssignment).filter(
-        ReservationSmsAssignment.reservation_id == reservation_id,
-        ReservationSmsAssignment.date == date,
-        ReservationSmsAssignment.schedule_id == schedule.id,
-    ).first()
-    if existing:
+    reservation = ctx.reservations.get(reservation_id)
+    if reservation and reservation.notes and '테스트' in reservation.notes:
+        return True
+    notes = ctx.daily_notes.get((reservation_id, date))
+    return bool(notes and '테스트' in notes)
+
+
+def _plan(ctx: _Context, reservation_id: int, date: str) -> Tuple[int, str, List[int], List[Dict[str, Any]]]:
+    """한 쌍의 칩 diff — (reservation_id, date, 삭제할 칩 id, 추가할 칩 row)."""
+    chips = ctx.chips.get((reservation_id, date), [])
+
+    def unsent(schedule_ids) -> List[int]:
+        return [chip_id for chip_id, schedule_id, _, sent in chips if schedule_id in schedule_ids and not sent]
+
+    # 0. [테스트 기간 전용] notes 에 '테스트' 포함된 예약에만 발송.
+    #    테스트 기간 종료 시 이 블록 제거하여 일반 발송으로 전환.
+    if not _has_test_marker(ctx, reservation_id, date):
+        diag("surcharge.skipped_no_test_marker", level="verbose", res_id=reservation_id, date=date)
+        return reservation_id, date, unsent(ctx.surcharge_schedule_ids), []
+
+    # 1~2. 배정 객실 (없거나 도미토리면 미발송 칩 전부 삭제)
+    room = ctx.rooms.get(ctx.assigned_room.get((reservation_id, date)))
+    if room is None or room.is_dormitory:
+        return reservation_id, date, unsent(ctx.surcharge_schedule_ids), []
+
+    # 3. 객실 타입 판단
+    is_double = _is_double_room(room)
+    target_type = SURCHARGE_DOUBLE if is_double else SURCHARGE_STANDARD
+    other_type = SURCHARGE_STANDARD if is_double else SURCHARGE_DOUBLE
+    target, other = ctx.schedules.get(target_type), ctx.schedules.get(other_type)
+
+    # 4. 초과 계산 (variables.py 와 공유 helper)
+    reservation = ctx.reservations.get(reservation_id)
+    if reservation is None:
+        return reservation_id, date, [], []
+    excess = compute_excess(reservation, room)
+
+    # 5. 칩 diff — 추가는 활성 템플릿일 때만 (chip_reconciler/template_scheduler 와 동일 규약)
+    add: List[Dict[str, Any]] = []
+    if excess > 0:
+        remove = unsent({other.id} if other else set())
+        if target and target.template and target.template.is_active and not any(
+            schedule_id == target.id or key == target.template.template_key for _, schedule_id, key, _ in chips
+        ):
+            add.append({
+                "tenant_id": reservation.tenant_id,
+                "reservation_id": reservation_id,
+                "template_key": target.template.template_key,
+                "date": date,
+                "assigned_by": 'auto',
+                "schedule_id": target.id,
+                "sent_at": None,
+            })
+        diag("surcharge.chip_applied", level="verbose",
+             res_id=reservation_id, date=date,
+             type=target_type, excess=excess, is_double=is_double)
+    else:
+        remove = unsent({s.id for s in (target, other) if s})
+    return reservation_id, date, remove, add
+
+
+def _write(db: Session, delete_ids: List[int], rows: List[Dict[str, Any]]) -> None:
+    if delete_ids:
+        db.query(ReservationSmsAssignment).filter(
+            ReservationSmsAssignment.id.in_(delete_ids)
+        ).delete(synchronize_session='fetch')
+    if rows:
+        db.execute(insert(ReservationSmsAssignment), rows)
+
+
+def _apply(db: Session, plans: List[Tuple[int, str, List[int], List[Dict[str, Any]]]]) -> None:
+    """칩 diff 일괄 반영. 실패 시 쌍별 SAVEPOINT 로 재시도 (한 건의 제약 위반이 나머지를 막지 않음)."""
+    if not plans:
         return
-    tenant_id = current_tenant_id.get()
-    db.add(ReservationSmsAssignment(
-        reservation_id=reservation_id,
-        template_key=schedule.template.template_key,
-        date=date,
-        assigned_by='auto',
-        schedule_id=schedule.id,
-        sent_at=None,
-        tenant_id=tenant_id,
-    ))
-
-
-def _remove_chip(db: Session, reservation_id: int, date: str, custom_type: str) -> None:
-    """해당 custom_type 의 미발송 칩 삭제."""
-    schedule = _find_schedule(db, custom_type)
-    if not schedule:
+    try:
+        with db.begin_nested():
+            _write(db, [cid for plan in plans for cid in plan[2]], [row for plan in plans for row in plan[3]])
+    except Exception:
+        logger.exception("surcharge: 일괄 반영 실패 — 예약별로 재시도 (pairs=%s)", len(plans))
+        for rid, date, delete_ids, rows in plans:
+            try:
+                with db.begin_nested():
+                    _write(db, delete_ids, rows)
+            except Exception:
+                logger.exception("surcharge: reconcile 실패 (reservation_id=%s, date=%s)", rid, date)
+                diag("surcharge.reconcile_failed", level="critical", reservation_id=rid, date=date)
+                continue
+            _applied(rid, date, delete_ids)
         return
-    existing = db.query(ReservationSmsAssignment).filter(
-        ReservationSmsAssignment.reservation_id == reservation_id,
-        ReservationSmsAssignment.date == date,
-        ReservationSmsAssignment.schedule_id == schedule.id,
-        ReservationSmsAssignment.sent_at.is_(None),
-    ).first()
-    if existing:
-        db.delete(existing)
+    for rid, date, delete_ids, _ in plans:
+        _applied(rid, date, delete_ids)
+
+
+def _applied(reservation_id: int, date: str, delete_ids: List[int]) -> None:
+    if delete_ids:
+        diag("surcharge.all_deleted", level="verbose", res_id=reservation_id, date=date, count=len(delete_ids))
 
 
 def _delete_all_surcharge_chips(db: Session, reservation_id: int, date: str) -> None:
@@ -229,18 +299,3 @@ def _delete_all_surcharge_chips(db: Session, reservation_id: int, date: str) ->
         db.flush()
         diag("surcharge.all_deleted", level="verbose",
              res_id=reservation_id, date=date, count=deleted)
-
-
-def reconcile_surcharge_batch(
-    db: Session,
-    reservation_ids: List[int],
-    date: str,
-) -> None:
-    """배치 reconcile (개별 실패가 전체 차단 안 함)."""
-    diag("surcharge.batch.enter", level="verbose", count=len(reservation_ids))
-    for rid in reservation_ids:
-        try:
-            reconcile_surcharge(db, rid, date)
-        except Exception:
-            logger.exception("surcharge: batch 처리 중 예외 (rid=%s, date=%s)", rid, date)
-    diag("surcharge.batch.exit", level="verbose", count=len(reservation_ids))
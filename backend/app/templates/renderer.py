@@ -2,7 +2,7 @@
 Template Renderer - Dynamic message generation with variable substitution
 Ported from stable-clasp-main/function_replaceMessage.js and password generation
 """
-from typing import Dict, Any, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 from sqlalchemy.orm import Session
 import re
 import logging
@@ -13,6 +13,66 @@ from app.diag_logger import diag
 logger = logging.getLogger(__name__)
 
 
+_VAR_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# 파싱 결과 캐시 — (tenant_id, template_key, updated_at) → CompiledTemplate.
+# updated_at 이 키에 포함되므로 수정된 템플릿은 자연히 새 항목으로 파싱되고,
+# api/templates.py 수정/삭제 시 invalidate_template_cache() 로 이전 항목을 즉시 제거한다.
+_COMPILED_CACHE: Dict[Tuple[Optional[int], str, Any], "CompiledTemplate"] = {}
+_COMPILED_CACHE_MAX = 1024
+
+
+class CompiledTemplate:
+    """
+    한 번 파싱된 템플릿 — 리터럴 조각과 변수 슬롯을 번갈아 담은 토큰 리스트.
+
+    tokens[0::2] 는 리터럴, tokens[1::2] 는 변수명 (re.split 규약).
+    variables 는 템플릿이 사용하는 변수명 집합으로, 렌더링 전에 정적으로 알 수 있다.
+    """
+
+    __slots__ = ("template_key", "content", "tokens", "variables")
+
+    def __init__(self, template_key: str, content: str):
+        self.template_key = template_key
+        self.content = content
+        self.tokens: List[str] = _VAR_RE.split(content)
+        self.variables: FrozenSet[str] = frozenset(self.tokens[1::2])
+
+    def render(self, variables: Dict[str, Any]) -> Tuple[str, List[str]]:
+        """변수 치환 → (렌더링 결과, 미치환 변수명 리스트 — 등장 순서, 중복 포함)."""
+        parts = []
+        unreplaced = []
+        for i, token in enumerate(self.tokens):
+            if i % 2 == 0:
+                parts.append(token)
+            elif token in variables:
+                parts.append(str(variables[token]))
+            else:
+                parts.append(f"{{{{{token}}}}}")
+                unreplaced.append(token)
+        return "".join(parts), unreplaced
+
+
+def compile_template(template: MessageTemplate) -> CompiledTemplate:
+    """MessageTemplate row → CompiledTemplate (캐시 경유)."""
+    key = (template.tenant_id, template.template_key, template.updated_at)
+    compiled = _COMPILED_CACHE.get(key)
+    # content 비교는 updated_at 을 갱신하지 않는 외부 수정(bulk update, 다른 워커) 대비 안전망
+    if compiled is None or compiled.content != template.content:
+        compiled = CompiledTemplate(template.template_key, template.content)
+        if len(_COMPILED_CACHE) >= _COMPILED_CACHE_MAX:
+            _COMPILED_CACHE.clear()
+        _COMPILED_CACHE[key] = compiled
+    return compiled
+
+
+def invalidate_template_cache(tenant_id: Optional[int] = None, template_key: Optional[str] = None) -> None:
+    """파싱 캐시 무효화. 인자 없으면 전체, 주어진 인자에 해당하는 항목만 제거."""
+    for key in list(_COMPILED_CACHE):
+        if (tenant_id is None or key[0] == tenant_id) and (template_key is None or key[1] == template_key):
+            _COMPILED_CACHE.pop(key, None)
+
+
 class TemplateRenderer:
     """
     Renders message templates with variable substitution
@@ -38,13 +98,9 @@ class TemplateRenderer:
         """
         diag("template.render.enter", level="verbose", template_key=template_key)
 
-        # Get template from database
-        template = self.db.query(MessageTemplate).filter_by(
-            template_key=template_key,
-            is_active=True
-        ).first()
+        compiled = self.get_compiled(template_key)
 
-        if not template:
+        if not compiled:
             logger.error(f"Template '{template_key}' not found")
             diag(
                 "template.render.exit",
@@ -56,34 +112,44 @@ class TemplateRenderer:
             )
             return f"[Template '{template_key}' not found]"
 
-        # Start with template content
-        result = template.content
+        result, _ = self.render_compiled(compiled, variables)
+        return result
+
+    def render_compiled(self, compiled: CompiledTemplate, variables: Dict[str, Any]) -> Tuple[str, List[str]]:
+        """
+        이미 조회/파싱된 템플릿 렌더링 (DB 조회 없음).
 
-        # Replace variables (format: {{variableName}})
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            result = result.replace(placeholder, str(value))
+        Returns:
+            (rendered, unreplaced) — unreplaced 는 값이 없어 남은 {{변수}} 이름들
+        """
+        result, unreplaced = compiled.render(variables)
 
         # Check for unreplaced variables (undefined detection)
-        unreplaced = re.findall(r'\{\{(\w+)\}\}', result)
         if unreplaced:
-            logger.warning(f"Undefined variables in template '{template_key}': {unreplaced}")
+            logger.warning(f"Undefined variables in template '{compiled.template_key}': {unreplaced}")
             diag(
                 "template.render.unreplaced",
                 level="critical",
-                template_key=template_key,
+                template_key=compiled.template_key,
                 unreplaced=list(unreplaced)[:5],
             )
 
         diag(
             "template.render.exit",
             level="verbose",
-            template_key=template_key,
+            template_key=compiled.template_key,
             length=len(result),
             unreplaced_count=len(unreplaced),
         )
 
-        return result
+        return result, unreplaced
+
+    def get_compiled(self, template_key: str) -> Optional[CompiledTemplate]:
+        """활성 템플릿 조회 + 파싱 캐시 적용. 없으면 None."""
+        template = self.get_template(template_key)
+        if template is None:
+            return None
+        return compile_template(template)
 
     def get_template(self, template_key: str) -> Optional[MessageTemplate]:
         """Get template by key"""
@@ -91,4 +157,3 @@ class TemplateRenderer:
             template_key=template_key,
             is_active=True
         ).first()
-
@@ -3,17 +3,19 @@ Template Variable Definitions and Auto-calculation
 
 Defines all available template variables and provides functions to calculate them.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import math
+import re
 import json as _json
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.config import KST
-from app.db.models import Reservation, ReservationStatus, ParticipantSnapshot
+from app.db.models import Reservation, ParticipantSnapshot
 from app.diag_logger import diag
 
+_ROOM_NUM_RE = re.compile(r'(\d[\d\-]*호?)')
+_SURCHARGE_TEMPLATE_KEYS = ('add_standard', 'add_double')
 
 # 사용 가능한 템플릿 변수 정의
 AVAILABLE_VARIABLES = {
@@ -154,7 +156,7 @@ def _apply_buffers(male: int, female: int, custom_vars: dict) -> tuple:
 
 def get_or_create_snapshot(db: Session, target_date: str) -> ParticipantSnapshot:
     """SMS 발송 시 호출 — 있으면 그대로 반환, 없으면 1회 생성."""
-    from app.services.filters import stay_coverage_filter
+    from app.services.daily_stats import get_daily_stat
 
     existing = db.query(ParticipantSnapshot).filter(
         ParticipantSnapshot.date == target_date
@@ -162,19 +164,13 @@ def get_or_create_snapshot(db: Session, target_date: str) -> ParticipantSnapshot
     if existing:
         return existing
 
-    # target_date 에 투숙/방문 중인 예약 합계 (연박 중간일 + NULL/당일 포함)
-    result = db.query(
-        func.coalesce(func.sum(Reservation.male_count), 0).label("total_male"),
-        func.coalesce(func.sum(Reservation.female_count), 0).label("total_female"),
-    ).filter(
-        stay_coverage_filter(target_date),
-        Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.COMPLETED]),
-    ).first()
+    # target_date 에 투숙/방문 중인 예약 합계 (daily_stats — 연박 중간일 + NULL/당일 포함)
+    stat = get_daily_stat(db, target_date)
 
     snapshot = ParticipantSnapshot(
         date=target_date,
-        male_count=int(result.total_male),
-        female_count=int(result.total_female),
+        male_count=stat.male_count,
+        female_count=stat.female_count,
     )
     db.add(snapshot)
     try:
@@ -196,20 +192,13 @@ def get_or_create_snapshot(db: Session, target_date: str) -> ParticipantSnapshot
 def refresh_snapshot(db: Session, target_date: str) -> Optional[ParticipantSnapshot]:
     """스케줄러(08:50/11:50) 호출 — 있으면 갱신, 없으면 생성."""
     import logging
-    from app.services.filters import stay_coverage_filter
+    from app.services.daily_stats import get_daily_stat
     _logger = logging.getLogger(__name__)
 
-    # target_date 에 투숙/방문 중인 예약 합계 (연박 중간일 + NULL/당일 포함)
-    result = db.query(
-        func.coalesce(func.sum(Reservation.male_count), 0).label("total_male"),
-        func.coalesce(func.sum(Reservation.female_count), 0).label("total_female"),
-    ).filter(
-        stay_coverage_filter(target_date),
-        Reservation.status.in_([ReservationStatus.CONFIRMED, ReservationStatus.COMPLETED]),
-    ).first()
-
-    new_male = int(result.total_male) if result else 0
-    new_female = int(result.total_female) if result else 0
+    # target_date 에 투숙/방문 중인 예약 합계 (daily_stats — 연박 중간일 + NULL/당일 포함)
+    stat = get_daily_stat(db, target_date)
+    new_male = stat.male_count or 0
+    new_female = stat.female_count or 0
 
     existing = db.query(ParticipantSnapshot).filter(
         ParticipantSnapshot.date == target_date
@@ -266,24 +255,40 @@ def _format_man_won(amount_won: int) -> str:
     return f"{v:g}"
 
 
-def _inject_surcharge_vars(context: Dict[str, Any], reservation, room_assignment, db: Session) -> None:
-    """surcharge 템플릿용 변수 주입 — excess/nights/per_night/total."""
+def _inject_surcharge_vars(
+    context: Dict[str, Any],
+    reservation,
+    room_assignment,
+    db: Session,
+    prefetched: Optional[Dict[str, Any]] = None,
+) -> None:
+    """surcharge 템플릿용 변수 주입 — excess/nights/per_night/total.
+
+    prefetched: 배치 경로에서 미리 로드한 {"room", "is_double", "tenant"} (있으면 쿼리 생략).
+    """
     from app.services.surcharge import _is_double_room, compute_guest_count, compute_excess
-    from app.db.models import Room, Tenant
+    from app.db.models import Tenant
     from app.db.tenant_context import current_tenant_id
+    from app.services.reference_cache import get_room
 
-    # Room / is_double 판단
-    room = None
-    is_double = False
-    if room_assignment:
-        room = db.query(Room).filter(Room.id == room_assignment.room_id).first()
-        if room:
-            is_double = _is_double_room(db, room)
+    if prefetched is not None:
+        room = prefetched["room"]
+        is_double = prefetched["is_double"]
+        tenant = prefetched["tenant"]
+    else:
+        # Room / is_double 판단
+        room = None
+        is_double = False
+        if room_assignment:
+            room = get_room(db, room_assignment.room_id)
+            if room:
+                is_double = _is_double_room(room)
+
+        # 단가 조회 (Tenant 설정)
+        tenant_id = current_tenant_id.get()
+        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first() if tenant_id else None
 
-    # 단가 조회 (Tenant 설정)
     # 더블룸 = 일반 인원 추가비(unit_standard × excess) + 객실 변경비(double_room_fee, 박수에만 곱함)
-    tenant_id = current_tenant_id.get()
-    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first() if tenant_id else None
     unit_standard = getattr(tenant, 'surcharge_unit_standard', 20000) if tenant else 20000
     double_room_fee = getattr(tenant, 'surcharge_double_room_fee', 5000) if tenant else 5000
 
@@ -305,28 +310,33 @@ def _inject_surcharge_vars(context: Dict[str, Any], reservation, room_assignment
     context['total_surcharge'] = _format_man_won(total)
 
 
-def calculate_template_variables(
+def _snapshot_dates(target_date) -> tuple:
+    """(당일, 내일, 어제) 스냅샷 날짜. 당일은 target_date 가 없으면 None."""
+    from datetime import timedelta as _td
+    try:
+        _base_date = datetime.strptime(target_date, '%Y-%m-%d').date() if isinstance(target_date, str) and target_date else datetime.now(KST).date()
+    except (ValueError, TypeError):
+        _base_date = datetime.now(KST).date()
+    return (
+        target_date or None,
+        (_base_date + _td(days=1)).strftime('%Y-%m-%d'),
+        (_base_date + _td(days=-1)).strftime('%Y-%m-%d'),
+    )
+
+
+def _build_template_variables(
     reservation: Reservation,
     db: Session,
-    date: Optional[str] = None,
-    custom_vars: Optional[Dict[str, Any]] = None,
-    room_assignment=None,
-    template_key: Optional[str] = None,
+    date: Optional[str],
+    custom_vars: Optional[Dict[str, Any]],
+    room_assignment,
+    room_obj,
+    building_obj,
+    snapshots: Dict[str, Any],
+    template_key: Optional[str],
+    surcharge_prefetched: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    """
-    Calculate all template variables for a reservation
-
-    Args:
-        reservation: Reservation object
-        db: Database session
-        date: Optional date for party statistics
-        custom_vars: Custom variables to override defaults
-        room_assignment: Optional RoomAssignment object
-        template_key: Optional template key for template-specific variable injection
-
-    Returns:
-        Dictionary of all calculated variables
-    """
+    """조회가 끝난 row 들로 변수 dict 구성 (단건/배치 공통, 쿼리 없음 — surcharge 단건 경로 제외)."""
     variables = {}
 
     # 직접 매핑 (모델 필드 = 변수명)
@@ -340,29 +350,18 @@ def calculate_template_variables(
     prefixed = room_assignment.room_password_prefixed if room_assignment else None
     variables['prefix_room_password'] = prefixed or effective_room_password or ''
 
-    from app.db.models import Room, Building
-    room_obj = None
-    if room_assignment and room_assignment.room_id:
-        room_obj = db.query(Room).filter(Room.id == room_assignment.room_id).first()
-
     variables['room_type'] = room_obj.room_type if room_obj else ''
 
     effective_room_number = room_obj.room_number if room_obj else ""
 
     if effective_room_number:
-        # Lookup Building name via Room → Building relationship
-        if room_obj and room_obj.building_id:
-            building_obj = db.query(Building).filter(Building.id == room_obj.building_id).first()
-            building_name = building_obj.name if building_obj else ''
-        else:
-            building_name = ''
+        building_name = building_obj.name if building_obj else ''
         # room_number 첫 글자가 A/B면 동 이름으로 치환 (본관 A동/B동 구분)
         if effective_room_number[0] in ('A', 'B'):
             building_name = f"{effective_room_number[0]}동"
         variables['building'] = building_name
         # Extract room number part: "본관 101호" → "101호", or just use as-is
-        import re
-        num_match = re.search(r'(\d[\d\-]*호?)', effective_room_number)
+        num_match = _ROOM_NUM_RE.search(effective_room_number)
         variables['room_num'] = num_match.group(1) if num_match else effective_room_number
     else:
         variables['building'] = ''
@@ -370,13 +369,11 @@ def calculate_template_variables(
 
     # 참여자 통계 — use snapshot for consistency across the day
     target_date = date or reservation.check_in_date
+    today_d, tomorrow_d, yesterday_d = _snapshot_dates(target_date)
     if target_date:
-        snapshot = get_or_create_snapshot(db, target_date)
-        total_male = snapshot.male_count
-        total_female = snapshot.female_count
-
+        snapshot = snapshots[today_d]
         # 버퍼 적용 (헬퍼 함수 사용)
-        eff_m, eff_f, total = _apply_buffers(total_male, total_female, custom_vars or {})
+        eff_m, eff_f, total = _apply_buffers(snapshot.male_count, snapshot.female_count, custom_vars or {})
         variables['male_count'] = str(eff_m)
         variables['female_count'] = str(eff_f)
         variables['participant_count'] = str(total)
@@ -387,23 +384,16 @@ def calculate_template_variables(
 
     # 날짜 프리픽스 변수: today/tomorrow/yesterday (동일 버퍼 적용)
     # NOTE: get_or_create_snapshot은 check_in_date 기준 집계. 인원 통계는 항상 체크인 기준.
-    from datetime import timedelta as _td
-    try:
-        _base_date = datetime.strptime(target_date, '%Y-%m-%d').date() if isinstance(target_date, str) and target_date else datetime.now(KST).date()
-    except (ValueError, TypeError):
-        _base_date = datetime.now(KST).date()
-
-    for _prefix, _delta in [('tomorrow', 1), ('yesterday', -1)]:
-        _d = (_base_date + _td(days=_delta)).strftime('%Y-%m-%d')
-        _snap = get_or_create_snapshot(db, _d)
+    for _prefix, _d in [('tomorrow', tomorrow_d), ('yesterday', yesterday_d)]:
+        _snap = snapshots[_d]
         _pm, _pf, _pt = _apply_buffers(_snap.male_count, _snap.female_count, custom_vars or {})
         variables[f'{_prefix}_male_count'] = str(_pm)
         variables[f'{_prefix}_female_count'] = str(_pf)
         variables[f'{_prefix}_total_count'] = str(_pt)
 
     # surcharge 변수 (add_standard / add_double 템플릿용)
-    if template_key in ('add_standard', 'add_double'):
-        _inject_surcharge_vars(variables, reservation, room_assignment, db)
+    if template_key in _SURCHARGE_TEMPLATE_KEYS:
+        _inject_surcharge_vars(variables, reservation, room_assignment, db, prefetched=surcharge_prefetched)
 
     # Custom variables override (excluding internal _prefixed keys)
     if custom_vars:
@@ -423,6 +413,172 @@ def calculate_template_variables(
     return variables
 
 
+def calculate_template_variables(
+    reservation: Reservation,
+    db: Session,
+    date: Optional[str] = None,
+    custom_vars: Optional[Dict[str, Any]] = None,
+    room_assignment=None,
+    template_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Calculate all template variables for a reservation
+
+    Args:
+        reservation: Reservation object
+        db: Database session
+        date: Optional date for party statistics
+        custom_vars: Custom variables to override defaults
+        room_assignment: Optional RoomAssignment object
+        template_key: Optional template key for template-specific variable injection
+
+    Returns:
+        Dictionary of all calculated variables
+    """
+    from app.services.reference_cache import get_building, get_room
+
+    room_obj = None
+    if room_assignment and room_assignment.room_id:
+        room_obj = get_room(db, room_assignment.room_id)
+
+    # Lookup Building name via Room → Building relationship
+    building_obj = None
+    if room_obj and room_obj.room_number and room_obj.building_id:
+        building_obj = get_building(db, room_obj.building_id)
+
+    snapshots = {}
+    for d in _snapshot_dates(date or reservation.check_in_date):
+        if d and d not in snapshots:
+            snapshots[d] = get_or_create_snapshot(db, d)
+
+    return _build_template_variables(
+        reservation, db, date, custom_vars, room_assignment,
+        room_obj, building_obj, snapshots, template_key,
+    )
+
+
+def prefetch_room_assignments(
+    db: Session,
+    reservations: List[Reservation],
+    date: Optional[str] = None,
+) -> Dict[int, Any]:
+    """예약별 (date or check_in_date) 날짜의 RoomAssignment 를 1회 조회로 매핑.
+
+    Returns:
+        {reservation_id: RoomAssignment} — 배정 없는 예약은 키 없음.
+    """
+    from app.db.models import RoomAssignment
+
+    wanted = {
+        (r.id, str(date or r.check_in_date))
+        for r in reservations if (date or r.check_in_date)
+    }
+    if not wanted:
+        return {}
+    rows = db.query(RoomAssignment).filter(
+        RoomAssignment.reservation_id.in_({rid for rid, _ in wanted}),
+        RoomAssignment.date.in_({d for _, d in wanted}),
+    ).all()
+    return {ra.reservation_id: ra for ra in rows if (ra.reservation_id, ra.date) in wanted}
+
+
+def calculate_template_variables_batch(
+    db: Session,
+    reservations: List[Reservation],
+    date: Optional[str] = None,
+    custom_vars: Optional[Dict[str, Any]] = None,
+    template_key: Optional[str] = None,
+    room_assignments: Optional[Dict[int, Any]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    calculate_template_variables 의 배치판 — 예약 수와 무관하게 고정 횟수 쿼리.
+
+    RoomAssignment / Room / Building / 스냅샷(당일·내일·어제) / surcharge 용
+    RoomBizItemLink·Tenant 를 한 번씩만 조회한 뒤 예약별로 동일한 변수 dict 를 만든다.
+
+    Args:
+        room_assignments: {reservation_id: RoomAssignment} — 이미 조회했다면 전달 (재조회 생략).
+            None 이면 prefetch_room_assignments() 로 조회.
+
+    Returns:
+        {reservation_id: variables}
+    """
+    from app.db.models import RoomBizItemLink, Tenant
+    from app.db.tenant_context import current_tenant_id
+    from app.services.reference_cache import get_building, get_room
+    from app.services.surcharge import DOUBLE_ROOM_BIZ_ITEM_IDS
+
+    if not reservations:
+        return {}
+
+    if room_assignments is None:
+        room_assignments = prefetch_room_assignments(db, reservations, date)
+
+    room_ids = {ra.room_id for ra in room_assignments.values() if ra and ra.room_id}
+    rooms = {}
+    for room_id in room_ids:
+        room = get_room(db, room_id)
+        if room is not None:
+            rooms[room_id] = room
+
+    building_ids = {rm.building_id for rm in rooms.values() if rm.room_number and rm.building_id}
+    buildings = {}
+    for building_id in building_ids:
+        building = get_building(db, building_id)
+        if building is not None:
+            buildings[building_id] = building
+
+    # 스냅샷: 필요한 날짜 전체를 1회 조회, 없는 날짜만 get_or_create_snapshot
+    needed_dates = []
+    for r in reservations:
+        for d in _snapshot_dates(date or r.check_in_date):
+            if d and d not in needed_dates:
+                needed_dates.append(d)
+    snapshots = {
+        snap.date: snap
+        for snap in db.query(ParticipantSnapshot).filter(ParticipantSnapshot.date.in_(needed_dates)).all()
+    }
+    for d in needed_dates:
+        if d not in snapshots:
+            snapshots[d] = get_or_create_snapshot(db, d)
+
+    # surcharge 템플릿: 더블룸 판정 + 테넌트 단가 1회 조회
+    double_room_ids: set = set()
+    tenant = None
+    is_surcharge = template_key in _SURCHARGE_TEMPLATE_KEYS
+    if is_surcharge:
+        if rooms:
+            double_room_ids = {
+                link.room_id for link in db.query(RoomBizItemLink).filter(
+                    RoomBizItemLink.room_id.in_(rooms.keys()),
+                    RoomBizItemLink.biz_item_id.in_(DOUBLE_ROOM_BIZ_ITEM_IDS),
+                ).all()
+            }
+        tenant_id = current_tenant_id.get()
+        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first() if tenant_id else None
+
+    contexts: Dict[int, Dict[str, Any]] = {}
+    for r in reservations:
+        ra = room_assignments.get(r.id)
+        room_obj = rooms.get(ra.room_id) if ra and ra.room_id else None
+        building_obj = (
+            buildings.get(room_obj.building_id)
+            if room_obj and room_obj.room_number and room_obj.building_id else None
+        )
+        surcharge_prefetched = None
+        if is_surcharge:
+            surcharge_prefetched = {
+                "room": room_obj,
+                "is_double": bool(room_obj and room_obj.id in double_room_ids),
+                "tenant": tenant,
+            }
+        contexts[r.id] = _build_template_variables(
+            r, db, date, custom_vars, ra, room_obj, building_obj,
+            snapshots, template_key, surcharge_prefetched,
+        )
+    return contexts
+
+
 def get_variable_categories() -> Dict[str, list]:
     """
     Get variables grouped by category
@@ -1,7 +1,11 @@
-"""통합 테스트용 in-memory SQLite fixture."""
+"""통합 테스트용 in-memory SQLite fixture + 실행 SQL 기록 (count_statements)."""
+import threading
+from contextlib import contextmanager
+
 import pytest
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.db.models import Base, Tenant
 from app.db.tenant_context import current_tenant_id
@@ -9,8 +13,15 @@ from app.db.tenant_context import current_tenant_id
 
 @pytest.fixture
 def db():
-    """In-memory SQLite 세션. 각 테스트마다 초기화."""
-    engine = create_engine("sqlite:///:memory:")
+    """In-memory SQLite 세션. 각 테스트마다 초기화.
+
+    StaticPool + check_same_thread=False: run_db() 워커 스레드에서도 같은 in-memory DB 를 본다.
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -26,3 +37,45 @@ def db():
     current_tenant_id.reset(token)
     session.close()
     engine.dispose()
+
+
+class StatementLog:
+    """count_statements 블록 안에서 실행된 SQL (실행 순서). executemany / threads 는 문장별 값."""
+
+    def __init__(self):
+        self.statements = []
+        self.executemany = []
+        self.threads = []
+
+    def __len__(self):
+        return len(self.statements)
+
+    def selects(self, *fragments):
+        """SELECT 문 중 fragments 를 모두 포함하는 것."""
+        return [
+            s for s in self.statements
+            if s.lstrip().upper().startswith("SELECT") and all(f in s for f in fragments)
+        ]
+
+
+@pytest.fixture
+def count_statements(db):
+    """with count_statements() as log: ... — db 엔진(기본) 또는 bind 에서 실행된 SQL 기록."""
+
+    @contextmanager
+    def counter(bind=None):
+        engine = bind if bind is not None else db.get_bind()
+        log = StatementLog()
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            log.statements.append(statement)
+            log.executemany.append(executemany)
+            log.threads.append(threading.get_ident())
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield log
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+    return counter
@@ -0,0 +1,70 @@
+"""API 날짜 파라미터 — 'YYYY-MM-DD' 가 아니면 DATE 컬럼 바인딩(500) 전에 422."""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import ValidationError
+
+from app.api import party_checkin, reservations
+from app.api.deps import get_tenant_scoped_db
+from app.api.reservations import ReservationCreate
+from app.auth.dependencies import get_current_user, require_any_role
+from app.db.models import Reservation, ReservationStatus, User, UserRole
+
+MALFORMED = ["2026-5-1", "", "2026-02-30", "20260501", "tomorrow"]
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(reservations.router)
+    app.include_router(party_checkin.router)
+    user = User(id=1, username="admin", role=UserRole.ADMIN)
+    app.dependency_overrides[get_tenant_scoped_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[require_any_role] = lambda: user
+
+    def get(url, **params):
+        async def _get():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+                return await c.get(url, params=params)
+        return run_async(_get())
+
+    return get
+
+
+class TestDateParams:
+    @pytest.mark.parametrize("value", MALFORMED)
+    def test_malformed_query_date_is_422(self, client, value):
+        assert client("/api/reservations", date=value).status_code == 422
+        assert client("/api/party-checkin", date=value).status_code == 422
+
+    def test_valid_query_date(self, db, client):
+        db.add(Reservation(
+            tenant_id=1, customer_name="A", phone="010", check_in_date="2026-05-01",
+            check_in_time="15:00", status=ReservationStatus.CONFIRMED,
+        ))
+        db.commit()
+        response = client("/api/reservations", date="2026-05-01")
+        assert response.status_code == 200
+        assert [r["check_in_date"] for r in response.json()["items"]] == ["2026-05-01"]
+
+    @pytest.mark.parametrize("value", MALFORMED)
+    def test_malformed_body_date_rejected(self, value):
+        with pytest.raises(ValidationError):
+            ReservationCreate(customer_name="A", phone="010", check_in_date=value, check_in_time="15:00")
+        with pytest.raises(ValidationError):
+            ReservationCreate(
+                customer_name="A", phone="010", check_in_date="2026-05-01", check_in_time="15:00",
+                check_out_date=value,
+            )
+
+    def test_body_date_kept_as_string(self):
+        body = ReservationCreate(customer_name="A", phone="010", check_in_date="2026-05-01", check_in_time="15:00")
+        assert body.check_in_date == "2026-05-01"
+        assert body.check_out_date is None
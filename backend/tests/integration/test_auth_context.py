@@ -0,0 +1,182 @@
+"""auth.context — 요청당 조인 쿼리 1회, 요청 간 TTL 캐시, 사용자/매핑/테넌트 변경 시 무효화."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.deps import get_current_tenant, get_current_tenant_id
+from app.auth import context as auth_context
+from app.auth.dependencies import get_current_user
+from app.auth.utils import create_access_token, hash_password
+from app.config import settings
+from app.db.models import Tenant, User, UserRole, UserTenantRole
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CACHE_TTL_SECONDS", 30)
+    auth_context.clear()
+    yield
+    auth_context.clear()
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _user(db, username="staff", role=UserRole.STAFF, tenant_ids=(1,)):
+    user = User(username=username, hashed_password=hash_password("pw"), name=username, role=role, is_active=True)
+    db.add(user)
+    db.flush()
+    for tid in tenant_ids:
+        db.add(UserTenantRole(user_id=user.id, tenant_id=tid))
+    db.commit()
+    return user
+
+
+def _request(token=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _resolve(db, token, tenant_id=1):
+    """get_current_tenant_id → get_current_user → get_current_tenant (FastAPI 와 같은 순서, 한 요청)."""
+    request = _request(token)
+    tid = run_async(get_current_tenant_id(request=request, x_tenant_id=tenant_id, db=db))
+    user = run_async(get_current_user(request=request, token=token, db=db))
+    tenant = run_async(get_current_tenant(request=request, tenant_id=tid, db=db))
+    return tid, user, tenant
+
+
+class TestQueryCount:
+    def test_one_statement_on_miss_none_on_hit(self, db, count_statements):
+        user = _user(db)
+        token = create_access_token({"sub": user.username})
+
+        with count_statements() as miss:
+            tid, resolved, tenant = _resolve(db, token)
+        assert (tid, resolved.id, tenant.id) == (1, user.id, 1)
+        assert len(miss.statements) == 1
+        assert "JOIN tenants" in miss.statements[0] and "JOIN user_tenant_roles" in miss.statements[0]
+
+        with count_statements() as hit:
+            _resolve(db, token)
+        assert hit.statements == []
+
+    def test_resolved_objects_belong_to_caller_session(self, db):
+        user = _user(db)
+        token = create_access_token({"sub": user.username})
+        _resolve(db, token)
+        db.expunge_all()
+
+        _, resolved, tenant = _resolve(db, token)
+        assert resolved in db and tenant in db
+        tenant.name = "변경된 이름"
+        db.commit()
+        assert db.get(Tenant, 1).name == "변경된 이름"
+
+    def test_ttl_zero_disables_cross_request_cache(self, db, monkeypatch, count_statements):
+        monkeypatch.setattr(settings, "AUTH_CACHE_TTL_SECONDS", 0)
+        user = _user(db)
+        token = create_access_token({"sub": user.username})
+        _resolve(db, token)
+
+        with count_statements() as again:
+            _resolve(db, token)
+        assert len(again.statements) == 1
+
+    def test_tokens_are_keyed_separately(self, db):
+        staff = _user(db, "staff")
+        admin = _user(db, "admin", role=UserRole.ADMIN)
+        staff_token = create_access_token({"sub": staff.username})
+        admin_token = create_access_token({"sub": admin.username})
+
+        assert _resolve(db, staff_token)[1].username == "staff"
+        assert _resolve(db, admin_token)[1].username == "admin"
+        assert _resolve(db, staff_token)[1].username == "staff"
+
+
+class TestInvalidation:
+    def test_removed_mapping_is_forbidden_on_next_request(self, db):
+        user = _user(db)
+        token = create_access_token({"sub": user.username})
+        _resolve(db, token)
+
+        db.query(UserTenantRole).filter(UserTenantRole.user_id == user.id).delete()
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc:
+            _resolve(db, token)
+        assert exc.value.status_code == 403
+
+    def test_deactivated_user_is_unauthorized_on_next_request(self, db):
+        user = _user(db)
+        token = create_access_token({"sub": user.username})
+        _resolve(db, token)
+
+        user.is_active = False
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc:
+            _resolve(db, token)
+        assert exc.value.status_code == 401
+
+    def test_deactivated_tenant_is_not_found_on_next_request(self, db):
+        user = _user(db)
+        token = create_access_token({"sub": user.username})
+        _resolve(db, token)
+
+        db.query(Tenant).filter(Tenant.id == 1).update({"is_active": False})
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc:
+            _resolve(db, token)
+        assert exc.value.status_code == 404
+
+
+class TestErrorSemantics:
+    def _status(self, db, token, tenant_id=1):
+        with pytest.raises(HTTPException) as exc:
+            run_async(get_current_tenant_id(request=_request(token), x_tenant_id=tenant_id, db=db))
+        return exc.value.status_code, exc.value.detail
+
+    def test_missing_header_and_unknown_tenant(self, db):
+        token = create_access_token({"sub": _user(db).username})
+        assert self._status(db, token, tenant_id=None) == (400, "X-Tenant-Id 헤더가 필요합니다")
+        assert self._status(db, token, tenant_id=99) == (404, "유효하지 않은 테넌트입니다")
+
+    def test_unknown_tenant_reported_before_missing_auth(self, db):
+        assert self._status(db, None, tenant_id=99)[0] == 404
+        assert self._status(db, "garbage", tenant_id=99)[0] == 404
+        assert self._status(db, None) == (401, "인증이 필요합니다")
+        assert self._status(db, "garbage") == (401, "인증이 필요합니다")
+
+    def test_superadmin_bypasses_mapping(self, db):
+        admin = _user(db, "root", role=UserRole.SUPERADMIN, tenant_ids=())
+        db.add(Tenant(id=2, slug="other", name="Other"))
+        db.commit()
+        token = create_access_token({"sub": admin.username})
+        assert _resolve(db, token, tenant_id=2)[0] == 2
+
+    def test_get_current_user_errors(self, db):
+        expired = create_access_token({"sub": _user(db).username}, expires_delta=timedelta(seconds=-1))
+        with pytest.raises(HTTPException) as exc:
+            run_async(get_current_user(request=_request(expired), token=expired, db=db))
+        assert exc.value.detail == "토큰이 만료되었습니다"
+
+        ghost = create_access_token({"sub": "nobody"})
+        with pytest.raises(HTTPException) as exc:
+            run_async(get_current_user(request=_request(ghost), token=ghost, db=db))
+        assert (exc.value.status_code, exc.value.detail) == (401, "인증 정보가 유효하지 않습니다")
+
+    def test_legacy_token_without_jti(self, db, count_statements):
+        import jwt
+
+        user = _user(db)
+        legacy = jwt.encode({"sub": user.username}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        assert _resolve(db, legacy)[1].id == user.id
+        with count_statements() as hit:
+            _resolve(db, legacy)
+        assert hit.statements == []
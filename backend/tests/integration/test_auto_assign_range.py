@@ -0,0 +1,103 @@
+"""auto_assign_rooms_range — 여러 날짜를 1회 적재로 배정, 연박자 전 박 배정 + reconcile 예약당 1회."""
+from unittest.mock import patch
+
+
+from app.db.models import Building, Reservation, ReservationStatus, Room, RoomAssignment, RoomBizItemLink
+from app.services.room_auto_assign import auto_assign_rooms, auto_assign_rooms_range
+
+DATES = ["2026-04-10", "2026-04-11", "2026-04-12"]
+
+
+def _room(db, number, is_dorm=False, bed_capacity=4):
+    if not db.query(Building).first():
+        db.add(Building(tenant_id=1, name="본관", is_active=True))
+        db.flush()
+    room = Room(
+        tenant_id=1, room_number=number, room_type="dormitory" if is_dorm else "더블",
+        building_id=db.query(Building).first().id, is_active=True,
+        is_dormitory=is_dorm, bed_capacity=bed_capacity, base_capacity=2, max_capacity=2,
+    )
+    db.add(room)
+    db.flush()
+    db.add(RoomBizItemLink(tenant_id=1, room_id=room.id, biz_item_id="BIZ001"))
+    db.flush()
+    return room
+
+
+def _res(db, name, check_in, check_out):
+    res = Reservation(
+        tenant_id=1, customer_name=name, phone="01012345678",
+        check_in_date=check_in, check_in_time="15:00", check_out_date=check_out,
+        status=ReservationStatus.CONFIRMED, party_size=1,
+        naver_biz_item_id="BIZ001", section="unassigned",
+    )
+    db.add(res)
+    db.flush()
+    return res
+
+
+def _nights(db, res):
+    return sorted(
+        (ra.date, ra.room_id) for ra in db.query(RoomAssignment).filter(RoomAssignment.reservation_id == res.id)
+    )
+
+
+class TestAutoAssignRange:
+    def test_multi_night_guest_assigned_once_for_all_nights(self, db):
+        r1, r2 = _room(db, "R1"), _room(db, "R2")
+        long_stay = _res(db, "연박", "2026-04-10", "2026-04-13")
+        late = _res(db, "후발", "2026-04-12", "2026-04-13")
+        db.commit()
+
+        with patch("app.services.surcharge.reconcile_surcharge_pairs") as surcharge, \
+                patch("app.services.chip_reconciler.reconcile_chips_for_reservations") as chips:
+            result = auto_assign_rooms_range(db, list(reversed(DATES)), created_by="sync")
+
+        assert result["dates"] == DATES
+        assert result["assigned"] == 2
+        assert [result["by_date"][d]["assigned"] for d in DATES] == [1, 0, 1]
+        assert _nights(db, long_stay) == [(d, r1.id) for d in DATES]
+        assert _nights(db, late) == [("2026-04-12", r2.id)]
+        # reconcile: 배정된 예약마다 1회 (surcharge 는 첫 배정일 기준)
+        chips.assert_called_once()
+        assert sorted(chips.call_args.args[1]) == sorted([long_stay.id, late.id])
+        surcharge.assert_called_once()
+        assert sorted(surcharge.call_args.args[1]) == \
+            sorted([(long_stay.id, "2026-04-10"), (late.id, "2026-04-12")])
+
+    def test_rooms_and_schedules_loaded_once(self, db, count_statements):
+        _room(db, "R1")
+        _room(db, "R2")
+        for i, d in enumerate(DATES):
+            _res(db, f"손님{i}", d, "2026-04-13")
+        db.commit()
+
+        with count_statements() as log, patch("app.services.surcharge.reconcile_surcharge_pairs"):
+            auto_assign_rooms_range(db, DATES)
+
+        def count(*fragments):
+            return len(log.selects(*fragments))
+
+        assert count("FROM rooms LEFT OUTER JOIN buildings") == 1  # 객실 목록 (reference_cache)
+        assert count("FROM room_biz_item_links", "room_biz_item_links.room_id IN") == 1  # selectinload
+        assert count("FROM template_schedules") == 1
+
+    def test_matches_per_date_loop(self, db):
+        _room(db, "D1", is_dorm=True, bed_capacity=2)
+        _room(db, "R1")
+        guests = [
+            _res(db, "A", "2026-04-10", "2026-04-12"),
+            _res(db, "B", "2026-04-11", "2026-04-13"),
+            _res(db, "C", "2026-04-11", "2026-04-12"),
+            _res(db, "D", "2026-04-12", "2026-04-13"),
+        ]
+        db.commit()
+        per_date = [auto_assign_rooms(db, d) for d in DATES]
+        looped = {g.id: _nights(db, g) for g in guests}
+
+        db.query(RoomAssignment).delete()
+        db.commit()
+        result = auto_assign_rooms_range(db, DATES)
+
+        assert {g.id: _nights(db, g) for g in guests} == looped
+        assert [result["by_date"][d]["assigned"] for d in DATES] == [r["assigned"] for r in per_date]
@@ -282,3 +282,99 @@ class TestPatchCancelledUnlinks:
         assert r3.stay_group_order == 1
         assert r1.is_last_in_group is False
         assert r3.is_last_in_group is True
+
+
+# ---------------------------------------------------------------------------
+# 증분 감지 (detect_and_link_for_reservations) — 전체 스캔과 같은 link/unlink 결과
+# ---------------------------------------------------------------------------
+
+def _day(offset):
+    from datetime import timedelta
+    from app.config import today_kst_date
+    return (today_kst_date() + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+def _stay_state(reservations):
+    """그룹 id 값(uuid)과 무관한 비교용 상태: (같은 그룹 멤버 집합, order, is_last)."""
+    by_group = {}
+    for r in reservations:
+        if r.stay_group_id:
+            by_group.setdefault(r.stay_group_id, set()).add(r.id)
+    return {
+        r.id: (frozenset(by_group.get(r.stay_group_id, ())), r.stay_group_order, r.is_last_in_group)
+        for r in reservations
+    }
+
+
+def _reset_stay_fields(reservations, snapshot):
+    for r in reservations:
+        r.stay_group_id, r.stay_group_order, r.is_last_in_group, r.is_long_stay = snapshot[r.id]
+
+
+class TestIncrementalDetection:
+    def _assert_matches_full_scan(self, db, reservations, seeds):
+        from app.services.consecutive_stay import (
+            detect_and_link_consecutive_stays,
+            detect_and_link_for_reservations,
+        )
+        snapshot = {r.id: (r.stay_group_id, r.stay_group_order, r.is_last_in_group, r.is_long_stay) for r in reservations}
+        full = detect_and_link_consecutive_stays(db)
+        expected = _stay_state(reservations)
+
+        _reset_stay_fields(reservations, snapshot)
+        db.flush()
+        incremental = detect_and_link_for_reservations(db, [r.id for r in seeds])
+        assert _stay_state(reservations) == expected
+        assert (incremental["linked"], incremental["unlinked"]) == (full["linked"], full["unlinked"])
+        return incremental
+
+    def test_links_chain_for_touched_identity_only(self, db):
+        a = _make_reservation(db, check_in=_day(0), check_out=_day(1), name="김철수")
+        b = _make_reservation(db, check_in=_day(1), check_out=_day(2), name="김철수")
+        other1 = _make_reservation(db, check_in=_day(0), check_out=_day(1), name="이영희", phone="01099990000")
+        other2 = _make_reservation(db, check_in=_day(1), check_out=_day(2), name="이영희", phone="01099990000")
+
+        from app.services.consecutive_stay import detect_and_link_for_reservations
+        result = detect_and_link_for_reservations(db, [b.id])
+        assert result["linked"] == 2
+        assert a.stay_group_id and a.stay_group_id == b.stay_group_id
+        assert other1.stay_group_id is None and other2.stay_group_id is None  # 건드리지 않은 identity
+
+    def test_visitor_identity_bridges_chain(self, db):
+        a = _make_reservation(db, check_in=_day(0), check_out=_day(1), name="김철수")
+        b = _make_reservation(db, check_in=_day(1), check_out=_day(2), name="박대리")
+        b.visitor_name = "김철수"
+        c = _make_reservation(db, check_in=_day(2), check_out=_day(3), name="박대리")
+        db.flush()
+        self._assert_matches_full_scan(db, [a, b, c], seeds=[c])
+        assert a.stay_group_id == b.stay_group_id == c.stay_group_id is not None
+
+    def test_identity_change_unlinks_old_partner(self, db):
+        a = _make_reservation(db, check_in=_day(0), check_out=_day(1), name="김철수", stay_group_id="g1")
+        b = _make_reservation(db, check_in=_day(1), check_out=_day(2), name="김철수", stay_group_id="g1")
+        a.stay_group_order, b.stay_group_order = 0, 1
+        a.phone = "01055556666"  # 네이버에서 전화번호 변경
+        db.flush()
+        result = self._assert_matches_full_scan(db, [a, b], seeds=[a])
+        assert result["unlinked"] == 2
+        assert a.stay_group_id is None and b.stay_group_id is None
+
+    def test_cancelled_middle_splits_chain(self, db):
+        rs = [_make_reservation(db, check_in=_day(i), check_out=_day(i + 1), stay_group_id="g1") for i in range(3)]
+        for i, r in enumerate(rs):
+            r.stay_group_order = i
+        rs[1].status = ReservationStatus.CANCELLED
+        db.flush()
+        self._assert_matches_full_scan(db, rs, seeds=[rs[1]])
+        assert rs[0].stay_group_id is None and rs[2].stay_group_id is None
+
+    def test_lookup_is_keyed_not_window_scan(self, db, count_statements):
+        from app.services.consecutive_stay import detect_and_link_for_reservations
+
+        a = _make_reservation(db, check_in=_day(0), check_out=_day(1))
+        _make_reservation(db, check_in=_day(1), check_out=_day(2))
+        with count_statements() as log:
+            detect_and_link_for_reservations(db, [a.id])
+        selects = log.selects("FROM reservations")
+        assert selects
+        assert all("reservations.id IN" in s or "reservations.phone IN" in s for s in selects)
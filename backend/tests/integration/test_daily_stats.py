@@ -0,0 +1,236 @@
+"""services/daily_stats — 날짜별 집계: commit 시 영향 날짜 증분 갱신, 즉시 계산 fallback, 재구축/정합성 검사."""
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import insert, update
+
+from app.db.models import (
+    Building, DailyHost, DailyStat, Reservation, ReservationDailyInfo, ReservationStatus, Room, RoomAssignment, Tenant,
+)
+from app.services import daily_stats
+from app.services.daily_stats import check_daily_stats, get_daily_stats, rebuild_daily_stats, stay_dates
+from app.templates.variables import get_or_create_snapshot
+
+
+def _res(db, name, check_in="2026-05-10", check_out="2026-05-12", male=1, female=0, **kwargs):
+    fields = dict(
+        customer_name=name, phone="01000000000", check_in_date=check_in, check_in_time="15:00",
+        check_out_date=check_out, status=ReservationStatus.CONFIRMED, male_count=male, female_count=female,
+        section="room", party_type="1",
+    )
+    fields.update(kwargs)
+    res = Reservation(**fields)
+    db.add(res)
+    db.flush()
+    return res
+
+
+def _stored(db):
+    db.expire_all()
+    return {s.date: s for s in db.query(DailyStat).all()}
+
+
+def _room(db, number, dormitory=False, beds=1):
+    building = db.query(Building).first()
+    if building is None:
+        building = Building(name="본관", is_active=True)
+        db.add(building)
+        db.flush()
+    room = Room(room_number=number, room_type="더블", building_id=building.id, is_active=True,
+                is_dormitory=dormitory, bed_capacity=beds)
+    db.add(room)
+    db.flush()
+    return room
+
+
+class TestDailyStatsMaintenance:
+    def test_stay_dates_match_coverage_rules(self):
+        assert stay_dates("2026-05-10", "2026-05-12") == ["2026-05-10", "2026-05-11"]
+        assert stay_dates("2026-05-10", None) == ["2026-05-10"]
+        assert stay_dates("2026-05-10", "2026-05-10") == ["2026-05-10"]
+        assert stay_dates(None, "2026-05-10") == []
+
+    def test_commit_maintains_gender_and_party_counts(self, db):
+        _res(db, "A", male=2, female=1)
+        _res(db, "B", check_in="2026-05-11", check_out=None, male=0, female=2, party_type="2차만")
+        _res(db, "C", male=1, status=ReservationStatus.COMPLETED)
+        _res(db, "D", male=5, status=ReservationStatus.CANCELLED)
+        _res(db, "E", male=1, female=1, section="unstable")
+        db.commit()
+
+        stats = _stored(db)
+        assert sorted(stats) == ["2026-05-10", "2026-05-11"]
+        day1, day2 = stats["2026-05-10"], stats["2026-05-11"]
+        assert (day1.male_count, day1.female_count) == (4, 2)
+        assert (day1.party_1_count, day1.party_2only_count, day1.party_unstable_count) == (3, 0, 2)
+        assert (day2.male_count, day2.female_count) == (4, 4)
+        assert (day2.party_1_count, day2.party_2only_count) == (3, 2)
+        assert day2.party_participants == 5
+
+    def test_cancel_and_date_change_recompute_old_and_new_dates(self, db):
+        res = _res(db, "A", male=2)
+        db.commit()
+        res.check_in_date, res.check_out_date = "2026-05-11", "2026-05-13"
+        db.commit()
+        stats = _stored(db)
+        assert {d: s.male_count for d, s in stats.items()} == {"2026-05-10": 0, "2026-05-11": 2, "2026-05-12": 2}
+
+        res.status = ReservationStatus.CANCELLED
+        db.commit()
+        assert all(s.male_count == 0 for s in _stored(db).values())
+        assert check_daily_stats(db, 1, "2026-05-09", "2026-05-14") == []
+
+    def test_daily_info_overrides_party_type(self, db):
+        res = _res(db, "A", male=1, female=1)
+        db.commit()
+        info = ReservationDailyInfo(reservation_id=res.id, date="2026-05-11", party_type="2")
+        db.add(info)
+        db.commit()
+        stats = _stored(db)
+        assert (stats["2026-05-10"].party_1_count, stats["2026-05-11"].party_2_count) == (2, 2)
+
+        info.party_type = None
+        info.unstable_party = True
+        db.commit()
+        day2 = _stored(db)["2026-05-11"]
+        assert (day2.party_1_count, day2.party_2_count, day2.party_unstable_count) == (0, 0, 2)
+
+        db.delete(info)
+        db.commit()
+        assert _stored(db)["2026-05-11"].party_1_count == 2
+
+    def test_sales_count_keeps_report_rules(self, db):
+        """매출 리포트 인원: 당일(체크아웃 = 체크인) 예약 제외, 날짜별 unstable_party 는 포함."""
+        _res(db, "숙박", male=1, female=1)
+        _res(db, "당일", check_out="2026-05-10", male=3)
+        flagged = _res(db, "그날 언스테이블", male=0, female=2)
+        _res(db, "언스테이블", male=4, section="unstable")
+        db.add(ReservationDailyInfo(reservation_id=flagged.id, date="2026-05-10", unstable_party=True))
+        db.commit()
+
+        day1 = _stored(db)["2026-05-10"]
+        assert day1.party_participants == 5  # 숙박 2 + 당일 3
+        assert day1.party_sales_count == 4  # 숙박 2 + 그날 언스테이블 2
+        assert day1.party_unstable_count == 6
+
+        from app.api.sales_report import get_sales_report
+        db.add(DailyHost(date="2026-05-10", host_username="mc"))
+        db.commit()
+        report = asyncio.get_event_loop().run_until_complete(
+            get_sales_report(date_from="2026-05-10", date_to="2026-05-10", db=db, current_user=None)
+        )
+        assert report.hosts[0].total_participants == 4
+
+    def test_room_assignments_and_bulk_delete(self, db):
+        room = _room(db, "101")
+        dorm = _room(db, "도미", dormitory=True, beds=4)
+        a = _res(db, "A")
+        b = _res(db, "B", party_size=3)
+        for d in ("2026-05-10", "2026-05-11"):
+            db.add(RoomAssignment(reservation_id=a.id, date=d, room_id=room.id))
+            db.add(RoomAssignment(reservation_id=b.id, date=d, room_id=dorm.id))
+        db.commit()
+        day1 = _stored(db)["2026-05-10"]
+        assert (day1.rooms_occupied, day1.beds_used) == (2, 3)
+
+        db.query(RoomAssignment).filter(RoomAssignment.reservation_id == b.id,
+                                        RoomAssignment.date == "2026-05-11").delete(synchronize_session="fetch")
+        db.commit()
+        stats = _stored(db)
+        assert (stats["2026-05-10"].beds_used, stats["2026-05-11"].beds_used) == (3, 0)
+        assert stats["2026-05-11"].rooms_occupied == 1
+
+    def test_bulk_insert_and_pk_update(self, db):
+        ids = [row.id for row in db.execute(insert(Reservation).returning(Reservation.id), [
+            dict(tenant_id=1, customer_name=n, phone="010", check_in_date="2026-05-10", check_in_time="15:00",
+                 check_out_date="2026-05-11", status=ReservationStatus.CONFIRMED, male_count=1, female_count=0)
+            for n in ("A", "B")
+        ])]
+        db.commit()
+        assert _stored(db)["2026-05-10"].male_count == 2
+
+        db.execute(update(Reservation), [{"id": ids[0], "check_in_date": "2026-05-20", "check_out_date": "2026-05-21"}])
+        db.commit()
+        stats = _stored(db)
+        assert (stats["2026-05-10"].male_count, stats["2026-05-20"].male_count) == (1, 1)
+
+    def test_unrelated_updates_do_not_recompute(self, db, monkeypatch):
+        res = _res(db, "A")
+        db.commit()
+        calls = []
+        monkeypatch.setattr(daily_stats, "recompute_daily_stats", lambda *a: calls.append(a))
+        res.notes = "메모"
+        db.commit()
+        assert calls == []
+
+
+class TestDailyStatsReadAndRepair:
+    def test_missing_rows_computed_on_read_without_saving(self, db):
+        _res(db, "A", male=2)
+        db.commit()
+        db.query(DailyStat).delete()
+        db.commit()
+
+        stats = get_daily_stats(db, ["2026-05-10", "2026-05-15"])
+        assert (stats["2026-05-10"].male_count, stats["2026-05-15"].male_count) == (2, 0)
+        assert db.query(DailyStat).count() == 0
+        assert get_or_create_snapshot(db, "2026-05-10").male_count == 2
+
+    def test_rebuild_and_check_repair(self, db):
+        _res(db, "A", check_in="2026-05-01", check_out="2026-05-04", male=1)
+        db.commit()
+        db.query(DailyStat).filter(DailyStat.date == "2026-05-02").update({"male_count": 9})
+        db.add(DailyStat(date="2025-01-01", male_count=3))
+        db.commit()
+
+        mismatches = check_daily_stats(db, 1, "2026-05-01", "2026-05-03", repair=True)
+        assert [(m["date"], m["field"], m["stored"], m["actual"]) for m in mismatches] == [
+            ("2026-05-02", "male_count", 9, 1),
+        ]
+        db.commit()
+        assert check_daily_stats(db, 1, "2026-05-01", "2026-05-03") == []
+
+        assert rebuild_daily_stats(db, 1) == 4  # 05-01 ~ 05-04 (체크아웃일 0 행 포함)
+        db.commit()
+        assert sorted(_stored(db)) == ["2026-05-01", "2026-05-02", "2026-05-03", "2026-05-04"]
+
+    def test_tenants_isolated(self, db):
+        db.add(Tenant(id=2, slug="other", name="Other"))
+        db.commit()
+        _res(db, "A", male=1)
+        _res(db, "B", male=4, tenant_id=2)
+        db.commit()
+        assert get_daily_stats(db, ["2026-05-10"])["2026-05-10"].male_count == 1
+        assert check_daily_stats(db, 2, "2026-05-10", "2026-05-11") == []
+
+
+class TestConcurrentRecompute:
+    class _PgSession:
+        def __init__(self):
+            self.calls = []
+
+        def get_bind(self):
+            return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+        def execute(self, stmt, params=None):
+            self.calls.append(("execute", str(stmt), params))
+
+    def test_postgresql_locks_dates_before_reading(self, monkeypatch):
+        pg = self._PgSession()
+        monkeypatch.setattr(daily_stats, "compute_daily_stats", lambda db, tid, dates: pg.calls.append(("compute",)) or {})
+        monkeypatch.setattr(daily_stats, "_store", lambda *a: None)
+
+        daily_stats.recompute_daily_stats(pg, 3, ["2026-05-11", "2026-05-10", "2026-05-11"])
+        (kind, sql, params), compute = pg.calls
+        assert kind == "execute" and "pg_advisory_xact_lock(:tid, d)" in sql
+        assert params == {"tid": 3, "days": [date(2026, 5, 10).toordinal(), date(2026, 5, 11).toordinal()]}
+        assert compute == ("compute",)
+
+    def test_sqlite_takes_no_lock(self, db, monkeypatch):
+        statements = []
+        monkeypatch.setattr(daily_stats, "text", lambda sql: statements.append(sql))
+        _res(db, "A")
+        db.commit()
+        assert statements == []
+        assert _stored(db)["2026-05-10"].male_count == 1
@@ -0,0 +1,82 @@
+"""DATE 컬럼 호환 계층 (DateString) + stay_coverage_filter / stay_overlap_filter 방언별 컴파일."""
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Reservation, ReservationStatus, RoomAssignment
+from app.services.daily_stats import stay_dates
+from app.services.filters import stay_coverage_filter, stay_overlap_filter
+
+
+def _res(db, check_in, check_out=None, **kwargs):
+    res = Reservation(
+        tenant_id=1, customer_name="손님", phone="01000000000", check_in_date=check_in, check_in_time="15:00",
+        check_out_date=check_out, status=ReservationStatus.CONFIRMED, **kwargs,
+    )
+    db.add(res)
+    db.flush()
+    return res
+
+
+def _ids(db, condition):
+    return {rid for (rid,) in db.query(Reservation.id).filter(condition)}
+
+
+class TestDateString:
+    def test_round_trip_as_iso_string(self, db):
+        res = _res(db, "2026-05-10", date(2026, 5, 12))
+        db.add(RoomAssignment(tenant_id=1, reservation_id=res.id, date=datetime(2026, 5, 11, 9, 30), room_id=1))
+        db.commit()
+        db.expire_all()
+
+        assert (res.check_in_date, res.check_out_date) == ("2026-05-10", "2026-05-12")
+        assert [a.date for a in res.room_assignments] == ["2026-05-11"]
+
+    def test_string_literals_compare_against_date_column(self, db):
+        early, late = _res(db, "2026-05-01"), _res(db, "2026-05-20")
+        assert _ids(db, Reservation.check_in_date >= "2026-05-10") == {late.id}
+        assert _ids(db, Reservation.check_in_date.in_(["2026-05-01", "2026-06-01"])) == {early.id}
+
+    def test_malformed_legacy_values_load_as_raw_strings(self, db):
+        res = _res(db, "2026-05-10", "2026-05-12")
+        db.commit()
+        db.execute(
+            text("UPDATE reservations SET end_date = '2026/05/12' WHERE id = :id"), {"id": res.id},
+        )
+        db.commit()
+        db.expire_all()
+
+        loaded = db.query(Reservation).get(res.id)
+        assert (loaded.check_in_date, loaded.check_out_date) == ("2026-05-10", "2026/05/12")
+
+
+class TestStayFilters:
+    def test_coverage_and_overlap_match_stay_dates(self, db):
+        rng = random.Random(3)
+        base = date(2026, 5, 1)
+        stays = {}
+        for _ in range(80):
+            check_in = base + timedelta(days=rng.randrange(20))
+            nights = rng.choice((None, 0, 1, 2, 4))
+            check_out = (check_in + timedelta(days=nights)).isoformat() if nights is not None else None
+            res = _res(db, check_in.isoformat(), check_out)
+            stays[res.id] = set(stay_dates(res.check_in_date, res.check_out_date))
+
+        days = [(base + timedelta(days=n)).isoformat() for n in range(26)]
+        for d in days:  # 같은 SQL 모양, 다른 날짜 — 캐시된 컴파일이 값을 섞지 않아야 함
+            assert _ids(db, stay_coverage_filter(d)) == {rid for rid, ds in stays.items() if d in ds}
+        for lo, hi in (("2026-05-03", "2026-05-09"), ("2026-05-19", "2026-05-25")):
+            window = {d for d in days if lo <= d <= hi}
+            assert _ids(db, stay_overlap_filter(lo, hi)) == {rid for rid, ds in stays.items() if ds & window}
+
+    def test_postgresql_uses_stay_range_operators(self):
+        dialect = postgresql.dialect()
+        coverage = str(select(Reservation.id).where(stay_coverage_filter("2026-05-10")).compile(dialect=dialect))
+        overlap = str(select(Reservation.id).where(
+            Reservation.tenant_id == 1, stay_overlap_filter("2026-05-10", "2026-05-16"),
+        ).compile(dialect=dialect))
+        assert "reservations.stay_range @> %(param_1)s" in coverage
+        assert "reservations.stay_range && daterange(%(param_1)s, %(param_2)s, '[]')" in overlap
+        assert "end_date" not in coverage + overlap
@@ -0,0 +1,142 @@
+"""run_db() — DB 스레드 풀 실행 검증 + 블로킹 작업 중 이벤트 루프 응답성.
+
+실제 엔드포인트(/health, GET /api/reservations) 지연 측정은 scripts/bench/loop_latency.py.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.db.executor import run_db
+from app.db.models import Reservation, ReservationStatus
+from app.db.tenant_context import bypass_tenant_filter, current_tenant_id
+from app.services import event_bus
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _slow_sync(db, seconds):
+    """블로킹 DB 작업 모사 — 쿼리 + 드라이버 대기."""
+    db.query(Reservation).count()
+    time.sleep(seconds)
+    return db.query(Reservation).count()
+
+
+async def _probe_latencies(work, duration=0.6, interval=0.01):
+    """work 코루틴이 도는 동안 interval 주기 probe 의 지연(초) 목록."""
+    latencies = []
+
+    async def probe():
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            await asyncio.sleep(interval)
+            latencies.append(time.perf_counter() - t0 - interval)
+
+    await asyncio.gather(probe(), work())
+    return latencies
+
+
+def _p99(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+class TestRunDb:
+    def test_runs_in_worker_thread_with_context(self, db):
+        main_thread = threading.get_ident()
+
+        def _work():
+            return threading.get_ident(), current_tenant_id.get(), bypass_tenant_filter.get()
+
+        token = bypass_tenant_filter.set(True)
+        try:
+            thread_id, tid, bypass = run_async(run_db(_work))
+        finally:
+            bypass_tenant_filter.reset(token)
+
+        assert thread_id != main_thread
+        assert tid == 1
+        assert bypass is True
+
+    def test_context_changes_do_not_leak_back(self, db):
+        def _work():
+            current_tenant_id.set(99)
+
+        run_async(run_db(_work))
+        assert current_tenant_id.get() == 1
+
+    def test_session_usable_from_worker(self, db):
+        db.add(Reservation(
+            tenant_id=1, customer_name="A", phone="010", check_in_date="2026-05-01",
+            check_in_time="15:00", status=ReservationStatus.CONFIRMED,
+        ))
+        db.commit()
+        assert run_async(run_db(lambda: db.query(Reservation).count())) == 1
+
+    def test_exception_propagates(self, db):
+        def _boom():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            run_async(run_db(_boom))
+
+
+class TestEventLoopLatency:
+    def test_offloaded_sync_keeps_loop_responsive(self, db):
+        block = 0.3
+
+        async def inline_work():
+            await asyncio.sleep(0.05)
+            _slow_sync(db, block)
+
+        async def offloaded_work():
+            await asyncio.sleep(0.05)
+            await run_db(_slow_sync, db, block)
+
+        inline_p99 = _p99(run_async(_probe_latencies(inline_work)))
+        offloaded_p99 = _p99(run_async(_probe_latencies(offloaded_work)))
+
+        assert inline_p99 >= block * 0.8
+        assert offloaded_p99 < block / 3
+
+
+class TestEventBusFromWorker:
+    def test_publish_from_worker_thread_reaches_subscriber(self, db):
+        async def scenario():
+            q = event_bus.subscribe(1)
+            try:
+                await run_db(event_bus.publish, "room_assign_failed", {"x": 1}, 1)
+                return await asyncio.wait_for(q.get(), timeout=1)
+            finally:
+                event_bus.unsubscribe(q, 1)
+
+        payload = run_async(scenario())
+        assert '"room_assign_failed"' in payload
+
+
+class TestSyncEndpointOffLoop:
+    def test_activity_log_and_commit_not_on_loop_thread(self, db, count_statements):
+        """POST /sync/naver — sync 이후 활동 로그 / commit 도 run_db 로 (루프 스레드 SQL 없음)."""
+        from unittest.mock import patch
+        from app.api.reservations import sync_from_naver
+        from app.db.models import ActivityLog, Tenant, User
+
+        async def fake_sync(provider, db, **kwargs):
+            return {"success": True, "total": 2, "synced": 2}
+
+        tenant = db.get(Tenant, 1)
+        user = User(username="admin")
+        loop_thread = threading.get_ident()
+        with patch("app.services.naver_sync.sync_naver_to_db", fake_sync), \
+                patch("app.api.reservations.get_reservation_provider_for_tenant"), \
+                count_statements() as log:
+            result = run_async(sync_from_naver.__wrapped__(None, db=db, current_user=user, tenant=tenant))
+
+        assert result["synced"] == 2
+        assert db.query(ActivityLog).filter(ActivityLog.activity_type == "naver_sync").count() == 1
+        assert any(s.lstrip().upper().startswith("INSERT") for s in log.statements)
+        assert [s for s, t in zip(log.statements, log.threads) if t == loop_thread] == []
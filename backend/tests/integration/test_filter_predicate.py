@@ -0,0 +1,143 @@
+"""compile_filter_predicate() — SQL 경로(apply_structural_filters)와 결과 일치 검증.
+
+무작위 예약/배정/일별정보 + 무작위 v2 필터를 생성해 두 백엔드가 같은 예약
+집합을 고르는지 확인한다 (seed 고정 property test).
+"""
+import json
+import random
+
+import pytest
+from sqlalchemy.orm import selectinload
+
+from app.db.models import (
+    Reservation, Room, Building, RoomAssignment, ReservationDailyInfo,
+    ReservationStatus, TemplateSchedule, MessageTemplate,
+)
+from app.services.filters import apply_structural_filters, compile_filter_predicate
+
+DATE = "2026-04-10"
+
+# SQLite LIKE 는 ASCII 대소문자를 구분하지 않으므로 한글/숫자/와일드카드만 사용
+_TEXT_POOL = [None, "", "조식", "조식 추가", "늦은 체크인", "2", "1", "2차만", "X", "50%", "a_b"]
+_NEEDLES = ["조식", "체크인", "2", "%", "_", "차만"]
+_SECTIONS = ["room", "unassigned", "party", "unstable", None]
+_COLUMNS = ["party_type", "gender", "naver_room_type", "notes"]
+_OPERATORS = ["is_empty", "is_not_empty", "contains", "not_contains"]
+
+
+def _seed_world(db, rng):
+    buildings = [Building(tenant_id=1, name=f"건물{i}", is_active=True) for i in range(3)]
+    db.add_all(buildings)
+    db.flush()
+    rooms = [
+        Room(tenant_id=1, room_number=f"{i}0{i}", room_type="standard",
+             building_id=buildings[i % 3].id, is_active=True)
+        for i in range(6)
+    ]
+    db.add_all(rooms)
+    db.flush()
+
+    for i in range(60):
+        res = Reservation(
+            tenant_id=1, customer_name=f"손님{i}", phone="01000000000",
+            check_in_date=DATE, check_in_time="15:00",
+            status=ReservationStatus.CONFIRMED,
+            section=rng.choice(_SECTIONS),
+            gender=rng.choice([None, "", "남", "여"]),
+            party_type=rng.choice(_TEXT_POOL),
+            notes=rng.choice(_TEXT_POOL),
+            naver_room_type=rng.choice(_TEXT_POOL),
+            is_long_stay=rng.random() < 0.3,
+        )
+        db.add(res)
+        db.flush()
+        if rng.random() < 0.6:
+            db.add(RoomAssignment(
+                tenant_id=1, reservation_id=res.id, room_id=rng.choice(rooms).id,
+                date=DATE, assigned_by="auto",
+            ))
+        if rng.random() < 0.5:
+            db.add(ReservationDailyInfo(
+                tenant_id=1, reservation_id=res.id, date=DATE,
+                party_type=rng.choice(_TEXT_POOL),
+                notes=rng.choice(_TEXT_POOL),
+                unstable_party=rng.random() < 0.3,
+            ))
+    db.flush()
+    return [b.id for b in buildings]
+
+
+def _random_filters(rng, building_ids):
+    filters = []
+    for _ in range(rng.randint(0, 2)):
+        value = rng.choice(["room", "party", "unassigned", "unstable"])
+        f = {"type": "assignment", "value": value}
+        if value == "room":
+            if rng.random() < 0.5:
+                f["buildings"] = rng.sample(building_ids, rng.randint(1, len(building_ids)))
+            if rng.random() < 0.3:
+                f["include_unassigned"] = True
+        filters.append(f)
+    for _ in range(rng.randint(0, 2)):
+        filters.append({
+            "type": "column_match",
+            "value": f"{rng.choice(_COLUMNS)}:{rng.choice(_OPERATORS)}:{rng.choice(_NEEDLES)}",
+        })
+    return filters
+
+
+def _python_ids(db, schedule):
+    predicate = compile_filter_predicate(schedule)
+    reservations = db.query(Reservation).all()
+    assignments = {
+        a.reservation_id: a
+        for a in db.query(RoomAssignment)
+        .options(selectinload(RoomAssignment.room))
+        .filter(RoomAssignment.date == DATE).all()
+    }
+    daily = {
+        d.reservation_id: d
+        for d in db.query(ReservationDailyInfo).filter(ReservationDailyInfo.date == DATE).all()
+    }
+    return {
+        r.id for r in reservations
+        if predicate(r, assignments.get(r.id), daily.get(r.id))
+    }
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_predicate_agrees_with_sql(db, seed):
+    rng = random.Random(seed)
+    building_ids = _seed_world(db, rng)
+    tpl = MessageTemplate(tenant_id=1, template_key="tpl_pred", name="T", content="c", is_active=True)
+    db.add(tpl)
+    db.flush()
+
+    for _ in range(25):
+        filters = _random_filters(rng, building_ids)
+        sched = TemplateSchedule(
+            tenant_id=1, template_id=tpl.id, schedule_name="pred",
+            schedule_type="daily", hour=9, minute=0,
+            filters=json.dumps(filters),
+        )
+        sql_ids = {
+            r.id for r in apply_structural_filters(db, db.query(Reservation), sched, DATE).all()
+        }
+        assert _python_ids(db, sched) == sql_ids, filters
+
+
+def test_predicate_is_cached_per_filters():
+    a = TemplateSchedule(filters=json.dumps([{"type": "assignment", "value": "party"}]))
+    b = TemplateSchedule(filters=json.dumps([{"type": "assignment", "value": "party"}]))
+    c = TemplateSchedule(filters=json.dumps([{"type": "assignment", "value": "room"}]))
+    assert compile_filter_predicate(a) is compile_filter_predicate(b)
+    assert compile_filter_predicate(a) is not compile_filter_predicate(c)
+
+
+def test_stay_filter_opt_in():
+    sched = TemplateSchedule(filters=json.dumps([
+        {"type": "assignment", "value": "room", "stay_filter": "exclude"},
+    ]))
+    res = Reservation(section="room", is_long_stay=True)
+    assert compile_filter_predicate(sched)(res) is True
+    assert compile_filter_predicate(sched, include_stay_filter=True)(res) is False
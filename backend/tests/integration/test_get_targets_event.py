@@ -125,3 +125,54 @@ class TestGetTargetsEvent:
         executor = _executor(db)
         targets = executor._get_targets_event(sched)
         assert res.id not in [r.id for r in targets]
+
+    def test_exclude_sent_skips_sent_and_failed(self, db):
+        """exclude_sent — 날짜 무관, 발송 완료 또는 실패 이력이 있으면 제외 (대기 칩은 포함)."""
+        tpl = _make_template(db, key="evt_sent")
+        sched = _make_event_schedule(db, tpl, exclude_sent=True)
+        sent, failed, pending, other_key = (_make_reservation(db) for _ in range(4))
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for res, key, sent_at, status in (
+            (sent, "evt_sent", now, "sent"),
+            (failed, "evt_sent", None, "failed"),
+            (pending, "evt_sent", None, None),
+            (other_key, "other_tpl", now, "sent"),
+        ):
+            db.add(ReservationSmsAssignment(
+                tenant_id=1, reservation_id=res.id, template_key=key, date="2026-01-01",
+                sent_at=sent_at, send_status=status,
+            ))
+        db.flush()
+
+        executor = _executor(db)
+        ids = {r.id for r in executor._get_targets_event(sched)}
+        assert ids == {pending.id, other_key.id}
+        ids = {r.id for r in executor._get_targets_event(sched, exclude_sent=False)}
+        assert {sent.id, failed.id} <= ids
+
+    def test_stay_filter_exclude_drops_long_stay(self, db):
+        """stay_filter=exclude — 연박 예약 제외."""
+        tpl = _make_template(db, key="evt_stay")
+        sched = _make_event_schedule(db, tpl)
+        sched.stay_filter = 'exclude'
+        single = _make_reservation(db)
+        long_stay = _make_reservation(db, is_long_stay=True)
+
+        ids = [r.id for r in _executor(db)._get_targets_event(sched)]
+        assert single.id in ids
+        assert long_stay.id not in ids
+
+    def test_single_statement_with_restrict_to_ids(self, db, count_statements):
+        """훅 경로 — 발송 이력 규모와 무관하게 SELECT 1회."""
+        tpl = _make_template(db, key="evt_hook")
+        sched = _make_event_schedule(db, tpl, hours_since_booking=24, exclude_sent=True)
+        confirmed = datetime.now(timezone.utc) - timedelta(hours=1)
+        target = _make_reservation(db, confirmed_at=confirmed)
+        db.commit()
+        _executor(db)._get_targets_event(sched)  # commit 후 만료된 스케줄/템플릿 로드는 측정 밖에서
+
+        with count_statements() as log:
+            targets = _executor(db)._get_targets_event(sched, restrict_to_ids=[target.id])
+        assert [r.id for r in targets] == [target.id]
+        assert len(log) == 1
+        assert "NOT (EXISTS" in log.statements[0]
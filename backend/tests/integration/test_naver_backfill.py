@@ -0,0 +1,133 @@
+"""네이버 과거 백필 — 청크별 commit + 체크포인트 재개 + 다음 청크 prefetch + SSE 진행 이벤트."""
+import asyncio
+import time
+from unittest.mock import patch
+
+from app.db.models import NaverBackfillCheckpoint, Reservation
+from app.services import naver_sync
+from app.services.naver_sync import sync_naver_to_db
+
+CHUNKS = [("2026-01-01", "2026-01-31"), ("2026-02-01", "2026-03-03"), ("2026-03-04", "2026-04-03")]
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _booking(ext_id, date):
+    return {
+        "external_id": ext_id, "naver_booking_id": ext_id, "naver_biz_item_id": "biz-1",
+        "customer_name": f"고객{ext_id}", "phone": "01012345678", "date": date, "end_date": date,
+        "status": "confirmed", "booking_count": 1, "people_count": 1,
+    }
+
+
+class FakeProvider:
+    """iter_history_chunks 만 흉내 — fail_after 개 청크 이후 쿠키 만료처럼 예외."""
+
+    def __init__(self, fail_after=None, log=None):
+        self.fail_after = fail_after
+        self.log = log if log is not None else []
+        self.started_from = []
+
+    async def iter_history_chunks(self, from_date):
+        self.started_from.append(from_date)
+        for i, (start, end) in enumerate(CHUNKS):
+            if end < from_date:
+                continue
+            if self.fail_after is not None and i >= self.fail_after:
+                raise RuntimeError("401 Unauthorized")
+            await asyncio.sleep(0)
+            self.log.append(f"fetched {start}")
+            yield start, end, [_booking(f"{start}-{n}", start) for n in range(3)]
+
+
+def _backfill(db, provider):
+    with patch("app.services.event_bus.publish") as publish:
+        result = run_async(sync_naver_to_db(provider, db, from_date="2026-01-01"))
+    return result, [(c.args[0], c.args[1]) for c in publish.call_args_list]
+
+
+class TestBackfill:
+    def test_chunks_committed_and_progress_published(self, db):
+        result, events = _backfill(db, FakeProvider())
+
+        assert result["success"] is True
+        assert (result["chunks"], result["added"], result["fetched"]) == (3, 9, 9)
+        assert db.query(Reservation).count() == 9
+        checkpoint = db.query(NaverBackfillCheckpoint).one()
+        assert (checkpoint.last_chunk_end, checkpoint.chunks_done) == ("2026-04-03", 3)
+        assert checkpoint.completed_at is not None
+
+        progress = [data for name, data in events if name == "naver_backfill_progress"]
+        assert [(p["chunk_end"], p["chunks"], p["added"]) for p in progress] == \
+            [("2026-01-31", 1, 3), ("2026-03-03", 2, 6), ("2026-04-03", 3, 9)]
+        assert events[-1][0] == "naver_backfill_done"
+
+    def test_failure_keeps_progress_and_rerun_resumes(self, db):
+        result, events = _backfill(db, FakeProvider(fail_after=2))
+        assert result["success"] is False and result["resumable"] is True
+        assert db.query(Reservation).count() == 6  # 앞 2청크는 커밋됨
+        assert events[-1][0] == "naver_backfill_failed"
+
+        provider = FakeProvider()
+        result, _ = _backfill(db, provider)
+        assert provider.started_from == ["2026-03-04"]
+        assert result["resumed_from"] == "2026-03-04"
+        assert (result["added"], result["chunks"]) == (9, 1)  # 누적 합계
+        assert db.query(Reservation).count() == 9
+
+    def test_finished_backfill_restarts_from_scratch(self, db):
+        _backfill(db, FakeProvider())
+        provider = FakeProvider()
+        result, _ = _backfill(db, provider)
+        assert provider.started_from == ["2026-01-01"]
+        assert (result["added"], result["updated"]) == (0, 9)
+
+    def test_next_chunk_fetched_while_current_is_written(self, db):
+        log = []
+        real_apply = naver_sync._apply_naver_reservations
+
+        def slow_apply(db_, reservations, *args):
+            log.append(f"apply {reservations[0]['date']}")
+            time.sleep(0.05)
+            result = real_apply(db_, reservations, *args)
+            log.append(f"applied {reservations[0]['date']}")
+            return result
+
+        with patch.object(naver_sync, "_apply_naver_reservations", slow_apply):
+            _backfill(db, FakeProvider(log=log))
+        assert log.index("fetched 2026-02-01") < log.index("applied 2026-01-01")
+
+    def test_chunk_processing_error_is_not_checkpointed(self, db):
+        """실제 provider — 청크 변환 실패가 빈 청크로 반영돼 체크포인트가 넘어가면 안 됨."""
+        from datetime import datetime
+        from app.real.reservation import RealReservationProvider
+
+        provider = RealReservationProvider(business_id="biz", cookie="cookie")
+        broken = {"2026-02-01"}
+
+        async def raw_chunks(chunk_start, now):
+            for start, end in CHUNKS:
+                if end < chunk_start.strftime("%Y-%m-%d"):
+                    continue
+                items = [{"bookingStatusCode": "RC03", "bookingId": f"{start}-{n}", "date": start} for n in range(3)]
+                yield datetime.strptime(start, "%Y-%m-%d"), datetime.strptime(end, "%Y-%m-%d"), items
+
+        def parse(item, multi_booking_ids):
+            if item["date"] in broken:
+                raise KeyError("bizItemId")
+            return _booking(item["bookingId"], item["date"])
+
+        with patch.object(provider, "_iter_raw_chunks", raw_chunks), \
+                patch.object(provider, "_detect_multi_bookings", lambda items: set()), \
+                patch.object(provider, "_parse_reservation", parse), \
+                patch("app.services.naver_user_cache.cache_enabled", lambda: False):
+            result, _ = _backfill(db, provider)
+            assert result["success"] is False and result["chunks"] == 1
+            assert db.query(NaverBackfillCheckpoint).one().last_chunk_end == "2026-01-31"
+
+            broken.clear()
+            result, _ = _backfill(db, provider)
+        assert result["resumed_from"] == "2026-02-01"
+        assert db.query(Reservation).count() == 9
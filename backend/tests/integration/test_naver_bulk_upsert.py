@@ -0,0 +1,150 @@
+"""네이버 sync Phase 2 bulk 경로 — 신규 INSERT 1회, 변경 없는 예약은 UPDATE 생략, 집계는 기존과 동일."""
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Reservation, ReservationStatus, RoomAssignment
+from app.services import naver_sync
+from app.services.naver_sync import _apply_naver_reservations, _reservation_insert
+
+
+def _booking(ext_id, **overrides):
+    base = {
+        "external_id": ext_id,
+        "naver_booking_id": ext_id,
+        "naver_biz_item_id": "biz-1",
+        "customer_name": f"고객{ext_id}",
+        "phone": "01012345678",
+        "date": "2026-05-01",
+        "end_date": "2026-05-02",
+        "status": "confirmed",
+        "booking_count": 1,
+        "people_count": 1,
+        "gender": "남",
+    }
+    base.update(overrides)
+    return base
+
+
+def _apply(db, bookings):
+    return _apply_naver_reservations(db, [dict(b) for b in bookings], None, "naver", False)
+
+
+def _writes(log, verb):
+    """reservations 에 대한 INSERT / UPDATE 종류 ("INSERT many" = executemany)."""
+    executed = set()
+    for statement, many in zip(log.statements, log.executemany):
+        words = statement.split()
+        if words[0].upper() == verb and "reservations" in words[:3]:
+            executed.add(verb + (" many" if many else ""))
+    return sorted(executed)
+
+
+class TestBulkInsert:
+    def test_new_bookings_inserted_in_one_statement(self, db, count_statements):
+        bookings = [_booking(str(1000 + i)) for i in range(20)]
+        with count_statements() as log:
+            result = _apply(db, bookings)
+
+        assert result["added"] == 20
+        assert len(result["new_reservation_ids"]) == 20
+        rows = {r.id: r for r in db.query(Reservation).all()}
+        assert sorted(result["new_reservation_ids"]) == sorted(rows)
+        # 반환 ID 는 입력 순서와 일치
+        assert [rows[i].external_id for i in result["new_reservation_ids"]] == [b["external_id"] for b in bookings]
+        assert all(r.tenant_id == 1 and r.status == ReservationStatus.CONFIRMED for r in rows.values())
+        assert all(r.created_at is not None for r in rows.values())
+        # 행별 add+flush 대신 executemany 한 번 (PostgreSQL 은 ON CONFLICT 포함 단일 round trip)
+        assert _writes(log, "INSERT") == ["INSERT many"]
+
+    def test_bookings_without_valid_date_are_skipped(self, db):
+        missing = _booking("1004")
+        del missing["date"]
+        result = _apply(db, [
+            _booking("1001"), _booking("1002", date=""), _booking("1003", end_date="2026/05/02"), missing,
+        ])
+        assert result["added"] == 1
+        assert [r.external_id for r in db.query(Reservation).all()] == ["1001"]
+
+        # 기존 예약도 날짜가 빠진 데이터로는 갱신하지 않음
+        result = _apply(db, [_booking("1001", date="", customer_name="새이름")])
+        assert result["updated"] == 0
+        assert db.query(Reservation).one().check_in_date == "2026-05-01"
+
+
+class TestConcurrentInsert:
+    def test_postgresql_conflict_leaves_row_untouched(self):
+        sql = str(_reservation_insert("postgresql").compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (tenant_id, external_id) DO UPDATE SET external_id = excluded.external_id RETURNING" in sql
+        assert "(xmax = 0) AS inserted" in sql
+
+    def test_conflicting_row_updated_with_naver_fields_only(self, db, monkeypatch):
+        """다른 sync 가 existing_map 적재 뒤 같은 예약을 먼저 넣은 경우 (PostgreSQL ON CONFLICT 결과 재현)."""
+        real_insert = naver_sync._bulk_insert_reservations
+
+        def racing_insert(session, rows):
+            raced = Reservation(
+                tenant_id=1, external_id="1002", naver_booking_id="1002", customer_name="옛이름", phone="010",
+                check_in_date="2026-05-01", check_in_time="", check_out_date="2026-05-02",
+                status=ReservationStatus.CONFIRMED, section="party", notes="직원 메모",
+            )
+            session.add(raced)
+            session.flush()
+            results = real_insert(session, [r for r in rows if r["external_id"] != "1002"])
+            position = [r["external_id"] for r in rows].index("1002")
+            results.insert(position, (raced.id, False))
+            return results
+
+        monkeypatch.setattr(naver_sync, "_bulk_insert_reservations", racing_insert)
+        result = _apply(db, [_booking("1001"), _booking("1002"), _booking("1003")])
+
+        assert (result["added"], result["updated"]) == (2, 1)
+        raced = db.query(Reservation).filter(Reservation.external_id == "1002").one()
+        assert raced.id not in result["new_reservation_ids"]
+        assert raced.customer_name == "고객1002"
+        assert (raced.section, raced.notes) == ("party", "직원 메모")
+
+
+class TestBulkUpdate:
+    def test_unchanged_rows_skip_update_but_count_as_updated(self, db, count_statements):
+        bookings = [_booking(str(1000 + i)) for i in range(5)]
+        _apply(db, bookings)
+
+        with count_statements() as log:
+            result = _apply(db, bookings)
+        assert (result["added"], result["updated"]) == (0, 5)
+        assert _writes(log, "UPDATE") == []
+
+    def test_plain_field_changes_batched(self, db, count_statements):
+        bookings = [_booking(str(1000 + i)) for i in range(5)]
+        _apply(db, bookings)
+
+        changed = [dict(b, customer_name="새이름", phone="01000000000") for b in bookings[:3]] + bookings[3:]
+        with count_statements() as log:
+            result = _apply(db, changed)
+
+        assert (result["added"], result["updated"]) == (0, 5)
+        assert _writes(log, "UPDATE") == ["UPDATE many"]
+        names = {r.external_id: r.customer_name for r in db.query(Reservation).all()}
+        assert [names[b["external_id"]] for b in bookings] == ["새이름"] * 3 + ["고객1003", "고객1004"]
+
+    def test_date_change_takes_full_path(self, db):
+        first = _apply(db, [_booking("1001"), _booking("1002")])
+        moved_id = first["new_reservation_ids"][0]
+        db.add(RoomAssignment(tenant_id=1, reservation_id=moved_id, room_id=1, date="2026-05-01", assigned_by="auto"))
+        db.commit()
+
+        result = _apply(db, [_booking("1001", date="2026-05-03", end_date="2026-05-04"), _booking("1002")])
+        assert result["updated"] == 2
+        moved = db.query(Reservation).get(moved_id)
+        assert (moved.check_in_date, moved.check_out_date) == ("2026-05-03", "2026-05-04")
+        # reconcile_dates: 옛 날짜 배정 정리
+        assert db.query(RoomAssignment).filter(RoomAssignment.date == "2026-05-01").count() == 0
+
+    def test_cancellation_clears_assignments(self, db):
+        res_id = _apply(db, [_booking("1001", date="2030-05-01", end_date="2030-05-02")])["new_reservation_ids"][0]
+        db.add(RoomAssignment(tenant_id=1, reservation_id=res_id, room_id=1, date="2030-05-01", assigned_by="auto"))
+        db.commit()
+
+        result = _apply(db, [_booking("1001", date="2030-05-01", end_date="2030-05-02", status="cancelled")])
+        assert result["updated"] == 1
+        assert db.query(Reservation).get(res_id).status == ReservationStatus.CANCELLED
+        assert db.query(RoomAssignment).count() == 0
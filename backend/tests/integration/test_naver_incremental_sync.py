@@ -0,0 +1,105 @@
+"""네이버 증분 sync — 커서(high-water mark) + 예약 내용 해시로 변경 없는 예약 건너뛰기."""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.db.models import NaverBookingHash, NaverSyncCursor, Reservation
+from app.services.naver_sync import _advance_cursor, _apply_naver_reservations, _load_cursor_since
+
+
+def _booking(ext_id="1001", **overrides):
+    base = {
+        "external_id": ext_id,
+        "naver_booking_id": ext_id,
+        "naver_biz_item_id": "biz-1",
+        "customer_name": "김철수",
+        "phone": "01012345678",
+        "date": "2026-05-01",
+        "end_date": "2026-05-02",
+        "status": "confirmed",
+        "booking_count": 1,
+        "people_count": 1,
+        "gender": "남",
+        "raw_data": {"noCache": 1},
+    }
+    base.update(overrides)
+    return base
+
+
+def _apply(db, bookings, incremental=True):
+    # enrichment 가 res_data 를 변경하므로 호출마다 새 dict 전달 (실제 sync 도 매번 새 응답)
+    return _apply_naver_reservations(db, [dict(b) for b in bookings], None, "naver", incremental)
+
+
+class TestContentHashSkip:
+    def test_second_run_skips_unchanged(self, db):
+        bookings = [_booking("1001"), _booking("1002", customer_name="이영희", phone="01099998888")]
+
+        first = _apply(db, bookings)
+        assert (first["fetched"], first["changed"], first["unchanged"]) == (2, 2, 0)
+        assert first["added"] == 2
+        assert db.query(NaverBookingHash).count() == 2
+
+        second = _apply(db, bookings)
+        assert (second["fetched"], second["changed"], second["unchanged"]) == (2, 0, 2)
+        assert second["added"] == second["updated"] == 0
+
+    def test_raw_data_noise_ignored_but_field_change_applied(self, db):
+        _apply(db, [_booking("1001")])
+
+        result = _apply(db, [_booking("1001", raw_data={"noCache": 2}, customer_name="김철수2")])
+        assert result["changed"] == 1
+        assert db.query(Reservation).filter(Reservation.external_id == "1001").one().customer_name == "김철수2"
+
+        result = _apply(db, [_booking("1001", raw_data={"noCache": 3}, customer_name="김철수2")])
+        assert result["unchanged"] == 1
+
+    def test_missing_row_is_recreated(self, db):
+        _apply(db, [_booking("1001")])
+        db.execute(text("DELETE FROM reservations WHERE external_id = '1001'"))
+        db.commit()
+
+        result = _apply(db, [_booking("1001")])
+        assert result["added"] == 1
+
+    def test_full_mode_never_skips(self, db):
+        _apply(db, [_booking("1001")])
+        result = _apply(db, [_booking("1001")], incremental=False)
+        assert result["unchanged"] == 0
+        assert result["changed"] == 1
+
+
+    def test_hashes_not_stored_when_later_phase_fails(self, db, monkeypatch):
+        """Phase 4~5 / 칩 reconcile 실패 시 해시 미저장 → 다음 증분 sync 가 다시 반영."""
+        from app.services import consecutive_stay
+
+        def _boom(*args, **kwargs):
+            raise RuntimeError("link failed")
+
+        bookings = [_booking("1001")]
+        with monkeypatch.context() as m:
+            m.setattr(consecutive_stay, "detect_and_link_for_reservations", _boom)
+            first = _apply(db, bookings)
+        assert first["added"] == 1
+        assert db.query(NaverBookingHash).count() == 0
+
+        retry = _apply(db, bookings)
+        assert (retry["changed"], retry["unchanged"]) == (1, 0)
+        assert db.query(NaverBookingHash).count() == 1
+        assert _apply(db, bookings)["unchanged"] == 1
+
+
+class TestCursor:
+    def test_no_cursor_means_default_window(self, db):
+        assert _load_cursor_since(db, "naver") is None
+
+    def test_since_is_cursor_minus_overlap_in_local_time(self, db):
+        fetched_at = datetime(2026, 5, 1, 3, 0, tzinfo=timezone.utc)
+        _advance_cursor(db, "naver", fetched_at)
+        _advance_cursor(db, "naver", fetched_at + timedelta(hours=1))  # upsert
+
+        assert db.query(NaverSyncCursor).count() == 1
+        expected = (fetched_at + timedelta(hours=1) - timedelta(minutes=settings.NAVER_SYNC_OVERLAP_MINUTES))
+        assert _load_cursor_since(db, "naver") == expected.astimezone().replace(tzinfo=None)
+        assert _load_cursor_since(db, "unstable") is None
@@ -0,0 +1,106 @@
+"""네이버 user-info 캐시 — 재방문 고객은 TTL 동안 API 재조회 안 함 + negative 캐시 + warm-up."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.db.models import NaverUserInfo, Reservation, ReservationStatus, Tenant
+from app.real.reservation import RealReservationProvider
+from app.services import naver_user_cache
+from app.services.naver_user_cache import warm_user_info_cache
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _item(booking_id, user_id):
+    return {
+        "bookingId": booking_id, "bookingStatusCode": "RC03", "bizItemId": 111,
+        "name": f"고객{user_id}", "phone": f"010{booking_id:08d}", "userId": user_id,
+        "startDate": "2026-05-01", "endDate": "2026-05-02", "startTime": "15:00", "bookingCount": 1,
+    }
+
+
+@pytest.fixture
+def provider(db, monkeypatch):
+    monkeypatch.setattr(naver_user_cache, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    provider = RealReservationProvider(business_id="biz-A", cookie="cookie")
+    provider.calls = []
+
+    async def fake_user_info(uid):
+        provider.calls.append(uid)
+        if uid == "broken":
+            return None
+        return {"age_group": "20", "gender": "여", "visit_count": 3, "summary": "3번/20여"}
+
+    monkeypatch.setattr(provider, "get_user_info", fake_user_info)
+    return provider
+
+
+class TestUserInfoCache:
+    def test_second_sync_hits_cache(self, db, provider):
+        data = [_item(1, "u1"), _item(2, "u2")]
+
+        first = run_async(provider._process_raw_data(data))
+        assert sorted(provider.calls) == ["u1", "u2"]
+        assert provider.last_user_info_stats["api_calls"] == 2
+
+        provider.calls.clear()
+        second = run_async(provider._process_raw_data(data))
+        assert provider.calls == []
+        assert provider.last_user_info_stats == {"users": 2, "cache_hits": 2, "negative_hits": 0, "api_calls": 0}
+        assert [(r["gender"], r["age_group"], r["visit_count"]) for r in second] == \
+            [(r["gender"], r["age_group"], r["visit_count"]) for r in first] == [("여", "20", 3)] * 2
+
+    def test_expired_entry_refetched(self, db, provider):
+        run_async(provider._process_raw_data([_item(1, "u1")]))
+        row = db.query(NaverUserInfo).one()
+        row.fetched_at = datetime.now(timezone.utc) - timedelta(hours=settings.NAVER_USER_INFO_TTL_HOURS + 1)
+        db.commit()
+
+        provider.calls.clear()
+        run_async(provider._process_raw_data([_item(1, "u1")]))
+        assert provider.calls == ["u1"]
+
+    def test_failed_lookup_negative_cached(self, db, provider):
+        run_async(provider._process_raw_data([_item(1, "broken")]))
+        assert db.query(NaverUserInfo).one().is_negative is True
+
+        provider.calls.clear()
+        run_async(provider._process_raw_data([_item(1, "broken")]))
+        assert provider.calls == []
+        assert provider.last_user_info_stats["negative_hits"] == 1
+
+    def test_keyed_by_business(self, db, provider):
+        run_async(provider._process_raw_data([_item(1, "u1")]))
+        provider.business_id = "biz-B"  # 같은 테넌트의 언스테이블 업체 — 방문횟수가 다르다
+        provider.calls.clear()
+        run_async(provider._process_raw_data([_item(1, "u1")]))
+        assert provider.calls == ["u1"]
+
+
+class TestWarmUp:
+    def test_seeds_from_reservations(self, db):
+        tenant = db.query(Tenant).get(1)
+        tenant.naver_business_id = "biz-A"
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            Reservation(customer_name="A", phone="010", check_in_date="2026-05-01", check_in_time="15:00",
+                        status=ReservationStatus.CONFIRMED, naver_user_id="u1", gender="남", age_group="30",
+                        visit_count=2, updated_at=now),
+            Reservation(customer_name="B", phone="011", check_in_date="2026-05-01", check_in_time="15:00",
+                        status=ReservationStatus.CONFIRMED, naver_user_id="u2", gender="여",
+                        gender_manual=True, updated_at=now),
+        ])
+        db.commit()
+
+        before = datetime.now(timezone.utc)
+        assert warm_user_info_cache(db, tenant) == 1
+        assert warm_user_info_cache(db, tenant) == 0
+        row = db.query(NaverUserInfo).one()
+        assert (row.business_id, row.naver_user_id, row.gender, row.visit_count) == ("biz-A", "u1", "남", 2)
+        # fetched_at 은 예약 갱신 시각이 아니라 warm-up 시각
+        assert naver_user_cache._as_utc(row.fetched_at) >= before.replace(microsecond=0)
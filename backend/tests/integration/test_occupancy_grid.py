@@ -0,0 +1,120 @@
+"""OccupancyGrid — check_capacity_all_dates / 도미토리 성별 잠금과 같은 판정을 메모리에서 수행."""
+from unittest.mock import patch
+
+
+from app.db.models import Building, Reservation, ReservationStatus, Room, RoomAssignment, RoomBizItemLink
+from app.services.occupancy_grid import OccupancyGrid
+from app.services.room_assignment import check_capacity_all_dates
+from app.services.room_auto_assign import auto_assign_rooms
+
+NIGHTS = ["2026-04-10", "2026-04-11"]
+
+
+def _room(db, number, is_dorm=True, bed_capacity=4, biz="BIZ001"):
+    if not db.query(Building).first():
+        db.add(Building(tenant_id=1, name="본관", is_active=True))
+        db.flush()
+    room = Room(
+        tenant_id=1, room_number=number, room_type="dormitory" if is_dorm else "더블",
+        building_id=db.query(Building).first().id, is_active=True,
+        is_dormitory=is_dorm, bed_capacity=bed_capacity, base_capacity=2, max_capacity=2,
+    )
+    db.add(room)
+    db.flush()
+    db.add(RoomBizItemLink(tenant_id=1, room_id=room.id, biz_item_id=biz))
+    db.flush()
+    return room
+
+
+def _res(db, name="손님", check_in="2026-04-10", check_out="2026-04-12", gender=None, party_size=1, biz="BIZ001"):
+    res = Reservation(
+        tenant_id=1, customer_name=name, phone="01012345678",
+        check_in_date=check_in, check_in_time="15:00", check_out_date=check_out,
+        status=ReservationStatus.CONFIRMED, gender=gender, party_size=party_size,
+        naver_biz_item_id=biz, section="unassigned",
+    )
+    db.add(res)
+    db.flush()
+    return res
+
+
+def _occupy(db, res, room, dates):
+    for d in dates:
+        db.add(RoomAssignment(tenant_id=1, reservation_id=res.id, room_id=room.id, date=d, assigned_by="auto"))
+    db.flush()
+
+
+class TestGridMatchesSql:
+    def test_dorm_capacity_and_exclusion(self, db):
+        dorm = _room(db, "D1", bed_capacity=4)
+        a = _res(db, party_size=3)
+        _occupy(db, a, dorm, NIGHTS[1:])
+        grid = OccupancyGrid.load(db, [dorm], NIGHTS)
+
+        for people in (1, 2):
+            assert grid.has_capacity(dorm.id, NIGHTS, people) == \
+                check_capacity_all_dates(db, dorm.id, NIGHTS[0], "2026-04-12", people_count=people)
+        assert grid.has_capacity(dorm.id, NIGHTS, 2) is False
+        assert grid.has_capacity(dorm.id, NIGHTS, 4, exclude_reservation_id=a.id) is True
+
+    def test_regular_room_single_occupant(self, db):
+        room = _room(db, "R1", is_dorm=False)
+        a = _res(db)
+        _occupy(db, a, room, NIGHTS[:1])
+        grid = OccupancyGrid.load(db, [room], NIGHTS)
+
+        assert grid.has_capacity(room.id, NIGHTS) is False
+        assert grid.has_capacity(room.id, NIGHTS[1:]) is True
+        assert grid.has_capacity(room.id, NIGHTS, exclude_reservation_id=a.id) is True
+
+    def test_gender_lock_over_stay_range(self, db):
+        dorm = _room(db, "D1")
+        _occupy(db, _res(db, gender="남"), dorm, NIGHTS[1:])
+        _occupy(db, _res(db, gender=None), dorm, NIGHTS[:1])
+        grid = OccupancyGrid.load(db, [dorm], NIGHTS)
+
+        assert grid.gender_conflict(dorm.id, NIGHTS, "여") is True
+        assert grid.gender_conflict(dorm.id, NIGHTS[:1], "여") is False  # 성별 미상은 무시
+        assert grid.gender_conflict(dorm.id, NIGHTS, "남") is False
+        assert grid.gender_conflict(dorm.id, NIGHTS, "") is False
+
+    def test_place_updates_and_moves(self, db):
+        d1, d2 = _room(db, "D1", bed_capacity=2), _room(db, "D2", bed_capacity=2)
+        guest = _res(db, gender="여", party_size=2)
+        _occupy(db, guest, d1, NIGHTS)
+        grid = OccupancyGrid.load(db, [d1, d2], NIGHTS)
+
+        grid.place(d2.id, NIGHTS, guest)
+        assert grid.has_capacity(d1.id, NIGHTS, 2) is True  # 이전 방에서 빠짐
+        assert grid.has_capacity(d2.id, NIGHTS, 1) is False
+        assert grid.gender_conflict(d2.id, NIGHTS, "남") is True
+
+
+class TestAutoAssignUsesGrid:
+    def test_no_per_candidate_capacity_queries(self, db):
+        dorm = _room(db, "D1", bed_capacity=2)
+        rooms = [_room(db, f"R{i}", is_dorm=False, biz="BIZ002") for i in range(3)]
+        guests = [_res(db, name=f"여{i}", gender="여") for i in range(3)]
+        guests += [_res(db, name=f"일반{i}", biz="BIZ002") for i in range(4)]
+        db.commit()
+
+        with patch("app.services.room_assignment.check_capacity_all_dates",
+                   side_effect=AssertionError("grid should answer capacity")):
+            result = auto_assign_rooms(db, "2026-04-10")
+
+        assert result["assigned"] == 5  # 도미토리 2 + 일반실 3
+        by_room = {}
+        for ra in db.query(RoomAssignment).filter(RoomAssignment.date == "2026-04-10").all():
+            by_room.setdefault(ra.room_id, set()).add(ra.reservation_id)
+        assert len(by_room[dorm.id]) == 2
+        assert all(len(by_room[r.id]) == 1 for r in rooms)
+        # 연박 전 박 배정
+        assert db.query(RoomAssignment).filter(RoomAssignment.date == "2026-04-11").count() == 5
+
+    def test_grid_load_is_single_query(self, db, count_statements):
+        dorm = _room(db, "D1")
+        for _ in range(5):
+            _occupy(db, _res(db), dorm, NIGHTS)
+        with count_statements() as log:
+            OccupancyGrid.load(db, [dorm], NIGHTS)
+        assert len(log.selects()) == 1
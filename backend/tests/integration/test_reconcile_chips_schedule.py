@@ -1,7 +1,7 @@
 """reconcile_chips_for_schedule() 통합 테스트 — in-memory SQLite."""
 import json
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from app.db.models import (
     Reservation, Room, Building, RoomAssignment,
     ReservationStatus, TemplateSchedule, MessageTemplate,
@@ -259,3 +259,50 @@ class TestNonCandidateChipPreservation:
         assert len(survivors) == 1, (
             "candidate 범위 밖 예약의 칩이 scope_dates 겹침만으로 삭제되면 안 됨"
         )
+
+
+from app.services.chip_reconciler import reconcile_chips_for_reservations  # noqa: E402
+
+
+class TestBatchedReservationReconcile:
+    """reconcile_chips_for_reservations 는 예약별 단건 호출과 같은 칩을 만든다."""
+
+    def _chips(self, db):
+        return sorted(
+            (a.reservation_id, a.template_key, a.date, a.assigned_by, a.schedule_id)
+            for a in db.query(ReservationSmsAssignment).all()
+        )
+
+    def test_batch_matches_single(self, db):
+        tpl_a = _make_template(db, key="tpl_batch_a")
+        tpl_b = _make_template(db, key="tpl_batch_b")
+        _make_schedule(db, tpl_a, target_mode='first_night')
+        _make_schedule(db, tpl_b, target_mode=None)
+        r1 = _make_reservation(db)
+        r2 = _make_reservation(db)
+        r2.check_out_date = (datetime.strptime(today_kst(), "%Y-%m-%d") + timedelta(days=2)).strftime("%Y-%m-%d")
+        r3 = _make_reservation(db, status=ReservationStatus.CANCELLED)
+        db.add(ReservationSmsAssignment(
+            tenant_id=1, reservation_id=r3.id, template_key="tpl_batch_a",
+            date=today_kst(), assigned_by='auto',
+        ))
+        db.flush()
+        ids = [r1.id, r2.id, r3.id]
+
+        reconcile_chips_for_reservations(db, ids + [r1.id])
+        db.flush()
+        batched = self._chips(db)
+
+        for a in db.query(ReservationSmsAssignment).all():
+            db.delete(a)
+        db.add(ReservationSmsAssignment(
+            tenant_id=1, reservation_id=r3.id, template_key="tpl_batch_a",
+            date=today_kst(), assigned_by='auto',
+        ))
+        db.flush()
+        for rid in ids:
+            reconcile_chips_for_reservation(db, rid)
+            db.flush()
+
+        assert batched == self._chips(db)
+        assert len(batched) == 2 + 3  # r1: first_night+daily, r2: first_night+2박 daily, r3(취소): 없음
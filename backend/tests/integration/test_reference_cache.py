@@ -0,0 +1,170 @@
+"""reference_cache — 테넌트별 rooms / buildings / 활성 스케줄 캐시: hit 시 SQL 없음, 쓰기 시 무효화."""
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Building, MessageTemplate, Room, RoomBizItemLink, TemplateSchedule, Tenant
+from app.db.tenant_context import current_tenant_id
+from app.services import reference_cache
+from app.services.reference_cache import (
+    get_active_schedules, get_building, get_room, get_rooms, reference_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    reference_cache.clear()
+    yield
+    reference_cache.clear()
+
+
+def _room(db, number, biz_item_id="BIZ001", tenant_id=1):
+    building = db.query(Building).first()
+    if building is None:
+        building = Building(tenant_id=tenant_id, name="본관", is_active=True)
+        db.add(building)
+        db.flush()
+    room = Room(
+        tenant_id=tenant_id, room_number=number, room_type="더블", building_id=building.id,
+        is_active=True, base_capacity=2, max_capacity=2,
+    )
+    db.add(room)
+    db.flush()
+    db.add(RoomBizItemLink(tenant_id=tenant_id, room_id=room.id, biz_item_id=biz_item_id))
+    db.flush()
+    return room
+
+
+class TestReferenceCache:
+    def test_hit_in_new_session_emits_no_select(self, db, count_statements):
+        _room(db, "101")
+        _room(db, "102", biz_item_id="BIZ002")
+        db.commit()
+        assert [r.room_number for r in get_rooms(db)] == ["101", "102"]
+
+        other = sessionmaker(bind=db.get_bind())()
+        try:
+            with count_statements() as log:
+                rooms = get_rooms(other)
+                links = [link.biz_item_id for room in rooms for link in room.biz_item_links]
+                building_name = rooms[0].building.name
+            assert log.selects() == []
+            assert links == ["BIZ001", "BIZ002"]
+            assert building_name == "본관"
+            assert all(room in other for room in rooms)
+            assert get_room(other, rooms[1].id) is rooms[1]
+        finally:
+            other.close()
+
+        stats = reference_cache_stats()["kinds"]["rooms"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert stats["hit_rate"] == pytest.approx(0.667)
+
+    def test_flush_and_bulk_update_invalidate(self, db):
+        _room(db, "101")
+        db.commit()
+        assert len(get_rooms(db)) == 1
+
+        _room(db, "102")
+        assert [r.room_number for r in get_rooms(db)] == ["101", "102"]
+
+        db.query(Room).filter(Room.room_number == "101").update({"is_active": False})
+        db.commit()
+        db.expire_all()
+        assert [r.is_active for r in get_rooms(db)] == [False, True]
+        assert reference_cache_stats()["kinds"]["rooms"]["hits"] == 0
+
+    def test_reads_do_not_invalidate(self, db):
+        _room(db, "101")
+        db.commit()
+        get_rooms(db)
+        db.expunge_all()
+        get_rooms(db)
+        db.flush()
+        db.commit()
+        get_rooms(db)
+        assert reference_cache_stats()["kinds"]["rooms"] == {"hits": 2, "misses": 1, "hit_rate": 0.667}
+
+    def test_active_schedules_follow_template_changes(self, db, count_statements):
+        template = MessageTemplate(tenant_id=1, template_key="room_info", name="객실안내", content="x", is_active=True)
+        db.add(template)
+        db.flush()
+        db.add(TemplateSchedule(
+            tenant_id=1, template_id=template.id, schedule_name="객실안내", schedule_type="daily", hour=9, minute=0,
+            is_active=True,
+        ))
+        db.commit()
+        assert [s.template.template_key for s in get_active_schedules(db)] == ["room_info"]
+
+        db.expunge_all()
+        with count_statements() as log:
+            schedule = get_active_schedules(db)[0]
+            assert schedule.template.name == "객실안내"
+        assert log.selects() == []
+
+        schedule.template.name = "객실 안내"
+        schedule.is_active = False
+        db.commit()
+        assert get_active_schedules(db) == []
+
+    def test_building_lookup(self, db):
+        room = _room(db, "101")
+        db.commit()
+        assert get_building(db, room.building_id).name == "본관"
+        assert get_building(db, None) is None
+        assert get_building(db, 999) is None
+
+    def test_tenants_isolated(self, db):
+        db.add(Tenant(id=2, slug="other", name="Other"))
+        db.commit()
+        _room(db, "101")
+        db.commit()
+        assert len(get_rooms(db)) == 1
+
+        token = current_tenant_id.set(2)
+        try:
+            assert get_rooms(db) == []
+        finally:
+            current_tenant_id.reset(token)
+        assert len(get_rooms(db)) == 1
+
+    def test_no_tenant_context_bypasses_cache(self, db):
+        token = current_tenant_id.set(None)
+        try:
+            assert reference_cache._payload(db, "rooms") is None
+        finally:
+            current_tenant_id.reset(token)
+        assert reference_cache_stats()["kinds"] == {}
+
+    def test_remote_invalidation_message(self, db):
+        _room(db, "101")
+        db.commit()
+        get_rooms(db)
+
+        reference_cache._apply_remote(json.dumps({"tenant_id": 1, "origin": "other-process"}))
+        reference_cache._apply_remote(json.dumps({"tenant_id": 1, "origin": reference_cache._ORIGIN}))
+        get_rooms(db)
+
+        stats = reference_cache_stats()
+        assert stats["kinds"]["rooms"]["misses"] == 2
+        assert stats["invalidations"]["remote"] == 1
+
+    def test_publish_reuses_one_redis_client(self, db, monkeypatch):
+        from unittest.mock import MagicMock, patch
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "REDIS_URL", "redis://localhost:6379/0")
+        with patch("redis.Redis.from_url", return_value=MagicMock()) as from_url:
+            try:
+                _room(db, "101")
+                db.commit()
+                _room(db, "102")
+                db.commit()
+                client = from_url.return_value
+                assert from_url.call_count == 1
+                assert client.publish.call_count == 2
+            finally:
+                reference_cache.stop_invalidation_listener()
+        client.close.assert_called_once()
@@ -0,0 +1,155 @@
+"""GET /api/reservations?date= — 그리드 date view: SQL 1회, 칩 날짜 필터, keyset 페이지네이션."""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.reservations import get_reservations
+from app.db.models import (
+    Building, MessageTemplate, Reservation, ReservationDailyInfo, ReservationSmsAssignment, ReservationStatus,
+    Room, RoomAssignment, TemplateSchedule, Tenant,
+)
+
+DATE = "2026-05-10"
+BASE = datetime(2026, 5, 1, 12, 0)
+
+
+def _get(db, **kwargs):
+    params = dict(skip=0, limit=50, status=None, date=None, date_from=None, date_to=None,
+                  search=None, source=None, cursor=None, count="exact")
+    params.update(kwargs)
+    result = get_reservations(db=db, current_user=None, **params)
+    return json.loads(result.body) if hasattr(result, "body") else result
+
+
+def _res(db, name, confirmed_minutes=0, tenant_id=1, **kwargs):
+    fields = dict(
+        tenant_id=tenant_id, customer_name=name, phone="01000000000", check_in_date=DATE, check_in_time="15:00",
+        check_out_date="2026-05-11", status=ReservationStatus.CONFIRMED, section="room",
+        confirmed_at=BASE + timedelta(minutes=confirmed_minutes),
+    )
+    fields.update(kwargs)
+    res = Reservation(**fields)
+    db.add(res)
+    db.flush()
+    return res
+
+
+def _chip(db, res, key, date, sent=False, assigned_by="auto"):
+    db.add(ReservationSmsAssignment(
+        tenant_id=1, reservation_id=res.id, template_key=key, date=date, assigned_at=BASE,
+        sent_at=BASE if sent else None, assigned_by=assigned_by,
+    ))
+
+
+@pytest.fixture
+def grid(db):
+    building = Building(tenant_id=1, name="본관", is_active=True)
+    db.add(building)
+    db.flush()
+    room = Room(tenant_id=1, room_number="201", room_type="더블", building_id=building.id, is_active=True)
+    db.add(room)
+    for key, target_mode in (("room_info", None), ("hook", "once")):
+        template = MessageTemplate(tenant_id=1, template_key=key, name=key, content="x", is_active=True)
+        db.add(template)
+        db.flush()
+        db.add(TemplateSchedule(
+            tenant_id=1, template_id=template.id, schedule_name=key, schedule_type="daily",
+            hour=9, minute=0, is_active=True, target_mode=target_mode,
+        ))
+    db.flush()
+
+    assigned = _res(db, "배정", confirmed_minutes=10, party_type="1", notes="예약 메모")
+    db.add(RoomAssignment(tenant_id=1, reservation_id=assigned.id, date=DATE, room_id=room.id,
+                          room_password="1234", assigned_by="manual", bed_order=2))
+    db.add(ReservationDailyInfo(tenant_id=1, reservation_id=assigned.id, date=DATE,
+                                party_type="X", notes=None, unstable_party=True))
+    _chip(db, assigned, "room_info", DATE)                      # 당일 → 표시
+    _chip(db, assigned, "room_info", "2026-05-09", sent=True)   # 과거 발송이지만 daily → 숨김
+    _chip(db, assigned, "hook", "2026-05-09", sent=True)        # 과거 발송 → 표시
+    _chip(db, assigned, "hook", "2026-05-11")                   # 미래 미발송 → 표시
+    _chip(db, assigned, "party", DATE, assigned_by="excluded")  # excluded → 숨김
+
+    unassigned = _res(db, "미배정", confirmed_minutes=5, phone="01099999999")
+    _res(db, "언스테이블", confirmed_minutes=1, phone="01099999999", section="unstable")
+    _res(db, "미확정", confirmed_at=None)
+    db.commit()
+    return {"assigned": assigned, "unassigned": unassigned, "room": room}
+
+
+class TestReservationGridDateView:
+    def test_row_fields_match_grid_rules(self, db, grid):
+        body = _get(db, date=DATE)
+        assert body["total"] == 4
+        assert [i["customer_name"] for i in body["items"]] == ["배정", "미배정", "언스테이블", "미확정"]
+
+        row = body["items"][0]
+        assert (row["room_id"], row["room_number"], row["room_password"], row["room_assigned_by"], row["bed_order"]) == \
+            (grid["room"].id, "201", "1234", "manual", 2)
+        assert row["party_type"] == "X"       # daily info 우선
+        assert row["notes"] == "예약 메모"      # daily notes 가 NULL 이면 예약 값
+        assert row["unstable_party"] is True
+        assert row["status"] == "confirmed"
+        assert [(c["template_key"], c["date"]) for c in row["sms_assignments"]] == [
+            ("room_info", DATE), ("hook", "2026-05-09"), ("hook", "2026-05-11"),
+        ]
+
+        empty = body["items"][1]
+        assert (empty["room_id"], empty["room_number"], empty["room_password"], empty["bed_order"]) == (None, "", "", 0)
+        assert empty["has_unstable_booking"] is True
+        assert body["items"][2]["has_unstable_booking"] is False
+
+    def test_single_statement_when_count_skipped(self, db, grid, count_statements):
+        _get(db, date=DATE)  # 참조 데이터 캐시 채움
+        with count_statements() as log:
+            body = _get(db, date=DATE, count="none")
+        assert len(log) == 1
+        assert body["total"] is None
+        assert len(body["items"]) == 4
+
+    def test_keyset_pages_cover_all_rows_once(self, db, grid):
+        for i in range(7):
+            _res(db, f"추가{i}", confirmed_minutes=5)  # confirmed_at 동률 → id 로 정렬
+        db.commit()
+        expected = [i["id"] for i in _get(db, date=DATE, limit=100)["items"]]
+
+        seen, cursor = [], None
+        while True:
+            body = _get(db, date=DATE, limit=3, cursor=cursor, count="none")
+            seen += [i["id"] for i in body["items"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == expected
+        assert len(seen) == 11
+
+    def test_invalid_cursor_and_count_rejected(self, db, grid):
+        with pytest.raises(HTTPException) as exc:
+            _get(db, date=DATE, cursor="not-a-cursor")
+        assert exc.value.status_code == 400
+        with pytest.raises(HTTPException):
+            _get(db, date=DATE, count="approx")
+
+    def test_estimate_falls_back_to_exact_on_sqlite(self, db, grid):
+        body = _get(db, date=DATE, count="estimate")
+        assert body["total"] == 4
+        assert body["total_estimated"] is False
+
+    def test_other_tenant_rows_excluded(self, db, grid):
+        db.add(Tenant(id=2, slug="other", name="Other"))
+        db.flush()
+        other = _res(db, "타테넌트", tenant_id=2)
+        db.add(ReservationSmsAssignment(
+            tenant_id=2, reservation_id=other.id, template_key="room_info", date=DATE, assigned_at=BASE,
+        ))
+        db.commit()
+        names = [i["customer_name"] for i in _get(db, date=DATE)["items"]]
+        assert "타테넌트" not in names
+
+    def test_list_without_date_keeps_offset_and_cursor(self, db, grid):
+        first = _get(db, limit=2)
+        assert [i.customer_name for i in first["items"]] == ["배정", "미배정"]
+        nxt = _get(db, limit=2, cursor=first["next_cursor"])
+        assert [i.customer_name for i in nxt["items"]] == ["언스테이블", "미확정"]
+        assert [i.customer_name for i in _get(db, limit=2, skip=2)["items"]] == ["언스테이블", "미확정"]
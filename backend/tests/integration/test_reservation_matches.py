@@ -1,11 +1,12 @@
 """_reservation_matches_schedule() 통합 테스트 — in-memory SQLite."""
 import json
+
 import pytest
 from app.db.models import (
-    Reservation, Room, Building, RoomAssignment,
+    Reservation, ReservationDailyInfo, Room, Building, RoomAssignment,
     ReservationStatus, TemplateSchedule, MessageTemplate,
 )
-from app.services.chip_reconciler import _reservation_matches_schedule
+from app.services.chip_reconciler import _reservation_matches_schedule, match_schedule_batch
 
 
 def _make_template(db, key="tpl_match"):
@@ -101,3 +102,92 @@ class TestReservationMatchesSchedule:
         res = _make_reservation(db, section="unassigned")
 
         assert _reservation_matches_schedule(db, sched, res, "2026-04-10") is False
+
+
+class TestMatchScheduleBatch:
+    """match_schedule_batch() 는 _reservation_matches_schedule() 의 (예약, 날짜) 쌍별 결과와 동일해야 함."""
+
+    def _assert_same(self, db, sched, reservations, dates):
+        pairs = [(r.id, d) for r in reservations for d in dates]
+        expected = {
+            (r.id, d) for r in reservations for d in dates
+            if _reservation_matches_schedule(db, sched, r, d)
+        }
+        assert match_schedule_batch(db, sched, pairs) == expected
+        return expected
+
+    def test_empty_pairs(self, db):
+        tpl = _make_template(db)
+        sched = _make_schedule(db, tpl, [{"type": "assignment", "value": "room"}])
+        assert match_schedule_batch(db, sched, []) == set()
+
+    def test_no_filters_matches_all_pairs(self, db):
+        tpl = _make_template(db)
+        sched = _make_schedule(db, tpl, filters_json=None)
+        res = [_make_reservation(db), _make_reservation(db, section="party")]
+        matched = self._assert_same(db, sched, res, ["2026-04-10", "2026-04-11"])
+        assert len(matched) == 4
+
+    def test_building_filter_per_date(self, db):
+        """배정이 날짜별로 다르면 날짜별로 다른 결과."""
+        b1 = _make_building(db, "본관")
+        b2 = _make_building(db, "별관")
+        room1 = _make_room(db, b1.id, "101")
+        room2 = _make_room(db, b2.id, "201")
+        tpl = _make_template(db, key="tpl_batch_bld")
+        sched = _make_schedule(db, tpl, [
+            {"type": "assignment", "value": "room", "buildings": [b1.id]},
+            {"type": "column_match", "value": "notes:not_contains:VIP"},
+        ])
+        r1 = _make_reservation(db)
+        r2 = _make_reservation(db)
+        r3 = _make_reservation(db, section="party")
+        _assign_room(db, r1.id, room1.id, "2026-04-10")
+        _assign_room(db, r1.id, room2.id, "2026-04-11")
+        _assign_room(db, r2.id, room1.id, "2026-04-11")
+
+        matched = self._assert_same(db, sched, [r1, r2, r3], ["2026-04-10", "2026-04-11"])
+        assert matched == {(r1.id, "2026-04-10"), (r2.id, "2026-04-11")}
+
+    def test_only_requested_pairs_returned(self, db):
+        tpl = _make_template(db)
+        sched = _make_schedule(db, tpl, filters_json=None)
+        r1 = _make_reservation(db)
+        r2 = _make_reservation(db)
+        pairs = [(r1.id, "2026-04-10"), (r2.id, "2026-04-11")]
+        assert match_schedule_batch(db, sched, pairs) == set(pairs)
+
+    def test_daily_info_overrides_per_date(self, db):
+        """unstable_party / party_type 일별 override 는 해당 날짜에만."""
+        tpl = _make_template(db, key="tpl_batch_daily")
+        sched = _make_schedule(db, tpl, [
+            {"type": "assignment", "value": "unstable"},
+            {"type": "column_match", "value": "party_type:contains:2차"},
+        ])
+        r1 = _make_reservation(db, section="party")
+        r2 = _make_reservation(db, section="unstable")
+        db.add(ReservationDailyInfo(tenant_id=1, reservation_id=r1.id, date="2026-04-11",
+                                    unstable_party=True, party_type="1,2차"))
+        db.add(ReservationDailyInfo(tenant_id=1, reservation_id=r2.id, date="2026-04-10", party_type="2차"))
+        db.flush()
+
+        matched = self._assert_same(db, sched, [r1, r2], ["2026-04-10", "2026-04-11"])
+        assert matched == {(r1.id, "2026-04-11"), (r2.id, "2026-04-10")}
+
+    def test_statement_count_independent_of_dates(self, db, count_statements):
+        b = _make_building(db)
+        room = _make_room(db, b.id)
+        tpl = _make_template(db, key="tpl_batch_count")
+        sched = _make_schedule(db, tpl, [
+            {"type": "assignment", "value": "room", "buildings": [b.id]},
+            {"type": "column_match", "value": "notes:is_empty"},
+        ])
+        res = [_make_reservation(db) for _ in range(5)]
+        dates = [f"2026-04-{d:02d}" for d in range(1, 29)]
+        for r in res:
+            _assign_room(db, r.id, room.id, "2026-04-10")
+
+        with count_statements() as log:
+            matched = match_schedule_batch(db, sched, [(r.id, d) for r in res for d in dates])
+        assert matched == {(r.id, "2026-04-10") for r in res}
+        assert len(log) == 3  # reservations, room_assignments(+rooms), daily_info
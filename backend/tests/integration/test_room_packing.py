@@ -0,0 +1,148 @@
+"""자동 배정 optimal 모드 (room_packing) — greedy 가 떨어뜨리는 손님을 재배치로 수용."""
+import pytest
+
+from app.db.models import Building, Reservation, ReservationStatus, Room, RoomAssignment, RoomBizItemLink, Tenant
+from app.services.room_auto_assign import auto_assign_rooms
+
+
+def _dorm(db, number, bed_capacity, priority):
+    if not db.query(Building).first():
+        db.add(Building(tenant_id=1, name="본관", is_active=True))
+        db.flush()
+    room = Room(
+        tenant_id=1, room_number=number, room_type="dormitory", building_id=db.query(Building).first().id,
+        is_active=True, is_dormitory=True, bed_capacity=bed_capacity, sort_order=priority,
+    )
+    db.add(room)
+    db.flush()
+    db.add(RoomBizItemLink(tenant_id=1, room_id=room.id, biz_item_id="DORM"))
+    db.flush()
+    return room
+
+
+def _guest(db, name, gender, party_size):
+    res = Reservation(
+        tenant_id=1, customer_name=name, phone="01012345678",
+        check_in_date="2026-04-10", check_in_time="15:00", check_out_date="2026-04-11",
+        status=ReservationStatus.CONFIRMED, gender=gender, party_size=party_size,
+        naver_biz_item_id="DORM", section="unassigned",
+    )
+    db.add(res)
+    db.flush()
+    return res
+
+
+def _sold_out_weekend(db):
+    """greedy: 여성 2명이 큰 방(D1)을 먼저 잡아 남성 3인 일행이 갈 곳이 없어짐."""
+    big = _dorm(db, "D1", bed_capacity=4, priority=1)
+    small = _dorm(db, "D2", bed_capacity=2, priority=2)
+    women = [_guest(db, "여1", "여", 1), _guest(db, "여2", "여", 1)]
+    men = _guest(db, "남일행", "남", 3)
+    db.commit()
+    return big, small, women, men
+
+
+def _rooms_by_reservation(db):
+    return {ra.reservation_id: ra.room_id for ra in db.query(RoomAssignment).all()}
+
+
+class TestOptimalSolver:
+    def test_greedy_leaves_guest_unassigned(self, db):
+        _, _, _, men = _sold_out_weekend(db)
+        result = auto_assign_rooms(db, "2026-04-10", solver="greedy")
+        assert result["assigned"] == 2
+        assert "solver" not in result
+        assert men.id not in _rooms_by_reservation(db)
+
+    def test_optimal_places_everyone_and_reports_gain(self, db):
+        big, small, women, men = _sold_out_weekend(db)
+        result = auto_assign_rooms(db, "2026-04-10", solver="optimal")
+
+        assert result["assigned"] == 3
+        assert result["solver"]["greedy_assigned"] == 2
+        assert result["solver"]["gain"] == 1
+        assert result["solver"]["timed_out"] is False
+        rooms = _rooms_by_reservation(db)
+        assert rooms[men.id] == big.id
+        assert rooms[women[0].id] == rooms[women[1].id] == small.id
+
+    def test_tenant_setting_selects_solver(self, db):
+        _, _, _, men = _sold_out_weekend(db)
+        db.query(Tenant).filter(Tenant.id == 1).one().room_assign_solver = "optimal"
+        db.commit()
+        assert auto_assign_rooms(db, "2026-04-10")["assigned"] == 3
+
+    def test_deadline_falls_back_to_greedy(self, db, monkeypatch):
+        from app.config import settings
+        monkeypatch.setattr(settings, "ROOM_ASSIGN_SOLVER_TIMEOUT_SECONDS", 0.0)
+        _, _, _, men = _sold_out_weekend(db)
+
+        result = auto_assign_rooms(db, "2026-04-10", solver="optimal")
+        assert result["solver"]["timed_out"] is True
+        assert result["solver"]["gain"] == 0
+        assert result["assigned"] == 2
+        assert men.id not in _rooms_by_reservation(db)
+
+    def test_no_search_when_greedy_places_everyone(self, db):
+        _dorm(db, "D1", bed_capacity=4, priority=1)
+        _guest(db, "여1", "여", 1)
+        db.commit()
+        result = auto_assign_rooms(db, "2026-04-10", solver="optimal")
+        assert result["assigned"] == 1
+        assert "solver" not in result
+
+
+class TestGreedyConstraints:
+    """optimal 탐색도 greedy(_pick_room) 의 규칙을 그대로 따른다."""
+
+    def test_regular_first_candidates_never_fall_back_to_dorm(self, db):
+        building = Building(tenant_id=1, name="본관", is_active=True)
+        db.add(building)
+        db.flush()
+        regular = Room(tenant_id=1, room_number="101", room_type="double", building_id=building.id,
+                       is_active=True, is_dormitory=False, sort_order=1)
+        dorm = Room(tenant_id=1, room_number="D1", room_type="dormitory", building_id=building.id,
+                    is_active=True, is_dormitory=True, bed_capacity=2, sort_order=2)
+        db.add_all([regular, dorm])
+        db.flush()
+        db.add_all([RoomBizItemLink(tenant_id=1, room_id=room.id, biz_item_id="MIX") for room in (regular, dorm)])
+        guests = [_guest(db, f"손님{i}", "여", 1) for i in range(2)]
+        for res in guests:
+            res.naver_biz_item_id = "MIX"
+        db.commit()
+
+        result = auto_assign_rooms(db, "2026-04-10", solver="optimal")
+        assert result["assigned"] == 1
+        assert result["solver"]["gain"] == 0
+        assert dorm.id not in _rooms_by_reservation(db).values()
+
+    @staticmethod
+    def _continuing_guest(db, big, kind):
+        """04-09 에 big 방에 있던 여성 손님 (kind: 단일 예약 연박 / 연장 그룹)."""
+        if kind == "long_stay":
+            res = _guest(db, "연박", "여", 1)
+            res.check_in_date, res.check_out_date = "2026-04-09", "2026-04-11"
+            previous = res
+        else:
+            previous = _guest(db, "연장 1박차", "여", 1)
+            previous.check_in_date, previous.check_out_date = "2026-04-09", "2026-04-10"
+            res = _guest(db, "연장 2박차", "여", 1)
+            previous.stay_group_id = res.stay_group_id = "grp-1"
+        db.add(RoomAssignment(tenant_id=1, reservation_id=previous.id, room_id=big.id, date="2026-04-09"))
+        return res
+
+    @pytest.mark.parametrize("kind", ["long_stay", "stay_group"])
+    def test_continuing_guest_keeps_room(self, db, kind):
+        big = _dorm(db, "D1", bed_capacity=4, priority=1)
+        _dorm(db, "D2", bed_capacity=2, priority=2)
+        staying = self._continuing_guest(db, big, kind)
+        _guest(db, "여2", "여", 1)
+        men = _guest(db, "남일행", "남", 3)
+        db.commit()
+
+        # 연속 투숙자를 D2 로 옮기면 남성 일행까지 3명 배정 가능하지만, greedy 처럼 D1 유지
+        result = auto_assign_rooms(db, "2026-04-10", solver="optimal")
+        rooms = _rooms_by_reservation(db)
+        assert rooms[staying.id] == big.id
+        assert men.id not in rooms
+        assert result["solver"]["gain"] == 0
@@ -119,3 +119,99 @@ class TestSendPipeline:
             assert result["success"] is False
         except Exception:
             pass  # Exception is acceptable for missing template
+
+
+class _ConcurrencyProvider:
+    """동시 호출 수를 기록하고, 지정 번호는 실패 처리하는 mock."""
+
+    def __init__(self, fail_to=()):
+        self.fail_to = set(fail_to)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def send_sms(self, to, message, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        self.calls.append(to)
+        if to in self.fail_to:
+            return {"success": False, "message_id": None, "error": "provider error"}
+        return {"success": True, "message_id": f"id_{to}", "error": None}
+
+
+class TestExecuteSchedulePipeline:
+    def _setup(self, db, phones):
+        from app.config import today_kst
+        from app.db.models import TemplateSchedule
+
+        tpl = _make_template(db, key="pipe_tpl")
+        sched = TemplateSchedule(
+            tenant_id=1, template_id=tpl.id, schedule_name="pipe",
+            schedule_type="daily", hour=9, minute=0,
+            target_mode="first_night", date_target="today", is_active=True,
+        )
+        db.add(sched)
+        db.flush()
+        reservations = [_make_reservation(db, phone=p, check_in=today_kst()) for p in phones]
+        return sched, reservations
+
+    def test_concurrent_send_records_each_recipient(self, db, monkeypatch):
+        import json
+        from app.config import settings, today_kst
+        from app.db.models import ActivityLog, ReservationSmsAssignment
+        from app.scheduler.template_scheduler import TemplateScheduleExecutor
+
+        monkeypatch.setattr(settings, "SMS_SEND_CONCURRENCY", 2)
+        phones = ["01000000001", "01000000002", "01000000003", "01000000004", "bad"]
+        sched, reservations = self._setup(db, phones)
+
+        executor = TemplateScheduleExecutor(db, tenant=None)
+        provider = _ConcurrencyProvider(fail_to={"01000000002"})
+        executor.sms_provider = provider
+
+        result = run_async(executor.execute_schedule(sched.id))
+
+        assert result["sent_count"] == 3
+        assert result["failed_count"] == 2
+        assert 1 < provider.max_in_flight <= 2
+        assert "bad" not in provider.calls
+
+        chips = {
+            c.reservation_id: c
+            for c in db.query(ReservationSmsAssignment).filter(
+                ReservationSmsAssignment.template_key == "pipe_tpl",
+                ReservationSmsAssignment.date == today_kst(),
+            ).all()
+        }
+        assert len(chips) == 5
+        status = {r.phone: chips[r.id].send_status for r in reservations}
+        assert status == {
+            "01000000001": "sent", "01000000002": "failed", "01000000003": "sent",
+            "01000000004": "sent", "bad": "failed",
+        }
+
+        log = db.query(ActivityLog).filter(ActivityLog.activity_type == "sms_send").one()
+        targets = json.loads(log.detail)["targets"]
+        assert [t["phone"] for t in targets] == phones
+        assert [t["status"] for t in targets] == ["success", "failed", "success", "success", "failed"]
+
+    def test_no_sql_on_event_loop_thread(self, db, count_statements):
+        """execute_schedule 의 DB 구간은 모두 run_db — 루프 스레드에서는 SQL 이 돌지 않아야 함."""
+        import threading
+        from app.scheduler.template_scheduler import TemplateScheduleExecutor
+
+        sched, _ = self._setup(db, ["01000000001", "01000000002"])
+        db.commit()
+        schedule_id = sched.id
+        db.expire_all()  # 스케줄/템플릿도 다시 로드되게
+        executor = TemplateScheduleExecutor(db, tenant=None)
+        executor.sms_provider = _ConcurrencyProvider()
+
+        loop_thread = threading.get_ident()
+        with count_statements() as log:
+            result = run_async(executor.execute_schedule(schedule_id))
+
+        assert result["sent_count"] == 2
+        assert [s for s, t in zip(log.statements, log.threads) if t == loop_thread] == []
@@ -13,7 +13,7 @@ from app.db.models import (
     ReservationSmsAssignment, RoomBizItemLink,
 )
 from app.services.surcharge import (
-    reconcile_surcharge, reconcile_surcharge_batch,
+    reconcile_surcharge, reconcile_surcharge_batch, reconcile_surcharge_pairs,
     SURCHARGE_STANDARD, SURCHARGE_DOUBLE, DOUBLE_ROOM_BIZ_ITEM_IDS,
 )
 
@@ -297,16 +297,16 @@ class TestReconcileSurcharge:
         _make_surcharge_schedule(db, tpl, custom_type=SURCHARGE_STANDARD)
 
         call_count = {"n": 0}
-        original = reconcile_surcharge
+        import app.services.surcharge as surcharge_mod
+        original = surcharge_mod.compute_excess
 
-        def _failing_once(db_arg, rid, date_arg, room_id=None):
+        def _failing_once(reservation, room):
             call_count["n"] += 1
             if call_count["n"] == 1:
                 raise RuntimeError("첫 번째 실패 시뮬레이션")
-            original(db_arg, rid, date_arg, room_id=room_id)
+            return original(reservation, room)
 
-        import app.services.surcharge as surcharge_mod
-        monkeypatch.setattr(surcharge_mod, "reconcile_surcharge", _failing_once)
+        monkeypatch.setattr(surcharge_mod, "compute_excess", _failing_once)
 
         # Should not raise even though first call fails
         reconcile_surcharge_batch(db, [res1.id, res2.id], DATE)
@@ -355,3 +355,52 @@ class TestReconcileSurcharge:
         chips = _surcharge_chips(db, res.id)
         schedule_ids = {c.schedule_id for c in chips}
         assert s_std.id in schedule_ids, "이미 발송된 standard 칩은 보존되어야 함"
+
+
+class TestReconcileSurchargePairs:
+    def _setup(self, db, n):
+        b = _make_building(db)
+        room = _make_room(db, b.id, base_capacity=2)
+        dbl = _make_room(db, b.id, room_number="R201", base_capacity=2)
+        _link_double_biz_item(db, dbl.id)
+        _make_surcharge_schedule(db, _make_template(db, key="add_standard"), custom_type=SURCHARGE_STANDARD)
+        _make_surcharge_schedule(db, _make_template(db, key="add_double"), custom_type=SURCHARGE_DOUBLE)
+        pairs = []
+        for i in range(n):
+            res = _make_reservation(db, party_size=3 if i % 2 == 0 else 2, check_out="2026-04-17")
+            for d in (DATE, "2026-04-16"):
+                _make_assignment(db, res.id, (room if d == DATE else dbl).id, date=d)
+                pairs.append((res.id, d))
+        db.commit()
+        return pairs
+
+    def test_statement_count_independent_of_batch_size(self, db, count_statements):
+        pairs = self._setup(db, 12)
+        reconcile_surcharge_pairs(db, pairs[:1])  # reference_cache 적재
+        db.commit()
+
+        with count_statements() as small:
+            reconcile_surcharge_pairs(db, pairs[:4])
+        db.commit()
+        with count_statements() as large:
+            reconcile_surcharge_pairs(db, pairs)
+        db.commit()
+        assert len(large) == len(small)
+        assert sum(len(_surcharge_chips(db, rid, date=d)) for rid, d in pairs) == 12  # 초과 6명 × 2박
+
+    def test_pairs_follow_room_type_per_date(self, db):
+        pairs = self._setup(db, 2)
+        reconcile_surcharge_pairs(db, pairs)
+        db.commit()
+
+        over_id = pairs[0][0]
+        keys = {
+            c.date: c.template_key for c in _surcharge_chips(db, over_id)
+        } | {c.date: c.template_key for c in _surcharge_chips(db, over_id, date="2026-04-16")}
+        assert keys == {DATE: "add_standard", "2026-04-16": "add_double"}
+        assert _surcharge_chips(db, pairs[2][0]) == []  # 정원 내
+
+        # 재실행은 변경 없음 (중복 INSERT 없음)
+        reconcile_surcharge_pairs(db, pairs)
+        db.commit()
+        assert len(_surcharge_chips(db, over_id)) == 1
@@ -11,7 +11,11 @@ from app.db.models import (
 )
 from app.db.tenant_context import current_tenant_id
 from app.services.surcharge import DOUBLE_ROOM_BIZ_ITEM_IDS
-from app.templates.variables import calculate_template_variables, _calculate_stay_nights
+from app.templates.variables import (
+    calculate_template_variables,
+    calculate_template_variables_batch,
+    _calculate_stay_nights,
+)
 
 
 DATE = "2026-04-15"
@@ -284,3 +288,60 @@ class TestSurchargeVariables:
         # excess=1, is_double=True → 20000*1 + 5000 = 25000 → '2.5'
         assert ctx["excess"] == 1
         assert ctx["surcharge_per_night"] == '2.5'
+
+
+# ---------------------------------------------------------------------------
+# Tests — calculate_template_variables_batch == 단건 호출 결과
+# ---------------------------------------------------------------------------
+
+class TestBatchVariables:
+    def _fixture(self, db):
+        """일반/더블/A동/미배정/다른 체크인 날짜 예약 혼합."""
+        b = _make_building(db)
+        std = _make_room(db, b.id, base_capacity=2, room_number="R101")
+        dbl = _make_room(db, b.id, base_capacity=2, room_number="R102")
+        a_wing = _make_room(db, b.id, base_capacity=4, room_number="A203호")
+        _link_double(db, dbl.id)
+
+        r1 = _make_reservation(db, party_size=4)
+        r2 = _make_reservation(db, party_size=3, check_out="2026-04-18")
+        r3 = _make_reservation(db, male_count=1, female_count=1)
+        r4 = _make_reservation(db, party_size=2)  # 미배정
+        r5 = _make_reservation(db, check_in="2026-04-20", check_out="2026-04-21", party_size=5)
+        _make_assignment(db, r1.id, std.id)
+        _make_assignment(db, r2.id, dbl.id)
+        _make_assignment(db, r3.id, a_wing.id)
+        _make_assignment(db, r5.id, std.id, date="2026-04-20")
+        return [r1, r2, r3, r4, r5]
+
+    @pytest.mark.parametrize("template_key", [None, "add_standard", "add_double"])
+    def test_batch_matches_single_calls(self, db, template_key):
+        reservations = self._fixture(db)
+        custom = {"_male_buffer": 1, "_female_buffer": 2, "extra": "x"}
+
+        batch = calculate_template_variables_batch(
+            db, reservations, custom_vars=custom, template_key=template_key,
+        )
+
+        for res in reservations:
+            ra = db.query(RoomAssignment).filter(
+                RoomAssignment.reservation_id == res.id,
+                RoomAssignment.date == res.check_in_date,
+            ).first()
+            single = calculate_template_variables(
+                reservation=res, db=db, custom_vars=custom,
+                room_assignment=ra, template_key=template_key,
+            )
+            assert batch[res.id] == single, res.id
+
+    def test_batch_with_explicit_date(self, db):
+        reservations = self._fixture(db)[:4]
+        batch = calculate_template_variables_batch(db, reservations, date=DATE)
+        assert batch[reservations[2].id]["building"] == "A동"
+        assert batch[reservations[2].id]["room_num"] == "203호"
+        assert batch[reservations[3].id]["room_num"] == ""
+        for res in reservations:
+            assert batch[res.id]["participant_count"] == "2"  # 스냅샷은 male+female 합계
+
+    def test_empty(self, db):
+        assert calculate_template_variables_batch(db, []) == {}
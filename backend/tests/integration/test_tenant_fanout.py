@@ -0,0 +1,120 @@
+"""scheduler/tenant_fanout.fan_out_tenants — 동시 실행 상한/격리/타임아웃/중복 실행 방지."""
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.executor import run_db
+from app.db.models import ActivityLog, Tenant
+from app.db.tenant_context import current_tenant_id
+from app.scheduler import tenant_fanout
+from app.scheduler.tenant_fanout import fan_out_tenants
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture
+def tenants(db, monkeypatch):
+    """테넌트 1(conftest) + 2, 3. fan-out 이 쓰는 SessionLocal 을 테스트 엔진으로 교체."""
+    db.add_all([Tenant(id=2, slug="t2", name="T2"), Tenant(id=3, slug="t3", name="T3")])
+    db.commit()
+    monkeypatch.setattr(tenant_fanout, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    tenant_fanout._in_flight.clear()
+    return db.query(Tenant).order_by(Tenant.id).all()
+
+
+class TestFanOut:
+    def test_runs_concurrently_under_cap_with_own_context(self, db, tenants):
+        running = {"now": 0, "max": 0}
+        seen = {}
+
+        async def work(session, tenant):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.05)
+            seen[tenant.id] = current_tenant_id.get()
+            running["now"] -= 1
+            return tenant.slug
+
+        reports = run_async(fan_out_tenants("job", work, tenants=tenants, concurrency=2))
+
+        assert running["max"] == 2
+        assert seen == {1: 1, 2: 2, 3: 3}
+        assert [r["outcome"] for r in reports] == ["ok", "ok", "ok"]
+        assert [r["result"] for r in reports] == ["test", "t2", "t3"]
+        assert all(r["duration_ms"] >= 0 for r in reports)
+        assert current_tenant_id.get() == 1  # 호출자 컨텍스트 불변
+
+    def test_commit_per_tenant_and_error_isolated(self, db, tenants):
+        async def work(session, tenant):
+            session.add(ActivityLog(activity_type="test", title=f"fanout {tenant.slug}"))
+            if tenant.id == 2:
+                raise RuntimeError("naver cookie expired")
+            return None
+
+        # StaticPool 은 커넥션 1개를 공유 — 트랜잭션이 섞이지 않도록 순차 실행
+        reports = run_async(fan_out_tenants("job", work, tenants=tenants, concurrency=1))
+
+        by_tenant = {r["tenant_id"]: r for r in reports}
+        assert by_tenant[2]["outcome"] == "error"
+        assert "cookie" in by_tenant[2]["error"]
+        assert by_tenant[1]["outcome"] == by_tenant[3]["outcome"] == "ok"
+
+        rows = db.execute(text("SELECT tenant_id, title FROM activity_logs ORDER BY tenant_id")).all()
+        titles = [title for _, title in rows]
+        assert titles == ["fanout test", "fanout t3"]  # t2 는 rollback
+
+    def test_timeout_does_not_stall_others(self, db, tenants):
+        async def work(session, tenant):
+            if tenant.id == 1:
+                await asyncio.sleep(5)
+            return "done"
+
+        started = time.perf_counter()
+        reports = run_async(fan_out_tenants("job", work, tenants=tenants, timeout=0.1))
+
+        assert time.perf_counter() - started < 1
+        assert [r["outcome"] for r in reports] == ["timeout", "ok", "ok"]
+
+    def test_skips_tenant_still_in_flight(self, db, tenants):
+        async def slow_db(session, tenant):
+            if tenant.id == 1:
+                await run_db(time.sleep, 0.6)  # 취소돼도 스레드 작업이 끝날 때까지 in-flight
+            return "done"
+
+        async def fast(session, tenant):
+            return "second"
+
+        async def scenario():
+            first = await fan_out_tenants("job", slow_db, tenants=tenants, timeout=0.2)
+            second = await fan_out_tenants("job", fast, tenants=tenants)
+            other_job = await fan_out_tenants("other", fast, tenants=tenants)
+            await asyncio.sleep(0.6)
+            third = await fan_out_tenants("job", fast, tenants=tenants)
+            return first, second, other_job, third
+
+        first, second, other_job, third = run_async(scenario())
+
+        assert [r["outcome"] for r in first] == ["timeout", "ok", "ok"]
+        assert [r["outcome"] for r in second] == ["skipped", "ok", "ok"]
+        assert [r["outcome"] for r in other_job] == ["ok", "ok", "ok"]
+        assert [r["outcome"] for r in third] == ["ok", "ok", "ok"]
+
+    def test_timed_out_tenant_keeps_slot_until_finished(self, db, tenants):
+        """타임아웃 후에도 스레드 작업이 끝날 때까지 슬롯 유지 — concurrency 상한이 hung 테넌트에도 적용."""
+        started = {}
+
+        async def work(session, tenant):
+            started[tenant.id] = time.perf_counter()
+            if tenant.id == 1:
+                await run_db(time.sleep, 0.3)
+            return "done"
+
+        reports = run_async(fan_out_tenants("job", work, tenants=tenants, concurrency=1, timeout=0.05))
+
+        assert [r["outcome"] for r in reports] == ["timeout", "ok", "ok"]
+        assert started[2] - started[1] >= 0.25
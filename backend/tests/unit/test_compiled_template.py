@@ -0,0 +1,81 @@
+"""CompiledTemplate / 파싱 캐시 유닛 테스트 — DB 불필요 (MessageTemplate 은 저장하지 않고 객체만 사용)."""
+from datetime import datetime
+
+from app.db.models import MessageTemplate
+from app.services.sms_sender import find_unreplaced_vars
+from app.templates.renderer import (
+    CompiledTemplate,
+    _COMPILED_CACHE,
+    compile_template,
+    invalidate_template_cache,
+)
+
+
+def _legacy_render(content, variables):
+    """기존 renderer 의 순차 str.replace 방식 (비교 기준)."""
+    for key, value in variables.items():
+        content = content.replace(f"{{{{{key}}}}}", str(value))
+    return content
+
+
+def _template(content, key="welcome", tenant_id=1, updated_at=datetime(2026, 4, 1)):
+    return MessageTemplate(tenant_id=tenant_id, template_key=key, content=content, updated_at=updated_at)
+
+
+class TestCompiledTemplate:
+    def test_tokens_and_variables(self):
+        c = CompiledTemplate("k", "{{customer_name}}님 {{room_num}} / {{room_num}}")
+        assert c.tokens == ["", "customer_name", "님 ", "room_num", " / ", "room_num", ""]
+        assert c.variables == {"customer_name", "room_num"}
+
+    def test_render_matches_legacy_replace(self):
+        content = "{{customer_name}}님 {{building}} {{room_num}}호 {{{room_password}}} {단일} {{x-y}}"
+        variables = {"customer_name": "김철수", "building": "본관", "room_num": 101, "room_password": "1234"}
+        rendered, unreplaced = CompiledTemplate("k", content).render(variables)
+        assert rendered == _legacy_render(content, variables)
+        assert unreplaced == []
+
+    def test_unreplaced_reported_statically(self):
+        content = "{{customer_name}}님 {{building}} {{room_num}}호"
+        rendered, unreplaced = CompiledTemplate("k", content).render({"customer_name": "김철수"})
+        assert rendered == "김철수님 {{building}} {{room_num}}호"
+        assert unreplaced == find_unreplaced_vars(rendered) == ["building", "room_num"]
+
+    def test_no_variables(self):
+        c = CompiledTemplate("k", "안내 문자입니다")
+        assert c.variables == frozenset()
+        assert c.render({"a": 1}) == ("안내 문자입니다", [])
+
+
+class TestCompileCache:
+    def setup_method(self):
+        invalidate_template_cache()
+
+    def test_same_version_reuses_parse(self):
+        a = compile_template(_template("{{a}}"))
+        b = compile_template(_template("{{a}}"))
+        assert a is b
+
+    def test_updated_at_change_reparses(self):
+        a = compile_template(_template("{{a}}"))
+        b = compile_template(_template("{{b}}", updated_at=datetime(2026, 4, 2)))
+        assert a is not b
+        assert b.variables == {"b"}
+
+    def test_content_change_without_timestamp_reparses(self):
+        compile_template(_template("{{a}}"))
+        assert compile_template(_template("{{b}}")).variables == {"b"}
+
+    def test_tenants_isolated(self):
+        a = compile_template(_template("{{a}}", tenant_id=1))
+        b = compile_template(_template("{{a}}", tenant_id=2))
+        assert a is not b
+
+    def test_invalidate_by_key(self):
+        compile_template(_template("{{a}}", key="one"))
+        compile_template(_template("{{a}}", key="two"))
+        compile_template(_template("{{a}}", key="one", tenant_id=2))
+        invalidate_template_cache(1, "one")
+        assert {(k[0], k[1]) for k in _COMPILED_CACHE} == {(1, "two"), (2, "one")}
+        invalidate_template_cache()
+        assert not _COMPILED_CACHE
@@ -0,0 +1,132 @@
+"""services/event_bus — 이벤트 ID, Last-Event-ID 재전송, 느린 구독자 병합 (memory 백엔드, DB 불필요)."""
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.services import event_bus
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture(autouse=True)
+def _memory_backend(monkeypatch):
+    monkeypatch.setattr(settings, "EVENT_BUS_BACKEND", "memory")
+    monkeypatch.setattr(event_bus, "_backend_instance", None)
+    yield
+    event_bus._subscribers.clear()
+
+
+async def _drain(sub, n):
+    out = []
+    for _ in range(n):
+        payload = await asyncio.wait_for(sub.get(), timeout=1)
+        out.append((sub.last_id, json.loads(payload)))
+    return out
+
+
+class TestEventBus:
+    def test_events_get_increasing_ids(self):
+        async def scenario():
+            sub = event_bus.subscribe(1)
+            try:
+                event_bus.publish("a", {"n": 1}, tenant_id=1)
+                event_bus.publish("b", {"n": 2}, tenant_id=1)
+                event_bus.publish("a", {"n": 3}, tenant_id=2)  # 다른 테넌트
+                return await _drain(sub, 2), sub.qsize()
+            finally:
+                event_bus.unsubscribe(sub, 1)
+
+        received, left = run_async(scenario())
+        assert [e["data"]["n"] for _, e in received] == [1, 2]
+        assert [event_bus._id_key(i)[1] for i, _ in received] == [1, 2]
+        assert left == 0
+
+    def test_reconnect_replays_missed_events(self):
+        async def scenario():
+            first = event_bus.subscribe(1)
+            event_bus.publish("schedule_complete", {"n": 1}, tenant_id=1)
+            [(last_id, _)] = await _drain(first, 1)
+            event_bus.unsubscribe(first, 1)
+
+            # 연결 끊긴 동안 발행
+            event_bus.publish("schedule_complete", {"n": 2}, tenant_id=1)
+            event_bus.publish("room_assign_failed", {"n": 3}, tenant_id=1)
+
+            second = event_bus.subscribe(1, last_event_id=last_id)
+            try:
+                event_bus.publish("schedule_complete", {"n": 4}, tenant_id=1)
+                return await _drain(second, 3)
+            finally:
+                event_bus.unsubscribe(second, 1)
+
+        received = run_async(scenario())
+        assert [e["data"]["n"] for _, e in received] == [2, 3, 4]
+
+    def test_unknown_epoch_replays_retained_history(self):
+        async def scenario():
+            event_bus.publish("a", {"n": 1}, tenant_id=1)
+            event_bus.publish("a", {"n": 2}, tenant_id=1)
+            sub = event_bus.subscribe(1, last_event_id="1-99")  # 재시작 전 프로세스의 ID
+            try:
+                return await _drain(sub, 2)
+            finally:
+                event_bus.unsubscribe(sub, 1)
+
+        assert [e["data"]["n"] for _, e in run_async(scenario())] == [1, 2]
+
+    def test_malformed_last_event_id_ignored(self):
+        async def scenario():
+            event_bus.publish("a", {"n": 1}, tenant_id=1)
+            sub = event_bus.subscribe(1, last_event_id="garbage")
+            try:
+                event_bus.publish("a", {"n": 2}, tenant_id=1)
+                return await _drain(sub, 1)
+            finally:
+                event_bus.unsubscribe(sub, 1)
+
+        assert [e["data"]["n"] for _, e in run_async(scenario())] == [2]
+
+    def test_full_buffer_coalesces_same_event_type(self, monkeypatch):
+        monkeypatch.setattr(settings, "EVENT_BUS_CLIENT_BUFFER", 3)
+
+        async def scenario():
+            sub = event_bus.subscribe(1)
+            try:
+                event_bus.publish("schedule_complete", {"n": 1}, tenant_id=1)
+                event_bus.publish("naver_backfill_progress", {"n": 2}, tenant_id=1)
+                event_bus.publish("room_assign_failed", {"n": 3}, tenant_id=1)
+                event_bus.publish("naver_backfill_progress", {"n": 4}, tenant_id=1)
+                event_bus.publish("naver_backfill_progress", {"n": 5}, tenant_id=1)
+                received = await _drain(sub, 3)
+                return received, sub.coalesced, sub.dropped
+            finally:
+                event_bus.unsubscribe(sub, 1)
+
+        received, coalesced, dropped = run_async(scenario())
+        assert [e["data"]["n"] for _, e in received] == [1, 3, 5]
+        assert (coalesced, dropped) == (2, 0)
+
+    def test_full_buffer_without_same_type_drops_oldest(self, monkeypatch):
+        monkeypatch.setattr(settings, "EVENT_BUS_CLIENT_BUFFER", 2)
+
+        async def scenario():
+            sub = event_bus.subscribe(1)
+            try:
+                for i, kind in enumerate(["a", "b", "c"], start=1):
+                    event_bus.publish(kind, {"n": i}, tenant_id=1)
+                return await _drain(sub, 2), sub.dropped
+            finally:
+                event_bus.unsubscribe(sub, 1)
+
+        received, dropped = run_async(scenario())
+        assert [e["data"]["n"] for _, e in received] == [2, 3]
+        assert dropped == 1
+
+    def test_redis_setting_without_url_falls_back_to_memory(self, monkeypatch):
+        monkeypatch.setattr(settings, "EVENT_BUS_BACKEND", "redis")
+        monkeypatch.setattr(settings, "REDIS_URL", "")
+        assert isinstance(event_bus._backend(), event_bus._MemoryBackend)
@@ -0,0 +1,155 @@
+"""real/http_client — 공용 커넥션 풀 재사용 + 재시도 정책 (DB 불필요)."""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.real import http_client
+
+
+def run_async(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRY_BASE_DELAY_SECONDS", 0.0)
+    http_client._clients.clear()
+    http_client._stats.clear()
+    yield
+    http_client._clients.clear()
+    http_client._stats.clear()
+
+
+@pytest.fixture
+def local_server():
+    """HTTP/1.1 keep-alive 로컬 서버."""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def _mock_client(monkeypatch, handler):
+    monkeypatch.setattr(http_client, "_new_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+class TestConnectionReuse:
+    def test_keepalive_connection_reused(self, local_server):
+        async def scenario():
+            for _ in range(3):
+                response = await http_client.request("naver", "GET", local_server)
+                assert response.text == "ok"
+            await http_client.close_http_clients()
+
+        run_async(scenario())
+        stats = http_client.http_client_stats()["naver"]
+        assert stats["requests"] == 3
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 2
+
+    def test_client_per_provider_and_loop(self):
+        async def clients():
+            return http_client.get_client("naver"), http_client.get_client("naver"), http_client.get_client("aligo")
+
+        a, b, c = run_async(clients())
+        assert a is b
+        assert a is not c
+
+        other_loop = asyncio.new_event_loop()
+        try:
+            d, _, _ = other_loop.run_until_complete(clients())
+        finally:
+            other_loop.close()
+        assert d is not a
+
+
+class TestRetry:
+    def test_idempotent_retries_5xx_then_succeeds(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503 if len(calls) < 3 else 200, json={"ok": True})
+
+        _mock_client(monkeypatch, handler)
+        response = run_async(http_client.request("naver", "GET", "https://example.test/"))
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert http_client.http_client_stats()["naver"]["retries"] == 2
+
+    def test_gives_up_after_max_retries(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        _mock_client(monkeypatch, handler)
+        response = run_async(http_client.request("naver", "GET", "https://example.test/", retries=1))
+        assert response.status_code == 500
+        assert len(calls) == 2
+
+    def test_timeout_retried_for_idempotent(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ReadTimeout("slow", request=request)
+            return httpx.Response(200)
+
+        _mock_client(monkeypatch, handler)
+        assert run_async(http_client.request("naver", "GET", "https://example.test/")).status_code == 200
+        assert len(calls) == 2
+
+    def test_non_idempotent_never_retries_after_send(self, monkeypatch):
+        """SMS 발송: 응답 타임아웃/5xx 는 이미 발송됐을 수 있으므로 재시도하지 않는다."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ReadTimeout("slow", request=request)
+            return httpx.Response(500)
+
+        _mock_client(monkeypatch, handler)
+        with pytest.raises(httpx.ReadTimeout):
+            run_async(http_client.request("aligo", "POST", "https://example.test/", idempotent=False))
+        assert len(calls) == 1
+
+        response = run_async(http_client.request("aligo", "POST", "https://example.test/", idempotent=False))
+        assert response.status_code == 500
+        assert len(calls) == 2
+
+    def test_non_idempotent_retries_connect_error(self, monkeypatch):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200)
+
+        _mock_client(monkeypatch, handler)
+        response = run_async(http_client.request("aligo", "POST", "https://example.test/", idempotent=False))
+        assert response.status_code == 200
+        assert len(calls) == 2
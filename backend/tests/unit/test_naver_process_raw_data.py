@@ -114,3 +114,31 @@ class TestRebookFilterRemoval:
         out = _run(provider._process_raw_data(data))
 
         assert len(out) == 2
+
+
+class TestIncrementalWindow:
+    """since 증분 조회 — REGDATE 일 단위라 최소 어제+오늘, 오래된 커서면 그날부터."""
+
+    def _first_start(self, monkeypatch, since):
+        provider = _make_provider(monkeypatch)
+        calls = []
+
+        async def _fetch_page(start, end, page=0):
+            calls.append(start)
+            return []
+
+        monkeypatch.setattr(provider, "_fetch_page", _fetch_page)
+        _run(provider.sync_reservations(since=since))
+        return calls[0]
+
+    def test_fresh_cursor_still_covers_yesterday(self, monkeypatch):
+        from datetime import datetime, timedelta
+        now = datetime.now()
+        start = self._first_start(monkeypatch, now - timedelta(minutes=10))
+        assert start == (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def test_stale_cursor_extends_window(self, monkeypatch):
+        from datetime import datetime, timedelta
+        since = datetime.now() - timedelta(days=3, hours=2)
+        start = self._first_start(monkeypatch, since)
+        assert start == since.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+인증/테넌트 의존성 오버헤드 벤치마크 — 핸들러가 아무 일도 하지 않는 엔드포인트의 요청당 SQL 수와 지연.
+
+get_tenant_scoped_db + get_current_user + get_current_tenant 에 의존하는 빈 라우트를 TestClient 로
+반복 호출한다 (실제 API 와 같은 의존성 조합). 비교:
+  - ttl=0:  요청 간 캐시 없음 — 요청 안 재사용 + 조인 쿼리 1회만
+  - ttl=N:  AUTH_CACHE_TTL_SECONDS=N — 같은 토큰이면 SQL 없음
+
+Usage (backend 디렉터리를 sys.path 에 추가):
+  python3 scripts/bench/auth_overhead.py
+  python3 scripts/bench/auth_overhead.py --requests 5000 --ttl 30
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.api import deps  # noqa: E402
+from app.api.deps import get_current_tenant, get_tenant_scoped_db  # noqa: E402
+from app.auth import context as auth_context  # noqa: E402
+from app.auth.dependencies import get_current_user  # noqa: E402
+from app.auth.utils import create_access_token, hash_password  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.db.database import get_db  # noqa: E402
+from app.db.models import Base, Tenant, User, UserRole, UserTenantRole  # noqa: E402
+
+
+def _build(engine):
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as db:
+        db.add(Tenant(id=1, slug="bench", name="Bench"))
+        user = User(username="staff", hashed_password=hash_password("pw"), name="staff", role=UserRole.STAFF)
+        db.add(user)
+        db.flush()
+        db.add(UserTenantRole(user_id=user.id, tenant_id=1))
+        db.commit()
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping(db=Depends(get_tenant_scoped_db), user=Depends(get_current_user), tenant=Depends(get_current_tenant)):
+        return {"user": user.username, "tenant": tenant.slug}
+
+    app.dependency_overrides[get_db] = _get_db
+    deps.SessionLocal = Session  # get_tenant_scoped_db 가 직접 여는 세션
+    return app
+
+
+def _run(client, headers, engine, n: int):
+    statements = []
+
+    def _count(conn, cursor, stmt, *args):
+        statements.append(stmt)
+
+    timings = []
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        for _ in range(n):
+            started = time.perf_counter()
+            resp = client.get("/ping", headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert resp.status_code == 200, resp.text
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    return len(statements) / n, statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--ttl", type=int, default=30, help="캐시 켠 경우의 AUTH_CACHE_TTL_SECONDS")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    client = TestClient(_build(engine))
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': 'staff'})}",
+        "X-Tenant-Id": "1",
+    }
+    _run(client, headers, engine, 50)  # warm-up
+
+    print(f"# auth_overhead — {args.requests:,} requests, in-memory SQLite")
+    print("| mode | SQL / request | median ms | p99 ms |")
+    print("|---|---:|---:|---:|")
+    for label, ttl in (("ttl=0", 0), (f"ttl={args.ttl}", args.ttl)):
+        settings.AUTH_CACHE_TTL_SECONDS = ttl
+        auth_context.clear()
+        per_request, median, p99 = _run(client, headers, engine, args.requests)
+        print(f"| {label} | {per_request:.2f} | {median:.3f} | {p99:.3f} |")
+    print(f"\n{auth_context.auth_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+핫 쿼리 실행 계획 / 인덱스 감사 — PostgreSQL 또는 SQLite.
+
+멀티 테넌트 합성 데이터(기본 테넌트 4 × 예약 25,000, 2년치)를 빈 DB 에 만들고, 코드에서 가장
+자주 도는 쿼리 모양마다 실행 계획(PostgreSQL: EXPLAIN (ANALYZE, BUFFERS), SQLite: EXPLAIN QUERY
+PLAN)과 실행 시간(중앙값)을 잰다. 순차 스캔(PostgreSQL "Seq Scan", SQLite "SCAN <table>")은
+표시한다.
+
+before / after: 시드 직후 AUDIT_INDEXES(alembic hot_query_indexes 가 추가하는 인덱스)를 지운
+상태로 한 번, 다시 만들고 ANALYZE 한 뒤 한 번 측정해 나란히 보고한다.
+
+Usage (backend 디렉터리 기준 경로를 sys.path 에 추가):
+  python3 scripts/bench/index_audit.py                                  # in-memory SQLite
+  python3 scripts/bench/index_audit.py --database-url postgresql://.../scratch --output report.md
+  python3 scripts/bench/index_audit.py --tenants 2 --reservations 5000 --repeat 3
+
+--database-url 은 비어 있는 스크래치 DB 여야 한다 (테이블 생성 후 종료 시 전부 drop).
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+os.environ.setdefault("DISABLE_SCHEDULER", "1")
+
+from sqlalchemy import and_, create_engine, exists, inspect, insert, or_, select  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db.models import (  # noqa: E402
+    ActivityLog, Base, Building, Reservation, ReservationSmsAssignment, ReservationStatus, Room,
+    RoomAssignment, Tenant,
+)
+from app.services.filters import stay_coverage_filter  # noqa: E402
+
+# alembic hot_query_indexes 가 추가하는 인덱스 — before 측정 때만 지운다
+AUDIT_INDEXES = (
+    ("reservations", "ix_reservation_stay_range"),
+    ("reservations", "ix_reservation_confirmed"),
+    ("reservation_sms_assignments", "ix_res_sms_pending"),
+    ("activity_logs", "ix_activity_log_type_created"),
+)
+
+START = date(2025, 1, 1)
+DAYS = 730
+AUDIT_DATE = "2026-03-14"
+NOW = datetime(2026, 3, 14, 12, 0)
+TEMPLATE_KEYS = ("room_info", "party_info", "checkout", "welcome_event")
+ACTIVITY_TYPES = ("naver_sync", "room_assign", "sms_template", "sms_manual", "schedule_execute", "sms_campaign")
+CHUNK = 5000
+
+
+def _insert(conn, model, rows):
+    """Core executemany — 속성명 → 컬럼명 (check_in_date → date 등). ORM 세션 이벤트(daily_stats)를 타지 않는다."""
+    names = {attr.key: attr.columns[0].name for attr in inspect(model).column_attrs}
+    rows = [{names[k]: v for k, v in row.items()} for row in rows]
+    for i in range(0, len(rows), CHUNK):
+        conn.execute(insert(model.__table__), rows[i:i + CHUNK])
+
+
+def seed(engine, tenants: int, per_tenant: int, seed_value: int = 7):
+    """테넌트마다 객실 40개, 예약 per_tenant 건(1~3박, 10% 당일), 박마다 배정, 예약당 칩 3개, 로그."""
+    rnd = random.Random(seed_value)
+    now = NOW
+    with engine.begin() as conn:
+        for tid in range(1, tenants + 1):
+            conn.execute(insert(Tenant), [{"id": tid, "slug": f"bench{tid}", "name": f"Bench {tid}"}])
+            conn.execute(insert(Building), [{"tenant_id": tid, "name": "본관", "is_active": True}])
+            building_id = conn.execute(select(Building.id).where(Building.tenant_id == tid)).scalar_one()
+            _insert(conn, Room, [
+                {"tenant_id": tid, "room_number": f"{i:03d}", "room_type": "더블", "building_id": building_id,
+                 "is_active": True}
+                for i in range(40)
+            ])
+            room_ids = conn.execute(select(Room.id).where(Room.tenant_id == tid)).scalars().all()
+
+            reservations = []
+            for i in range(per_tenant):
+                check_in = START + timedelta(days=rnd.randrange(DAYS))
+                nights = rnd.choice((0, 1, 1, 1, 2, 2, 3)) if rnd.random() > 0.1 else 0
+                reservations.append({
+                    "tenant_id": tid, "customer_name": f"손님{i}", "phone": f"010{rnd.randrange(10**8):08d}",
+                    "check_in_date": check_in.isoformat(), "check_in_time": "15:00",
+                    "check_out_date": (check_in + timedelta(days=nights)).isoformat() if nights else None,
+                    "status": ReservationStatus.CONFIRMED if rnd.random() < 0.9 else ReservationStatus.CANCELLED,
+                    "booking_source": "naver", "section": "room", "party_size": 2,
+                    "gender": rnd.choice(("남", "여")), "is_long_stay": nights > 1,
+                    "confirmed_at": min(  # 기준 시각 이후 확정은 없음 (미래 체크인은 최근 60일 안에 확정)
+                        datetime.combine(check_in, datetime.min.time()) - timedelta(hours=rnd.randrange(1, 720)),
+                        NOW - timedelta(minutes=rnd.randrange(60 * 24 * 60)),
+                    ),
+                    "created_at": now, "updated_at": now,
+                })
+            _insert(conn, Reservation, reservations)
+            stays = conn.execute(
+                select(Reservation.id, Reservation.check_in_date, Reservation.check_out_date)
+                .where(Reservation.tenant_id == tid)
+            ).all()
+
+            assignments, chips = [], []
+            for rid, check_in, check_out in stays:
+                first = date.fromisoformat(check_in)
+                nights = (date.fromisoformat(check_out) - first).days if check_out else 1
+                for n in range(nights):
+                    assignments.append({
+                        "tenant_id": tid, "reservation_id": rid, "date": (first + timedelta(days=n)).isoformat(),
+                        "room_id": rnd.choice(room_ids), "assigned_by": "auto", "bed_order": 0,
+                    })
+                for key in rnd.sample(TEMPLATE_KEYS, 3):
+                    sent = check_in < AUDIT_DATE or rnd.random() < 0.1
+                    chips.append({
+                        "tenant_id": tid, "reservation_id": rid, "template_key": key, "date": check_in,
+                        "assigned_at": now, "assigned_by": "auto",
+                        "sent_at": now if sent else None, "send_status": "sent" if sent else None,
+                    })
+            _insert(conn, RoomAssignment, assignments)
+            _insert(conn, ReservationSmsAssignment, chips)
+            _insert(conn, ActivityLog, [
+                {"tenant_id": tid, "activity_type": rnd.choice(ACTIVITY_TYPES), "title": "bench", "status": "success",
+                 "created_at": now - timedelta(minutes=rnd.randrange(DAYS * 24 * 60))}
+                for _ in range(per_tenant)
+            ])
+
+
+def hot_queries(tenant_id: int, sample_reservation_id: int):
+    """(이름, 코드 위치, statement). Core select 이므로 tenant 조건을 앱 쿼리와 같게 명시."""
+    chip, res = ReservationSmsAssignment, Reservation
+    cutoff = NOW - timedelta(hours=24)  # hours_since_booking=24
+    return [
+        ("stay_coverage", "filters.stay_coverage_filter (daily_stats, 대시보드, 스케줄 타겟)",
+         select(res.id).where(res.tenant_id == tenant_id, res.status == ReservationStatus.CONFIRMED,
+                              stay_coverage_filter(AUDIT_DATE))),
+        ("room_assignment_by_res_date", "room_assignment / sms_sender (reservation_id, date)",
+         select(RoomAssignment.id).where(RoomAssignment.reservation_id == sample_reservation_id,
+                                         RoomAssignment.date == AUDIT_DATE)),
+        ("room_assignment_by_date", "객실 그리드 / 배정 (date, room_id)",
+         select(RoomAssignment.room_id, RoomAssignment.reservation_id).where(
+             RoomAssignment.tenant_id == tenant_id, RoomAssignment.date == AUDIT_DATE)),
+        ("pending_chips", "sms_sender 템플릿 일괄 발송 (template_key, date, sent_at IS NULL)",
+         select(chip.id).join(res, and_(chip.reservation_id == res.id, chip.tenant_id == res.tenant_id)).where(
+             chip.tenant_id == tenant_id, chip.template_key == "room_info", chip.date == AUDIT_DATE,
+             chip.sent_at.is_(None), stay_coverage_filter(AUDIT_DATE), res.status == ReservationStatus.CONFIRMED)),
+        ("event_exclude_sent", "template_scheduler._get_targets_event (NOT EXISTS)",
+         select(res.id).where(
+             res.tenant_id == tenant_id, res.status == ReservationStatus.CONFIRMED, res.confirmed_at >= cutoff,
+             ~exists().where(chip.tenant_id == res.tenant_id, chip.template_key == "welcome_event",
+                             chip.reservation_id == res.id,
+                             or_(chip.sent_at.isnot(None), chip.send_status == "failed")))),
+        ("reservation_list_page", "GET /api/reservations (날짜 없음, confirmed_at DESC keyset)",
+         select(res.id).where(res.tenant_id == tenant_id)
+         .order_by(res.confirmed_at.desc().nullslast(), res.id.desc()).limit(50)),
+        ("activity_latest_by_type", "dashboard 마지막 naver_sync",
+         select(ActivityLog.id).where(ActivityLog.tenant_id == tenant_id, ActivityLog.activity_type == "naver_sync")
+         .order_by(ActivityLog.created_at.desc()).limit(1)),
+        ("activity_list_by_type", "GET /api/activity-logs?type=",
+         select(ActivityLog.id, ActivityLog.title).where(
+             ActivityLog.tenant_id == tenant_id, ActivityLog.activity_type == "sms_template")
+         .order_by(ActivityLog.created_at.desc()).limit(50)),
+    ]
+
+
+_SQLITE_SEQ = re.compile(r"^SCAN (\w+)")  # "SCAN t USING INDEX" 도 인덱스 전체 순회
+_PG_SEQ = re.compile(r"Seq Scan on (\w+)")
+
+
+def explain(conn, stmt) -> tuple:
+    """(계획 텍스트, 순차 스캔 테이블 목록)."""
+    dialect = conn.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "postgresql":
+        lines = [r[0] for r in conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")]
+        seq = [m.group(1) for line in lines for m in [_PG_SEQ.search(line)] if m]
+    else:
+        lines = [r[3] for r in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+        seq = [m.group(1) for line in lines for m in [_SQLITE_SEQ.match(line.strip())] if m]
+    return "\n".join(lines), sorted(set(seq))
+
+
+def measure(conn, stmt, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(stmt).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_pass(engine, repeat: int) -> dict:
+    with engine.connect() as conn:
+        tenant_id = 2 if conn.execute(select(Tenant.id).where(Tenant.id == 2)).first() else 1
+        sample = conn.execute(
+            select(RoomAssignment.reservation_id).where(RoomAssignment.date == AUDIT_DATE).limit(1)
+        ).scalar() or 1
+        out = {}
+        for name, where, stmt in hot_queries(tenant_id, sample):
+            plan, seq = explain(conn, stmt)
+            out[name] = {"where": where, "plan": plan, "seq": seq, "ms": measure(conn, stmt, repeat)}
+        return out
+
+
+def _audit_index(name: str):
+    table_name = next(t for t, n in AUDIT_INDEXES if n == name)
+    return next(ix for ix in Base.metadata.tables[table_name].indexes if ix.name == name)
+
+
+def set_audit_indexes(engine, present: bool):
+    existing = {
+        ix["name"] for table, _ in AUDIT_INDEXES for ix in inspect(engine).get_indexes(table)
+    }
+    with engine.begin() as conn:
+        for _, name in AUDIT_INDEXES:
+            if present and name not in existing:
+                _audit_index(name).create(conn)
+            elif not present and name in existing:
+                _audit_index(name).drop(conn)
+        conn.exec_driver_sql("ANALYZE")
+
+
+def report(before: dict, after: dict, engine, tenants: int, per_tenant: int, verbose: bool) -> str:
+    lines = [
+        f"# Index audit — {engine.dialect.name}",
+        "",
+        f"테넌트 {tenants} × 예약 {per_tenant:,} ({START} 부터 {DAYS}일), 기준일 {AUDIT_DATE}.",
+        f"감사 대상 인덱스: {', '.join(n for _, n in AUDIT_INDEXES)}",
+        "",
+        "| query | before ms | after ms | seq scan before | seq scan after |",
+        "|---|---:|---:|---|---|",
+    ]
+    for name, b in before.items():
+        a = after[name]
+        lines.append(
+            f"| {name} | {b['ms']:.2f} | {a['ms']:.2f} | {', '.join(b['seq']) or '-'} | {', '.join(a['seq']) or '-'} |"
+        )
+    if verbose:
+        for name, a in after.items():
+            lines += ["", f"## {name}", "", a["where"], "", "before:", "```", before[name]["plan"], "```",
+                      "after:", "```", a["plan"], "```"]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///:memory:", help="빈 스크래치 DB (기본: in-memory SQLite)")
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--reservations", type=int, default=25000, help="테넌트당 예약 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--plans", action="store_true", help="쿼리별 실행 계획 전문 포함")
+    parser.add_argument("--output", help="보고서 파일 (생략 시 stdout)")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite"):
+        engine = create_engine(args.database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(args.database_url)
+    if inspect(engine).get_table_names():
+        sys.exit("스크래치 DB 가 비어 있지 않습니다 — 빈 DB 를 지정하세요")
+
+    Base.metadata.create_all(engine)
+    try:
+        started = time.perf_counter()
+        seed(engine, args.tenants, args.reservations)
+        print(f"seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        set_audit_indexes(engine, present=False)
+        before = run_pass(engine, args.repeat)
+        set_audit_indexes(engine, present=True)
+        after = run_pass(engine, args.repeat)
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+    text_report = report(before, after, engine, args.tenants, args.reservations, args.plans)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text_report)
+    else:
+        print(text_report)
+    failing = [name for name, a in after.items() if a["seq"]]
+    if failing:
+        print(f"seq scan remaining: {', '.join(failing)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
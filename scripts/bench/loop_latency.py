@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+네이버 sync 중 API 지연 벤치마크 — /health, GET /api/reservations 의 p50/p99.
+
+실제 FastAPI 앱(app.main)에 httpx ASGITransport 로 요청을 보내면서, 같은 이벤트 루프에서
+sync_naver_to_db 를 돌린다 (가짜 provider 가 신규 예약 N건을 반환 → Phase 2~5 실제 실행).
+비교:
+  - idle:    sync 없음
+  - inline:  sync 의 DB 구간을 루프에서 직접 실행 (run_db 도입 전 동작)
+  - run_db:  현재 코드 — DB 구간은 DB 스레드 풀에서
+
+DB 는 임시 SQLite 파일(WAL) 또는 --database-url 의 빈 스크래치 DB.
+
+Usage (backend 디렉터리를 sys.path 에 추가):
+  python3 scripts/bench/loop_latency.py
+  python3 scripts/bench/loop_latency.py --bookings 3000 --database-url postgresql://.../scratch
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+os.environ.setdefault("DISABLE_SCHEDULER", "1")
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="", help="빈 스크래치 DB (기본: 임시 SQLite 파일)")
+    parser.add_argument("--bookings", type=int, default=1500, help="sync 1회에 들어오는 신규 예약 수")
+    parser.add_argument("--rounds", type=int, default=5, help="모드별 sync 반복 횟수")
+    parser.add_argument("--interval-ms", type=float, default=10, help="probe 요청 간격")
+    return parser.parse_args()
+
+
+args = _parse_args()
+_tmpdir = None
+if not args.database_url:
+    _tmpdir = tempfile.TemporaryDirectory()
+    args.database_url = f"sqlite:///{_tmpdir.name}/loop_latency.db"
+os.environ["DATABASE_URL"] = args.database_url  # app.db.database 가 import 시 엔진 생성
+
+import httpx  # noqa: E402
+from sqlalchemy import event, inspect  # noqa: E402
+
+from app.auth.utils import create_access_token, hash_password  # noqa: E402
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.db.models import Base, Tenant, User, UserRole, UserTenantRole  # noqa: E402
+from app.db.tenant_context import current_tenant_id  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import naver_sync  # noqa: E402
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _wal(dbapi_conn, _):
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+
+
+class _FakeProvider:
+    """신규 예약 n건을 돌려주는 provider (네이버 API 응답 형태)."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.batch = 0
+
+    async def sync_reservations(self, target_date=None, from_date=None, since=None):
+        self.batch += 1
+        out = []
+        for i in range(self.n):
+            ext = f"bench-{self.batch}-{i}"
+            day = 1 + i % 28
+            out.append({
+                "external_id": ext, "naver_booking_id": ext, "naver_biz_item_id": "biz-1",
+                "customer_name": f"손님{i}", "phone": f"010{i:08d}",
+                "date": f"2026-05-{day:02d}", "end_date": f"2026-05-{min(day + 1 + i % 3, 28):02d}",
+                "status": "confirmed", "booking_count": 1, "people_count": 2, "gender": "남",
+                "raw_data": {},
+            })
+        return out
+
+
+async def _inline(fn, *a, **kw):
+    return fn(*a, **kw)
+
+
+def _seed():
+    if inspect(engine).get_table_names():
+        sys.exit("스크래치 DB 가 비어 있지 않습니다 — 빈 DB 를 지정하세요")
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add(Tenant(id=1, slug="bench", name="Bench"))
+        user = User(username="bench", hashed_password=hash_password("pw"), name="bench", role=UserRole.STAFF)
+        db.add(user)
+        db.flush()
+        db.add(UserTenantRole(user_id=user.id, tenant_id=1))
+        db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}", "X-Tenant-Id": "1"}
+
+
+async def _probe(client, path, headers, stop, interval):
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        resp = await client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert resp.status_code == 200, (path, resp.status_code, resp.text[:200])
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def _sync(provider):
+    token = current_tenant_id.set(1)
+    db = SessionLocal()
+    try:
+        return await naver_sync.sync_naver_to_db(provider, db, source="naver")
+    finally:
+        db.close()
+        current_tenant_id.reset(token)
+
+
+async def _measure(client, headers, provider, mode, interval, rounds):
+    """mode 로 sync 를 rounds 번 (idle 은 같은 시간만큼 대기) 돌리는 동안의 probe 지연."""
+    stop = asyncio.Event()
+    probes = [
+        asyncio.create_task(_probe(client, "/health", {}, stop, interval)),
+        asyncio.create_task(_probe(client, "/api/reservations?limit=50", headers, stop, interval)),
+    ]
+    started = time.perf_counter()
+    naver_sync.run_db = _inline if mode == "inline" else _run_db
+    try:
+        for _ in range(rounds):
+            await asyncio.sleep(0.05)
+            if mode == "idle":
+                await asyncio.sleep(0.5)
+            else:
+                await _sync(provider)
+    finally:
+        naver_sync.run_db = _run_db
+    elapsed = (time.perf_counter() - started) / rounds
+    stop.set()
+    return elapsed, await asyncio.gather(*probes)
+
+
+def _pct(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+_run_db = naver_sync.run_db
+
+
+async def main():
+    headers = _seed()
+    provider = _FakeProvider(args.bookings)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await _measure(client, headers, _FakeProvider(50), "run_db", 0, 2)  # warm-up (import, 첫 커넥션)
+        print(f"# loop_latency — {engine.dialect.name}, {args.rounds} syncs × {args.bookings:,} new bookings per mode")
+        print("| mode | s / sync | /health p50 | /health p99 | /api/reservations p50 | /api/reservations p99 |")
+        print("|---|---:|---:|---:|---:|---:|")
+        counts = {}
+        for mode in ("idle", "inline", "run_db"):
+            elapsed, (health, listing) = await _measure(
+                client, headers, provider, mode, args.interval_ms / 1000, args.rounds,
+            )
+            print(f"| {mode} | {elapsed:.2f} | {_pct(health, .5):.1f} | {_pct(health, .99):.1f} "
+                  f"| {_pct(listing, .5):.1f} | {_pct(listing, .99):.1f} |")
+            counts[mode] = (len(health), len(listing))
+    print(f"\n(ms; requests per mode (health, reservations): {counts})")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    finally:
+        if _tmpdir is not None:
+            _tmpdir.cleanup()
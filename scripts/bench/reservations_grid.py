@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+GET /api/reservations?date=... (객실 배정 그리드) 벤치마크 — in-memory SQLite.
+
+날짜당 예약 N건(기본 500 / 2,000 / 10,000)을 만들고 각 예약에 객실 배정·daily info·칩 4개
+(어제 발송 / 당일 / 내일 미발송 / excluded)를 붙인 뒤, 엔드포인트 함수를 직접 호출해
+SQL 문 수와 응답 생성 시간(중앙값)을 잰다.
+
+Usage (backend 디렉터리 기준 경로를 sys.path 에 추가):
+  python3 scripts/bench/reservations_grid.py
+  python3 scripts/bench/reservations_grid.py --sizes 500 2000 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+os.environ.setdefault("DISABLE_SCHEDULER", "1")
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.api.reservations import get_reservations  # noqa: E402
+from app.db.models import (  # noqa: E402
+    Base, Building, MessageTemplate, Reservation, ReservationDailyInfo, ReservationSmsAssignment,
+    ReservationStatus, Room, RoomAssignment, TemplateSchedule, Tenant,
+)
+from app.db.tenant_context import current_tenant_id  # noqa: E402
+
+DATE = "2026-05-10"
+PREV, NEXT = "2026-05-09", "2026-05-11"
+
+
+def _seed(n: int):
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Tenant(id=1, slug="bench", name="Bench"))
+    db.commit()
+    current_tenant_id.set(1)
+
+    building = Building(tenant_id=1, name="본관", is_active=True)
+    db.add(building)
+    db.flush()
+    rooms = [
+        Room(tenant_id=1, room_number=f"{i:04d}", room_type="더블", building_id=building.id, is_active=True)
+        for i in range(n)
+    ]
+    db.add_all(rooms)
+    for key, target_mode in (("room_info", None), ("hook", "once")):
+        template = MessageTemplate(tenant_id=1, template_key=key, name=key, content="x", is_active=True)
+        db.add(template)
+        db.flush()
+        db.add(TemplateSchedule(
+            tenant_id=1, template_id=template.id, schedule_name=key, schedule_type="daily",
+            hour=9, minute=0, is_active=True, target_mode=target_mode,
+        ))
+    db.flush()
+
+    now = datetime(2026, 5, 1, 12, 0)
+    db.execute(insert(Reservation), [
+        {
+            "tenant_id": 1, "customer_name": f"손님{i}", "phone": f"010{i:08d}",
+            "check_in_date": PREV if i % 3 == 0 else DATE, "check_in_time": "15:00", "check_out_date": NEXT,
+            "status": ReservationStatus.CONFIRMED, "booking_source": "naver", "party_size": 2,
+            "section": "unstable" if i % 50 == 0 else "room", "confirmed_at": now - timedelta(minutes=i),
+            "created_at": now, "updated_at": now,
+        }
+        for i in range(n)
+    ])
+    res_ids = [rid for (rid,) in db.query(Reservation.id).order_by(Reservation.id)]
+    db.execute(insert(RoomAssignment), [
+        {"tenant_id": 1, "reservation_id": rid, "date": DATE, "room_id": rooms[i].id,
+         "room_password": "1234", "assigned_by": "auto", "bed_order": 0}
+        for i, rid in enumerate(res_ids)
+    ])
+    db.execute(insert(ReservationDailyInfo), [
+        {"tenant_id": 1, "reservation_id": rid, "date": DATE, "party_type": "1", "notes": "메모"}
+        for rid in res_ids[::2]
+    ])
+    chips = []
+    for rid in res_ids:
+        chips += [
+            {"tenant_id": 1, "reservation_id": rid, "template_key": "room_info", "date": PREV,
+             "assigned_at": now, "sent_at": now, "assigned_by": "auto", "send_status": "sent"},
+            {"tenant_id": 1, "reservation_id": rid, "template_key": "room_info", "date": DATE,
+             "assigned_at": now, "assigned_by": "auto"},
+            {"tenant_id": 1, "reservation_id": rid, "template_key": "hook", "date": NEXT,
+             "assigned_at": now, "assigned_by": "auto"},
+            {"tenant_id": 1, "reservation_id": rid, "template_key": "party", "date": DATE,
+             "assigned_at": now, "assigned_by": "excluded"},
+        ]
+    db.execute(insert(ReservationSmsAssignment), chips)
+    db.commit()
+    return engine, db
+
+
+def _body_size(result) -> int:
+    body = getattr(result, "body", None)
+    if body is not None:
+        return len(body)
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    return len(JSONResponse(jsonable_encoder(result)).body)
+
+
+def bench(n: int, limit: int, repeat: int) -> dict:
+    engine, db = _seed(n)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        statements.clear()
+        db.expire_all()
+        started = time.perf_counter()
+        result = get_reservations(date=DATE, limit=limit, db=db, current_user=None)
+        size = _body_size(result)  # 응답 직렬화까지 포함
+        timings.append((time.perf_counter() - started) * 1000)
+    db.close()
+    engine.dispose()
+    return {"n": n, "limit": limit, "statements": len(statements), "ms": statistics.median(timings), "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'per date':>9} {'limit':>6} {'SQL':>4} {'median ms':>10} {'bytes':>10}")
+    for n in args.sizes:
+        for limit in (200, n):
+            r = bench(n, limit, args.repeat)
+            print(f"{r['n']:>9} {r['limit']:>6} {r['statements']:>4} {r['ms']:>10.1f} {r['bytes']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+stay_coverage_filter 벤치마크 — "날짜 d 에 투숙 중" / 구간 겹침 조회, 이식 가능한 B-tree 형태 vs 방언 형태.
+
+index_audit.py 와 같은 합성 데이터를 빈 DB 에 만들고, 기준일 주변 날짜들에 대해
+  - or:    stay_coverage_or (date <= d AND end_date > d OR date = d) — 문자열 시절과 같은 조건
+  - range: stay_coverage_filter (PostgreSQL 은 stay_range @> d, GiST) — SQLite 는 or 와 같은 SQL
+를 번갈아 실행해 중앙값(ms)과 결과 행 수를 비교한다. 구간(7일) 겹침은 stay_overlap_filter.
+
+Usage (backend 디렉터리 기준 경로를 sys.path 에 추가):
+  python3 scripts/bench/stay_coverage.py                                    # in-memory SQLite
+  python3 scripts/bench/stay_coverage.py --database-url postgresql://.../scratch
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+from index_audit import AUDIT_DATE, seed  # noqa: E402  (backend 를 sys.path 에 추가)
+
+from sqlalchemy import create_engine, inspect, select  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db.models import Base, Reservation, ReservationStatus  # noqa: E402
+from app.services.filters import (  # noqa: E402
+    _stay_overlap_or, stay_coverage_filter, stay_coverage_or, stay_overlap_filter,
+)
+
+
+def _query(condition, tenant_id: int = 1):
+    return select(Reservation.id).where(
+        Reservation.tenant_id == tenant_id, Reservation.status == ReservationStatus.CONFIRMED, condition,
+    )
+
+
+def _time(conn, stmts, repeat: int):
+    timings, rows = [], 0
+    for _ in range(repeat):
+        for stmt in stmts:
+            started = time.perf_counter()
+            rows = len(conn.execute(stmt).all())
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///:memory:", help="빈 스크래치 DB (기본: in-memory SQLite)")
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--reservations", type=int, default=25000, help="테넌트당 예약 수")
+    parser.add_argument("--dates", type=int, default=30, help="기준일부터 측정할 날짜 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite"):
+        engine = create_engine(args.database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(args.database_url)
+    if inspect(engine).get_table_names():
+        sys.exit("스크래치 DB 가 비어 있지 않습니다 — 빈 DB 를 지정하세요")
+
+    Base.metadata.create_all(engine)
+    try:
+        seed(engine, args.tenants, args.reservations)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+        start = date.fromisoformat(AUDIT_DATE)
+        days = [(start + timedelta(days=n)).isoformat() for n in range(args.dates)]
+        weeks = [(d, (date.fromisoformat(d) + timedelta(days=6)).isoformat()) for d in days]
+        cases = [
+            ("coverage/or", [_query(stay_coverage_or(d)) for d in days]),
+            ("coverage/range", [_query(stay_coverage_filter(d)) for d in days]),
+            ("overlap7/or", [_query(_stay_overlap_or(lo, hi)) for lo, hi in weeks]),
+            ("overlap7/range", [_query(stay_overlap_filter(lo, hi)) for lo, hi in weeks]),
+        ]
+        print(f"# stay_coverage — {engine.dialect.name}, {args.tenants} × {args.reservations:,}, "
+              f"{args.dates} dates from {AUDIT_DATE}")
+        print(f"{'case':<16} {'median ms':>10} {'rows(last)':>11}")
+        with engine.connect() as conn:
+            for name, stmts in cases:
+                ms, rows = _time(conn, stmts, args.repeat)
+                print(f"{name:<16} {ms:>10.2f} {rows:>11}")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
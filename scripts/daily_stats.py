@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+daily_stats 재구축 / 정합성 검사 — settings.DATABASE_URL 대상.
+
+alembic upgrade (daily_stats) 직후 한 번 rebuild 로 과거 데이터를 채운다. 그 뒤로는
+예약/daily info/배정 commit 시 자동 갱신 + 매일 04:20 check_daily_stats_job 이 보정.
+
+Usage (backend 디렉터리 기준 경로를 sys.path 에 추가):
+  python3 scripts/daily_stats.py rebuild                       # 활성 테넌트 전체, 전 기간
+  python3 scripts/daily_stats.py rebuild --tenant stable --from 2026-01-01 --to 2026-12-31
+  python3 scripts/daily_stats.py check --from 2026-10-01 --to 2026-11-30 [--repair]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+os.environ.setdefault("DISABLE_SCHEDULER", "1")
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.db.tenant_context import current_tenant_id  # noqa: E402
+from app.scheduler.tenant_fanout import active_tenants  # noqa: E402
+from app.services.daily_stats import check_daily_stats, rebuild_daily_stats  # noqa: E402
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("command", choices=["rebuild", "check"])
+    p.add_argument("--tenant", help="테넌트 slug (생략 시 활성 테넌트 전체)")
+    p.add_argument("--from", dest="date_from", help="YYYY-MM-DD (check 는 필수)")
+    p.add_argument("--to", dest="date_to", help="YYYY-MM-DD (check 는 필수)")
+    p.add_argument("--repair", action="store_true", help="check: 불일치 날짜 재계산 저장")
+    args = p.parse_args()
+    if args.command == "check" and not (args.date_from and args.date_to):
+        p.error("check 는 --from / --to 가 필요합니다")
+
+    tenants = [t for t in active_tenants() if args.tenant in (None, t.slug)]
+    if not tenants:
+        print(f"대상 테넌트 없음: {args.tenant}")
+        sys.exit(1)
+
+    failed = 0
+    for tenant in tenants:
+        token = current_tenant_id.set(tenant.id)
+        db = SessionLocal()
+        try:
+            if args.command == "rebuild":
+                days = rebuild_daily_stats(db, tenant.id, args.date_from, args.date_to)
+                db.commit()
+                print(f"[{tenant.slug}] rebuilt {days} days")
+            else:
+                mismatches = check_daily_stats(db, tenant.id, args.date_from, args.date_to, repair=args.repair)
+                db.commit()
+                failed += len(mismatches)
+                print(f"[{tenant.slug}] {len(mismatches)} mismatches{' (repaired)' if args.repair and mismatches else ''}")
+                for m in mismatches[:20]:
+                    print(f"  {m['date']} {m['field']}: stored={m['stored']} actual={m['actual']}")
+        finally:
+            db.close()
+            current_tenant_id.reset(token)
+
+    sys.exit(0 if failed == 0 or args.repair else 1)
+
+
+if __name__ == "__main__":
+    main()
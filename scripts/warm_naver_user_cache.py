@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+네이버 user-info 캐시 warm-up — 기존 예약의 성별/연령대/방문횟수로 naver_user_infos 를 채운다.
+
+alembic upgrade (naver_user_info_cache) 직후 한 번 실행. 안 돌려도 동작은 같고, 첫 sync 들이
+재방문 고객 user-info 를 전부 API 로 다시 조회할 뿐이다. 이미 캐시 행이 있는 고객은 건너뛰므로
+여러 번 실행해도 안전하다.
+
+Usage (backend 디렉터리 기준 경로를 sys.path 에 추가):
+  python3 scripts/warm_naver_user_cache.py                     # 활성 테넌트 전체
+  python3 scripts/warm_naver_user_cache.py --tenant stable
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+os.environ.setdefault("DISABLE_SCHEDULER", "1")
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.db.tenant_context import current_tenant_id  # noqa: E402
+from app.scheduler.tenant_fanout import active_tenants  # noqa: E402
+from app.services.naver_user_cache import warm_user_info_cache  # noqa: E402
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--tenant", help="테넌트 slug (생략 시 활성 테넌트 전체)")
+    args = p.parse_args()
+
+    tenants = [t for t in active_tenants() if args.tenant in (None, t.slug)]
+    if not tenants:
+        print(f"대상 테넌트 없음: {args.tenant}")
+        sys.exit(1)
+
+    for tenant in tenants:
+        token = current_tenant_id.set(tenant.id)
+        db = SessionLocal()
+        try:
+            added = warm_user_info_cache(db, tenant)
+            print(f"[{tenant.slug}] warmed {added} rows")
+        finally:
+            db.close()
+            current_tenant_id.reset(token)
+
+
+if __name__ == "__main__":
+    main()